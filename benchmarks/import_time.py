@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Solana Detective Cold-Start Benchmark
+Measures `import solana_detective` and client construction in fresh
+interpreters, as short-lived CLI, cron and serverless invocations see them
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Any, Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter; prints one JSON line
+PROBE = """
+import sys, time, json
+started = time.perf_counter()
+import solana_detective
+imported = time.perf_counter()
+transport_loaded = "requests" in sys.modules
+first = solana_detective.SolanaDetective(api_key="benchmark")
+constructed = time.perf_counter()
+for _ in range(100):
+    solana_detective.SolanaDetective(api_key="benchmark")
+repeated = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_client_ms": (constructed - imported) * 1000,
+    "client_ms": (repeated - constructed) * 1000 / 100,
+    "transport_loaded_on_import": transport_loaded,
+    "shared_session": first.session is solana_detective.SolanaDetective(api_key="other").session
+}))
+"""
+
+
+def run_probe() -> Dict[str, Any]:
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    env.pop("SOLANA_TRACKER_API_KEY", None)
+    output = subprocess.run([sys.executable, "-c", PROBE], env=env, check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {}
+    for key in ("import_ms", "first_client_ms", "client_ms"):
+        values = sorted(run[key] for run in runs)
+        summary[key] = {"median": statistics.median(values), "max": values[-1]}
+    summary["transport_loaded_on_import"] = any(run["transport_loaded_on_import"] for run in runs)
+    summary["shared_session"] = all(run["shared_session"] for run in runs)
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Measure SolanaDetective import and construction time")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters to measure")
+    parser.add_argument("--max-import-ms", type=float, default=25.0,
+                        help="Fail when the median `import solana_detective` takes longer")
+    parser.add_argument("--max-client-ms", type=float, default=1.0,
+                        help="Fail when the median construction of further clients takes longer")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    # Warm the bytecode cache so the first run does not pay for compilation
+    run_probe()
+    summary = summarize([run_probe() for _ in range(args.runs)])
+
+    print(f"{'measure':<26} {'median ms':>10} {'max ms':>10}")
+    print("-" * 48)
+    for key, label in (("import_ms", "import solana_detective"),
+                       ("first_client_ms", "first SolanaDetective()"),
+                       ("client_ms", "next SolanaDetective()")):
+        print(f"{label:<26} {summary[key]['median']:>10.2f} {summary[key]['max']:>10.2f}")
+    print(f"\nrequests imported by `import solana_detective`: {summary['transport_loaded_on_import']}")
+    print(f"Clients share one session: {summary['shared_session']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    failures = []
+    if summary["import_ms"]["median"] > args.max_import_ms:
+        failures.append(f"import takes {summary['import_ms']['median']:.2f} ms (target {args.max_import_ms} ms)")
+    if summary["client_ms"]["median"] > args.max_client_ms:
+        failures.append(f"client construction takes {summary['client_ms']['median']:.2f} ms "
+                        f"(target {args.max_client_ms} ms)")
+    if summary["transport_loaded_on_import"]:
+        failures.append("`import solana_detective` loads requests")
+    if failures:
+        print("\nCold-start targets missed:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print(f"\nWithin targets (import {args.max_import_ms} ms, client {args.max_client_ms} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
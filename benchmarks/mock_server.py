@@ -0,0 +1,601 @@
+#!/usr/bin/env python3
+"""
+Mock Solana Tracker API server for Solana Detective benchmarks
+Serves the example responses from docs/QUALITY_CHECKED_SOLANA_API_DOCS.json
+(the /events endpoints in their binary format) with configurable latency, 429 rate and payload size, over HTTP/1.1 or (with
+hypercorn) HTTP/1.1 and HTTP/2
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import socket
+import asyncio
+import time
+import random
+import zlib
+import hashlib
+import argparse
+import threading
+from copy import deepcopy
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Add package to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solana_detective.events import encode_events
+
+DOCS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "docs", "QUALITY_CHECKED_SOLANA_API_DOCS.json")
+
+# Addresses used by the benchmark workloads
+SAMPLE_TOKEN = "6p6xgHyF7AeE6TZkSmFsko444wqoP15icUSqi2jfGiPN"
+SAMPLE_POOL = "9d9mb8kooFfaD3SctgZtkxQypkshx6ezhbKio89ixyy2"
+SAMPLE_WALLET = "8psNvWTrdNTiVRNzAgsou9kETXNJm2SXZyaKuJraVRtf"
+
+# Event endpoints; served as JSON events, or in the package's provisional
+# compact layout with event_layout="compact" (see solana_detective.events)
+EVENT_ROUTES = {("GET", "/events/{tokenAddress}"), ("GET", "/events/{tokenAddress}/{poolAddress}")}
+
+# Endpoints without a usable example reuse another endpoint's body
+_SYNTHESIZED = {
+    ("GET", "/tokens/by-pool/{poolAddress}"): lambda ex: ex[("GET", "/tokens/{tokenAddress}")],
+    ("GET", "/tokens/multi"): lambda ex: {"tokens": {SAMPLE_TOKEN: ex[("GET", "/tokens/{tokenAddress}")]}},
+    ("POST", "/tokens/multi"): lambda ex: {"tokens": {SAMPLE_TOKEN: ex[("GET", "/tokens/{tokenAddress}")]}},
+    ("GET", "/tokens/trending"): lambda ex: ex[("GET", "/tokens/latest")],
+    ("GET", "/tokens/trending/{timeframe}"): lambda ex: ex[("GET", "/tokens/latest")],
+    ("GET", "/tokens/volume"): lambda ex: ex[("GET", "/tokens/latest")],
+    ("GET", "/tokens/volume/{timeframe}"): lambda ex: ex[("GET", "/tokens/latest")],
+    ("GET", "/tokens/multi/graduated"): lambda ex: ex[("GET", "/tokens/latest")],
+    ("POST", "/price"): lambda ex: ex[("GET", "/price")],
+    ("GET", "/price/multi"): lambda ex: {SAMPLE_TOKEN: ex[("GET", "/price")]},
+    ("POST", "/price/multi"): lambda ex: {SAMPLE_TOKEN: ex[("GET", "/price")]},
+    ("GET", "/wallet/{owner}/page/{page}"): lambda ex: ex[("GET", "/wallet/{owner}")],
+    ("GET", "/trades/{tokenAddress}/{poolAddress}"): lambda ex: ex[("GET", "/wallet/{owner}/trades")],
+    ("GET", "/trades/{tokenAddress}/{poolAddress}/{owner}"): lambda ex: ex[("GET", "/wallet/{owner}/trades")],
+    ("GET", "/trades/{tokenAddress}/by-wallet/{owner}"): lambda ex: ex[("GET", "/wallet/{owner}/trades")],
+    ("GET", "/chart/holders/{token}"): lambda ex: ex[("GET", "/holders/chart/{token}")],
+    ("GET", "/first-buyers/{token}"): lambda ex: [
+        dict(ex[("GET", "/pnl/{wallet}/{token}")], wallet=SAMPLE_WALLET)
+    ],
+    ("GET", "/top-traders/all"): lambda ex: {"wallets": [_top_trader(ex)]},
+    ("GET", "/top-traders/all/{page}"): lambda ex: {"wallets": [_top_trader(ex)]},
+    ("GET", "/top-traders/{token}"): lambda ex: [dict(ex[("GET", "/pnl/{wallet}/{token}")], wallet=SAMPLE_WALLET)],
+    ("GET", "/events/{tokenAddress}/{poolAddress}"): lambda ex: ex[("GET", "/events/{tokenAddress}")],
+    ("GET", "/live-events"): lambda ex: ex[("GET", "/events/{tokenAddress}")],
+}
+
+
+def _top_trader(examples: Dict[Tuple[str, str], Any]) -> Dict[str, Any]:
+    summary = examples.get(("GET", "/pnl/{wallet}"), {}).get("summary", {})
+    return {"wallet": SAMPLE_WALLET, "summary": summary}
+
+
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"?|[{}\[\]:,]|[^\s{}\[\]:,"]+')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+_CLOSERS = {"{": "}", "[": "]"}
+_OPENERS = {"}": "{", "]": "["}
+
+
+def repair_json(text: str) -> Any:
+    """
+    Parse a documentation example, repairing the usual damage
+
+    The examples were scraped from HTML and are often cut at both ends or
+    mangled in between: Markdown fences, "{...}" placeholders, missing or
+    trailing commas, arrays closed by the wrong bracket and documents missing
+    their first or last lines. The tokens are re-emitted through a small
+    JSON grammar that inserts commas, closes containers and supplies missing
+    openers, and the result is parsed normally.
+
+    Raises:
+        ValueError: When the example cannot be repaired
+    """
+    text = re.sub(r"^```\w*|```$", "", text.strip()).strip()
+    text = text.replace("{...}", "{}").replace("[...]", "[]")
+    tokens = [token for token in _TOKEN.findall(text) if token != "..."]
+    if not tokens:
+        raise ValueError("Empty example")
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    return json.loads("".join(_rebuild(_missing_openers(tokens) + tokens)))
+
+
+def _missing_openers(tokens: List[str]) -> List[str]:
+    """Openers cut off the start of an example (closers seen with nothing open)"""
+    depth = 0
+    missing = []
+    for token in tokens:
+        if token in _CLOSERS:
+            depth += 1
+        elif token in _OPENERS:
+            if depth:
+                depth -= 1
+            else:
+                missing.insert(0, _OPENERS[token])
+    # An object closed by "]" is the tail of an array even when brackets inside are unbalanced
+    if not missing and tokens[0] == "{" and tokens[-1] == "]":
+        missing = ["["]
+    return missing
+
+
+def _rebuild(tokens: List[str]) -> List[str]:
+    """Re-emit tokens as valid JSON"""
+    out: List[str] = []
+    # Open containers as [opener, state]; state is "start", "value" (object key
+    # written, value pending) or "next" (a member was written)
+    stack: List[List[str]] = []
+
+    def complete() -> None:
+        if stack:
+            stack[-1][1] = "next"
+
+    def close() -> None:
+        opener, state = stack.pop()
+        if state == "value":
+            out.append("null")
+        out.append(_CLOSERS[opener])
+        complete()
+
+    for index, token in enumerate(tokens):
+        if token in (",", ":"):
+            continue
+        if token in _OPENERS:
+            if any(opener == _OPENERS[token] for opener, _ in stack):
+                while stack[-1][0] != _OPENERS[token]:
+                    close()
+                close()
+            continue
+        if token.startswith('"') and not _STRING.fullmatch(token):
+            token += '"'
+        is_key = token.startswith('"') and index + 1 < len(tokens) and tokens[index + 1] == ":"
+        if is_key:
+            while stack and stack[-1][0] == "[":
+                close()
+            if not stack:
+                continue
+            if stack[-1][1] == "next":
+                out.append(",")
+            elif stack[-1][1] == "value":
+                out.append("null,")
+            out.append(token + ":")
+            stack[-1][1] = "value"
+            continue
+        if stack:
+            opener, state = stack[-1]
+            if opener == "{" and state != "value":
+                continue  # value without a key
+            if state == "next":
+                out.append(",")
+        elif out:
+            continue  # trailing data after the top-level value
+        out.append(token)
+        if token in _CLOSERS:
+            stack.append([token, "start"])
+        else:
+            complete()
+    while stack:
+        close()
+    return out
+
+
+def load_examples(docs_path: str = DOCS_PATH) -> Dict[Tuple[str, str], Any]:
+    """
+    Example bodies keyed by (method, path template)
+
+    Examples that are empty or cannot be repaired are synthesized from
+    related endpoints.
+    """
+    with open(docs_path, "r") as f:
+        docs = json.load(f)
+
+    examples = {}
+    for spec in docs["endpoints"].values():
+        try:
+            examples[(spec["method"], spec["path"])] = repair_json(spec.get("example_response") or "")
+        except ValueError:
+            continue
+    for key, build in _SYNTHESIZED.items():
+        if key not in examples:
+            examples[key] = build(examples)
+    return examples
+
+
+def scale_payload(body: Any, items: Optional[int]) -> Any:
+    """
+    Resize the arrays of a body to `items` elements by repeating its examples
+
+    Top-level arrays and arrays directly inside a top-level object are
+    resized, which covers the list endpoints (holders, trades, tokens, events).
+    """
+    if not items:
+        return body
+
+    def resize(value: Any) -> Any:
+        if isinstance(value, list) and value:
+            return [deepcopy(value[i % len(value)]) for i in range(items)]
+        return value
+
+    if isinstance(body, dict):
+        return {key: resize(value) for key, value in body.items()}
+    return resize(body)
+
+
+class MockSolanaTracker:
+    """
+    Request handling of the mock API, independent of the HTTP transport
+
+    Responses are encoded (and compressed) once per route, so serving costs
+    little next to the client work being measured.
+    """
+
+    def __init__(self, examples: Dict[Tuple[str, str], Any] = None, latency: float = 0.0,
+                 jitter: float = 0.0, rate_429: float = 0.0, retry_after: float = 0,
+                 payload_items: Optional[int] = None, seed: int = None, compress: bool = False,
+                 etag: bool = True, event_layout: str = "json"):
+        """
+        Initialize mock API
+
+        Args:
+            examples: Bodies keyed by (method, path template) (default: load_examples())
+            latency: Base response delay in seconds
+            jitter: Extra random delay, uniform between 0 and `jitter` seconds
+            rate_429: Fraction of requests answered with 429 Too Many Requests
+            retry_after: Retry-After value sent with 429 responses
+            payload_items: Resize response arrays to this many elements
+            seed: Random seed for reproducible jitter and 429s
+            compress: Compress responses with the best coding the client accepts
+                (zstd and br when zstandard / brotli are installed, else gzip)
+            etag: Send an ETag per route and answer matching If-None-Match with
+                304 Not Modified (False leaves revalidation to content hashes)
+            event_layout: "json" or "compact" bodies for the /events routes (the
+                compact layout is provisional, defined by solana_detective.events)
+        """
+        examples = examples if examples is not None else load_examples()
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+        self.not_modified = 0
+        self.compress = compress
+        self.etag = etag
+        self._compressed: Dict[Tuple[int, str], bytes] = {}
+
+        self._routes: List[Tuple[str, Any, bytes, str, str]] = []
+        ordered = sorted(examples.items(), key=lambda item: _route_priority(item[0][1]))
+        for (method, template), body in ordered:
+            pattern = re.compile("^" + re.sub(r"\\\{[^/]+?\\\}", "[^/]+", re.escape(template)) + "$")
+            body = scale_payload(body, payload_items)
+            if (method, template) in EVENT_ROUTES and event_layout == "compact":
+                encoded, content_type = encode_events(body), "application/octet-stream"
+            else:
+                encoded, content_type = json.dumps(body).encode("utf-8"), "application/json"
+            # Weak: the same tag covers every content coding of the body
+            tag = f'W/"{hashlib.blake2b(encoded, digest_size=8).hexdigest()}"'
+            self._routes.append((method, pattern, encoded, tag, content_type))
+
+    def respond(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Build the response for a request
+
+        Args:
+            method: HTTP method
+            target: Request target (path and query string)
+            headers: Request headers (lower-case names)
+
+        Returns:
+            (status, response headers, body)
+        """
+        delay, limited = self.admit()
+        if delay:
+            time.sleep(delay)
+        return self.build(method, target, headers, limited)
+
+    def admit(self) -> Tuple[float, bool]:
+        """Count a request and draw its (delay in seconds, answered with 429)"""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            limited = bool(self.rate_429 and self._random.random() < self.rate_429)
+            if limited:
+                self.rate_limited += 1
+        return delay, limited
+
+    def build(self, method: str, target: str, headers: Dict[str, str],
+              limited: bool = False) -> Tuple[int, Dict[str, str], bytes]:
+        """Response for an admitted request, without the delay (see respond())"""
+        if not headers.get("x-api-key"):
+            return _error(401, "Missing API key")
+        if limited:
+            status, extra, body = _error(429, "Rate limit exceeded")
+            extra["Retry-After"] = str(self.retry_after)
+            return status, extra, body
+
+        path = urlsplit(target).path
+        for index, (route_method, pattern, body, tag, content_type) in enumerate(self._routes):
+            if route_method == method and pattern.match(path):
+                if self.etag and tag in headers.get("if-none-match", ""):
+                    with self._lock:
+                        self.not_modified += 1
+                    return 304, {"ETag": tag}, b""
+                response_headers = {"Content-Type": content_type}
+                if self.etag:
+                    response_headers["ETag"] = tag
+                encoding = self._encoding(headers.get("accept-encoding", "")) if self.compress else None
+                if encoding:
+                    response_headers["Content-Encoding"] = encoding
+                    body = self._compress(index, encoding, body)
+                return 200, response_headers, body
+        return _error(404, f"No mock route for {method} {path}")
+
+    @staticmethod
+    def _encoding(accept_encoding: str) -> Optional[str]:
+        """Best supported coding the client accepts (q-values are ignored)"""
+        accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+        for encoding in COMPRESSORS:
+            if encoding in accepted:
+                return encoding
+        return None
+
+    def _compress(self, index: int, encoding: str, body: bytes) -> bytes:
+        with self._lock:
+            compressed = self._compressed.get((index, encoding))
+        if compressed is None:
+            compressed = COMPRESSORS[encoding](body)
+            with self._lock:
+                self._compressed[(index, encoding)] = compressed
+        return compressed
+
+    def stats(self) -> Dict[str, int]:
+        """Request counters"""
+        with self._lock:
+            return {"requests": self.requests, "rate_limited": self.rate_limited,
+                    "not_modified": self.not_modified}
+
+
+def _compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    """Available content codings, best first"""
+    compressors: Dict[str, Callable[[bytes], bytes]] = {}
+    try:
+        import zstandard
+        compressors["zstd"] = zstandard.ZstdCompressor().compress
+    except ImportError:
+        pass
+    try:
+        import brotli
+        compressors["br"] = brotli.compress
+    except ImportError:
+        pass
+    compressors["gzip"] = lambda body: gzip.compress(body, mtime=0)
+    compressors["deflate"] = zlib.compress
+    return compressors
+
+
+COMPRESSORS = _compressors()
+
+
+def _route_priority(template: str) -> Tuple[int, int]:
+    """Sort key putting literal routes ("/tokens/latest") before parameterized ones"""
+    segments = template.strip("/").split("/")
+    literals = sum(1 for segment in segments if not segment.startswith("{"))
+    return (-literals, -len(segments))
+
+
+def _error(status: int, message: str) -> Tuple[int, Dict[str, str], bytes]:
+    return status, {"Content-Type": "application/json"}, json.dumps({"error": message}).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY each
+    # response would wait on the client's delayed ACK
+    disable_nagle_algorithm = True
+    api: MockSolanaTracker = None
+
+    def _serve(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        headers = {name.lower(): value for name, value in self.headers.items()}
+        status, response_headers, body = self.api.respond(self.command, self.path, headers)
+        self.send_response(status)
+        for name, value in response_headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _serve
+    do_POST = _serve
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockServer:
+    """
+    Threaded HTTP/1.1 server for a MockSolanaTracker
+
+    Example:
+        with MockServer(MockSolanaTracker(latency=0.02)) as server:
+            detective = SolanaDetective(api_key="bench", base_url=server.url)
+    """
+
+    def __init__(self, api: MockSolanaTracker = None, host: str = "127.0.0.1", port: int = 0):
+        self.api = api or MockSolanaTracker()
+        handler = type("Handler", (_Handler,), {"api": self.api})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class ASGIMockServer:
+    """
+    Hypercorn server for a MockSolanaTracker, speaking HTTP/1.1 and HTTP/2
+
+    Plain-text HTTP/2 needs prior knowledge on the client side (h2c), e.g.
+    SolanaDetective(http2=True, http2_prior_knowledge=True). Delays are
+    awaited, so concurrent streams on one connection are served concurrently.
+    Requires hypercorn (pip install hypercorn).
+
+    Example:
+        with ASGIMockServer(MockSolanaTracker(latency=0.02)) as server:
+            detective = SolanaDetective(api_key="bench", base_url=server.url,
+                                        http2=True, http2_prior_knowledge=True)
+    """
+
+    def __init__(self, api: MockSolanaTracker = None, host: str = "127.0.0.1", port: int = 0):
+        self.api = api or MockSolanaTracker()
+        # Bound here so port 0 resolves before the server starts
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, port))
+        self._socket.listen(1024)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._started = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._socket.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def app(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        """ASGI application"""
+        if scope["type"] != "http":
+            return
+        while (await receive()).get("more_body"):
+            pass
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        target = scope["raw_path"].decode("latin-1")
+        if scope["query_string"]:
+            target += "?" + scope["query_string"].decode("latin-1")
+        delay, limited = self.api.admit()
+        if delay:
+            await asyncio.sleep(delay)
+        status, response_headers, body = self.api.build(scope["method"], target, headers, limited)
+        if status != 304:
+            response_headers = dict(response_headers, **{"Content-Length": str(len(body))})
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in response_headers.items()]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _serve(self) -> None:
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config as HypercornConfig
+
+        config = HypercornConfig()
+        # Hypercorn closes the socket it serves on; keep ours for url and stop()
+        config.bind = [f"fd://{os.dup(self._socket.fileno())}"]
+        config.accesslog = None
+        config.errorlog = None
+        config.keep_alive_timeout = 75
+        config.h2_max_concurrent_streams = 1000
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._started.set()
+        await serve(self.app, config, shutdown_trigger=self._stopped.wait)
+
+    def start(self) -> "ASGIMockServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._socket.close()
+
+    def serve_forever(self) -> None:
+        asyncio.run(self._serve())
+
+    def __enter__(self) -> "ASGIMockServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Mock Solana Tracker API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080, help="Port (0 picks a free one)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Base response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay up to this many seconds")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=0, help="Retry-After sent with 429 responses")
+    parser.add_argument("--items", type=int, default=None, help="Resize response arrays to this many elements")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--docs", default=DOCS_PATH, help="API documentation JSON with example responses")
+    parser.add_argument("--compress", action="store_true",
+                        help="Compress responses with the best coding the client accepts")
+    parser.add_argument("--no-etag", dest="etag", action="store_false",
+                        help="Send no ETags and never answer 304 Not Modified")
+    parser.add_argument("--http2", action="store_true",
+                        help="Serve with hypercorn, speaking HTTP/1.1 and HTTP/2 (h2c prior knowledge)")
+    parser.add_argument("--event-layout", choices=("json", "compact"), default="json",
+                        help="Layout of /events bodies (compact: the package's provisional binary layout)")
+    return parser
+
+
+def main(argv: List[str] = None) -> None:
+    args = build_parser().parse_args(argv)
+    api = MockSolanaTracker(load_examples(args.docs), latency=args.latency, jitter=args.jitter,
+                            rate_429=args.rate_429, retry_after=args.retry_after,
+                            payload_items=args.items, seed=args.seed, compress=args.compress,
+                            etag=args.etag, event_layout=args.event_layout)
+    server = (ASGIMockServer if args.http2 else MockServer)(api, args.host, args.port)
+    # The benchmark runner reads the URL from this first line
+    print(f"Mock Solana Tracker listening on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
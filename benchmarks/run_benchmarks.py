@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Solana Detective Benchmarks
+Drives SolanaDetective against the local mock server and reports throughput,
+latency percentiles and peak memory, optionally checked against a baseline
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import subprocess
+import tracemalloc
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Add package to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solana_detective import SolanaDetective, AsyncSolanaDetective, SolanaDetectiveError
+from solana_detective.metrics import LatencyHistogram
+from mock_server import SAMPLE_TOKEN, SAMPLE_POOL, SAMPLE_WALLET
+
+MOCK_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_server.py")
+
+# Realistic mix of lookups, weighted towards the endpoints analyses call most
+MIXED_OPERATIONS: List[Callable[[SolanaDetective], Any]] = [
+    lambda d: d.get_token_info(SAMPLE_TOKEN),
+    lambda d: d.get_token_price(SAMPLE_TOKEN),
+    lambda d: d.get_token_price(SAMPLE_TOKEN),
+    lambda d: d.get_token_holders(SAMPLE_TOKEN),
+    lambda d: d.get_token_holders_top(SAMPLE_TOKEN),
+    lambda d: d.get_wallet_trades(SAMPLE_WALLET),
+    lambda d: d.get_wallet_pnl(SAMPLE_WALLET),
+    lambda d: d.get_wallet_token_pnl(SAMPLE_WALLET, SAMPLE_TOKEN),
+    lambda d: d.get_pool_trades(SAMPLE_TOKEN, SAMPLE_POOL),
+    lambda d: d.get_chart_data(SAMPLE_TOKEN),
+    lambda d: d.get_token_stats(SAMPLE_TOKEN),
+    lambda d: d.get_token_events(SAMPLE_TOKEN),
+]
+
+
+def _mixed(count: int) -> List[Callable[[SolanaDetective], Any]]:
+    return [MIXED_OPERATIONS[i % len(MIXED_OPERATIONS)] for i in range(count)]
+
+
+def _drain(iterator: Iterator[Any]) -> int:
+    return sum(1 for _ in iterator)
+
+
+class Workload:
+    """A named list of client operations and how to run them"""
+
+    def __init__(self, name: str, description: str,
+                 operations: Callable[[argparse.Namespace], List[Callable[[SolanaDetective], Any]]],
+                 workers: Callable[[argparse.Namespace], int] = lambda args: 1,
+                 items: Callable[[argparse.Namespace], Optional[int]] = lambda args: args.items,
+                 asynchronous: bool = False):
+        self.name = name
+        self.description = description
+        self.operations = operations
+        self.workers = workers
+        self.items = items
+        self.asynchronous = asynchronous
+
+
+WORKLOADS: Dict[str, Workload] = {
+    workload.name: workload for workload in (
+        Workload("sequential", "Mixed endpoint lookups, one at a time",
+                 lambda args: _mixed(args.requests)),
+        Workload("threaded", "Mixed endpoint lookups from a thread pool sharing one client",
+                 lambda args: _mixed(args.requests),
+                 workers=lambda args: args.workers),
+        Workload("async", "Mixed endpoint lookups gathered on AsyncSolanaDetective",
+                 lambda args: _mixed(args.requests),
+                 workers=lambda args: args.workers, asynchronous=True),
+        Workload("batch", "get_token_info for many tokens through batch()",
+                 lambda args: [lambda d: d.batch("get_token_info", [SAMPLE_TOKEN] * 20,
+                                                 max_workers=args.workers)] * max(1, args.requests // 20),
+                 workers=lambda args: 1),
+        Workload("large-decode", "Whole-body decode of large /tokens/multi/all responses",
+                 lambda args: [lambda d: d.get_tokens_multi_all()] * max(1, args.requests // 20),
+                 items=lambda args: args.large_items),
+        Workload("events-decode", "/events/{token} payloads decoded into columns (see --events-layout)",
+                 lambda args: [lambda d: d.get_token_events(SAMPLE_TOKEN)] * max(1, args.requests // 20),
+                 items=lambda args: args.large_items),
+        Workload("large-stream", "Streamed /tokens/multi/all responses, one element at a time",
+                 lambda args: [lambda d: _drain(d.iter_tokens_multi_all())] * max(1, args.requests // 20),
+                 items=lambda args: args.large_items),
+    )
+}
+
+
+@contextmanager
+def mock_server(args: argparse.Namespace, items: Optional[int]) -> Iterator[str]:
+    """Run the mock server in a subprocess so it does not compete for the client's GIL"""
+    command = [
+        sys.executable, MOCK_SERVER, "--port", "0",
+        "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--rate-429", str(args.rate_429), "--seed", str(args.seed)
+    ]
+    if items:
+        command += ["--items", str(items)]
+    if args.http2 or args.hypercorn:
+        command += ["--http2"]
+    if args.compress:
+        command += ["--compress"]
+    command += ["--event-layout", args.events_layout]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, universal_newlines=True)
+    try:
+        line = process.stdout.readline()
+        if "http://" not in line:
+            raise RuntimeError("Mock server failed to start")
+        yield line.rsplit(" ", 1)[-1].strip()
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def make_client(url: str, args: argparse.Namespace) -> SolanaDetective:
+    return SolanaDetective(
+        api_key="benchmark",
+        base_url=url,
+        rate_limit_delay=args.rate_limit_delay,
+        retry_delay=0.01,
+        retry_max_delay=1,
+        json_backend=args.json_backend,
+        events_layout=args.events_layout,
+        pool_maxsize=args.pool_maxsize,
+        http2=args.http2,
+        # The mock server speaks plain-text HTTP/2 (h2c)
+        http2_prior_knowledge=args.http2
+    )
+
+
+def pool_totals(detective: SolanaDetective) -> Dict[str, int]:
+    """Connections opened and discarded so far, over all of the client's pools"""
+    pools = detective.connection_pools().values()
+    return {key: sum(pool.get(key, 0) for pool in pools) for key in ("connections_opened", "discarded")}
+
+
+def run_operations(detective: SolanaDetective, operations: List[Callable[[SolanaDetective], Any]],
+                   workers: int, asynchronous: bool = False) -> Dict[str, Any]:
+    """Run operations and time each one"""
+    if asynchronous:
+        return asyncio.run(run_async_operations(detective, operations, workers))
+    latencies = LatencyHistogram()
+    errors = 0
+
+    def timed(operation: Callable[[SolanaDetective], Any]) -> bool:
+        started = time.perf_counter()
+        try:
+            operation(detective)
+            ok = True
+        except SolanaDetectiveError:
+            ok = False
+        latencies.record(time.perf_counter() - started)
+        return ok
+
+    started = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(timed, operations))
+    else:
+        outcomes = [timed(operation) for operation in operations]
+    elapsed = time.perf_counter() - started
+    errors = outcomes.count(False)
+    return {"elapsed": elapsed, "latencies": latencies, "errors": errors}
+
+
+async def run_async_operations(detective: SolanaDetective,
+                               operations: List[Callable[[Any], Any]],
+                               workers: int) -> Dict[str, Any]:
+    """Run operations as coroutines on an AsyncSolanaDetective wrapping the client"""
+    latencies = LatencyHistogram()
+
+    async def timed(client: AsyncSolanaDetective, operation: Callable[[Any], Any]) -> bool:
+        started = time.perf_counter()
+        try:
+            await operation(client)
+            ok = True
+        except SolanaDetectiveError:
+            ok = False
+        latencies.record(time.perf_counter() - started)
+        return ok
+
+    started = time.perf_counter()
+    async with AsyncSolanaDetective(client=detective, max_workers=workers) as client:
+        outcomes = await asyncio.gather(*(timed(client, operation) for operation in operations))
+    elapsed = time.perf_counter() - started
+    return {"elapsed": elapsed, "latencies": latencies, "errors": outcomes.count(False)}
+
+
+def run_workload(workload: Workload, args: argparse.Namespace) -> Dict[str, Any]:
+    """Timed pass, then a separate traced pass for peak memory"""
+    operations = workload.operations(args)
+    workers = workload.workers(args)
+    with mock_server(args, workload.items(args)) as url:
+        # Warm up connections and caches outside the measurement
+        warmup = make_client(url, args)
+        run_operations(warmup, operations[:min(len(operations), 5)], 1, workload.asynchronous)
+
+        detective = make_client(url, args)
+        # Clients share the session, so count the pool activity of this pass only
+        before = pool_totals(detective)
+        timed = run_operations(detective, operations, workers, workload.asynchronous)
+        after = pool_totals(detective)
+        endpoints = detective.metrics()["endpoints"].values()
+        retries = sum(endpoint["retries"] for endpoint in endpoints)
+        body_bytes = sum(endpoint["bytes_received"] for endpoint in endpoints)
+        wire_bytes = sum(endpoint["wire_bytes"] for endpoint in endpoints)
+
+        peak = None
+        if args.memory:
+            detective = make_client(url, args)
+            tracemalloc.start()
+            try:
+                run_operations(detective, operations, workers, workload.asynchronous)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    latencies = timed["latencies"]
+    return {
+        "operations": len(operations),
+        "workers": workers,
+        "errors": timed["errors"],
+        "retries": retries,
+        "connections_opened": after["connections_opened"] - before["connections_opened"],
+        "connections_discarded": after["discarded"] - before["discarded"],
+        "body_mb": body_bytes / 1e6,
+        "wire_mb": wire_bytes / 1e6,
+        "seconds": timed["elapsed"],
+        "ops_per_second": len(operations) / timed["elapsed"] if timed["elapsed"] else None,
+        "p50_ms": latencies.percentile(50) * 1000,
+        "p99_ms": latencies.percentile(99) * 1000,
+        "peak_memory_mb": peak / 1e6 if peak is not None else None
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float) -> List[str]:
+    """
+    Regressions against a baseline run
+
+    Throughput may not drop, and p99 latency and peak memory may not grow,
+    by more than `tolerance` (a fraction).
+    """
+    regressions = []
+    checks = (("ops_per_second", -1), ("p99_ms", 1), ("peak_memory_mb", 1))
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for metric, direction in checks:
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change * direction > tolerance:
+                regressions.append(f"{name}: {metric} {old:.2f} -> {new:.2f} ({change:+.0%})")
+    return regressions
+
+
+def print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    header = f"{'workload':<14} {'ops':>6} {'workers':>7} {'errors':>6} {'retries':>7} " \
+             f"{'conns':>6} {'wire MB':>8} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'peak MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        peak = f"{result['peak_memory_mb']:.2f}" if result["peak_memory_mb"] is not None else "-"
+        print(f"{name:<14} {result['operations']:>6} {result['workers']:>7} {result['errors']:>6} "
+              f"{result['retries']:>7} {result['connections_opened']:>6} {result['wire_mb']:>8.2f} "
+              f"{result['ops_per_second']:>9.1f} {result['p50_ms']:>8.2f} "
+              f"{result['p99_ms']:>8.2f} {peak:>8}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark SolanaDetective against a local mock API")
+    parser.add_argument("workloads", nargs="*", default=list(WORKLOADS),
+                        help=f"Workloads to run (default: all of {', '.join(WORKLOADS)})")
+    parser.add_argument("--requests", type=int, default=300, help="Operations per mixed workload")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Threads for the threaded, async and batch workloads")
+    parser.add_argument("--latency", type=float, default=0.005, help="Mock server response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.005, help="Extra random server delay in seconds")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--items", type=int, default=None, help="Array length in mixed responses")
+    parser.add_argument("--large-items", type=int, default=5000, help="Array length in large responses")
+    parser.add_argument("--rate-limit-delay", type=float, default=0, help="Client rate_limit_delay")
+    parser.add_argument("--json-backend", default="auto", help="Client json_backend")
+    parser.add_argument("--events-layout", choices=("json", "compact"), default="json",
+                        help="/events layout served and decoded (compact is the package's provisional layout)")
+    parser.add_argument("--pool-maxsize", type=int, default=32,
+                        help="Client pool_maxsize (connections kept per host)")
+    parser.add_argument("--compress", action="store_true",
+                        help="Mock server compresses responses (gzip, or zstd/br when installed)")
+    parser.add_argument("--http2", action="store_true",
+                        help="Client uses HTTP/2, against the hypercorn mock server")
+    parser.add_argument("--hypercorn", action="store_true",
+                        help="Serve with hypercorn also for HTTP/1.1 (the --http2 server, for comparison)")
+    parser.add_argument("--seed", type=int, default=1, help="Mock server random seed")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="Skip the tracemalloc pass")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative regression against the baseline")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    unknown = [name for name in args.workloads if name not in WORKLOADS]
+    if unknown:
+        print(f"Unknown workloads: {', '.join(unknown)}. Choose from: {', '.join(WORKLOADS)}")
+        return 2
+    logging.getLogger("solana_detective").setLevel(logging.WARNING)
+
+    print(f"Mock latency {args.latency * 1000:.1f} ms (+ up to {args.jitter * 1000:.1f} ms), "
+          f"429 rate {args.rate_429:.0%}, JSON backend {args.json_backend}")
+    results = {}
+    for name in args.workloads:
+        workload = WORKLOADS[name]
+        print(f"Running {name}: {workload.description}")
+        results[name] = run_workload(workload, args)
+    print()
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,7 +17,7 @@ def read_requirements():
     if os.path.exists(requirements_file):
         with open(requirements_file, "r") as f:
             return [line.strip() for line in f if line.strip() and not line.startswith("#")]
-    return ["requests>=2.25.0"]
+    return ["requests>=2.25.0", "urllib3>=1.26,<3"]
 
 setup(
     name="solana-detective",
@@ -55,6 +55,24 @@ setup(
             "flake8>=3.8",
             "mypy>=0.800",
         ],
+        "fast": [
+            "orjson>=3.6",
+            "msgspec>=0.16",
+            "numpy>=1.20",
+        ],
+        "tracing": [
+            "opentelemetry-api>=1.0",
+        ],
+        "http2": [
+            "httpx[http2]>=0.27.1",
+        ],
+        "compression": [
+            "brotli>=1.0",
+            "zstandard>=0.18",
+        ],
+        "analysis": [
+            "numpy>=1.20",
+        ],
         "test": [
             "pytest>=6.0",
             "pytest-mock>=3.0",
@@ -36,21 +36,71 @@ __version__ = "1.0.0"
 __author__ = "AI-Generated Package"
 __license__ = "MIT"
 
-from .client import SolanaDetective
+import logging
+import importlib
+from typing import TYPE_CHECKING
+
 from .exceptions import (
     SolanaDetectiveError,
     APIError,
     AuthenticationError,
     RateLimitError,
-    ValidationError
+    ValidationError,
+    CircuitOpenError,
+    CassetteError
 )
 
+# Library logging is opt-in: records go nowhere until the application configures logging
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# Imported on first access (PEP 562), so `import solana_detective` does not
+# load requests/urllib3 or the optional JSON backends
+_LAZY_ATTRIBUTES = {
+    "SolanaDetective": ".client",
+    "AsyncSolanaDetective": ".async_client",
+    "ENDPOINTS": ".endpoints",
+    "RequestScheduler": ".scheduler",
+    "Cassette": ".cassette",
+    "AddressTable": ".addresses",
+    "validate_many": ".endpoints"
+}
+
+if TYPE_CHECKING:
+    from .client import SolanaDetective
+    from .async_client import AsyncSolanaDetective
+    from .endpoints import ENDPOINTS
+    from .scheduler import RequestScheduler
+    from .cassette import Cassette
+    from .addresses import AddressTable
+    from .endpoints import validate_many
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 __all__ = [
     "SolanaDetective",
+    "AsyncSolanaDetective",
+    "ENDPOINTS",
+    "RequestScheduler",
+    "Cassette",
+    "AddressTable",
+    "validate_many",
     "SolanaDetectiveError", 
     "APIError",
     "AuthenticationError",
     "RateLimitError",
-    "ValidationError"
+    "ValidationError",
+    "CircuitOpenError",
+    "CassetteError"
 ]
 
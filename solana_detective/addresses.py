@@ -0,0 +1,239 @@
+"""
+Address interning for Solana Detective package
+Base58 addresses decoded to 32-byte keys and mapped to dense integer ids
+
+Wallet and mint addresses repeat across millions of trade, event and holder
+records. An AddressTable gives each distinct address a small integer id
+(in first-seen order), keeps its 32-byte public key in one contiguous
+buffer and decodes each address only once, so joins, set operations and
+group-bys over addresses become integer operations on arrays of ids.
+"""
+
+import re
+import array
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List
+
+ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+KEY_SIZE = 32
+
+# Byte -> base58 digit (255 for bytes outside the alphabet)
+_DIGITS = bytes(ALPHABET.index(chr(i)) if chr(i) in ALPHABET else 255 for i in range(256))
+# Two base58 digits per divmod when encoding
+_PAIRS = [ALPHABET[i // 58] + ALPHABET[i % 58] for i in range(58 * 58)]
+
+
+def b58decode(value: str) -> bytes:
+    """
+    Decode a base58 string (Bitcoin alphabet, as Solana uses)
+
+    Raises:
+        ValueError: When the string has characters outside the alphabet
+    """
+    try:
+        digits = value.encode("ascii").translate(_DIGITS)
+    except (AttributeError, UnicodeEncodeError):
+        raise ValueError(f"Invalid base58 string: {value!r}") from None
+    if 255 in digits:
+        raise ValueError(f"Invalid base58 string: {value!r}")
+    number = 0
+    for digit in digits:
+        number = number * 58 + digit
+    zeros = len(digits) - len(digits.lstrip(b"\0"))
+    return bytes(zeros) + number.to_bytes((number.bit_length() + 7) // 8, "big")
+
+
+def b58encode(data: bytes) -> str:
+    """Encode bytes as base58 (Bitcoin alphabet)"""
+    number = int.from_bytes(data, "big")
+    pairs = []
+    while number:
+        number, pair = divmod(number, 58 * 58)
+        pairs.append(_PAIRS[pair])
+    zeros = len(data) - len(bytes(data).lstrip(b"\0"))
+    return "1" * zeros + "".join(reversed(pairs)).lstrip("1")
+
+
+# Base58 digits sort in ASCII order, so numbers written without leading "1"s
+# compare as (length, string). Bounds for a k-byte number: [256^(k-1), 256^k)
+_BASE58 = re.compile(r"[1-9A-HJ-NP-Za-km-z]{32,44}")
+_BOUNDS = [("", "")] + [(b58encode(b"\1" + bytes(k - 1)), b58encode(b"\1" + bytes(k)))
+                        for k in range(1, KEY_SIZE + 1)]
+
+
+@lru_cache(maxsize=4096)
+def _is_address(address: str) -> bool:
+    if _BASE58.fullmatch(address) is None:
+        return False
+    digits = address.lstrip("1")
+    size = KEY_SIZE - (len(address) - len(digits))
+    if size <= 0:
+        return size == 0 and not digits
+    low, high = _BOUNDS[size]
+    return (len(low), low) <= (len(digits), digits) < (len(high), high)
+
+
+def is_address(address: Any) -> bool:
+    """
+    Whether a value is a Solana address: base58 that decodes to exactly 32 bytes
+
+    No big-integer decoding: the length check compares strings against
+    precomputed bounds, and recent answers are cached, so a check takes
+    about a microsecond.
+    """
+    return isinstance(address, str) and _is_address(address)
+
+
+def invalid_addresses(addresses: Iterable[Any]) -> List[int]:
+    """Positions of the values that are not Solana addresses"""
+    return [i for i, address in enumerate(addresses) if not is_address(address)]
+
+
+def address_key(address: str) -> bytes:
+    """
+    32-byte public key of an address
+
+    Raises:
+        ValueError: When the address is not base58 or does not decode to 32 bytes
+    """
+    key = b58decode(address)
+    if len(key) != KEY_SIZE:
+        raise ValueError(f"Invalid Solana address (decodes to {len(key)} bytes, expected 32): {address!r}")
+    return key
+
+
+class AddressTable:
+    """
+    Dense integer ids for Solana addresses
+
+    Ids are assigned in first-seen order and never change, so arrays of ids
+    from different records (and snapshots taken at different times) can be
+    joined directly. `keys` holds the 32-byte public keys back to back:
+    the key of id i is keys[32 * i:32 * (i + 1)].
+
+    Thread safe; share one table between everything that should compare ids
+    (SolanaDetective.addresses is the client's table). Addresses are never
+    removed one by one, so a long-lived table grows with every address it
+    sees; clear() empties it, or give short-lived work its own table.
+
+    Example:
+        table = AddressTable()
+        ids = table.intern_many(holder["wallet"] for holder in page["accounts"])
+        table.address(ids[0]), table.key(ids[0])
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._addresses: List[str] = []
+        self._keys = bytearray()
+        self._lock = threading.Lock()
+
+    def _add(self, address: str) -> int:
+        """Append a new address (lock held)"""
+        key = address_key(address)
+        address_id = len(self._addresses)
+        self._addresses.append(address)
+        self._keys += key
+        self._ids[address] = address_id
+        return address_id
+
+    def intern(self, address: str) -> int:
+        """
+        Id of an address, assigning one when it is new
+
+        Raises:
+            ValueError: When the address is not a valid Solana address
+        """
+        address_id = self._ids.get(address)
+        if address_id is not None:
+            return address_id
+        with self._lock:
+            address_id = self._ids.get(address)
+            return address_id if address_id is not None else self._add(address)
+
+    def intern_many(self, addresses: Iterable[str]) -> "array.array":
+        """
+        Ids of many addresses, as an array of int64 (numpy.asarray views it without copying)
+
+        Raises:
+            ValueError: When an address is not a valid Solana address
+        """
+        addresses = addresses if isinstance(addresses, (list, tuple)) else list(addresses)
+        with self._lock:
+            # Known addresses are looked up at C speed; only misses take the slow path
+            ids = list(map(self._ids.get, addresses))
+            if None in ids:
+                get = self._ids.get
+                for i, address_id in enumerate(ids):
+                    if address_id is None:
+                        # Repeats of an address first seen in this call are found by get()
+                        address_id = get(addresses[i])
+                        ids[i] = address_id if address_id is not None else self._add(addresses[i])
+        return array.array("q", ids)
+
+    def intern_key(self, key: bytes) -> int:
+        """
+        Id of a 32-byte public key, assigning one when it is new
+
+        Raises:
+            ValueError: When the key is not 32 bytes
+        """
+        if len(key) != KEY_SIZE:
+            raise ValueError(f"Public keys are 32 bytes, got {len(key)}")
+        return self.intern(b58encode(key))
+
+    def clear(self) -> None:
+        """
+        Forget every address
+
+        Ids start again from 0, so ids (and engines such as HolderTracker
+        or CohortPnL) built on the table before are no longer valid;
+        discard or rebuild them.
+        """
+        with self._lock:
+            self._ids = {}
+            self._addresses = []
+            self._keys = bytearray()
+
+    def get(self, address: str, default: Any = None) -> Any:
+        """Id of an address, or `default` when it has not been interned"""
+        return self._ids.get(address, default)
+
+    def address(self, address_id: int) -> str:
+        return self._addresses[address_id]
+
+    def lookup(self, ids: Iterable[int]) -> List[str]:
+        """Addresses of many ids"""
+        addresses = self._addresses
+        return [addresses[i] for i in ids]
+
+    def key(self, address_id: int) -> bytes:
+        """32-byte public key of an id"""
+        if not 0 <= address_id < len(self._addresses):
+            raise IndexError("address id out of range")
+        return bytes(self._keys[KEY_SIZE * address_id:KEY_SIZE * (address_id + 1)])
+
+    @property
+    def keys(self) -> bytes:
+        """All public keys back to back, in id order (a copy)"""
+        with self._lock:
+            return bytes(self._keys)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the public key buffer"""
+        return len(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def __contains__(self, address: object) -> bool:
+        return address in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._addresses))
+
+    def __repr__(self) -> str:
+        return f"AddressTable({len(self)} addresses)"
+
@@ -0,0 +1,50 @@
+"""
+Analysis engines for Solana Detective package
+Vectorized analytics over API data (requires numpy: pip install -e .[analysis])
+
+Usage:
+    from solana_detective.analysis import TokenFlow
+
+    flow = TokenFlow.fetch(detective, "token_address")
+    print(flow.summary()["5m"])
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+# Imported on first access, so importing the package does not load numpy
+_LAZY_ATTRIBUTES = {
+    "TokenFlow": ".token_flow",
+    "HolderSnapshot": ".holders",
+    "HolderDiff": ".holders",
+    "HolderTracker": ".holders",
+    "LineageCrawler": ".lineage",
+    "LineageGraph": ".lineage",
+    "SniperIndex": ".snipers",
+    "CohortPnL": ".pnl",
+    "PortfolioHistory": ".portfolio",
+    "SmartMoneyIndex": ".smart_money",
+    "AddressTable": "..addresses",
+}
+
+if TYPE_CHECKING:
+    from .token_flow import TokenFlow
+    from .holders import HolderSnapshot, HolderDiff, HolderTracker
+    from .lineage import LineageCrawler, LineageGraph
+    from .snipers import SniperIndex
+    from .pnl import CohortPnL
+    from .portfolio import PortfolioHistory
+    from .smart_money import SmartMoneyIndex
+    from ..addresses import AddressTable
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = list(_LAZY_ATTRIBUTES)
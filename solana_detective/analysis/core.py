@@ -0,0 +1,148 @@
+"""
+Shared helpers for the Solana Detective analysis package
+numpy import, time intervals and group-by primitives
+"""
+
+import re
+from typing import Any, Callable, Iterable, List, Tuple, Union
+
+from ..endpoints import validate_many
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, see require_numpy()
+    np = None
+
+_INTERVAL = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h|d|w)?\s*$")
+_UNIT_MS = {"ms": 1, "s": 1000, "m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+
+def require_numpy() -> Any:
+    """
+    numpy module, for the analysis entry points to call before any work
+
+    Raises:
+        ValueError: When numpy is not installed
+    """
+    if np is None:
+        raise ValueError("The analysis package requires the numpy package (pip install numpy)")
+    return np
+
+
+def interval_ms(interval: Union[str, float]) -> int:
+    """
+    Interval in milliseconds
+
+    Args:
+        interval: Seconds as a number, or a string such as "30s", "5m", "1h", "1d"
+
+    Raises:
+        ValueError: When the interval cannot be parsed or is not positive
+    """
+    if isinstance(interval, (int, float)):
+        ms = int(round(interval * 1000))
+    else:
+        match = _INTERVAL.match(str(interval))
+        if match is None:
+            raise ValueError(f"Invalid interval '{interval}'. Use seconds or e.g. '30s', '5m', '1h', '1d'")
+        ms = int(round(float(match.group(1)) * _UNIT_MS[match.group(2) or "s"]))
+    if ms <= 0:
+        raise ValueError(f"Interval must be positive, got '{interval}'")
+    return ms
+
+
+def field(record: Any, name: str) -> Any:
+    """Field of a response record, dict or typed Struct (None when missing)"""
+    if isinstance(record, dict):
+        return record.get(name)
+    return getattr(record, name, None)
+
+
+def group_sum(groups: "np.ndarray", values: "np.ndarray", size: int) -> "np.ndarray":
+    """Sum of `values` per group id in [0, size), as float64"""
+    return np.bincount(groups, weights=values, minlength=size).astype(np.float64, copy=False)
+
+
+def group_count(groups: "np.ndarray", size: int) -> "np.ndarray":
+    """Number of rows per group id in [0, size)"""
+    return np.bincount(groups, minlength=size)
+
+
+def group_first(groups: "np.ndarray", values: "np.ndarray", size: int) -> "np.ndarray":
+    """First value per group id, for sorted group ids (NaN for empty groups)"""
+    result = np.full(size, np.nan)
+    if len(groups):
+        starts = np.flatnonzero(np.diff(groups, prepend=groups[0] - 1))
+        result[groups[starts]] = values[starts]
+    return result
+
+
+def group_last(groups: "np.ndarray", values: "np.ndarray", size: int) -> "np.ndarray":
+    """Last value per group id, for sorted group ids (NaN for empty groups)"""
+    result = np.full(size, np.nan)
+    if len(groups):
+        ends = np.flatnonzero(np.diff(groups, append=groups[-1] + 1))
+        result[groups[ends]] = values[ends]
+    return result
+
+
+def distinct_pairs(groups: "np.ndarray", keys: "np.ndarray", key_count: int) -> "np.ndarray":
+    """
+    Distinct (group, key) pairs, encoded as group * key_count + key and sorted
+
+    The sort orders pairs by group, then key; divide by key_count for the
+    group and take the remainder for the key.
+    """
+    return sorted_unique(groups.astype(np.int64) * key_count + keys)
+
+
+def sorted_unique(values: "np.ndarray") -> "np.ndarray":
+    """Sorted distinct values (a plain sort, faster than np.unique's hashing for integer ids)"""
+    values = np.sort(values)
+    if len(values) < 2:
+        return values
+    keep = np.empty(len(values), dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def factorize(values: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    (sorted distinct values, code of each value) with codes in [0, len(distinct))
+
+    Turns sparse ids (e.g. AddressTable ids) into dense group ids for the
+    bincount group-bys.
+    """
+    values = np.asarray(values)
+    order = np.argsort(values, kind="stable")
+    ordered = values[order]
+    changes = np.empty(len(values), dtype=bool)
+    if len(values):
+        changes[0] = True
+        np.not_equal(ordered[1:], ordered[:-1], out=changes[1:])
+    codes = np.empty(len(values), dtype=np.int64)
+    codes[order] = np.cumsum(changes) - 1
+    return ordered[changes], codes
+
+
+def distinct_count(ids: "np.ndarray", size: int) -> int:
+    """Number of distinct ids in [0, size)"""
+    return int(np.count_nonzero(np.bincount(ids, minlength=size)))
+
+
+def fan_out(client: Any, function: Callable[[Any], Any], items: Iterable[Any], max_workers: int = None,
+            lane: str = "batch", return_exceptions: bool = False, check: str = None) -> List[Any]:
+    """
+    Run function(item) for every item on the client's worker pool, results in item order
+
+    Requests made by the function go through the given scheduler lane, so
+    analysis crawls do not starve interactive calls. With `check` (TOKEN or
+    WALLET) the items are validated as addresses before the first request;
+    with return_exceptions bad items fail on their own instead, also locally.
+    """
+    items = list(items)
+    if check is not None and not return_exceptions:
+        validate_many(items, check)
+    with client.lane(lane):
+        return client._fan_out(function, items, max_workers, return_exceptions)
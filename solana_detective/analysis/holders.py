@@ -0,0 +1,395 @@
+"""
+Holder snapshots for Solana Detective package
+Compact holder distributions, concentration metrics and snapshot diffs
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..addresses import AddressTable
+from ..endpoints import MAX_PAGE_LIMIT, TOKEN
+from .core import np, require_numpy, fan_out, field
+
+
+class HolderSnapshot:
+    """
+    Holder balances of one token at one point in time
+
+    Stored as two arrays, sorted by address id: ids in an AddressTable and
+    float64 balances (a few bytes per holder instead of a dict per record).
+    Snapshots sharing a table can be diffed with array joins; fetched
+    snapshots use the client's table by default.
+
+    Example:
+        before = HolderSnapshot.fetch(detective, token)
+        ...
+        after = HolderSnapshot.fetch(detective, token)
+        print(after.concentration())
+        print(after.diff(before).accumulators(limit=10))
+    """
+
+    __slots__ = ("token", "ids", "balances", "table", "taken_at", "reported_total")
+
+    def __init__(self, token: str, ids: Sequence[int], balances: Sequence[float], table: AddressTable,
+                 taken_at: float = None, reported_total: int = None):
+        """
+        Initialize snapshot
+
+        Args:
+            token: Token mint address
+            ids: Address ids in `table`, one per holder record
+            balances: Token balance per record (records of the same address are added up)
+            table: AddressTable the ids belong to
+            taken_at: Unix time of the snapshot (default: now)
+            reported_total: Holder count reported by the API (optional)
+
+        Raises:
+            ValueError: When numpy is not installed
+        """
+        require_numpy()
+        ids = np.asarray(ids, dtype=np.int64)
+        balances = np.asarray(balances, dtype=np.float64)
+        order = np.argsort(ids, kind="stable")
+        ids, balances = ids[order], balances[order]
+        if len(ids) > 1:
+            starts = np.flatnonzero(np.diff(ids, prepend=ids[0] - 1))
+            if len(starts) < len(ids):
+                balances = np.add.reduceat(balances, starts)
+                ids = ids[starts]
+        self.token = token
+        self.ids = ids
+        self.balances = balances
+        self.table = table
+        self.taken_at = time.time() if taken_at is None else taken_at
+        self.reported_total = reported_total
+
+    @classmethod
+    def from_holders(cls, token: str, holders: Iterable[Any], table: AddressTable = None,
+                     reported_total: int = None) -> "HolderSnapshot":
+        """
+        Snapshot from holder records (holders pages use `wallet`, top holders `address`)
+
+        Args:
+            token: Token mint address
+            holders: Holder dicts or typed Holder Structs
+            table: AddressTable to share with other snapshots (default: a new one)
+            reported_total: Holder count reported by the API (optional)
+        """
+        require_numpy()
+        table = table if table is not None else AddressTable()
+        addresses, amounts = [], []
+        for holder in holders:
+            address = field(holder, "wallet") or field(holder, "address")
+            if address:
+                addresses.append(address)
+                amounts.append(field(holder, "amount") or 0.0)
+        return cls(token, table.intern_many(addresses), amounts, table,
+                   reported_total=reported_total)
+
+    @classmethod
+    def fetch(cls, client: Any, token: str, table: AddressTable = None, limit: int = MAX_PAGE_LIMIT,
+              max_pages: int = None, max_workers: int = 8) -> "HolderSnapshot":
+        """
+        Fetch every holders page of a token, concurrently after the first
+
+        Args:
+            client: SolanaDetective
+            token: Token mint address
+            table: AddressTable to share with other snapshots (default: client.addresses)
+            limit: Holders per page (default: the API maximum)
+            max_pages: Most pages to fetch (default: all)
+            max_workers: Concurrent page requests
+        """
+        require_numpy()
+        holders: List[Any] = []
+        total = None
+        for page in client.paginate("get_token_holders", token, limit=limit, max_pages=max_pages,
+                                    max_workers=max_workers):
+            if total is None:
+                total = field(page, "total")
+            holders.extend(field(page, "accounts") or ())
+        table = table if table is not None else client.addresses
+        return cls.from_holders(token, holders, table, reported_total=total)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the snapshot arrays"""
+        return self.ids.nbytes + self.balances.nbytes
+
+    @property
+    def addresses(self) -> List[str]:
+        return self.table.lookup(self.ids)
+
+    @property
+    def holders(self) -> int:
+        """Addresses with a positive balance"""
+        return int(np.count_nonzero(self.balances > 0))
+
+    @property
+    def total_balance(self) -> float:
+        return float(self.balances.sum())
+
+    def _positive(self) -> "np.ndarray":
+        return self.balances[self.balances > 0]
+
+    def top(self, n: int = 10) -> Dict[str, Any]:
+        """
+        Largest holders, largest first
+
+        Returns:
+            Dict of columns: wallet (addresses), balance, share (of the total balance)
+        """
+        n = min(n, len(self.balances))
+        if n <= 0:
+            return {"wallet": [], "balance": np.empty(0), "share": np.empty(0)}
+        top = np.argpartition(-self.balances, n - 1)[:n]
+        top = top[np.argsort(-self.balances[top], kind="stable")]
+        total = self.total_balance
+        return {
+            "wallet": self.table.lookup(self.ids[top]),
+            "balance": self.balances[top],
+            "share": self.balances[top] / total if total else np.zeros(n)
+        }
+
+    def top_share(self, n: int = 10) -> float:
+        """Share of the total balance held by the n largest holders (0 to 1)"""
+        total = self.total_balance
+        if not total or n <= 0:
+            return 0.0
+        if n >= len(self.balances):
+            return 1.0
+        return float(np.partition(self.balances, len(self.balances) - n)[-n:].sum() / total)
+
+    def gini(self) -> float:
+        """Gini coefficient of the positive balances (0 equal, towards 1 concentrated)"""
+        balances = np.sort(self._positive())
+        count = len(balances)
+        total = balances.sum()
+        if count < 2 or not total:
+            return 0.0
+        ranks = np.arange(1, count + 1)
+        return float(2 * np.dot(ranks, balances) / (count * total) - (count + 1) / count)
+
+    def hhi(self) -> float:
+        """Herfindahl-Hirschman index of the holder shares (0 to 1; x 10,000 for the usual scale)"""
+        total = self.total_balance
+        if not total:
+            return 0.0
+        shares = self.balances / total
+        return float(np.dot(shares, shares))
+
+    def concentration(self, top: Tuple[int, ...] = (10, 20, 50, 100)) -> Dict[str, Any]:
+        """
+        Concentration metrics
+
+        Returns:
+            Dict with holders, reported_total, total_balance, gini, hhi and
+            top_<n>_share for each n in `top`
+        """
+        metrics = {
+            "holders": self.holders,
+            "reported_total": self.reported_total,
+            "total_balance": self.total_balance,
+            "gini": self.gini(),
+            "hhi": self.hhi()
+        }
+        for n in top:
+            metrics[f"top_{n}_share"] = self.top_share(n)
+        return metrics
+
+    def diff(self, previous: "HolderSnapshot") -> "HolderDiff":
+        """
+        Balance changes from an earlier snapshot of the same token
+
+        Raises:
+            ValueError: When the snapshots do not share an AddressTable
+        """
+        if previous.table is not self.table:
+            raise ValueError("Snapshots must share an AddressTable to be diffed")
+        # Both id arrays are sorted: join them with binary searches
+        positions, found = _match(self.ids, previous.ids)
+        before = np.where(found, previous.balances[positions] if len(previous.ids) else 0.0, 0.0)
+        changed = before != self.balances
+        # Addresses missing from this snapshot changed only if they held something
+        exited = ~_match(previous.ids, self.ids)[1] & (previous.balances != 0)
+        ids = np.concatenate((self.ids[changed], previous.ids[exited]))
+        before = np.concatenate((before[changed], previous.balances[exited]))
+        after = np.concatenate((self.balances[changed], np.zeros(np.count_nonzero(exited))))
+        order = np.argsort(ids, kind="stable")
+        return HolderDiff(self.token, ids[order], before[order], after[order], self.table,
+                          previous.taken_at, self.taken_at)
+
+    def __repr__(self) -> str:
+        return f"HolderSnapshot({self.token!r}, {len(self)} holders)"
+
+
+def _match(ids: "np.ndarray", other_ids: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """Position of each id in `other_ids` and whether it is there (both sorted)"""
+    if not len(other_ids):
+        return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+    positions = np.minimum(np.searchsorted(other_ids, ids), len(other_ids) - 1)
+    return positions, other_ids[positions] == ids
+
+
+class HolderDiff:
+    """
+    Addresses whose balance changed between two snapshots
+
+    Attributes:
+        token: Token mint address
+        ids: Address ids (sorted)
+        before: Balance in the earlier snapshot (0 when the address was not a holder)
+        after: Balance in the later snapshot (0 when it no longer is)
+        change: after - before
+        started: Time of the earlier snapshot
+        ended: Time of the later snapshot
+    """
+
+    __slots__ = ("token", "ids", "before", "after", "change", "table", "started", "ended")
+
+    def __init__(self, token: str, ids: "np.ndarray", before: "np.ndarray", after: "np.ndarray",
+                 table: AddressTable, started: float, ended: float):
+        self.token = token
+        self.ids = ids
+        self.before = before
+        self.after = after
+        self.change = after - before
+        self.table = table
+        self.started = started
+        self.ended = ended
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _columns(self, rows: "np.ndarray") -> Dict[str, Any]:
+        return {
+            "wallet": self.table.lookup(self.ids[rows]),
+            "before": self.before[rows],
+            "after": self.after[rows],
+            "change": self.change[rows]
+        }
+
+    def accumulators(self, limit: int = None) -> Dict[str, Any]:
+        """Addresses whose balance grew, largest increase first (columns: wallet, before, after, change)"""
+        rows = np.flatnonzero(self.change > 0)
+        rows = rows[np.argsort(-self.change[rows], kind="stable")][:limit]
+        return self._columns(rows)
+
+    def distributors(self, limit: int = None) -> Dict[str, Any]:
+        """Addresses whose balance shrank, largest decrease first (columns: wallet, before, after, change)"""
+        rows = np.flatnonzero(self.change < 0)
+        rows = rows[np.argsort(self.change[rows], kind="stable")][:limit]
+        return self._columns(rows)
+
+    def new_holders(self) -> Dict[str, Any]:
+        """Addresses that were not holders in the earlier snapshot"""
+        return self._columns(np.flatnonzero((self.before <= 0) & (self.after > 0)))
+
+    def exited(self) -> Dict[str, Any]:
+        """Addresses that no longer hold the token"""
+        return self._columns(np.flatnonzero((self.before > 0) & (self.after <= 0)))
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts and totals of the changes"""
+        increases = self.change[self.change > 0]
+        decreases = self.change[self.change < 0]
+        return {
+            "changed": len(self.ids),
+            "accumulators": len(increases),
+            "distributors": len(decreases),
+            "new_holders": int(np.count_nonzero((self.before <= 0) & (self.after > 0))),
+            "exited": int(np.count_nonzero((self.before > 0) & (self.after <= 0))),
+            "accumulated": float(increases.sum()),
+            "distributed": float(-decreases.sum()),
+            "net_change": float(self.change.sum()),
+            "seconds": self.ended - self.started
+        }
+
+    def __repr__(self) -> str:
+        return f"HolderDiff({self.token!r}, {len(self)} changed)"
+
+
+class HolderTracker:
+    """
+    Latest holder snapshots per token, diffed on every update
+
+    All snapshots share one AddressTable, so an address has the same id across
+    tokens and runs.
+
+    Example:
+        tracker = HolderTracker(detective)
+        tracker.update_many(tokens)                  # first snapshots
+        ...
+        for token, diff in tracker.update_many(tokens).items():
+            print(token, diff.summary()["net_change"], diff.accumulators(limit=5)["wallet"])
+    """
+
+    def __init__(self, client: Any, table: AddressTable = None, history: int = 2,
+                 limit: int = MAX_PAGE_LIMIT, page_workers: int = 4):
+        """
+        Initialize tracker
+
+        Args:
+            client: SolanaDetective
+            table: AddressTable to share (default: client.addresses)
+            history: Snapshots kept per token
+            limit: Holders per page
+            page_workers: Concurrent page requests per token
+
+        Raises:
+            ValueError: When numpy is not installed
+        """
+        require_numpy()
+        self.client = client
+        self.table = table if table is not None else client.addresses
+        self.history = max(history, 1)
+        self.limit = limit
+        self.page_workers = page_workers
+        self.snapshots: Dict[str, Deque[HolderSnapshot]] = {}
+        self._lock = threading.Lock()
+
+    def latest(self, token: str) -> Optional[HolderSnapshot]:
+        snapshots = self.snapshots.get(token)
+        return snapshots[-1] if snapshots else None
+
+    def add(self, snapshot: HolderSnapshot) -> Optional[HolderDiff]:
+        """Keep a snapshot and diff it against the token's previous one (None for the first)"""
+        with self._lock:
+            snapshots = self.snapshots.get(snapshot.token)
+            if snapshots is None:
+                snapshots = self.snapshots[snapshot.token] = deque(maxlen=self.history)
+            previous = snapshots[-1] if snapshots else None
+            snapshots.append(snapshot)
+        return snapshot.diff(previous) if previous is not None else None
+
+    def update(self, token: str) -> Optional[HolderDiff]:
+        """Take a new snapshot of a token; its diff from the previous one (None for the first)"""
+        return self.add(HolderSnapshot.fetch(self.client, token, self.table, limit=self.limit,
+                                             max_workers=self.page_workers))
+
+    def update_many(self, tokens: Iterable[str], max_workers: int = None,
+                    return_exceptions: bool = False) -> Dict[str, Any]:
+        """
+        Snapshot many tokens concurrently
+
+        Args:
+            tokens: Token mint addresses
+            max_workers: Tokens fetched at once (default: batch_max_workers)
+            return_exceptions: Put exceptions in place of failed diffs instead of raising
+
+        Returns:
+            Diff (or None for a first snapshot) by token
+
+        Raises:
+            ValidationError: Before any request, when a token address is invalid
+                (without return_exceptions)
+        """
+        tokens = list(dict.fromkeys(tokens))
+        diffs = fan_out(self.client, self.update, tokens, max_workers,
+                        return_exceptions=return_exceptions, check=TOKEN)
+        return dict(zip(tokens, diffs))
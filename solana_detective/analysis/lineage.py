@@ -0,0 +1,416 @@
+"""
+Deployer lineage graphs for Solana Detective package
+Crawls deployers, their tokens and those tokens' early wallets into a CSR graph
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..addresses import AddressTable, is_address
+from ..endpoints import WALLET, get_endpoint, validate_many
+from .core import np, require_numpy, fan_out, field, sorted_unique
+
+# Node kinds
+WALLET_NODE = 0
+TOKEN_NODE = 1
+
+# Edge kinds, all from a wallet to a token
+DEPLOYED = 0
+FIRST_BUYER = 1
+TOP_TRADER = 2
+EDGE_KINDS = {"deployed": DEPLOYED, "first_buyer": FIRST_BUYER, "top_trader": TOP_TRADER}
+
+
+def _records(response: Any, key: str) -> List[Any]:
+    """List of records of a response that is either the list or a dict holding it under `key`"""
+    if isinstance(response, list):
+        return response
+    return (field(response, key) or []) if response is not None else []
+
+
+class LineageGraph:
+    """
+    Wallets and tokens linked by deployments, first buys and top trades
+
+    Nodes are addresses (ids in an AddressTable) with a kind (WALLET_NODE or
+    TOKEN_NODE) and the crawl depth they were found at. Edges run from a
+    wallet to a token and have a kind (DEPLOYED, FIRST_BUYER, TOP_TRADER);
+    they are stored both ways in CSR arrays, so the neighbours of node i are
+    indices[indptr[i]:indptr[i + 1]] and connected components are computed
+    with array operations.
+
+    Example:
+        graph = LineageCrawler(detective, max_depth=2, credit_budget=500).crawl([deployer])
+        for cluster in graph.clusters(min_deployers=2):
+            print(cluster["deployers"], len(cluster["tokens"]))
+    """
+
+    def __init__(self, table: AddressTable, node_ids: Iterable[int], kinds: Iterable[int],
+                 depths: Iterable[int], src: Iterable[int], dst: Iterable[int], edge_kinds: Iterable[int],
+                 credits_used: int = 0, truncated: bool = False, errors: List[Tuple[str, str, Any]] = None):
+        """
+        Initialize graph
+
+        Args:
+            table: AddressTable the node ids belong to
+            node_ids: Address id of each node
+            kinds: Kind of each node (WALLET_NODE or TOKEN_NODE)
+            depths: Crawl depth of each node
+            src: Wallet node of each edge
+            dst: Token node of each edge
+            edge_kinds: Kind of each edge (duplicate edges are dropped)
+            credits_used: API credits the crawl spent
+            truncated: Whether the credit budget cut the crawl short
+            errors: (endpoint name, address, exception) of failed calls
+
+        Raises:
+            ValueError: When numpy is not installed
+        """
+        require_numpy()
+        self.table = table
+        self.node_ids = np.asarray(node_ids, dtype=np.int64)
+        self.kinds = np.asarray(kinds, dtype=np.uint8)
+        self.depths = np.asarray(depths, dtype=np.int32)
+        self.credits_used = credits_used
+        self.truncated = truncated
+        self.errors = errors or []
+        self._nodes: Dict[int, int] = {int(address_id): i for i, address_id in enumerate(self.node_ids)}
+        self._labels = None
+
+        size = len(self.node_ids)
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        edge_kinds = np.asarray(edge_kinds, dtype=np.int64)
+        # Drop duplicates: encode (src, dst, kind) as one sortable integer
+        codes = sorted_unique((src * size + dst) * len(EDGE_KINDS) + edge_kinds)
+        self.edge_kinds = (codes % len(EDGE_KINDS)).astype(np.uint8)
+        pairs = codes // len(EDGE_KINDS)
+        self.src, self.dst = np.divmod(pairs, max(size, 1))
+
+        # Both directions, grouped by source node
+        heads = np.concatenate((self.src, self.dst))
+        order = np.argsort(heads, kind="stable")
+        self.indices = np.concatenate((self.dst, self.src))[order]
+        self.neighbor_kinds = np.concatenate((self.edge_kinds, self.edge_kinds))[order]
+        self.indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(heads, minlength=size), out=self.indptr[1:])
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.src)
+
+    def node(self, address: str) -> Optional[int]:
+        """Node index of an address (None when it is not in the graph)"""
+        address_id = self.table.get(address)
+        return self._nodes.get(address_id) if address_id is not None else None
+
+    def addresses(self, nodes: Iterable[int]) -> List[str]:
+        """Addresses of node indices"""
+        return self.table.lookup(self.node_ids[np.asarray(nodes, dtype=np.int64)])
+
+    def _node(self, address: Union[str, int]) -> int:
+        node = address if isinstance(address, (int, np.integer)) else self.node(address)
+        if node is None or not 0 <= node < len(self):
+            raise KeyError(f"Address not in the graph: {address!r}")
+        return int(node)
+
+    def neighbor_nodes(self, address: Union[str, int], kind: str = None) -> "np.ndarray":
+        """
+        Node indices linked to an address or node index
+
+        Args:
+            address: Address or node index
+            kind: Only edges of this kind ("deployed", "first_buyer" or "top_trader")
+
+        Raises:
+            KeyError: When the address is not in the graph
+            ValueError: When the edge kind is unknown
+        """
+        node = self._node(address)
+        start, end = self.indptr[node], self.indptr[node + 1]
+        neighbors = self.indices[start:end]
+        if kind is not None:
+            if kind not in EDGE_KINDS:
+                raise ValueError(f"Unknown edge kind '{kind}'. Choose from: {', '.join(EDGE_KINDS)}")
+            neighbors = neighbors[self.neighbor_kinds[start:end] == EDGE_KINDS[kind]]
+        return sorted_unique(neighbors)
+
+    def neighbors(self, address: Union[str, int], kind: str = None) -> List[str]:
+        """Addresses linked to an address or node index (see neighbor_nodes)"""
+        return self.addresses(self.neighbor_nodes(address, kind))
+
+    def degrees(self) -> "np.ndarray":
+        """Number of edges at each node"""
+        return np.diff(self.indptr)
+
+    def component_labels(self) -> "np.ndarray":
+        """
+        Connected component of each node, numbered from 0 by first node
+
+        Hooks the larger of two linked roots onto the smaller and compresses
+        paths by pointer jumping until no edge joins two roots; every round is
+        a few array operations over all edges. Cached after the first call.
+        """
+        if self._labels is None:
+            labels = np.arange(len(self), dtype=np.int64)
+            src, dst = self.src, self.dst
+            while True:
+                left, right = labels[src], labels[dst]
+                joined = left != right
+                if not joined.any():
+                    break
+                left, right = left[joined], right[joined]
+                np.minimum.at(labels, np.maximum(left, right), np.minimum(left, right))
+                while True:
+                    jumped = labels[labels]
+                    if np.array_equal(jumped, labels):
+                        break
+                    labels = jumped
+            roots = sorted_unique(labels)
+            self._labels = np.searchsorted(roots, labels)
+        return self._labels
+
+    def component(self, address: Union[str, int]) -> Dict[str, List[str]]:
+        """Wallets and tokens connected to an address or node index"""
+        labels = self.component_labels()
+        members = np.flatnonzero(labels == labels[self._node(address)])
+        return self._split(members)
+
+    def _split(self, members: "np.ndarray") -> Dict[str, List[str]]:
+        wallets = members[self.kinds[members] == WALLET_NODE]
+        tokens = members[self.kinds[members] == TOKEN_NODE]
+        return {"wallets": self.addresses(wallets), "tokens": self.addresses(tokens)}
+
+    def deployer_nodes(self) -> "np.ndarray":
+        """Node indices of wallets that deployed a token in the graph"""
+        return sorted_unique(self.src[self.edge_kinds == DEPLOYED])
+
+    def clusters(self, min_deployers: int = 1, min_size: int = 2) -> List[Dict[str, Any]]:
+        """
+        Connected components, most deployers first
+
+        Args:
+            min_deployers: Keep components with at least this many deploying wallets
+            min_size: Keep components with at least this many nodes
+
+        Returns:
+            Dicts with wallets, tokens, deployers (addresses) and size
+        """
+        labels = self.component_labels()
+        count = int(labels.max()) + 1 if len(labels) else 0
+        sizes = np.bincount(labels, minlength=count)
+        deployers = self.deployer_nodes()
+        deployer_counts = np.bincount(labels[deployers], minlength=count)
+        keep = np.flatnonzero((sizes >= min_size) & (deployer_counts >= min_deployers))
+        keep = keep[np.lexsort((-sizes[keep], -deployer_counts[keep]))]
+        # Nodes grouped by component, for one slice per kept component
+        order = np.argsort(labels, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(sizes)))
+        deployer_labels = labels[deployers]
+        clusters = []
+        for label in keep:
+            cluster = self._split(order[starts[label]:starts[label + 1]])
+            cluster["deployers"] = self.addresses(deployers[deployer_labels == label])
+            cluster["size"] = int(sizes[label])
+            clusters.append(cluster)
+        return clusters
+
+    def summary(self) -> Dict[str, Any]:
+        """Node, edge and component counts plus crawl bookkeeping"""
+        labels = self.component_labels()
+        sizes = np.bincount(labels) if len(labels) else np.zeros(0, dtype=np.int64)
+        return {
+            "wallets": int(np.count_nonzero(self.kinds == WALLET_NODE)),
+            "tokens": int(np.count_nonzero(self.kinds == TOKEN_NODE)),
+            "deployers": len(self.deployer_nodes()),
+            "edges": {name: int(np.count_nonzero(self.edge_kinds == kind)) for name, kind in EDGE_KINDS.items()},
+            "components": len(sizes),
+            "largest_component": int(sizes.max()) if len(sizes) else 0,
+            "credits_used": self.credits_used,
+            "truncated": self.truncated,
+            "errors": len(self.errors)
+        }
+
+    def __repr__(self) -> str:
+        return f"LineageGraph({len(self)} nodes, {self.edge_count} edges)"
+
+
+class LineageCrawler:
+    """
+    Breadth-first crawl from deployers to the wallets around their tokens
+
+    Each round fetches the tokens of the new wallets (every page of
+    get_deployer_tokens, up to deployer_pages), then the first buyers and top
+    traders of the new tokens; those wallets are the next round's. Every
+    address is fetched once, calls run concurrently on the batch lane, and a
+    round is cut short when it would exceed the credit budget; each page
+    after a deployer's first is charged too, and a deployer's pages stop
+    when the next one would not fit. Failed calls are recorded on the graph
+    instead of stopping the crawl.
+    """
+
+    def __init__(self, client: Any, max_depth: int = 2, credit_budget: int = 1000,
+                 first_buyers: int = 100, top_traders: bool = True, max_workers: int = None,
+                 table: AddressTable = None, deployer_pages: int = 10):
+        """
+        Initialize crawler
+
+        Args:
+            client: SolanaDetective
+            max_depth: Wallet hops from the seed deployers (0 = only their tokens)
+            credit_budget: Most API credits to spend
+            first_buyers: First buyers requested per token (0 to skip get_first_buyers)
+            top_traders: Also link each token's top traders
+            max_workers: Concurrent calls (default: batch_max_workers)
+            table: AddressTable for the node ids (default: client.addresses)
+            deployer_pages: Most get_deployer_tokens pages per wallet
+                (default: 10, None for no limit)
+
+        Raises:
+            ValueError: When numpy is not installed
+        """
+        require_numpy()
+        self.client = client
+        self.max_depth = max(max_depth, 0)
+        self.credit_budget = credit_budget
+        self.first_buyers = first_buyers
+        self.top_traders = top_traders
+        self.max_workers = max_workers
+        self.table = table if table is not None else client.addresses
+        self.deployer_pages = deployer_pages
+
+    def crawl(self, deployers: Iterable[str]) -> LineageGraph:
+        """
+        Crawl from seed deployer wallets
+
+        Raises:
+            ValidationError: When a seed is not a valid wallet address
+        """
+        table = self.table
+        nodes: Dict[int, int] = {}
+        node_ids: List[int] = []
+        kinds: List[int] = []
+        depths: List[int] = []
+        src: List[int] = []
+        dst: List[int] = []
+        edge_kinds: List[int] = []
+        errors: List[Tuple[str, str, Any]] = []
+        credits = 0
+        truncated = False
+        lock = threading.Lock()
+        deployer_endpoint = get_endpoint("get_deployer_tokens")
+        page_limit = deployer_endpoint.param("limit").default
+
+        def add_node(address: str, kind: int, depth: int) -> Tuple[int, bool]:
+            address_id = table.intern(address)
+            node = nodes.get(address_id)
+            if node is not None:
+                return node, False
+            node = nodes[address_id] = len(node_ids)
+            node_ids.append(address_id)
+            kinds.append(kind)
+            depths.append(depth)
+            return node, True
+
+        def charge(cost: int) -> bool:
+            nonlocal credits, truncated
+            with lock:
+                if credits + cost > self.credit_budget:
+                    truncated = True
+                    return False
+                credits += cost
+                return True
+
+        def deployer_tokens(wallet: str) -> List[Any]:
+            # The first page was charged with the round; later ones as they are needed
+            tokens: List[Any] = []
+            pages = self.client.paginate("get_deployer_tokens", wallet, max_pages=self.deployer_pages)
+            try:
+                for number, page in enumerate(pages, 1):
+                    records = _records(page, "tokens")
+                    tokens.extend(records)
+                    # Stop where paginate() would, so only requested pages are charged
+                    if (len(records) < page_limit or not deployer_endpoint.has_next_page(page) or
+                            number == self.deployer_pages):
+                        break
+                    if not charge(deployer_endpoint.credits):
+                        break
+            except Exception as exc:
+                if not tokens:
+                    raise
+                errors.append(("get_deployer_tokens", wallet, exc))
+            return tokens
+
+        def fetch(call: Tuple[str, str]) -> Any:
+            name, address = call
+            if name == "get_deployer_tokens":
+                return deployer_tokens(address)
+            if name == "get_first_buyers":
+                return self.client.get_first_buyers(address, limit=self.first_buyers)
+            return getattr(self.client, name)(address)
+
+        def run(calls: List[Tuple[str, str]]) -> List[Any]:
+            affordable = []
+            for call in calls:
+                if not charge(get_endpoint(call[0]).credits):
+                    break
+                affordable.append(call)
+            responses = fan_out(self.client, fetch, affordable, self.max_workers, return_exceptions=True)
+            results = []
+            for call, response in zip(affordable, responses):
+                if isinstance(response, Exception):
+                    errors.append((call[0], call[1], response))
+                else:
+                    results.append((call, response))
+            return results
+
+        wallets = []
+        for address in dict.fromkeys(validate_many(deployers, WALLET)):
+            add_node(address, WALLET_NODE, 0)
+            wallets.append(address)
+
+        for depth in range(self.max_depth + 1):
+            tokens = []
+            for (_, wallet), response in run([("get_deployer_tokens", wallet) for wallet in wallets]):
+                wallet_node = nodes[table.intern(wallet)]
+                for token in _records(response, "tokens"):
+                    mint = field(token, "mint")
+                    if not is_address(mint):
+                        continue
+                    token_node, new = add_node(mint, TOKEN_NODE, depth)
+                    src.append(wallet_node)
+                    dst.append(token_node)
+                    edge_kinds.append(DEPLOYED)
+                    if new:
+                        tokens.append(mint)
+            if depth == self.max_depth or not tokens:
+                break
+
+            calls = []
+            for token in tokens:
+                if self.first_buyers:
+                    calls.append(("get_first_buyers", token))
+                if self.top_traders:
+                    calls.append(("get_top_traders_token", token))
+            wallets = []
+            for (name, token), response in run(calls):
+                token_node = nodes[table.intern(token)]
+                kind = FIRST_BUYER if name == "get_first_buyers" else TOP_TRADER
+                for record in _records(response, "wallets"):
+                    wallet = field(record, "wallet")
+                    if not is_address(wallet):
+                        continue
+                    wallet_node, new = add_node(wallet, WALLET_NODE, depth + 1)
+                    src.append(wallet_node)
+                    dst.append(token_node)
+                    edge_kinds.append(kind)
+                    if new:
+                        wallets.append(wallet)
+            if not wallets:
+                break
+
+        return LineageGraph(table, node_ids, kinds, depths, src, dst, edge_kinds,
+                            credits_used=credits, truncated=truncated, errors=errors)
@@ -0,0 +1,330 @@
+"""
+Cohort PnL for Solana Detective package
+Wallet/token PnL positions as columns, with rollups by token, wallet, cohort and time window
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from ..addresses import AddressTable, is_address
+from ..endpoints import TOKEN, WALLET, validate_many
+from .core import (np, require_numpy, interval_ms, fan_out, field, factorize, group_count, group_sum,
+                   distinct_pairs)
+
+# Summed per group by the rollups
+AMOUNTS = ("realized", "unrealized", "total", "invested", "current_value")
+# Columns a position is built from: name -> field of the PnL record
+_FIELDS = {"realized": "realized", "unrealized": "unrealized", "total": "total",
+           "invested": "total_invested", "current_value": "current_value", "holding": "holding"}
+_TIMES = ("first_buy_time", "last_trade_time")
+LEVELS = ("wallet", "token", "cohort")
+
+
+def _number(value: Any, missing: float = 0.0) -> float:
+    """Float of a PnL field (the API occasionally sends "" or null)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return missing
+
+
+class CohortPnL:
+    """
+    PnL positions (one wallet on one token) of many wallets, as columns
+
+    Positions are rows of wallet_id and token_id (ids in an AddressTable),
+    cohort (index into `cohorts`, -1 for none), realized, unrealized, total,
+    invested, current_value, holding, first_buy_time and last_trade_time.
+    Rollups are bincount group-bys over those arrays, so a cohort of
+    hundreds of wallets and tens of thousands of positions aggregates in
+    milliseconds. Fetching a position again replaces it.
+
+    Example:
+        pnl = CohortPnL(detective)
+        pnl.fetch(whales, cohort="whales")
+        pnl.fetch(insiders, cohort="insiders")
+        print(pnl.by_cohort())
+        print(pnl.leaderboard("wallet", sort="realized", limit=10)["wallet"])
+    """
+
+    def __init__(self, client: Any = None, table: AddressTable = None):
+        """
+        Initialize cohort PnL
+
+        Args:
+            client: SolanaDetective (needed for fetch())
+            table: AddressTable for wallet and token ids (default: client.addresses, or a new one)
+
+        Raises:
+            ValueError: When numpy is not installed
+        """
+        require_numpy()
+        self.client = client
+        if table is None:
+            table = client.addresses if client is not None else AddressTable()
+        self.table = table
+        self.cohorts: List[str] = []
+        self.errors: Dict[Any, BaseException] = {}
+        self._rows: List[tuple] = []
+        self._positions: Optional["np.ndarray"] = None
+        self._columns: Optional[Dict[str, "np.ndarray"]] = None
+
+    def _cohort(self, cohort: Optional[str]) -> int:
+        if cohort is None:
+            return -1
+        if cohort not in self.cohorts:
+            self.cohorts.append(cohort)
+        return self.cohorts.index(cohort)
+
+    def add_position(self, wallet: str, token: str, pnl: Any, cohort: str = None) -> None:
+        """
+        Add (or replace) one position from a token PnL record
+
+        Raises:
+            ValueError: When the wallet or token is not a valid address
+        """
+        table = self.table
+        self._rows.append((table.intern(wallet), table.intern(token), self._cohort(cohort))
+                          + tuple(_number(field(pnl, name)) for name in _FIELDS.values())
+                          + tuple(_number(field(pnl, name), np.nan) for name in _TIMES))
+        self._columns = None
+
+    def add_wallet(self, wallet: str, response: Any, cohort: str = None) -> int:
+        """
+        Add (or replace) every position of a wallet from a get_wallet_pnl response
+
+        Returns:
+            Positions added
+        """
+        tokens = field(response, "tokens") or {}
+        added = 0
+        for token, pnl in tokens.items():
+            if is_address(token):
+                self.add_position(wallet, token, pnl, cohort)
+                added += 1
+        return added
+
+    def fetch(self, wallets: Iterable[str], cohort: str = None, tokens: Iterable[str] = None,
+              max_workers: int = None, lane: str = "batch") -> int:
+        """
+        Fetch PnL for many wallets concurrently
+
+        Without `tokens` every position of each wallet comes from one
+        get_wallet_pnl call; with `tokens` only those positions are fetched,
+        one get_wallet_token_pnl call per wallet and token. Failed calls are
+        kept in `errors` (by wallet, or (wallet, token)) instead of raising.
+        get_wallet_pnl records carry no first_buy_time or last_trade_time,
+        so only positions fetched with `tokens` can be used by by_window().
+
+        Args:
+            wallets: Wallet addresses
+            cohort: Cohort the wallets belong to (optional)
+            tokens: Only these tokens (optional)
+            max_workers: Concurrent calls (default: batch_max_workers)
+            lane: Scheduler lane for the requests
+
+        Returns:
+            Positions added
+
+        Raises:
+            ValidationError: Before any request, when an address is invalid
+        """
+        if self.client is None:
+            raise ValueError("CohortPnL.fetch() needs a client")
+        wallets = list(dict.fromkeys(validate_many(wallets, WALLET)))
+        added = 0
+        if tokens is None:
+            responses = self.client.batch("get_wallet_pnl", wallets, lane=lane, max_workers=max_workers,
+                                          return_exceptions=True)
+            for wallet, response in zip(wallets, responses):
+                if isinstance(response, BaseException):
+                    self.errors[wallet] = response
+                else:
+                    self.errors.pop(wallet, None)
+                    added += self.add_wallet(wallet, response, cohort)
+            return added
+
+        tokens = list(dict.fromkeys(validate_many(tokens, TOKEN)))
+        pairs = [(wallet, token) for wallet in wallets for token in tokens]
+        responses = fan_out(self.client, lambda pair: self.client.get_wallet_token_pnl(*pair), pairs,
+                            max_workers, lane, return_exceptions=True)
+        for pair, response in zip(pairs, responses):
+            if isinstance(response, BaseException):
+                self.errors[pair] = response
+            else:
+                self.errors.pop(pair, None)
+                self.add_position(pair[0], pair[1], response, cohort)
+                added += 1
+        return added
+
+    @property
+    def columns(self) -> Dict[str, "np.ndarray"]:
+        """Position columns (the latest row of each wallet/token pair)"""
+        if self._columns is None:
+            names = ("wallet_id", "token_id", "cohort") + tuple(_FIELDS) + _TIMES
+            rows = self._positions if self._positions is not None else np.empty((0, len(names)))
+            if self._rows:
+                rows = np.concatenate((rows, np.array(self._rows, dtype=np.float64)))
+                self._rows = []
+                # Keep the last row of each (wallet, token) pair
+                pairs = rows[:, 0].astype(np.int64) << 32 | rows[:, 1].astype(np.int64)
+                keys, codes = factorize(pairs)
+                last = np.zeros(len(keys), dtype=np.int64)
+                np.maximum.at(last, codes, np.arange(len(rows)))
+                rows = rows[np.sort(last)]
+            self._positions = rows
+            self._columns = {name: np.ascontiguousarray(rows[:, i]) for i, name in enumerate(names)}
+            for name in ("wallet_id", "token_id", "cohort"):
+                self._columns[name] = self._columns[name].astype(np.int64)
+        return self._columns
+
+    def __len__(self) -> int:
+        return len(self.columns["wallet_id"])
+
+    def _mask(self, cohort: Optional[str]) -> "np.ndarray":
+        columns = self.columns
+        if cohort is None:
+            return np.ones(len(columns["wallet_id"]), dtype=bool)
+        if cohort not in self.cohorts:
+            raise KeyError(f"Unknown cohort: {cohort!r}")
+        return columns["cohort"] == self.cohorts.index(cohort)
+
+    def _rollup(self, groups: "np.ndarray", size: int, mask: "np.ndarray") -> Dict[str, "np.ndarray"]:
+        """Sums, counts and ratios of the masked positions per group in [0, size)"""
+        columns = self.columns
+        groups = groups[mask]
+        total = columns["total"][mask]
+        wallet_codes = factorize(columns["wallet_id"][mask])[1]
+        wallets = distinct_pairs(groups, wallet_codes, max(len(wallet_codes), 1)) // max(len(wallet_codes), 1)
+        stats = {
+            "positions": group_count(groups, size),
+            "wallets": group_count(wallets, size),
+            "wins": group_count(groups[total > 0], size),
+            "losses": group_count(groups[total < 0], size)
+        }
+        for name in AMOUNTS:
+            stats[name] = group_sum(groups, columns[name][mask], size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            stats["roi"] = np.where(stats["invested"] > 0, stats["total"] / stats["invested"], np.nan)
+            stats["win_rate"] = stats["wins"] / stats["positions"]
+        return stats
+
+    def rollup(self, level: str = "token", cohort: str = None) -> Dict[str, Any]:
+        """
+        PnL summed per wallet, token or cohort
+
+        Args:
+            level: "wallet", "token" or "cohort"
+            cohort: Only positions of this cohort (optional)
+
+        Returns:
+            Dict of equal-length columns: the level's key (wallet / token
+            addresses or cohort names), positions, wallets (distinct), wins,
+            losses, realized, unrealized, total, invested, current_value,
+            roi (total / invested) and win_rate
+
+        Raises:
+            ValueError: When the level is unknown
+            KeyError: When the cohort is unknown
+        """
+        if level not in LEVELS:
+            raise ValueError(f"Unknown level '{level}'. Choose from: {', '.join(LEVELS)}")
+        columns = self.columns
+        mask = self._mask(cohort)
+        if level == "cohort":
+            # Positions without a cohort are left out
+            mask &= columns["cohort"] >= 0
+            stats = self._rollup(columns["cohort"], len(self.cohorts), mask)
+            result = {"cohort": list(self.cohorts)}
+        else:
+            keys, codes = factorize(columns[f"{level}_id"])
+            stats = self._rollup(codes, len(keys), mask)
+            present = np.flatnonzero(stats["positions"])
+            stats = {name: values[present] for name, values in stats.items()}
+            result = {level: self.table.lookup(keys[present])}
+        result.update(stats)
+        return result
+
+    def by_token(self, cohort: str = None) -> Dict[str, Any]:
+        """Rollup per token (see rollup)"""
+        return self.rollup("token", cohort)
+
+    def by_wallet(self, cohort: str = None) -> Dict[str, Any]:
+        """Rollup per wallet (see rollup)"""
+        return self.rollup("wallet", cohort)
+
+    def by_cohort(self) -> Dict[str, Any]:
+        """Rollup per cohort (see rollup)"""
+        return self.rollup("cohort")
+
+    def by_window(self, interval: Union[str, float] = "1d", time: str = "first_buy_time",
+                  cohort: str = None) -> Dict[str, Any]:
+        """
+        PnL of the positions opened (or last traded) in each time bucket
+
+        Only get_wallet_token_pnl records have the times: positions from
+        fetch() without `tokens` (get_wallet_pnl) are left out.
+
+        Args:
+            interval: Bucket size, seconds or e.g. "1h", "1d", "1w"
+            time: "first_buy_time" or "last_trade_time"
+            cohort: Only positions of this cohort (optional)
+
+        Returns:
+            Dict of equal-length columns: start (bucket start, ms) plus the
+            rollup columns, for buckets from the first to the last position
+            (positions without the time are left out)
+
+        Raises:
+            ValueError: When the interval or time column is invalid, or when
+                there are positions but none has the time
+        """
+        if time not in _TIMES:
+            raise ValueError(f"Unknown time column '{time}'. Choose from: {', '.join(_TIMES)}")
+        step = interval_ms(interval)
+        times = self.columns[time]
+        selected = self._mask(cohort)
+        mask = selected & ~np.isnan(times)
+        if selected.any() and not mask.any():
+            raise ValueError(f"No position has {time}: get_wallet_pnl does not return it, "
+                             f"fetch the positions with fetch(wallets, tokens=...) instead")
+        if not mask.any():
+            stats = self._rollup(np.zeros(len(times), dtype=np.int64), 0, mask)
+            return dict(start=np.empty(0), **stats)
+        first = np.floor(times[mask].min() / step) * step
+        buckets = np.zeros(len(times), dtype=np.int64)
+        buckets[mask] = ((times[mask] - first) // step).astype(np.int64)
+        size = int(buckets.max()) + 1
+        return dict(start=first + step * np.arange(size), **self._rollup(buckets, size, mask))
+
+    def leaderboard(self, level: str = "wallet", sort: str = "total", limit: int = 20,
+                    cohort: str = None, min_invested: float = 0.0) -> Dict[str, Any]:
+        """
+        Top wallets, tokens or cohorts by a rollup column, descending
+
+        Args:
+            level: "wallet", "token" or "cohort"
+            sort: Rollup column to sort by (e.g. "total", "realized", "roi", "win_rate")
+            limit: Rows to keep (None for all)
+            cohort: Only positions of this cohort (optional)
+            min_invested: Leave out rows with less invested (keeps roi meaningful)
+
+        Raises:
+            ValueError: When the level or sort column is unknown
+        """
+        board = self.rollup(level, cohort)
+        if sort not in board or sort == level:
+            raise ValueError(f"Unknown sort column '{sort}'. Choose from: "
+                             f"{', '.join(sorted(name for name in board if name != level))}")
+        keep = np.flatnonzero(board["invested"] >= min_invested)
+        values = board[sort][keep]
+        # NaN ratios sort last
+        keep = keep[np.argsort(-np.where(np.isnan(values), -np.inf, values), kind="stable")]
+        if limit is not None:
+            keep = keep[:limit]
+        keys = board.pop(level)
+        result = {level: [keys[i] for i in keep]}
+        result.update((name, column[keep]) for name, column in board.items())
+        return result
+
+    def __repr__(self) -> str:
+        return f"CohortPnL({len(self)} positions, {len(self.cohorts)} cohorts)"
@@ -0,0 +1,460 @@
+"""
+Portfolio history for Solana Detective package
+Wallet holdings over time rebuilt from trade history and priced from chart candles
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..addresses import AddressTable, is_address
+from ..endpoints import TOKEN, WALLET, validate_many
+from .core import np, require_numpy, interval_ms, fan_out, field, factorize, group_count, group_sum
+
+# Wrapped SOL, USDC and USDT: held value in these is not counted as exposure
+QUOTE_TOKENS = (
+    "So11111111111111111111111111111111111111112",
+    "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+    "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB",
+)
+
+
+def _number(value: Any) -> float:
+    """Float of a trade field (the API occasionally sends "" or null)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _leg(trade: Any, side: str) -> Tuple[Any, float]:
+    """(token address, amount) of the "from" or "to" side of a trade"""
+    leg = field(trade, side)
+    if leg is None and side == "from":
+        leg = field(trade, "from_")
+    return field(leg, "address"), _number(field(leg, "amount"))
+
+
+class PortfolioHistory:
+    """
+    Holdings of many wallets over time, from their trades and token candles
+
+    Every trade moves two token balances (what the wallet paid and what it
+    received), stored as leg rows of wallet_id, token_id, time and signed
+    amount; trades themselves are rows of wallet_id, time and USD volume.
+    On a time grid, balances are cumulative sums of the legs per
+    (wallet, token) and are valued at the close of the last candle before
+    each bucket ends, so any resolution is rebuilt locally: candles are
+    fetched once per token (and reused from the client's response cache),
+    then drawdown, exposure and turnover for many wallets are array
+    operations without further API calls.
+
+    Balances only reflect trades in the fetched history: tokens sold that
+    were acquired before it starts are floored at zero as the balance runs
+    (legs in one bucket are netted first), so later receipts still count.
+    Times are in milliseconds since the epoch.
+
+    Example:
+        portfolio = PortfolioHistory(detective)
+        portfolio.fetch(wallets, max_pages=20)
+        portfolio.fetch_prices(interval="1h")
+        curve = portfolio.history(wallets[0], interval="4h")
+        print(curve["value"][-1], curve["drawdown"].min())
+        print(portfolio.metrics(interval="1d")["max_drawdown"])
+    """
+
+    def __init__(self, client: Any = None, table: AddressTable = None,
+                 quote_tokens: Iterable[str] = QUOTE_TOKENS):
+        """
+        Initialize portfolio history
+
+        Args:
+            client: SolanaDetective (needed for fetch() and fetch_prices())
+            table: AddressTable for wallet and token ids (default: client.addresses, or a new one)
+            quote_tokens: Tokens treated as cash when computing exposure
+
+        Raises:
+            ValueError: When numpy is not installed
+        """
+        require_numpy()
+        self.client = client
+        if table is None:
+            table = client.addresses if client is not None else AddressTable()
+        self.table = table
+        self.quote_ids = np.asarray(table.intern_many(list(quote_tokens)))
+        self.errors: Dict[str, BaseException] = {}
+        self._seen: set = set()
+        self._legs: List[tuple] = []
+        self._trades: List[tuple] = []
+        self._candles: Dict[int, Tuple["np.ndarray", "np.ndarray"]] = {}
+        self._columns: Optional[Tuple[Dict[str, "np.ndarray"], Dict[str, "np.ndarray"]]] = None
+
+    def add_trades(self, wallet: str, trades: Iterable[Any]) -> int:
+        """
+        Add a wallet's trades (get_wallet_trades records)
+
+        Trades already added (same wallet and transaction) are skipped, so
+        overlapping pages can be added again.
+
+        Returns:
+            Trades added
+
+        Raises:
+            ValueError: When the wallet is not a valid address
+        """
+        wallet_id = self.table.intern(wallet)
+        times, volumes, tokens, amounts = [], [], [], []
+        for trade in trades:
+            time = field(trade, "time")
+            tx = field(trade, "tx")
+            if time is None or (tx is not None and (wallet_id, tx) in self._seen):
+                continue
+            paid, paid_amount = _leg(trade, "from")
+            received, received_amount = _leg(trade, "to")
+            if not (is_address(paid) and is_address(received)):
+                continue
+            if tx is not None:
+                self._seen.add((wallet_id, tx))
+            times.append(time)
+            volumes.append(_number(field(field(trade, "volume"), "usd")))
+            tokens += (paid, received)
+            amounts += (-paid_amount, received_amount)
+        if not times:
+            return 0
+        times = np.asarray(times, dtype=np.float64)
+        self._trades.append((np.full(len(times), wallet_id, dtype=np.int64), times,
+                             np.asarray(volumes, dtype=np.float64)))
+        self._legs.append((np.full(len(tokens), wallet_id, dtype=np.int64),
+                           np.asarray(self.table.intern_many(tokens)), np.repeat(times, 2),
+                           np.asarray(amounts, dtype=np.float64)))
+        self._columns = None
+        return len(times)
+
+    def fetch(self, wallets: Iterable[str], max_pages: int = None, max_workers: int = None,
+              lane: str = "batch") -> int:
+        """
+        Fetch the trade history of many wallets concurrently
+
+        Each wallet's pages are read in order (get_wallet_trades); wallets
+        run in parallel. Failed wallets are kept in `errors` instead of
+        raising.
+
+        Args:
+            wallets: Wallet addresses
+            max_pages: Most pages per wallet (default: the whole history)
+            max_workers: Concurrent wallets (default: batch_max_workers)
+            lane: Scheduler lane for the requests
+
+        Returns:
+            Trades added
+
+        Raises:
+            ValidationError: Before any request, when a wallet address is invalid
+        """
+        if self.client is None:
+            raise ValueError("PortfolioHistory.fetch() needs a client")
+        wallets = list(dict.fromkeys(validate_many(wallets, WALLET)))
+        client = self.client
+        responses = fan_out(client, lambda wallet: list(client.paginate("get_wallet_trades", wallet,
+                                                                        max_pages=max_pages)),
+                            wallets, max_workers, lane, return_exceptions=True)
+        added = 0
+        for wallet, pages in zip(wallets, responses):
+            if isinstance(pages, BaseException):
+                self.errors[wallet] = pages
+                continue
+            self.errors.pop(wallet, None)
+            for page in pages:
+                added += self.add_trades(wallet, field(page, "trades") or [])
+        return added
+
+    def add_candles(self, token: str, candles: Any) -> int:
+        """
+        Set a token's price candles (a get_chart_data response or its "oclhv" list)
+
+        Returns:
+            Candles kept
+        """
+        if not isinstance(candles, list):
+            candles = field(candles, "oclhv") or []
+        rows = [(field(candle, "time"), field(candle, "close")) for candle in candles]
+        rows = [(time, _number(close)) for time, close in rows if time is not None and _number(close) > 0]
+        times = np.asarray([time for time, _ in rows], dtype=np.float64) * 1000.0
+        closes = np.asarray([close for _, close in rows], dtype=np.float64)
+        order = np.argsort(times, kind="stable")
+        self._candles[self.table.intern(token)] = (times[order], closes[order])
+        return len(rows)
+
+    def fetch_prices(self, tokens: Iterable[str] = None, interval: str = "1h", time_from: int = None,
+                     time_to: int = None, refresh: bool = False, max_workers: int = None,
+                     lane: str = "batch") -> int:
+        """
+        Fetch candles for many tokens concurrently (get_chart_data)
+
+        Tokens that already have candles are skipped unless `refresh`.
+        Failed tokens are kept in `errors` instead of raising.
+
+        Args:
+            tokens: Token addresses (default: every traded token)
+            interval: Candle interval ("1m", "1h", "1d", ...); the close of
+                the last candle before a bucket ends prices that bucket
+            time_from: Start time (unix seconds, optional)
+            time_to: End time (unix seconds, optional)
+            refresh: Fetch tokens that already have candles again
+            max_workers: Concurrent calls (default: batch_max_workers)
+            lane: Scheduler lane for the requests
+
+        Returns:
+            Tokens priced
+
+        Raises:
+            ValidationError: Before any request, when a token address is invalid
+        """
+        if self.client is None:
+            raise ValueError("PortfolioHistory.fetch_prices() needs a client")
+        if tokens is None:
+            tokens = self.table.lookup(np.unique(self.legs["token_id"]))
+        tokens = list(dict.fromkeys(validate_many(tokens, TOKEN)))
+        if not refresh:
+            tokens = [token for token in tokens if self.table.get(token) not in self._candles]
+        if not tokens:
+            return 0
+        responses = self.client.batch("get_chart_data", tokens, lane=lane, max_workers=max_workers,
+                                      return_exceptions=True, interval=interval, time_from=time_from,
+                                      time_to=time_to)
+        priced = 0
+        for token, response in zip(tokens, responses):
+            if isinstance(response, BaseException):
+                self.errors[token] = response
+                continue
+            self.errors.pop(token, None)
+            priced += self.add_candles(token, response) > 0
+        return priced
+
+    def _consolidate(self) -> Tuple[Dict[str, "np.ndarray"], Dict[str, "np.ndarray"]]:
+        if self._columns is None:
+            for chunks in (self._legs, self._trades):
+                if len(chunks) > 1:
+                    chunks[:] = [tuple(np.concatenate(column) for column in zip(*chunks))]
+            legs = self._legs[0] if self._legs else (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                                                    np.empty(0), np.empty(0))
+            trades = self._trades[0] if self._trades else (np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+            self._columns = (dict(zip(("wallet_id", "token_id", "time", "amount"), legs)),
+                             dict(zip(("wallet_id", "time", "volume"), trades)))
+        return self._columns
+
+    @property
+    def legs(self) -> Dict[str, "np.ndarray"]:
+        """Balance changes as columns: wallet_id, token_id, time and amount (+ received, - paid)"""
+        return self._consolidate()[0]
+
+    @property
+    def trades(self) -> Dict[str, "np.ndarray"]:
+        """Trades as columns: wallet_id, time and volume (USD)"""
+        return self._consolidate()[1]
+
+    def __len__(self) -> int:
+        return len(self.trades["time"])
+
+    def unpriced(self) -> List[str]:
+        """Traded tokens without candles (valued at zero)"""
+        tokens = np.unique(self.legs["token_id"])
+        return self.table.lookup(token for token in tokens if not len(self._candles.get(int(token), ((),))[0]))
+
+    def _prices(self, tokens: "np.ndarray", ends: "np.ndarray") -> "np.ndarray":
+        """Price of each token at each bucket end (tokens x buckets; 0 without candles)"""
+        prices = np.zeros((len(tokens), len(ends)))
+        for row, token in enumerate(tokens):
+            candles = self._candles.get(int(token))
+            if candles is None or not len(candles[0]):
+                continue
+            times, closes = candles
+            # Last candle opening before the bucket ends; buckets before the first candle use it too
+            index = np.searchsorted(times, ends, side="left") - 1
+            prices[row] = closes[np.maximum(index, 0)]
+        return prices
+
+    def _grid(self, wallet_ids: Optional["np.ndarray"], interval: Union[str, float], start: Optional[float],
+              end: Optional[float]) -> Dict[str, Any]:
+        """Balances per (wallet, token) pair on a time grid, with token prices"""
+        step = interval_ms(interval)
+        legs = self.legs
+        mask = np.ones(len(legs["time"]), dtype=bool) if wallet_ids is None else np.isin(legs["wallet_id"], wallet_ids)
+        times = legs["time"][mask]
+        if start is None:
+            start = times.min() if len(times) else 0.0
+        if end is None:
+            end = times.max() if len(times) else start
+        first = np.floor(start / step) * step
+        size = max(int((end - first) // step) + 1, 1)
+        # Legs before the grid open the balance; legs after it are left out
+        mask[mask] = times <= end
+        buckets = np.maximum((legs["time"][mask] - first) // step, 0).astype(np.int64)
+        pairs = legs["wallet_id"][mask] << 32 | legs["token_id"][mask]
+        keys, codes = factorize(pairs)
+        balance = group_sum(codes * size + buckets, legs["amount"][mask], len(keys) * size)
+        balance = np.cumsum(balance.reshape(len(keys), size), axis=1)
+        # Floor at zero as the sum runs (sells of holdings from before the history
+        # must not eat later receipts): subtract the lowest running total so far
+        balance -= np.minimum(np.minimum.accumulate(balance, axis=1), 0.0)
+
+        token_ids = keys & 0xFFFFFFFF
+        tokens, token_codes = factorize(token_ids)
+        wallet_of_pair = keys >> 32
+        starts = np.flatnonzero(np.diff(wallet_of_pair, prepend=-1))
+        return {
+            "start": first + step * np.arange(size),
+            "first": first,
+            "step": step,
+            "wallets": wallet_of_pair[starts],
+            "pair_starts": starts,
+            "token_ids": token_ids,
+            "token_codes": token_codes,
+            "balance": balance,
+            "prices": self._prices(tokens, first + step * np.arange(1, size + 1)),
+            "quote": np.isin(token_ids, self.quote_ids)
+        }
+
+    def _curves(self, grid: Dict[str, Any]) -> Dict[str, "np.ndarray"]:
+        """Per-wallet curves (wallets x buckets) from a grid"""
+        wallets, starts = grid["wallets"], grid["pair_starts"]
+        balance, prices, token_codes, quote = grid["balance"], grid["prices"], grid["token_codes"], grid["quote"]
+        size = len(grid["start"])
+        if not len(wallets):
+            empty = np.empty((0, size))
+            return {"value": empty, "risk_value": empty, "volume": empty}
+        trades = self.trades
+        end = grid["first"] + grid["step"] * size
+        position = np.searchsorted(wallets, trades["wallet_id"])
+        known = (position < len(wallets)) & (wallets[np.minimum(position, len(wallets) - 1)] == trades["wallet_id"])
+        inside = known & (trades["time"] >= grid["first"]) & (trades["time"] < end)
+        buckets = ((trades["time"][inside] - grid["first"]) // grid["step"]).astype(np.int64)
+        volume = group_sum(position[inside] * size + buckets, trades["volume"][inside], len(wallets) * size)
+
+        # One wallet's pairs at a time: the (pairs x buckets) value matrix is never built whole
+        value = np.empty((len(wallets), size))
+        quote_value = np.zeros((len(wallets), size))
+        bounds = np.append(starts, len(balance))
+        for row in range(len(wallets)):
+            lo, hi = bounds[row], bounds[row + 1]
+            pair_value = balance[lo:hi] * prices[token_codes[lo:hi]]
+            value[row] = pair_value.sum(axis=0)
+            if quote[lo:hi].any():
+                quote_value[row] = pair_value[quote[lo:hi]].sum(axis=0)
+        return {"value": value, "risk_value": value - quote_value, "volume": volume.reshape(len(wallets), size)}
+
+    def _wallet_ids(self, wallets: Optional[Iterable[str]]) -> Optional["np.ndarray"]:
+        if wallets is None:
+            return None
+        wallets = list(wallets)
+        unknown = [wallet for wallet in wallets if wallet not in self.table]
+        if unknown:
+            raise KeyError(f"Unknown wallet: {unknown[0]!r}")
+        return np.asarray(self.table.intern_many(wallets))
+
+    def positions(self, wallet: str, interval: Union[str, float] = "1h", start: float = None,
+                  end: float = None) -> Dict[str, Any]:
+        """
+        One wallet's token balances and their USD value over time
+
+        Returns:
+            Dict: start (bucket starts, ms), token (addresses), and balance
+            and value arrays of shape (tokens, buckets)
+
+        Raises:
+            KeyError: When the wallet is unknown
+            ValueError: When the interval is invalid
+        """
+        grid = self._grid(self._wallet_ids([wallet]), interval, start, end)
+        return {"start": grid["start"], "token": self.table.lookup(grid["token_ids"]),
+                "balance": grid["balance"], "value": grid["balance"] * grid["prices"][grid["token_codes"]]}
+
+    def history(self, wallet: str, interval: Union[str, float] = "1h", start: float = None,
+                end: float = None) -> Dict[str, "np.ndarray"]:
+        """
+        One wallet's portfolio curve
+
+        Args:
+            wallet: Wallet address
+            interval: Bucket size, seconds or e.g. "15m", "1h", "1d"
+            start: First bucket time (ms, default: the wallet's first trade)
+            end: Last bucket time (ms, default: the wallet's last trade)
+
+        Returns:
+            Dict of equal-length arrays: start (bucket start, ms), value
+            (USD at the bucket end), risk_value (value outside quote
+            tokens), exposure (risk_value / value), volume (USD traded in
+            the bucket), turnover (volume / value) and drawdown (value /
+            running peak - 1, 0 to -1)
+
+        Raises:
+            KeyError: When the wallet is unknown
+            ValueError: When the interval is invalid
+        """
+        wallet_ids = self._wallet_ids([wallet])
+        grid = self._grid(wallet_ids, interval, start, end)
+        curves = {name: values[0] if len(values) else np.zeros(len(grid["start"]))
+                  for name, values in self._curves(grid).items()}
+        value = curves["value"]
+        peak = np.maximum.accumulate(value)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            curves["exposure"] = np.where(value > 0, curves["risk_value"] / value, 0.0)
+            curves["turnover"] = np.where(value > 0, curves["volume"] / value, np.nan)
+            curves["drawdown"] = np.where(peak > 0, value / peak - 1.0, 0.0)
+        return dict(start=grid["start"], **curves)
+
+    def metrics(self, wallets: Iterable[str] = None, interval: Union[str, float] = "1h",
+                start: float = None, end: float = None, sort: str = None) -> Dict[str, Any]:
+        """
+        Drawdown, exposure and turnover of many wallets on one time grid
+
+        Args:
+            wallets: Wallet addresses (default: every wallet with trades)
+            interval: Bucket size, seconds or e.g. "15m", "1h", "1d"
+            start: First bucket time (ms, default: the first trade)
+            end: Last bucket time (ms, default: the last trade)
+            sort: Column to sort by, descending (default: wallet id order)
+
+        Returns:
+            Dict of equal-length columns: wallet (addresses), trades,
+            volume (USD), final_value, peak_value, max_drawdown (most
+            negative drawdown), mean_exposure (over buckets holding value,
+            NaN when none do) and turnover (volume / mean value)
+
+        Raises:
+            KeyError: When a wallet is unknown
+            ValueError: When the interval or sort column is invalid
+        """
+        grid = self._grid(self._wallet_ids(wallets), interval, start, end)
+        curves = self._curves(grid)
+        value = curves["value"]
+        wallet_ids = grid["wallets"]
+        trades = self.trades
+        position = np.searchsorted(wallet_ids, trades["wallet_id"])
+        known = position < len(wallet_ids)
+        known[known] = wallet_ids[position[known]] == trades["wallet_id"][known]
+        peak = np.maximum.accumulate(value, axis=1)
+        held = value > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            drawdown = np.where(peak > 0, value / peak - 1.0, 0.0)
+            exposure = np.where(held, curves["risk_value"] / value, 0.0)
+            stats = {
+                "trades": group_count(position[known], len(wallet_ids)),
+                "volume": curves["volume"].sum(axis=1),
+                "final_value": value[:, -1],
+                "peak_value": value.max(axis=1, initial=0.0),
+                "max_drawdown": drawdown.min(axis=1, initial=0.0),
+                "mean_exposure": exposure.sum(axis=1) / held.sum(axis=1),
+                "turnover": curves["volume"].sum(axis=1) / value.mean(axis=1)
+            }
+        if sort is not None and sort not in stats:
+            raise ValueError(f"Unknown sort column '{sort}'. Choose from: {', '.join(sorted(stats))}")
+        order = np.arange(len(wallet_ids))
+        if sort is not None:
+            values = stats[sort]
+            order = np.argsort(-np.where(np.isnan(values), -np.inf, values), kind="stable")
+        result = {"wallet": self.table.lookup(wallet_ids[order])}
+        result.update((name, values[order]) for name, values in stats.items())
+        return result
+
+    def __repr__(self) -> str:
+        return (f"PortfolioHistory({len(self)} trades, {len(np.unique(self.trades['wallet_id']))} wallets, "
+                f"{len(self._candles)} priced tokens)")
@@ -0,0 +1,357 @@
+"""
+Smart-money scoring for Solana Detective package
+Persistent ranked index of top traders, enriched with wallet PnL and holdings and refreshed incrementally
+"""
+
+import gzip
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from ..addresses import is_address
+from .core import np, require_numpy, fan_out, field, group_count, group_sum
+
+INDEX_VERSION = 1
+
+# Top-trader summary fields that only change when a trader trades; a change
+# in any of them triggers enrichment (unrealized PnL moves with prices)
+_FINGERPRINT = {"realized": "realized", "invested": "totalInvested", "wins": "totalWins",
+                "losses": "totalLosses"}
+_SUMMARY = dict(_FINGERPRINT, unrealized="unrealized", total="total")
+# Per-trader statistics from get_wallet_pnl and get_wallet_basic
+_STATS = ("positions", "token_wins", "mean_roi", "std_roi", "downside", "gross_profit", "gross_loss",
+          "top_profit", "holdings_value", "enriched")
+SCORES = ("total", "risk_adjusted", "consistency")
+# Downside deviation floor, so traders without losing tokens do not divide by zero
+DOWNSIDE_FLOOR = 0.1
+
+
+def _number(value: Any) -> float:
+    """Float of a summary field (NaN when missing or not a number)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _percentile(values: "np.ndarray") -> "np.ndarray":
+    """Rank of each value as a fraction in [0, 1] (NaN ranks lowest)"""
+    if len(values) < 2:
+        return np.ones(len(values))
+    order = np.argsort(np.where(np.isnan(values), -np.inf, values), kind="stable")
+    ranks = np.empty(len(values))
+    ranks[order] = np.arange(len(values)) / (len(values) - 1)
+    return ranks
+
+
+class SmartMoneyIndex:
+    """
+    Ranked index of top traders that survives between runs
+
+    Each trader is one row of columns: the top-trader summary (realized,
+    unrealized, total, invested, wins, losses) plus statistics from their
+    PnL per token (positions, token_wins, mean and standard deviation of
+    token ROI, downside deviation, gross profit and loss, largest single
+    token profit) and holdings value. refresh() streams every top-trader
+    page, compares each summary with the stored one and only enriches
+    traders that are new or have traded since (get_wallet_pnl and
+    get_wallet_basic, all calls in parallel); the others keep their rows.
+    Scores are computed across the whole index on demand, so ranking tens
+    of thousands of traders is a few array operations.
+
+    Example:
+        index = SmartMoneyIndex.load("smart_money.json.gz", detective)  # or SmartMoneyIndex(detective)
+        print(index.refresh())                     # {"traders": ..., "changed": ..., "enriched": ...}
+        top = index.rank(limit=50, min_positions=10)
+        print(top["wallet"][:5], top["score"][:5])
+        index.save("smart_money.json.gz")
+    """
+
+    def __init__(self, client: Any = None):
+        """
+        Initialize an empty index
+
+        Args:
+            client: SolanaDetective (needed for refresh())
+
+        Raises:
+            ValueError: When numpy is not installed
+        """
+        require_numpy()
+        self.client = client
+        self.wallets: List[str] = []
+        self.errors: Dict[str, BaseException] = {}
+        self._rows: Dict[str, int] = {}
+        self._columns: Dict[str, "np.ndarray"] = {name: np.empty(0) for name in tuple(_SUMMARY) + _STATS}
+        self._columns["listed"] = np.empty(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.wallets)
+
+    def __contains__(self, wallet: object) -> bool:
+        return wallet in self._rows
+
+    @property
+    def columns(self) -> Dict[str, "np.ndarray"]:
+        """Stored columns, one row per trader (in `wallets` order)"""
+        return self._columns
+
+    def _append(self, wallets: List[str]) -> None:
+        """Add rows for new traders (never enriched)"""
+        for wallet in wallets:
+            self._rows[wallet] = len(self.wallets)
+            self.wallets.append(wallet)
+        for name, column in self._columns.items():
+            fill = np.zeros(len(wallets), dtype=bool) if column.dtype == bool else np.full(len(wallets), np.nan)
+            self._columns[name] = np.concatenate((column, fill))
+
+    def _stream(self, max_pages: Optional[int], lane: str) -> Dict[str, Any]:
+        """Wallet -> summary over all top-trader pages, in list order"""
+        traders: Dict[str, Any] = {}
+        with self.client.lane(lane):
+            for page in self.client.paginate("get_top_traders_all", max_pages=max_pages):
+                before = len(traders)
+                for trader in field(page, "wallets") or []:
+                    wallet = field(trader, "wallet")
+                    if is_address(wallet) and wallet not in traders:
+                        traders[wallet] = field(trader, "summary") or {}
+                # A page without new traders means the list wrapped around
+                if len(traders) == before:
+                    break
+        return traders
+
+    def refresh(self, max_pages: int = None, force: bool = False, max_workers: int = None,
+                lane: str = "batch") -> Dict[str, int]:
+        """
+        Stream the top-trader list and enrich traders whose data changed
+
+        A trader is enriched when new, when realized PnL, invested amount,
+        wins or losses differ from the stored summary, or when an earlier
+        enrichment failed. Failed calls are kept in `errors` (by wallet)
+        instead of raising and are retried on the next refresh. Traders no
+        longer on the list keep their rows with listed=False.
+
+        Args:
+            max_pages: Most top-trader pages to read (default: all)
+            force: Enrich every listed trader
+            max_workers: Concurrent enrichment calls (default: batch_max_workers)
+            lane: Scheduler lane for the requests
+
+        Returns:
+            Counts: traders (listed), new, changed (enriched or failed), enriched, errors
+        """
+        if self.client is None:
+            raise ValueError("SmartMoneyIndex.refresh() needs a client")
+        traders = self._stream(max_pages, lane)
+        wallets = list(traders)
+        new = [wallet for wallet in wallets if wallet not in self._rows]
+        self._append(new)
+        rows = np.asarray([self._rows[wallet] for wallet in wallets], dtype=np.int64)
+        columns = self._columns
+
+        summary = {name: np.asarray([_number(field(traders[wallet], key)) for wallet in wallets])
+                   for name, key in _SUMMARY.items()}
+        failed = np.asarray([wallet in self.errors for wallet in wallets], dtype=bool)
+        changed = np.isnan(columns["enriched"][rows]) | failed | force
+        for name in _FINGERPRINT:
+            # NaN never equals NaN, so missing fields count as changed
+            changed |= columns[name][rows] != summary[name]
+        for name, values in summary.items():
+            if name not in _FINGERPRINT:
+                columns[name][rows] = values
+        columns["listed"][:] = False
+        columns["listed"][rows] = True
+
+        stale = np.flatnonzero(changed)
+        done = self._enrich([wallets[i] for i in stale], max_workers, lane)
+        # The fingerprint only moves once enrichment succeeded, so failures are retried
+        updated = stale[done]
+        for name in _FINGERPRINT:
+            columns[name][rows[updated]] = summary[name][updated]
+        enriched = int(np.count_nonzero(done))
+        return {"traders": len(wallets), "new": len(new), "changed": len(stale), "enriched": enriched,
+                "errors": len(stale) - enriched}
+
+    def _enrich(self, wallets: List[str], max_workers: Optional[int], lane: str) -> "np.ndarray":
+        """Fetch PnL and holdings of traders and store their statistics (mask of the traders enriched)"""
+        succeeded = np.zeros(len(wallets), dtype=bool)
+        if not wallets:
+            return succeeded
+        client = self.client
+        calls = [(name, wallet) for wallet in wallets for name in ("get_wallet_pnl", "get_wallet_basic")]
+        responses = fan_out(client, lambda call: getattr(client, call[0])(call[1]), calls, max_workers, lane,
+                            return_exceptions=True)
+        done, pnls, holdings = [], [], []
+        for i, wallet in enumerate(wallets):
+            pnl, basic = responses[2 * i], responses[2 * i + 1]
+            failure = pnl if isinstance(pnl, BaseException) else basic if isinstance(basic, BaseException) else None
+            if failure is not None:
+                self.errors[wallet] = failure
+                continue
+            self.errors.pop(wallet, None)
+            succeeded[i] = True
+            done.append(wallet)
+            pnls.append(field(pnl, "tokens") or {})
+            holdings.append(_number(field(basic, "total")))
+        if not done:
+            return succeeded
+
+        # Every token position of every trader as one set of columns
+        sizes = np.asarray([len(tokens) for tokens in pnls], dtype=np.int64)
+        owner = np.repeat(np.arange(len(done)), sizes)
+        invested = np.asarray([_number(field(position, "total_invested")) for tokens in pnls
+                               for position in tokens.values()]).reshape(-1)
+        total = np.asarray([_number(field(position, "total")) for tokens in pnls
+                            for position in tokens.values()]).reshape(-1)
+        total = np.nan_to_num(total)
+        size = len(done)
+        traded = invested > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            roi = total[traded] / invested[traded]
+            groups = owner[traded]
+            positions = group_count(groups, size)
+            mean_roi = group_sum(groups, roi, size) / positions
+            variance = group_sum(groups, roi * roi, size) / positions - mean_roi ** 2
+            stats = {
+                "positions": positions,
+                "token_wins": group_count(groups[roi > 0], size),
+                "mean_roi": mean_roi,
+                "std_roi": np.sqrt(np.maximum(variance, 0.0)),
+                "downside": np.sqrt(group_sum(groups, np.minimum(roi, 0.0) ** 2, size) / positions),
+                "gross_profit": group_sum(owner, np.maximum(total, 0.0), size),
+                "gross_loss": group_sum(owner, np.maximum(-total, 0.0), size),
+                "holdings_value": np.asarray(holdings),
+                "enriched": np.full(size, time.time() * 1000)
+            }
+        top_profit = np.zeros(size)
+        np.maximum.at(top_profit, owner, total)
+        stats["top_profit"] = top_profit
+
+        rows = np.asarray([self._rows[wallet] for wallet in done], dtype=np.int64)
+        for name, values in stats.items():
+            self._columns[name][rows] = values
+        return succeeded
+
+    def scores(self, weights: Dict[str, float] = None) -> Dict[str, "np.ndarray"]:
+        """
+        Scores of every trader (in `wallets` order)
+
+        risk_adjusted is mean token ROI over downside deviation (floored
+        at DOWNSIDE_FLOOR), times sqrt(positions) so more evidence counts
+        more. consistency is the share of winning tokens, smoothed by one
+        win and one loss, times one minus the share of gross profit from
+        the single best token. score averages the percentile ranks of
+        total PnL, risk_adjusted and consistency with `weights`.
+
+        Args:
+            weights: Weight per score in SCORES (default: equal)
+
+        Raises:
+            ValueError: When a weight names an unknown score
+        """
+        weights = dict.fromkeys(SCORES, 1.0) if weights is None else weights
+        unknown = set(weights) - set(SCORES)
+        if unknown:
+            raise ValueError(f"Unknown score '{sorted(unknown)[0]}'. Choose from: {', '.join(SCORES)}")
+        columns = self._columns
+        positions = columns["positions"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            concentration = np.where(columns["gross_profit"] > 0,
+                                     columns["top_profit"] / columns["gross_profit"], 1.0)
+            result = {
+                "risk_adjusted": columns["mean_roi"] / np.maximum(columns["downside"], DOWNSIDE_FLOOR)
+                * np.sqrt(positions),
+                "consistency": (columns["token_wins"] + 1) / (positions + 2) * (1.0 - concentration),
+                "profit_factor": columns["gross_profit"] / columns["gross_loss"],
+                "win_rate": columns["wins"] / (columns["wins"] + columns["losses"])
+            }
+        ranked = {"total": columns["total"], "risk_adjusted": result["risk_adjusted"],
+                  "consistency": result["consistency"]}
+        total_weight = sum(weights.values()) or 1.0
+        result["score"] = sum(weight * _percentile(ranked[name]) for name, weight in weights.items()) / total_weight
+        return result
+
+    def rank(self, sort: str = "score", limit: int = None, min_positions: int = 0, listed: bool = True,
+             weights: Dict[str, float] = None) -> Dict[str, Any]:
+        """
+        Traders ranked by a score or stored column, descending
+
+        Args:
+            sort: Column to sort by (e.g. "score", "risk_adjusted", "consistency", "total")
+            limit: Keep the first `limit` traders after sorting
+            min_positions: Leave out traders with fewer priced token positions
+            listed: Only traders on the latest top-trader list
+            weights: Score weights (see scores)
+
+        Returns:
+            Dict of equal-length columns: wallet (addresses), the stored
+            columns, risk_adjusted, consistency, profit_factor, win_rate and score
+
+        Raises:
+            ValueError: When the sort column is unknown
+        """
+        table = dict(self._columns)
+        table.update(self.scores(weights))
+        if sort not in table or sort == "listed":
+            raise ValueError(f"Unknown sort column '{sort}'. "
+                             f"Choose from: {', '.join(sorted(name for name in table if name != 'listed'))}")
+        keep = np.flatnonzero(np.nan_to_num(table["positions"]) >= min_positions)
+        if listed:
+            keep = keep[table["listed"][keep]]
+        values = table[sort][keep]
+        keep = keep[np.argsort(-np.where(np.isnan(values), -np.inf, values), kind="stable")]
+        if limit is not None:
+            keep = keep[:limit]
+        result = {"wallet": [self.wallets[i] for i in keep]}
+        result.update((name, values[keep]) for name, values in table.items())
+        return result
+
+    def get(self, wallet: str) -> Dict[str, Any]:
+        """One trader's stored columns and scores"""
+        row = self._rows[wallet]
+        scores = self.scores()
+        values = {name: column[row].item() for name, column in self._columns.items()}
+        values.update((name, column[row].item()) for name, column in scores.items())
+        return values
+
+    def save(self, path: str) -> None:
+        """Write the index to a gzipped JSON file"""
+        document = {
+            "version": INDEX_VERSION,
+            "wallets": self.wallets,
+            "columns": {name: column.tolist() for name, column in self._columns.items()}
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(document, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str, client: Any = None, missing_ok: bool = True) -> "SmartMoneyIndex":
+        """
+        Read an index written by save()
+
+        Args:
+            path: Index file
+            client: SolanaDetective (needed for refresh())
+            missing_ok: Return an empty index when the file does not exist
+
+        Raises:
+            ValueError: When the file is not a compatible index
+        """
+        index = cls(client)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                document = json.load(f)
+        except FileNotFoundError:
+            if missing_ok:
+                return index
+            raise
+        if document.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported smart-money index version: {document.get('version')!r}")
+        index._append(document["wallets"])
+        for name, values in document["columns"].items():
+            if name in index._columns:
+                index._columns[name] = np.asarray(values, dtype=index._columns[name].dtype)
+        return index
+
+    def __repr__(self) -> str:
+        return f"SmartMoneyIndex({len(self)} traders, {int(self._columns['listed'].sum())} listed)"
@@ -0,0 +1,292 @@
+"""
+Sniper detection for Solana Detective package
+Inverted index of first buyers across many token launches, ranked by how often and how early wallets enter
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..addresses import AddressTable, is_address
+from ..endpoints import TOKEN, validate_many
+from .core import np, require_numpy, field, group_count, group_sum
+
+
+class SniperIndex:
+    """
+    First buyers of many launches, indexed by wallet
+
+    Every entry (a wallet among a token's first buyers) is one row of
+    columnar arrays: wallet id, launch, entry rank (0 = first buyer) and
+    delay after the launch's first buy. Rows are grouped by wallet on
+    demand (one sort), so a wallet's launches are one slice and per-wallet
+    statistics are bincount group-bys. Launches already indexed are not
+    fetched again; with response_cache on, the client also reuses the
+    first-buyer responses across indexes.
+
+    Example:
+        index = SniperIndex(detective)
+        index.fetch(recent_launches)
+        snipers = index.rank_wallets(min_launches=3, limit=20)
+        print(snipers["wallet"][:5], snipers["early_launches"][:5])
+        print(index.launches_of(snipers["wallet"][0]))
+    """
+
+    def __init__(self, client: Any = None, table: AddressTable = None, limit: int = 100):
+        """
+        Initialize index
+
+        Args:
+            client: SolanaDetective (needed for fetch())
+            table: AddressTable for wallet ids (default: client.addresses, or a new one)
+            limit: First buyers requested per launch
+
+        Raises:
+            ValueError: When numpy is not installed
+        """
+        require_numpy()
+        self.client = client
+        if table is None:
+            table = client.addresses if client is not None else AddressTable()
+        self.table = table
+        self.limit = limit
+        self.tokens: List[str] = []
+        self.errors: Dict[str, BaseException] = {}
+        self._launches: Dict[str, int] = {}
+        self._chunks: List[tuple] = []
+        self._columns: Optional[Dict[str, "np.ndarray"]] = None
+        self._grouped: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __contains__(self, token: object) -> bool:
+        return token in self._launches
+
+    def add(self, token: str, buyers: Iterable[Any]) -> int:
+        """
+        Index the first buyers of one launch
+
+        Entry rank follows first_buy_time (list order when it is missing);
+        delays are measured from the launch's earliest first buy.
+
+        Args:
+            token: Token mint address
+            buyers: First-buyer records (get_first_buyers)
+
+        Returns:
+            Entries added (0 when the launch was already indexed)
+        """
+        if token in self._launches:
+            return 0
+        wallets, times, invested = [], [], []
+        for buyer in buyers:
+            wallet = field(buyer, "wallet")
+            if is_address(wallet):
+                wallets.append(wallet)
+                times.append(field(buyer, "first_buy_time"))
+                invested.append(field(buyer, "total_invested") or 0.0)
+        launch = self._launches[token] = len(self.tokens)
+        self.tokens.append(token)
+        if not wallets:
+            return 0
+
+        times = np.array([np.nan if time is None else time for time in times], dtype=np.float64)
+        order = np.argsort(np.where(np.isnan(times), np.inf, times), kind="stable")
+        ids = np.asarray(self.table.intern_many(wallets))[order]
+        # A wallet listed twice keeps its earliest entry
+        keep = np.sort(np.unique(ids, return_index=True)[1])
+        order, ids = order[keep], ids[keep]
+        rank = np.arange(len(order), dtype=np.int32)
+        delay = times[order] - np.nanmin(times) if not np.isnan(times).all() else np.full(len(order), np.nan)
+        self._chunks.append((ids, np.full(len(order), launch, dtype=np.int32), rank, delay,
+                             np.asarray(invested, dtype=np.float64)[order]))
+        self._columns = self._grouped = None
+        return len(order)
+
+    def fetch(self, tokens: Iterable[str], max_workers: int = None, lane: str = "batch") -> int:
+        """
+        Fetch and index the first buyers of many launches concurrently
+
+        Launches already in the index are skipped. Failed calls are kept in
+        `errors` (by token) instead of raising.
+
+        Args:
+            tokens: Token mint addresses
+            max_workers: Concurrent calls (default: batch_max_workers)
+            lane: Scheduler lane for the requests
+
+        Returns:
+            Launches added
+
+        Raises:
+            ValidationError: Before any request, when a token address is invalid
+        """
+        if self.client is None:
+            raise ValueError("SniperIndex.fetch() needs a client")
+        tokens = [token for token in dict.fromkeys(validate_many(tokens, TOKEN)) if token not in self._launches]
+        if not tokens:
+            return 0
+        responses = self.client.batch("get_first_buyers", tokens, lane=lane, max_workers=max_workers,
+                                      return_exceptions=True, limit=self.limit)
+        added = 0
+        for token, response in zip(tokens, responses):
+            if isinstance(response, BaseException):
+                self.errors[token] = response
+                continue
+            self.errors.pop(token, None)
+            self.add(token, response if isinstance(response, list) else field(response, "buyers") or [])
+            added += 1
+        return added
+
+    @property
+    def columns(self) -> Dict[str, "np.ndarray"]:
+        """
+        All entries as columns: wallet_id, launch (index into `tokens`), rank,
+        delay_ms and invested (USD)
+        """
+        if self._columns is None:
+            names = ("wallet_id", "launch", "rank", "delay_ms", "invested")
+            dtypes = (np.int64, np.int32, np.int32, np.float64, np.float64)
+            if self._chunks:
+                self._chunks = [tuple(np.concatenate(column) for column in zip(*self._chunks))]
+                self._columns = dict(zip(names, self._chunks[0]))
+            else:
+                self._columns = {name: np.empty(0, dtype=dtype) for name, dtype in zip(names, dtypes)}
+        return self._columns
+
+    def _group(self) -> tuple:
+        """(entry order by wallet, distinct wallet ids, slice bounds, wallet position of each entry)"""
+        if self._grouped is None:
+            wallet_ids = self.columns["wallet_id"]
+            order = np.argsort(wallet_ids, kind="stable")
+            ordered = wallet_ids[order]
+            changes = np.diff(ordered, prepend=-1) != 0
+            starts = np.flatnonzero(changes)
+            positions = np.empty(len(order), dtype=np.int64)
+            positions[order] = np.cumsum(changes) - 1
+            self._grouped = (order, ordered[starts], np.append(starts, len(order)), positions)
+        return self._grouped
+
+    @property
+    def entries(self) -> int:
+        return len(self.columns["wallet_id"])
+
+    def launches_of(self, wallet: str) -> Dict[str, Any]:
+        """
+        Launches a wallet entered, earliest rank first
+
+        Returns:
+            Dict of columns: token, rank, delay_ms, invested (empty when unknown)
+        """
+        columns = self.columns
+        order, wallets, bounds, _ = self._group()
+        address_id = self.table.get(wallet)
+        position = np.searchsorted(wallets, address_id) if address_id is not None else len(wallets)
+        if position >= len(wallets) or wallets[position] != address_id:
+            rows = np.empty(0, dtype=np.int64)
+        else:
+            rows = order[bounds[position]:bounds[position + 1]]
+            rows = rows[np.argsort(columns["rank"][rows], kind="stable")]
+        return {
+            "token": [self.tokens[i] for i in columns["launch"][rows]],
+            "rank": columns["rank"][rows],
+            "delay_ms": columns["delay_ms"][rows],
+            "invested": columns["invested"][rows]
+        }
+
+    def buyers_of(self, token: str) -> List[str]:
+        """First buyers of an indexed launch, in entry order"""
+        launch = self._launches.get(token)
+        if launch is None:
+            raise KeyError(f"Launch not indexed: {token!r}")
+        columns = self.columns
+        rows = np.flatnonzero(columns["launch"] == launch)
+        rows = rows[np.argsort(columns["rank"][rows], kind="stable")]
+        return self.table.lookup(columns["wallet_id"][rows])
+
+    def overlap(self, tokens: Iterable[str], min_launches: int = None) -> List[str]:
+        """
+        Wallets among the first buyers of several launches
+
+        Args:
+            tokens: Indexed token mint addresses
+            min_launches: Launches a wallet must have entered (default: all of them)
+        """
+        launches = [self._launches[token] for token in dict.fromkeys(tokens) if token in self._launches]
+        if not launches:
+            return []
+        columns = self.columns
+        _, wallets, _, positions = self._group()
+        selected = np.isin(columns["launch"], launches)
+        counts = group_count(positions[selected], len(wallets))
+        required = len(launches) if min_launches is None else min_launches
+        return self.table.lookup(wallets[counts >= required])
+
+    def rank_wallets(self, min_launches: int = 2, early_rank: int = 10, limit: int = None,
+                     sort: str = "score") -> Dict[str, Any]:
+        """
+        Wallets ranked by how often and how early they enter launches
+
+        The score adds 1 / (1 + rank) over a wallet's entries, so a wallet
+        that is first buyer in three launches scores 3 and one that is
+        tenth in three launches scores about 0.3.
+
+        Args:
+            min_launches: Keep wallets that entered at least this many launches
+            early_rank: Entries with rank below this count as early
+            limit: Keep the first `limit` wallets after sorting
+            sort: Column to sort by, descending (e.g. "score", "launches", "early_launches")
+
+        Returns:
+            Dict of equal-length columns: wallet (addresses), wallet_id,
+            launches, early_launches, share_early, best_rank, mean_rank,
+            mean_delay_ms, invested, score
+
+        Raises:
+            ValueError: When the sort column is unknown
+        """
+        columns = self.columns
+        _, wallets, _, positions = self._group()
+        size = len(wallets)
+        rank = columns["rank"]
+        delay = columns["delay_ms"]
+        timed = ~np.isnan(delay)
+        launches = group_count(positions, size)
+        timed_count = group_count(positions[timed], size)
+        best_rank = np.full(size, np.iinfo(np.int32).max, dtype=np.int64)
+        np.minimum.at(best_rank, positions, rank)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            stats = {
+                "launches": launches,
+                "early_launches": group_count(positions[rank < early_rank], size),
+                "best_rank": best_rank,
+                "mean_rank": group_sum(positions, rank, size) / launches,
+                "mean_delay_ms": group_sum(positions[timed], delay[timed], size) / timed_count,
+                "invested": group_sum(positions, columns["invested"], size),
+                "score": group_sum(positions, 1.0 / (1.0 + rank), size)
+            }
+            stats["share_early"] = stats["early_launches"] / launches
+        if sort not in stats:
+            raise ValueError(f"Unknown sort column '{sort}'. Choose from: {', '.join(sorted(stats))}")
+
+        keep = np.flatnonzero(launches >= min_launches)
+        keep = keep[np.argsort(-stats[sort][keep], kind="stable")]
+        if limit is not None:
+            keep = keep[:limit]
+        ranked = {"wallet": self.table.lookup(wallets[keep]), "wallet_id": wallets[keep]}
+        ranked.update((name, values[keep]) for name, values in stats.items())
+        return ranked
+
+    def summary(self) -> Dict[str, Any]:
+        """Launch, entry and wallet counts"""
+        _, wallets, _, positions = self._group()
+        launches = group_count(positions, len(wallets))
+        return {
+            "launches": len(self.tokens),
+            "entries": self.entries,
+            "wallets": len(wallets),
+            "repeat_wallets": int(np.count_nonzero(launches >= 2)),
+            "errors": len(self.errors)
+        }
+
+    def __repr__(self) -> str:
+        return f"SniperIndex({len(self.tokens)} launches, {self.entries} entries)"
@@ -0,0 +1,327 @@
+"""
+Token flow analytics for Solana Detective package
+Buy/sell pressure, unique traders, VWAP, large trades and wallet net flow from token events
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..addresses import AddressTable
+from ..events import BUY, SELL, EventColumns
+from .core import np, require_numpy, interval_ms, group_sum, group_count, group_first, group_last, distinct_pairs, distinct_count
+
+# Windows of GET /stats/{token}, reproduced by TokenFlow.summary()
+STATS_WINDOWS = ("1m", "5m", "15m", "30m", "1h", "2h", "3h", "4h", "5h", "6h", "12h", "24h")
+
+
+class TokenFlow:
+    """
+    Vectorized trade analytics over one token's events
+
+    Events are sorted by time once; every statistic is then computed with
+    array operations (bincount group-bys, cumulative sums, unique pairs), so
+    hundreds of thousands of events take milliseconds and any window size
+    can be computed locally without further API calls. Times are in
+    milliseconds since the epoch, as in the events.
+
+    Example:
+        flow = TokenFlow.fetch(detective, token)
+        minutes = flow.windows("1m", window="15m")   # rolling 15 minute windows, every minute
+        print(minutes["pressure"][-1], minutes["buyers"][-1], minutes["vwap"][-1])
+        print(flow.summary()["5m"])                  # same shape as get_token_stats()
+    """
+
+    def __init__(self, events: EventColumns, table: AddressTable = None):
+        """
+        Initialize token flow
+
+        Args:
+            events: Decoded events (see SolanaDetective.get_token_events)
+            table: AddressTable to map wallets into, so wallet_flow() ids join
+                with other analyses sharing the table (optional)
+
+        Raises:
+            ValueError: When numpy is not installed
+        """
+        require_numpy()
+        order = np.argsort(np.asarray(events.time), kind="stable")
+        # Fancy indexing copies, so the columns are contiguous from here on
+        self.wallets: List[str] = events.wallets
+        self.table = table
+        self.wallet_ids = np.asarray(table.intern_many(self.wallets)) if table is not None else None
+        self.wallet_index = np.asarray(events.wallet_index).astype(np.int64)[order]
+        self.amount = np.asarray(events.amount, dtype=np.float64)[order]
+        self.price_usd = np.asarray(events.price_usd, dtype=np.float64)[order]
+        self.volume = np.asarray(events.volume, dtype=np.float64)[order]
+        self.type = np.asarray(events.type)[order]
+        self.time = np.asarray(events.time, dtype=np.float64)[order]
+        self.is_buy = self.type == BUY
+        self.is_sell = self.type == SELL
+
+    @classmethod
+    def fetch(cls, client: Any, token_address: str, pool_address: str = None) -> "TokenFlow":
+        """
+        Fetch a token's (or token/pool's) events and build its flow (wallets in client.addresses)
+
+        Args:
+            client: SolanaDetective
+            token_address: Token mint address
+            pool_address: Limit to one pool (optional)
+        """
+        if pool_address:
+            return cls(client.get_pool_events(token_address, pool_address), client.addresses)
+        return cls(client.get_token_events(token_address), client.addresses)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def events(self) -> EventColumns:
+        """The events in time order"""
+        return EventColumns(self.wallets, self.wallet_index, self.amount, self.price_usd,
+                            self.volume, self.type, self.time)
+
+    def _range(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        """Row range of events with start <= time < end"""
+        lo = 0 if start is None else int(np.searchsorted(self.time, start, side="left"))
+        hi = len(self.time) if end is None else int(np.searchsorted(self.time, end, side="left"))
+        return lo, hi
+
+    def windows(self, interval: Union[str, float] = "1m", window: Union[str, float] = None,
+                start: float = None, end: float = None) -> Dict[str, Any]:
+        """
+        Trade statistics per time bucket, optionally over rolling windows
+
+        Buckets are aligned to multiples of `interval` since the epoch, like
+        candles. With `window`, each row covers the trailing window ending
+        with its bucket (e.g. interval="1m", window="1h": the last hour,
+        every minute).
+
+        Args:
+            interval: Bucket size (seconds, or "30s", "1m", "1h", ...)
+            window: Rolling window, a multiple of interval (default: one bucket)
+            start: First event time to include (ms, default: the first event)
+            end: Event time to stop before (ms, default: after the last event)
+
+        Returns:
+            Dict of equal-length arrays: start (bucket start, ms), trades, buys,
+            sells, buyers, sellers, wallets (distinct), buy_volume,
+            sell_volume, volume, net_volume (buys - sells, USD), pressure
+            (net_volume / volume, -1 to 1), vwap, open and close (first and
+            last trade price), price_change_pct. Price columns are NaN for
+            windows without trades.
+
+        Raises:
+            ValueError: When the interval or window is invalid
+        """
+        step = interval_ms(interval)
+        span = interval_ms(window) if window is not None else step
+        if span % step:
+            raise ValueError(f"Window '{window}' is not a multiple of the interval '{interval}'")
+        k = span // step
+        lo, hi = self._range(start, end)
+        first = start if start is not None else (self.time[lo] if hi > lo else 0.0)
+        origin = int(first // step) * step
+        last = (end - 1) if end is not None else (self.time[hi - 1] if hi > lo else origin)
+        count = max(int((last - origin) // step) + 1, 0)
+
+        buckets = ((self.time[lo:hi] - origin) // step).astype(np.int64)
+        buy, sell = self.is_buy[lo:hi], self.is_sell[lo:hi]
+        wallet = self.wallet_index[lo:hi]
+        volume, amount, price = self.volume[lo:hi], self.amount[lo:hi], self.price_usd[lo:hi]
+
+        def rolled(values: "np.ndarray") -> "np.ndarray":
+            return _trailing_sum(values, k)
+
+        buy_volume = rolled(group_sum(buckets[buy], volume[buy], count))
+        sell_volume = rolled(group_sum(buckets[sell], volume[sell], count))
+        traded = rolled(group_sum(buckets, amount, count))
+        priced = rolled(group_sum(buckets, price * amount, count))
+        total = buy_volume + sell_volume
+        net = buy_volume - sell_volume
+        opens, closes = _window_prices(buckets, price, count, k)
+        return {
+            "start": origin + np.arange(count, dtype=np.int64) * step - (k - 1) * step,
+            "trades": rolled(group_count(buckets, count)),
+            "buys": rolled(group_count(buckets[buy], count)),
+            "sells": rolled(group_count(buckets[sell], count)),
+            "buyers": _distinct_counts(buckets[buy], wallet[buy], count, k),
+            "sellers": _distinct_counts(buckets[sell], wallet[sell], count, k),
+            "wallets": _distinct_counts(buckets, wallet, count, k),
+            "buy_volume": buy_volume,
+            "sell_volume": sell_volume,
+            "volume": total,
+            "net_volume": net,
+            "pressure": _ratio(net, total),
+            "vwap": _ratio(priced, traded),
+            "open": opens,
+            "close": closes,
+            "price_change_pct": (_ratio(closes, opens) - 1) * 100
+        }
+
+    def summary(self, windows: Tuple[str, ...] = STATS_WINDOWS, now: float = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Statistics of the trailing windows, shaped like GET /stats/{token}
+
+        Args:
+            windows: Window labels ("1m", "5m", "1h", ...)
+            now: End of the windows (ms, default: just after the last event)
+
+        Returns:
+            Dict by window label with buyers, sellers, volume (buys, sells,
+            total), transactions, buys, sells, wallets, price (last trade)
+            and priceChangePercentage (first to last trade in the window)
+        """
+        if now is None:
+            now = float(self.time[-1]) + 1 if len(self.time) else 0.0
+        size = len(self.wallets)
+        summary = {}
+        for label in windows:
+            lo, hi = self._range(now - interval_ms(label), now)
+            buy, sell = self.is_buy[lo:hi], self.is_sell[lo:hi]
+            wallet = self.wallet_index[lo:hi]
+            volume = self.volume[lo:hi]
+            buys, sells = float(volume[buy].sum()), float(volume[sell].sum())
+            price = self.price_usd[lo:hi]
+            summary[label] = {
+                "buyers": distinct_count(wallet[buy], size),
+                "sellers": distinct_count(wallet[sell], size),
+                "volume": {"buys": buys, "sells": sells, "total": buys + sells},
+                "transactions": hi - lo,
+                "buys": int(buy.sum()),
+                "sells": int(sell.sum()),
+                "wallets": distinct_count(wallet, size),
+                "price": float(price[-1]) if hi > lo else None,
+                "priceChangePercentage": (float(price[-1] / price[0] - 1) * 100
+                                          if hi > lo and price[0] else None)
+            }
+        return summary
+
+    def vwap(self, start: float = None, end: float = None) -> Optional[float]:
+        """Volume-weighted average price between start and end (ms), None without trades"""
+        lo, hi = self._range(start, end)
+        traded = float(self.amount[lo:hi].sum())
+        if not traded:
+            return None
+        return float(np.dot(self.price_usd[lo:hi], self.amount[lo:hi]) / traded)
+
+    def large_trades(self, min_volume: float = None, quantile: float = 0.99,
+                     limit: int = None) -> EventColumns:
+        """
+        Trades at or above a USD volume, largest first
+
+        Args:
+            min_volume: Volume threshold (default: the `quantile` of all trade volumes)
+            quantile: Volume quantile used when min_volume is not given
+            limit: Most trades to return
+
+        Returns:
+            EventColumns of the large trades
+        """
+        if min_volume is None:
+            min_volume = float(np.quantile(self.volume, quantile)) if len(self.volume) else 0.0
+        selected = np.flatnonzero(self.volume >= min_volume)
+        selected = selected[np.argsort(-self.volume[selected], kind="stable")]
+        if limit is not None:
+            selected = selected[:limit]
+        return self.events().take(selected)
+
+    def wallet_flow(self, start: float = None, end: float = None, limit: int = None,
+                    sort: str = "net_volume") -> Dict[str, Any]:
+        """
+        Net flow per wallet (buys minus sells), for wallets that traded
+
+        Args:
+            start: First event time to include (ms)
+            end: Event time to stop before (ms)
+            limit: Keep the first `limit` wallets after sorting
+            sort: Column to sort by, descending (e.g. "net_volume", "buy_volume", "trades")
+
+        Returns:
+            Dict of equal-length columns: wallet (addresses), wallet_index,
+            wallet_id (with a table), trades, buy_amount, sell_amount, net_amount, buy_volume,
+            sell_volume, net_volume
+
+        Raises:
+            ValueError: When the sort column is unknown
+        """
+        lo, hi = self._range(start, end)
+        size = len(self.wallets)
+        wallet = self.wallet_index[lo:hi]
+        buy, sell = self.is_buy[lo:hi], self.is_sell[lo:hi]
+        amount, volume = self.amount[lo:hi], self.volume[lo:hi]
+        columns = {
+            "trades": group_count(wallet, size),
+            "buy_amount": group_sum(wallet[buy], amount[buy], size),
+            "sell_amount": group_sum(wallet[sell], amount[sell], size),
+            "buy_volume": group_sum(wallet[buy], volume[buy], size),
+            "sell_volume": group_sum(wallet[sell], volume[sell], size)
+        }
+        columns["net_amount"] = columns["buy_amount"] - columns["sell_amount"]
+        columns["net_volume"] = columns["buy_volume"] - columns["sell_volume"]
+        if sort not in columns:
+            raise ValueError(f"Unknown sort column '{sort}'. Choose from: {', '.join(sorted(columns))}")
+
+        active = np.flatnonzero(columns["trades"])
+        active = active[np.argsort(-columns[sort][active], kind="stable")]
+        if limit is not None:
+            active = active[:limit]
+        flow = {"wallet": [self.wallets[i] for i in active], "wallet_index": active}
+        if self.wallet_ids is not None:
+            flow["wallet_id"] = self.wallet_ids[active]
+        flow.update((name, values[active]) for name, values in columns.items())
+        return flow
+
+
+def _trailing_sum(values: "np.ndarray", k: int) -> "np.ndarray":
+    """Sum over the trailing k elements ending at each position"""
+    if k == 1:
+        return values
+    cumulative = np.cumsum(values)
+    result = cumulative.copy()
+    result[k:] -= cumulative[:-k]
+    return result
+
+
+def _distinct_counts(buckets: "np.ndarray", keys: "np.ndarray", count: int, k: int) -> "np.ndarray":
+    """
+    Distinct keys per trailing window of k buckets
+
+    Each distinct (bucket, key) pair counts in the windows ending from its
+    bucket until k buckets later or the key's next bucket, whichever is
+    first; the counts are the running sum of those +1 / -1 marks.
+    """
+    if not len(buckets):
+        return np.zeros(count, dtype=np.int64)
+    # Ordered by key, then bucket
+    pairs = distinct_pairs(keys, buckets, count)
+    key, bucket = pairs // count, pairs % count
+    stop = bucket + k
+    same = key[:-1] == key[1:]
+    stop[:-1][same] = np.minimum(stop[:-1][same], bucket[1:][same])
+    marks = np.bincount(bucket, minlength=count + 1) - np.bincount(np.minimum(stop, count), minlength=count + 1)
+    return np.cumsum(marks)[:count]
+
+
+def _window_prices(buckets: "np.ndarray", price: "np.ndarray", count: int,
+                   k: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """First and last trade price in each trailing window of k buckets (NaN when empty)"""
+    if not count:
+        return np.empty(0), np.empty(0)
+    firsts = group_first(buckets, price, count)
+    lasts = group_last(buckets, price, count)
+    positions = np.arange(count)
+    nonempty = ~np.isnan(lasts)
+    # Latest non-empty bucket at or before each bucket, and earliest at or after
+    previous = np.maximum.accumulate(np.where(nonempty, positions, -1))
+    following = np.minimum.accumulate(np.where(nonempty, positions, count)[::-1])[::-1]
+    window_start = np.maximum(positions - k + 1, 0)
+    first_in_window = following[window_start]
+    opens = np.where(first_in_window <= positions, firsts[np.minimum(first_in_window, count - 1)], np.nan)
+    closes = np.where(previous >= window_start, lasts[np.maximum(previous, 0)], np.nan)
+    return opens, closes
+
+
+def _ratio(numerator: "np.ndarray", denominator: "np.ndarray") -> "np.ndarray":
+    """numerator / denominator, NaN where the denominator is 0 or NaN"""
+    result = np.full(np.shape(numerator), np.nan)
+    np.divide(numerator, denominator, out=result, where=(denominator != 0) & ~np.isnan(denominator))
+    return result
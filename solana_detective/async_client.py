@@ -0,0 +1,120 @@
+"""
+Asyncio client for Solana Detective package
+Coroutine versions of every registered endpoint, run on a worker pool
+"""
+
+import asyncio
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from .addresses import AddressTable
+from .client import SolanaDetective
+from .config import Config
+from .endpoints import ENDPOINTS, Endpoint, attach_endpoints
+from .scheduler import request_lane
+
+
+class AsyncSolanaDetective:
+    """
+    Asyncio client for the Solana Tracker API
+
+    Has the same endpoint methods as SolanaDetective (generated from the same
+    registry), as coroutines. Calls run the synchronous client on a worker
+    pool, so retries, rate limiting, metrics, hooks and cassettes behave
+    exactly as they do there; the scheduler lane set with `lane()` is carried
+    over to the worker.
+
+    Example:
+        async with AsyncSolanaDetective(api_key="...") as detective:
+            info, price = await asyncio.gather(
+                detective.get_token_info(token),
+                detective.get_token_price(token)
+            )
+    """
+
+    def __init__(self, api_key: str = None, config: Config = None,
+                 client: SolanaDetective = None, max_workers: int = None, **kwargs):
+        """
+        Initialize async client
+
+        Args:
+            api_key: Solana Tracker API key
+            config: Configuration object
+            client: SolanaDetective to wrap (optional, created from the other
+                arguments when left out)
+            max_workers: Concurrent calls (default: async_max_workers)
+            **kwargs: Additional configuration options / SolanaDetective arguments
+        """
+        self._owns_client = client is None
+        self.client = client or SolanaDetective(api_key=api_key, config=config, **kwargs)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or self.client.config.get("async_max_workers"),
+            thread_name_prefix="solana-detective-async"
+        )
+
+    @property
+    def config(self) -> Config:
+        return self.client.config
+
+    @property
+    def addresses(self) -> AddressTable:
+        return self.client.addresses
+
+    async def _run(self, function, *args, **kwargs) -> Any:
+        """Run a blocking client call on the worker pool in the caller's context"""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(context.run, function, *args, **kwargs)
+        )
+
+    async def _call_endpoint(self, endpoint: Endpoint, values: Tuple[Any, ...]) -> Any:
+        """Run a registered endpoint; every generated endpoint method awaits this"""
+        return await self._run(self.client._call_endpoint, endpoint, values)
+
+    async def batch(self, name: str, items: List[Any], **kwargs) -> List[Any]:
+        """Call a batchable endpoint for many items (see SolanaDetective.batch)"""
+        return await self._run(self.client.batch, name, items, **kwargs)
+
+    async def paginate(self, name: str, *args, **kwargs) -> AsyncIterator[Any]:
+        """Iterate over the pages of a paged endpoint (see SolanaDetective.paginate)"""
+        pages = self.client.paginate(name, *args, **kwargs)
+        done = object()
+        while True:
+            page = await self._run(next, pages, done)
+            if page is done:
+                return
+            yield page
+
+    def lane(self, lane: str, tenant: str = None):
+        """Context manager routing requests made inside the block through a scheduler lane"""
+        return request_lane(lane, tenant)
+
+    def metrics(self, format: str = "dict") -> Any:
+        """Snapshot of request metrics (see SolanaDetective.metrics)"""
+        return self.client.metrics(format)
+
+    def get_available_endpoints(self) -> List[str]:
+        """List of all available endpoint method names"""
+        return sorted(ENDPOINTS)
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Perform health check by testing credits endpoint"""
+        return await self._run(self.client.health_check)
+
+    async def aclose(self) -> None:
+        """Stop the worker pool (and close the wrapped client if it was created here)"""
+        self._executor.shutdown(wait=False)
+        if self._owns_client:
+            self.client.close()
+
+    async def __aenter__(self) -> "AsyncSolanaDetective":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+
+attach_endpoints(AsyncSolanaDetective, "_call_endpoint", is_async=True)
@@ -0,0 +1,121 @@
+"""
+Response cache for Solana Detective package
+TTL cache of decoded GET responses with ETag / Last-Modified revalidation
+"""
+
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Outcomes of a cacheable call, counted per endpoint in the request metrics
+HIT = "hit"                    # fresh entry, no request made
+NOT_MODIFIED = "not_modified"  # stale entry revalidated with a 304, body not transferred
+UNCHANGED = "unchanged"        # 200 with the same body as the entry, not decoded again
+MISS = "miss"                  # new or changed body, decoded and stored
+OUTCOMES = (HIT, NOT_MODIFIED, UNCHANGED, MISS)
+
+
+def cache_key(method: str, endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple[Any, ...]:
+    """Key of a request: method, path and query parameters"""
+    query = tuple(sorted((name, str(value)) for name, value in params.items())) if params else ()
+    return (method, endpoint, query)
+
+
+def body_digest(body: bytes) -> bytes:
+    """Content hash used to recognise an unchanged body without decoding it"""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+class CacheEntry:
+    """A decoded response with its validators"""
+
+    __slots__ = ("value", "digest", "etag", "last_modified", "ttl", "expires")
+
+    def __init__(self, value: Any, digest: bytes, etag: Optional[str], last_modified: Optional[str],
+                 ttl: float):
+        self.value = value
+        self.digest = digest
+        self.etag = etag
+        self.last_modified = last_modified
+        self.ttl = ttl
+        self.expires = time.monotonic() + ttl
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires
+
+    def refresh(self) -> None:
+        """Start a new TTL period (after a 304 or an unchanged body)"""
+        self.expires = time.monotonic() + self.ttl
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of decoded GET responses
+
+    Entries stay fresh for the endpoint's cache_ttl (see endpoints.py). Stale
+    entries are kept until evicted, so their ETag / Last-Modified validators
+    and content hash can save the transfer or the decoding of an unchanged
+    response. Cached values are shared between callers: treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize response cache
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[Any, ...], CacheEntry]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[CacheEntry]:
+        """Entry for a key, fresh or stale (None when absent)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Tuple[Any, ...], entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Tuple[Any, ...]) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            fresh = sum(1 for entry in self._entries.values() if entry.fresh)
+            return {
+                "entries": len(self._entries),
+                "fresh": fresh,
+                "max_entries": self.max_entries,
+                "evictions": self.evictions
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
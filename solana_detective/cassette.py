@@ -0,0 +1,260 @@
+"""
+Record/replay transport for Solana Detective package
+Stores API responses in gzip-compressed cassette files and serves them offline
+"""
+
+import io
+import gzip
+import json
+import atexit
+import base64
+import hashlib
+import weakref
+import threading
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .exceptions import CassetteError
+
+# Cassette modes
+RECORD = "record"    # always call the API, replacing recorded responses
+REPLAY = "replay"    # never call the API; unrecorded requests raise CassetteError
+AUTO = "auto"        # replay recorded requests, record the others
+MODES = (RECORD, REPLAY, AUTO)
+
+CASSETTE_VERSION = 1
+
+# Response headers worth keeping (bodies are stored decoded, so no encoding/length)
+_KEPT_HEADERS = ("Content-Type", "Retry-After", "ETag", "Last-Modified", "Cache-Control")
+
+# Recording cassettes not closed yet; saved at interpreter exit as a last resort
+_open_cassettes: "weakref.WeakSet[Cassette]" = weakref.WeakSet()
+
+
+def _save_open_cassettes() -> None:
+    for cassette in list(_open_cassettes):
+        cassette.save()
+
+
+atexit.register(_save_open_cassettes)
+
+
+def request_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    """
+    Cassette key of a request: method, endpoint path and normalized params
+
+    The host is left out so cassettes work against any base URL; query
+    parameters are sorted, and JSON bodies are canonicalized and hashed.
+
+    Example:
+        "GET /tokens/abc/holders?limit=100&page=1"
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    key = f"{method.upper()} {parts.path}" + (f"?{query}" if query else "")
+    if body:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        except ValueError:
+            pass
+        key += " #" + hashlib.sha256(body).hexdigest()[:16]
+    return key
+
+
+class Cassette:
+    """
+    A set of recorded API responses backed by a gzip-compressed JSON file
+
+    Repeated identical requests are recorded in order and replayed in the
+    same order, repeating the last response once the recording runs out (so
+    polling workflows replay as they happened). Request headers, including
+    the API key, are never stored.
+
+    Recordings are written by save(), close() and on leaving a `with` block;
+    a client that opened the cassette from a path closes it with the client.
+    Cassettes still open at interpreter exit are saved then, unless they
+    were garbage collected first.
+    """
+
+    def __init__(self, path: str, mode: str = AUTO):
+        """
+        Initialize cassette
+
+        Args:
+            path: Cassette file (conventionally *.json.gz)
+            mode: "record", "replay" or "auto"
+
+        Raises:
+            ValueError: When the mode is unknown
+            CassetteError: When replaying and the file is missing or unreadable
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}'. Choose from: {', '.join(MODES)}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+        if mode != RECORD:
+            self._load()
+        if mode != REPLAY:
+            _open_cassettes.add(self)
+
+    def _load(self) -> None:
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                document = json.load(f)
+        except FileNotFoundError:
+            if self.mode == REPLAY:
+                raise CassetteError(f"Cassette not found: {self.path}")
+            return
+        except (OSError, ValueError) as e:
+            raise CassetteError(f"Unreadable cassette {self.path}: {e}")
+        if document.get("version") != CASSETTE_VERSION:
+            raise CassetteError(f"Unsupported cassette version in {self.path}: {document.get('version')}")
+        self._interactions = document.get("interactions", {})
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(responses) for responses in self._interactions.values())
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._interactions
+
+    def play(self, key: str) -> Optional[Dict[str, Any]]:
+        """Next recorded response for a key (None when not recorded)"""
+        with self._lock:
+            responses = self._interactions.get(key)
+            if not responses:
+                self.misses += 1
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            self.hits += 1
+            return responses[min(position, len(responses) - 1)]
+
+    def record(self, key: str, status_code: int, headers: Dict[str, str], body: bytes) -> None:
+        """Add a response for a key"""
+        entry: Dict[str, Any] = {"status": status_code, "headers": headers}
+        try:
+            entry["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(body).decode("ascii")
+        with self._lock:
+            responses = self._interactions.setdefault(key, [])
+            if self.mode == RECORD and self._positions.get(key) is None:
+                # First response for this key in a recording session replaces the old ones
+                responses.clear()
+            self._positions[key] = self._positions.get(key, 0) + 1
+            responses.append(entry)
+            self._dirty = True
+            self.recorded += 1
+
+    def save(self) -> None:
+        """Write recorded responses to the cassette file (no-op when nothing changed)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            document = {"version": CASSETTE_VERSION, "interactions": self._interactions}
+            with gzip.open(self.path, "wt", encoding="utf-8") as f:
+                json.dump(document, f, separators=(",", ":"))
+            self._dirty = False
+
+    def close(self) -> None:
+        """Save, and leave saving to the caller from now on (no save at exit)"""
+        self.save()
+        _open_cassettes.discard(self)
+
+    def stats(self) -> Dict[str, Any]:
+        """Mode, size and hit counters"""
+        return {
+            "path": self.path,
+            "mode": self.mode,
+            "interactions": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "recorded": self.recorded
+        }
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def build_response(entry: Dict[str, Any], request: requests.PreparedRequest) -> requests.Response:
+    """Build a requests.Response from a recorded entry"""
+    if "body_b64" in entry:
+        body = base64.b64decode(entry["body_b64"])
+    else:
+        body = entry.get("body", "").encode("utf-8")
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+    response.headers["Content-Length"] = str(len(body))
+    response.encoding = "utf-8"
+    response.reason = "Replayed"
+    response.url = request.url
+    response.request = request
+    response.elapsed = timedelta(0)
+    response.raw = io.BytesIO(body)
+    # Body is already in memory, also for stream=True callers (iter_content slices it)
+    response._content = body
+    response._content_consumed = True
+    return response
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    Transport adapter recording to and replaying from a Cassette
+
+    Mounted on the client's session in place of the HTTP adapter, so every
+    request still goes through retries, metrics and hooks.
+    """
+
+    def __init__(self, cassette: Cassette, adapter: BaseAdapter = None):
+        """
+        Initialize cassette adapter
+
+        Args:
+            cassette: Cassette to record to / replay from
+            adapter: Adapter making real requests when recording (default HTTPAdapter)
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter or HTTPAdapter(max_retries=0)
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None,
+             verify=True, cert=None, proxies=None) -> requests.Response:
+        key = request_key(request.method, request.url, request.body)
+        if self.cassette.mode != RECORD:
+            entry = self.cassette.play(key)
+            if entry is not None:
+                return build_response(entry, request)
+            if self.cassette.mode == REPLAY:
+                raise CassetteError(f"No recorded response for {key} in {self.cassette.path}")
+
+        response = self.adapter.send(request, stream=stream, timeout=timeout, verify=verify,
+                                     cert=cert, proxies=proxies)
+        body = response.content
+        headers = {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers}
+        self.cassette.record(key, response.status_code, headers, body)
+        return response
+
+    def close(self) -> None:
+        self.adapter.close()
+        self.cassette.save()
@@ -6,42 +6,124 @@ Implements all 47 Solana Tracker API endpoints
 import json
 import time
 import logging
-from typing import Dict, Any, List, Optional, Union
+import threading
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Any, List, Optional, Union, Iterator, Tuple
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from .config import Config
+from .scheduler import RequestScheduler, request_lane, current_lane
+from .concurrency import backoff_delay
+from .resilience import CircuitBreaker, LatencyTracker, HedgeBudget, endpoint_family
+from .decoding import get_decoder
+from .streaming import iter_array_items
+from .metrics import MetricsRegistry, pools_to_prometheus
+from .cassette import Cassette, CassetteAdapter, REPLAY
+from .transport import PoolSettings, accept_encoding, new_adapter, new_session, shared_session, wire_size
+from .addresses import AddressTable
+from .events import JSON, LAYOUTS, decode_events
+from .endpoints import (
+    ENDPOINTS, PAGE, TOKEN, WALLET, Endpoint, attach_endpoints, get_endpoint,
+    validate_token_address, validate_wallet_address, validate_many
+)
+from .hooks import (
+    HookChain, Phase, BEFORE_REQUEST, AFTER_RESPONSE, ON_ERROR, ON_RETRY, ON_CHANGE,
+    PHASE_RATE_LIMIT, PHASE_NETWORK, PHASE_DECODE
+)
+from .cache import (
+    ResponseCache, CacheEntry, cache_key, body_digest, HIT, NOT_MODIFIED, UNCHANGED, MISS
+)
 from .exceptions import (
     APIError, 
     AuthenticationError, 
     RateLimitError, 
     ValidationError,
+    CircuitOpenError,
+    CassetteError,
     EndpointNotFoundError
 )
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Responses that signal overload and may be retried
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+def _close_response(future) -> None:
+    """Release the connection held by a hedged copy that lost the race"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+class _Call:
+    """Per-call state threaded through the request pipeline"""
+    
+    __slots__ = ("method", "endpoint", "template", "url", "params", "data", "timeout",
+                 "lane", "tenant", "family", "model", "decoder", "stream", "attempt", "started",
+                 "started_ns", "status_code", "response", "phases", "state", "headers",
+                 "cache_key", "cache_ttl", "cached")
+    
+    def __init__(self, client: "SolanaDetective", method: str, endpoint: str,
+                 params: Optional[Dict[str, Any]], data: Optional[Dict[str, Any]],
+                 timeout: Optional[int], model: Optional[str], stream: bool,
+                 template: Optional[str], traced: bool = False,
+                 decoder: Optional[Callable[[bytes], Any]] = None):
+        config = client.config
+        self.method = method.upper()
+        self.endpoint = endpoint
+        self.template = template or endpoint
+        self.url = f"{config.get('base_url')}{endpoint}"
+        self.params = params
+        self.data = data
+        self.timeout = timeout or config.get("timeout")
+        self.lane, self.tenant = current_lane() or (config.get("default_lane"), config.get("tenant"))
+        self.family = endpoint_family(endpoint)
+        self.model = model
+        self.decoder = decoder
+        self.stream = stream
+        self.attempt = 0
+        self.started = time.monotonic()
+        self.started_ns = time.time_ns()
+        self.status_code = None
+        self.response = None
+        # Phase timings and hook state are only kept while hooks are registered
+        self.phases: Optional[List[Phase]] = [] if traced else None
+        self.state: Dict[str, Any] = {}
+        self.headers = client.headers
+        # Response cache state, see _cache_lookup
+        self.cache_key = None
+        self.cache_ttl = 0
+        self.cached: Optional[CacheEntry] = None
+    
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
 class SolanaDetective:
     """
     Comprehensive Solana blockchain analysis client
     
     Provides access to all 47 Solana Tracker API endpoints with:
+    - One method per endpoint, generated from the endpoint registry
+    - Batching and pagination helpers for every endpoint that supports them
     - Built-in error handling and retries
     - Rate limiting protection
     - Response validation
     - Comprehensive logging
     """
     
-    def __init__(self, api_key: str = None, config: Config = None, **kwargs):
+    def __init__(self, api_key: str = None, config: Config = None,
+                 scheduler: RequestScheduler = None, tracer: Any = None,
+                 cassette: Union[Cassette, str] = None, **kwargs):
         """
         Initialize Solana Detective client
         
         Args:
             api_key: Solana Tracker API key
             config: Configuration object
+            scheduler: Request scheduler to share with other clients (optional)
+            tracer: OpenTelemetry Tracer for request spans (optional, enables tracing)
+            cassette: Cassette, or cassette file path opened in cassette_mode, to
+                record responses to / replay them from (optional)
             **kwargs: Additional configuration options
         """
         if config:
@@ -49,776 +131,892 @@ class SolanaDetective:
         else:
             self.config = Config(api_key=api_key, **kwargs)
         
-        # Set up HTTP session with retries
-        self.session = requests.Session()
+        # Recorded responses (see cassette.py); replay-only runs never touch the network
+        if cassette is None:
+            cassette = self.config.get("cassette")
+        self._owns_cassette = isinstance(cassette, str)
+        if self._owns_cassette:
+            cassette = Cassette(cassette, self.config.get("cassette_mode"))
+        self.cassette = cassette
+        offline = cassette is not None and cassette.mode == REPLAY
         
-        retry_strategy = Retry(
-            total=self.config.get("max_retries"),
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
+        # All requests pass through one scheduler so lanes share the rate limit
+        if scheduler is None and offline:
+            scheduler = RequestScheduler(rate_limit_delay=0, default_lane=self.config.get("default_lane"))
+        self.scheduler = scheduler or RequestScheduler.from_config(self.config)
+        
+        # Tail-latency controls, keyed by endpoint family ("/tokens", "/price", ...)
+        self._resilience_lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._hedge_budget = HedgeBudget(self.config.get("hedge_budget"))
+        self._hedge_executor = None
+        
+        # Per-endpoint request metrics, see metrics()
+        self.metrics_registry = MetricsRegistry() if self.config.get("metrics_enabled") else None
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        # Decoded GET responses, kept for their endpoint's cache_ttl and revalidated after
+        self.cache = ResponseCache(self.config.get("cache_max_entries")) if self.config.get("response_cache") else None
         
-        # Set default headers
-        self.session.headers.update({
+        # Address ids shared by the analysis engines (see addresses.py); never
+        # pruned, it grows with every address interned until addresses.clear()
+        self.addresses = AddressTable()
+        
+        # Hook chain around every call; tracing spans are one middleware on it
+        self.hooks = HookChain()
+        if tracer is not None or self.config.get("tracing"):
+            from .tracing import TracingMiddleware
+            self.hooks.add(TracingMiddleware(tracer))
+        
+        # Response decoding (orjson/msgspec when installed, stdlib json otherwise)
+        self.decoder = get_decoder(self.config.get("json_backend"))
+        self._response_types: Dict[str, Any] = {}
+        if self.config.get("typed_responses"):
+            if not self.decoder.supports_typed:
+                raise ValueError("typed_responses requires the msgspec package (pip install msgspec)")
+            from .models import RESPONSE_TYPES
+            self._response_types = RESPONSE_TYPES
+        
+        # /events bodies: the documented JSON events, or the provisional compact layout
+        events_layout = self.config.get("events_layout", JSON)
+        if events_layout not in LAYOUTS:
+            raise ValueError(f"Unknown events_layout '{events_layout}'. Choose from: {', '.join(LAYOUTS)}")
+        self._events_decoder = functools.partial(decode_events, layout=events_layout)
+        
+        # HTTP session. Clients with the same pool settings share one
+        # process-wide session (and its connection pools) unless they
+        # record/replay or share_session is off. Retries are handled in
+        # _make_request so every attempt goes through the scheduler and feeds
+        # the concurrency limiter
+        pool_settings = PoolSettings.from_config(self.config)
+        self._owns_session = cassette is not None or not self.config.get("share_session")
+        if cassette is not None:
+            self.session = new_session(CassetteAdapter(cassette, new_adapter(pool_settings)))
+        elif self._owns_session:
+            self.session = new_session(new_adapter(pool_settings))
+        else:
+            self.session = shared_session(pool_settings)
+        
+        # Headers are sent per request, so the shared session holds no API key.
+        # Compressed responses are decoded incrementally as chunks arrive
+        encodings = self.config.get("accept_encoding")
+        if encodings == "auto":
+            encodings = accept_encoding(pool_settings.http2)
+        self.headers = {
             "x-api-key": self.config.get("api_key"),
             "User-Agent": self.config.get("user_agent"),
-            "Content-Type": "application/json"
-        })
+            "Content-Type": "application/json",
+            "Accept-Encoding": encodings or "identity"
+        }
+        
+        # Open connections up front so the first fan-out does not pay for handshakes
+        if self.config.get("pool_warmup") and not offline:
+            self.warm_up()
         
-        logger.info(f"SolanaDetective client initialized with base URL: {self.config.get('base_url')}")
+        logger.debug(f"SolanaDetective client initialized with base URL: {self.config.get('base_url')}")
+    
+    def _pooled_adapter(self) -> Any:
+        """Adapter holding the connection pools for the API host (PooledAdapter or HTTP2Adapter)"""
+        adapter = self.session.get_adapter(self.config.get("base_url"))
+        if isinstance(adapter, CassetteAdapter):
+            adapter = adapter.adapter
+        return adapter if hasattr(adapter, "pool_stats") else None
+    
+    def warm_up(self, connections: int = None) -> int:
+        """
+        Open pooled connections to the API host ahead of the first requests
+        
+        Connections are opened in parallel, each paying its TCP and TLS
+        handshake now instead of on a request. Failures are logged, not raised.
+        With http2 nothing is opened: a few multiplexed connections are opened
+        on first use.
+        
+        Args:
+            connections: Connections to open (default pool_warmup, capped at pool_maxsize)
+            
+        Returns:
+            Connections opened
+        """
+        adapter = self._pooled_adapter()
+        if adapter is None or not hasattr(adapter, "warm_up"):
+            return 0
+        if connections is None:
+            connections = self.config.get("pool_warmup")
+        url = self.config.get("base_url")
+        # The same pool (TLS settings, proxy) the requests will be sent through
+        settings = self.session.merge_environment_settings(url, {}, None, self.config.get("verify_ssl"), None)
+        opened = adapter.warm_up(url, connections, verify=settings["verify"],
+                                 proxies=settings["proxies"], cert=settings["cert"])
+        logger.debug(f"Warmed up {opened} connection(s) to {url}")
+        return opened
+    
+    def connection_pools(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Connection pool utilization per host
+        
+        Returns:
+            Per "scheme://host:port": maxsize, in_use, idle, connections_opened,
+            requests, discarded (closed because the pool was full; raise
+            pool_maxsize when this grows) and wait_seconds (time blocked on a
+            full pool with pool_block). With http2: maxsize, in_use,
+            connections_opened, requests and http2_responses
+        """
+        adapter = self._pooled_adapter()
+        return adapter.pool_stats() if adapter is not None else {}
+    
+    def close(self) -> None:
+        """
+        Release the client's own session and hedging threads (a shared session stays open)
+        
+        Recorded responses are saved; a cassette opened from a path is closed.
+        """
+        if self._owns_session:
+            self.session.close()
+        if self._owns_cassette:
+            self.cassette.close()
+        with self._resilience_lock:
+            executor, self._hedge_executor = self._hedge_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+    
+    def __enter__(self) -> "SolanaDetective":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
     
     def _make_request(self, 
                      method: str, 
                      endpoint: str, 
                      params: Dict[str, Any] = None,
                      data: Dict[str, Any] = None,
-                     timeout: int = None) -> Dict[str, Any]:
+                     timeout: int = None,
+                     model: str = None,
+                     stream: bool = False,
+                     template: str = None,
+                     cache_ttl: float = 0,
+                     decoder: Callable[[bytes], Any] = None) -> Dict[str, Any]:
         """
         Make HTTP request to Solana Tracker API
         
+        Rate limits (429) are retried for every method; server errors, timeouts
+        and connection errors only for idempotent GET requests. Retries use
+        exponential backoff with full jitter and honour Retry-After. Calls to
+        an endpoint family whose circuit is open fail fast, and slow GETs may
+        be hedged (see _attempt). Registered hooks (self.hooks) see the call
+        before it starts, before each retry and once it returned or raised.
+        
+        With response_cache enabled, GETs with a cache_ttl are answered from the
+        cache while fresh, without hooks or a request. Stale entries are
+        revalidated with If-None-Match / If-Modified-Since; a 304 or an
+        identical body renews the entry without decoding the body again.
+        
         Args:
             method: HTTP method (GET, POST)
             endpoint: API endpoint path
             params: Query parameters
             data: Request body data
             timeout: Request timeout
+            model: Typed response model name (see models.RESPONSE_TYPES), used
+                when typed_responses is enabled
+            stream: Return the open response instead of decoding the body
+            template: Endpoint path template used as the metrics key
+                (e.g. "/tokens/{token}/holders"); defaults to `endpoint`
+            cache_ttl: Seconds the decoded response may be reused (0 = not cached)
+            decoder: Decodes the raw body instead of the JSON decoder (binary payloads)
             
         Returns:
-            API response as dictionary
+            API response as dictionary (or typed Struct, or the streaming response)
             
         Raises:
             APIError: When API request fails
             AuthenticationError: When authentication fails
             RateLimitError: When rate limit is exceeded
-        """
-        url = f"{self.config.get('base_url')}{endpoint}"
-        timeout = timeout or self.config.get("timeout")
-        
-        # Add rate limiting delay
-        time.sleep(self.config.get("rate_limit_delay"))
+            CircuitOpenError: When the endpoint family's circuit is open
+        """
+        hooks = self.hooks if self.hooks else None
+        call = _Call(self, method, endpoint, params, data, timeout, model, stream, template,
+                     traced=hooks is not None, decoder=decoder)
+        if cache_ttl and self.cache is not None and call.method == "GET" and not stream:
+            entry = self._cache_lookup(call, cache_ttl)
+            if entry is not None:
+                self._record_cache(call, HIT)
+                return entry.value
+        if hooks is None:
+            return self._run(call, None)
         
+        hooks.emit(BEFORE_REQUEST, call, 0.0)
         try:
-            logger.debug(f"Making {method} request to {url}")
-            
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=data,
-                timeout=timeout,
-                verify=self.config.get("verify_ssl")
-            )
-            
-            # Handle different response status codes
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 401:
-                raise AuthenticationError("Invalid API key")
-            elif response.status_code == 429:
-                retry_after = int(response.headers.get("Retry-After", 60))
-                raise RateLimitError(f"Rate limit exceeded. Retry after {retry_after} seconds", retry_after)
-            else:
-                try:
-                    error_data = response.json()
-                except:
-                    error_data = {"error": response.text}
-                
-                raise APIError(
-                    f"API request failed with status {response.status_code}: {error_data}",
-                    status_code=response.status_code,
-                    response=error_data
-                )
-                
-        except requests.exceptions.Timeout:
-            raise APIError(f"Request timeout after {timeout} seconds")
-        except requests.exceptions.ConnectionError:
-            raise APIError("Connection error - unable to reach API")
-        except requests.exceptions.RequestException as e:
-            raise APIError(f"Request failed: {str(e)}")
-    
-    def _validate_token_address(self, token: str) -> str:
-        """Validate token address format"""
-        if not token or not isinstance(token, str):
-            raise ValidationError("Token address must be a non-empty string")
-        if len(token) < 32 or len(token) > 44:
-            raise ValidationError("Invalid token address format")
-        return token
-    
-    def _validate_wallet_address(self, wallet: str) -> str:
-        """Validate wallet address format"""
-        if not wallet or not isinstance(wallet, str):
-            raise ValidationError("Wallet address must be a non-empty string")
-        if len(wallet) < 32 or len(wallet) > 44:
-            raise ValidationError("Invalid wallet address format")
-        return wallet
-    
-    # ========================================
-    # TOKEN ENDPOINTS (13 endpoints)
-    # ========================================
+            result = self._run(call, hooks)
+        except Exception as e:
+            hooks.emit(ON_ERROR, call, call.elapsed(), error=e)
+            raise
+        hooks.emit(AFTER_RESPONSE, call, call.elapsed())
+        return result
     
-    def get_token_info(self, token: str) -> Dict[str, Any]:
-        """
-        Get comprehensive token information
+    def _run(self, call: "_Call", hooks: Optional[HookChain]) -> Any:
+        """Retry loop of _make_request"""
+        idempotent = call.method == "GET"
         
-        Args:
-            token: Token address
+        while True:
+            error = None
+            try:
+                response = self._attempt(call)
+            except requests.exceptions.Timeout as e:
+                delay = self._retry_delay(call.attempt) if idempotent else None
+                if delay is None:
+                    raise APIError(f"Request timeout after {call.timeout} seconds")
+                error = e
+            except requests.exceptions.ConnectionError as e:
+                delay = self._retry_delay(call.attempt) if idempotent else None
+                if delay is None:
+                    raise APIError("Connection error - unable to reach API")
+                error = e
+            except requests.exceptions.RequestException as e:
+                raise APIError(f"Request failed: {str(e)}")
+            else:
+                call.response = response
+                call.status_code = response.status_code
+                delay = None
+                if response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUS_CODES):
+                    delay = self._retry_delay(call.attempt, response)
+                if delay is None:
+                    return self._handle_response(call, response)
             
-        Returns:
-            Token information including pools, events, and risk data
-        """
-        token = self._validate_token_address(token)
-        return self._make_request("GET", f"/tokens/{token}")
+            if error is not None:
+                call.response = call.status_code = None
+            call.attempt += 1
+            if self.metrics_registry is not None:
+                self.metrics_registry.record_retry(call.method, call.template)
+            if hooks is not None:
+                hooks.emit(ON_RETRY, call, call.elapsed(), error=error, retry_delay=delay)
+            logger.debug(f"Retrying {call.method} request to {call.url} in {delay:.2f}s (attempt {call.attempt})")
+            if error is None:
+                # The body is never read (stream=True leaves it unread), so release the connection
+                response.close()
+            time.sleep(delay)
     
-    def get_tokens_by_pool(self, pool_address: str) -> Dict[str, Any]:
+    def _attempt(self, call: "_Call"):
         """
-        Get tokens by pool address
+        Run one attempt, hedging idempotent GETs when enabled
         
-        Args:
-            pool_address: Pool address
-            
-        Returns:
-            Token information for the specified pool
+        A hedged attempt sends a second copy once the first has been running
+        longer than the family's recent latency percentile (hedge_percentile)
+        and returns whichever copy answers first. Hedged copies are limited to
+        a fraction of requests (hedge_budget) so they cannot amplify an overload.
         """
-        if not pool_address:
-            raise ValidationError("Pool address is required")
-        return self._make_request("GET", f"/tokens/by-pool/{pool_address}")
-    
-    def get_token_holders(self, token: str, page: int = 1, limit: int = 250) -> Dict[str, Any]:
-        """
-        Get token holders with pagination
+        if not self.config.get("hedge_requests") or call.method != "GET" or call.stream:
+            return self._send(call)
         
-        Args:
-            token: Token address
-            page: Page number (default: 1)
-            limit: Items per page (default: 250, max: 500)
-            
-        Returns:
-            List of token holders with balances and percentages
-        """
-        token = self._validate_token_address(token)
-        params = {"page": page, "limit": min(limit, 500)}
-        return self._make_request("GET", f"/tokens/{token}/holders", params=params)
-    
-    def get_token_holders_top(self, token: str) -> Dict[str, Any]:
-        """
-        Get top 20 token holders
+        self._hedge_budget.record_request()
+        delay = self._latency_tracker(call.family).percentile(
+            self.config.get("hedge_percentile"), self.config.get("hedge_min_samples")
+        )
+        if delay is None:
+            return self._send(call)
         
-        Args:
-            token: Token address
-            
-        Returns:
-            List of top 20 holders with balances and percentages
-        """
-        token = self._validate_token_address(token)
-        return self._make_request("GET", f"/tokens/{token}/holders/top")
-    
-    def get_token_ath(self, token: str) -> Dict[str, Any]:
-        """
-        Get token all-time high information
+        executor = self._hedge_pool()
+        primary = executor.submit(contextvars.copy_context().run, self._send, call)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._hedge_budget.try_spend():
+            return primary.result()
         
-        Args:
-            token: Token address
-            
-        Returns:
-            All-time high price data and timestamps
-        """
-        token = self._validate_token_address(token)
-        return self._make_request("GET", f"/tokens/{token}/ath")
+        logger.debug(f"Hedging {call.method} request to {call.url} after {delay:.3f}s")
+        hedge = executor.submit(contextvars.copy_context().run, self._send, call)
+        done, pending = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        winner = primary if primary in done else hedge
+        if winner.exception() is not None and pending:
+            # The first copy to finish failed; wait for the other one
+            winner = pending.pop()
+        for future in (primary, hedge):
+            if future is not winner:
+                future.add_done_callback(_close_response)
+        if winner is hedge:
+            self._hedge_budget.record_win()
+        return winner.result()
     
-    def get_deployer_tokens(self, wallet: str, page: int = 1, limit: int = 250) -> Dict[str, Any]:
-        """
-        Get tokens deployed by a wallet
+    def _send(self, call: "_Call"):
+        """Send one copy through the circuit breaker and scheduler, then report its outcome"""
+        metrics = self.metrics_registry
+        breaker = self._breaker(call.family)
+        if breaker is not None:
+            try:
+                breaker.before_call()
+            except CircuitOpenError:
+                if metrics is not None:
+                    metrics.record_error(call.method, call.template, "circuit_open")
+                raise
         
-        Args:
-            wallet: Deployer wallet address
-            page: Page number (default: 1)
-            limit: Items per page (default: 250, max: 500)
-            
-        Returns:
-            List of tokens deployed by the wallet
-        """
-        wallet = self._validate_wallet_address(wallet)
-        params = {"page": page, "limit": min(limit, 500)}
-        return self._make_request("GET", f"/deployer/{wallet}", params=params)
+        queued_ns = time.time_ns()
+        waited = self.scheduler.acquire(call.lane, call.tenant)
+        started = time.monotonic()
+        sent_ns = time.time_ns()
+        overloaded = False
+        failed = True
+        status_code = None
+        error = "request"
+        try:
+            logger.debug(f"Making {call.method} request to {call.url}")
+            response = self.session.request(
+                method=call.method,
+                url=call.url,
+                params=call.params,
+                json=call.data,
+                headers=call.headers,
+                timeout=call.timeout,
+                verify=self.config.get("verify_ssl"),
+                stream=call.stream
+            )
+            status_code = response.status_code
+            error = None
+            overloaded = status_code in RETRY_STATUS_CODES
+            failed = status_code >= 500
+            return response
+        except requests.exceptions.Timeout:
+            overloaded = True
+            error = "timeout"
+            raise
+        except requests.exceptions.ConnectionError:
+            overloaded = True
+            error = "connection"
+            raise
+        except CassetteError:
+            # Nothing recorded for this request; the API itself is fine
+            failed = False
+            error = "cassette_miss"
+            raise
+        finally:
+            latency = time.monotonic() - started
+            self.scheduler.release(latency, overloaded)
+            if breaker is not None:
+                if failed:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if not failed and not overloaded:
+                self._latency_tracker(call.family).record(latency)
+            if metrics is not None:
+                metrics.record_attempt(call.method, call.template, status_code, latency, waited, error)
+            if call.phases is not None:
+                attributes = {"attempt": call.attempt}
+                if status_code is not None:
+                    attributes["http.status_code"] = status_code
+                if error:
+                    attributes["error"] = error
+                call.phases.append(Phase(PHASE_RATE_LIMIT, queued_ns, sent_ns))
+                call.phases.append(Phase(PHASE_NETWORK, sent_ns, sent_ns + int(latency * 1e9), attributes))
     
-    def search_tokens(self, query: str, limit: int = 10) -> Dict[str, Any]:
-        """
-        Search for tokens by name or symbol
-        
-        Args:
-            query: Search query
-            limit: Number of results to return
-            
-        Returns:
-            List of matching tokens
-        """
-        if not query:
-            raise ValidationError("Search query is required")
-        params = {"query": query, "limit": limit}
-        return self._make_request("GET", "/search", params=params)
+    def _breaker(self, family: str) -> Optional[CircuitBreaker]:
+        """Circuit breaker for an endpoint family (None when disabled)"""
+        if not self.config.get("circuit_breaker"):
+            return None
+        with self._resilience_lock:
+            breaker = self._breakers.get(family)
+            if breaker is None:
+                breaker = self._breakers[family] = CircuitBreaker(
+                    family,
+                    failure_threshold=self.config.get("circuit_failure_threshold"),
+                    recovery_timeout=self.config.get("circuit_recovery_timeout"),
+                    half_open_max_calls=self.config.get("circuit_half_open_max_calls")
+                )
+            return breaker
     
-    def get_latest_tokens(self, page: int = 1, limit: int = 250) -> Dict[str, Any]:
-        """
-        Get latest tokens
-        
-        Args:
-            page: Page number (default: 1)
-            limit: Items per page (default: 250, max: 500)
-            
-        Returns:
-            List of latest tokens
-        """
-        params = {"page": page, "limit": min(limit, 500)}
-        return self._make_request("GET", "/tokens/latest", params=params)
+    def _latency_tracker(self, family: str) -> LatencyTracker:
+        """Recent successful latencies for an endpoint family"""
+        with self._resilience_lock:
+            tracker = self._latencies.get(family)
+            if tracker is None:
+                tracker = self._latencies[family] = LatencyTracker()
+            return tracker
     
-    def get_tokens_multi(self, tokens: List[str]) -> Dict[str, Any]:
-        """
-        Get information for multiple tokens (GET method)
-        
-        Args:
-            tokens: List of token addresses
-            
-        Returns:
-            Information for all requested tokens
-        """
-        if not tokens or not isinstance(tokens, list):
-            raise ValidationError("Tokens must be a non-empty list")
-        params = {"tokens": ",".join(tokens)}
-        return self._make_request("GET", "/tokens/multi", params=params)
+    def _hedge_pool(self) -> ThreadPoolExecutor:
+        """Worker pool running hedged copies (created on first use)"""
+        with self._resilience_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.config.get("hedge_max_workers"),
+                    thread_name_prefix="solana-detective-hedge"
+                )
+            return self._hedge_executor
     
-    def post_tokens_multi(self, tokens: List[str]) -> Dict[str, Any]:
+    def _retry_delay(self, attempt: int, response=None) -> Optional[float]:
         """
-        Get information for multiple tokens (POST method)
+        Seconds to wait before the next attempt, or None when no retry should be made
         
         Args:
-            tokens: List of token addresses
-            
-        Returns:
-            Information for all requested tokens
-        """
-        if not tokens or not isinstance(tokens, list):
-            raise ValidationError("Tokens must be a non-empty list")
-        data = {"tokens": tokens}
-        return self._make_request("POST", "/tokens/multi", data=data)
+            attempt: Number of retries already made
+            response: Response that triggered the retry (for Retry-After)
+        """
+        if attempt >= self.config.get("max_retries"):
+            return None
+        cap = self.config.get("retry_max_delay")
+        delay = backoff_delay(attempt, self.config.get("retry_delay"), cap)
+        if response is not None and response.status_code == 429:
+            try:
+                retry_after = float(response.headers.get("Retry-After", 0))
+            except ValueError:
+                retry_after = 0
+            # Waiting longer than the cap inside the call is the caller's decision
+            if retry_after > cap:
+                return None
+            delay += retry_after
+        return delay
     
-    def get_trending_tokens(self, timeframe: str = None) -> Dict[str, Any]:
-        """
-        Get trending tokens
-        
-        Args:
-            timeframe: Optional timeframe filter
-            
-        Returns:
-            List of trending tokens
-        """
-        if timeframe:
-            return self._make_request("GET", f"/tokens/trending/{timeframe}")
+    def _handle_response(self, call: "_Call", response) -> Dict[str, Any]:
+        """Map a final HTTP response to parsed data or a package exception"""
+        # Handle different response status codes
+        if response.status_code == 200:
+            if call.stream:
+                return response
+            if call.cache_key is not None:
+                return self._cache_response(call, response)
+            return self._decode(call, response)
+        elif response.status_code == 304 and call.cached is not None:
+            # Revalidated: the cached value is still current
+            call.cached.refresh()
+            self._record_cache(call, NOT_MODIFIED)
+            return call.cached.value
+        elif response.status_code == 401:
+            raise AuthenticationError("Invalid API key")
+        elif response.status_code == 429:
+            retry_after = int(response.headers.get("Retry-After", 60))
+            raise RateLimitError(f"Rate limit exceeded. Retry after {retry_after} seconds", retry_after)
         else:
-            return self._make_request("GET", "/tokens/trending")
-    
-    def get_tokens_by_volume(self, timeframe: str = None) -> Dict[str, Any]:
-        """
-        Get tokens sorted by volume
-        
-        Args:
-            timeframe: Optional timeframe filter
+            try:
+                error_data = response.json()
+            except:
+                error_data = {"error": response.text}
             
-        Returns:
-            List of tokens sorted by volume
-        """
-        if timeframe:
-            return self._make_request("GET", f"/tokens/volume/{timeframe}")
-        else:
-            return self._make_request("GET", "/tokens/volume")
+            raise APIError(
+                f"API request failed with status {response.status_code}: {error_data}",
+                status_code=response.status_code,
+                response=error_data
+            )
     
-    def get_tokens_multi_all(self) -> Dict[str, Any]:
+    def _cache_lookup(self, call: "_Call", ttl: float) -> Optional[CacheEntry]:
         """
-        Get all tokens (multi endpoint)
+        Fresh cache entry for a call, or None after preparing the call to revalidate
         
-        Returns:
-            Information for all tokens
-        """
-        return self._make_request("GET", "/tokens/multi/all")
+        A stale entry is kept on the call and its validators are sent as
+        conditional request headers.
+        """
+        call.cache_key = cache_key(call.method, call.endpoint, call.params)
+        call.cache_ttl = ttl
+        entry = self.cache.get(call.cache_key)
+        if entry is None:
+            return None
+        if entry.fresh:
+            return entry
+        call.cached = entry
+        validators = entry.validators()
+        if validators:
+            call.headers = dict(self.headers, **validators)
+        return None
     
-    def get_tokens_multi_graduated(self) -> Dict[str, Any]:
-        """
-        Get graduated tokens only
+    def _cache_response(self, call: "_Call", response) -> Any:
+        """Decode and cache a 200 response, reusing the cached value when the body is unchanged"""
+        content = response.content
+        digest = body_digest(content)
+        entry = call.cached
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if entry is not None and entry.digest == digest:
+            # Same body (the server ignored or does not support validators)
+            entry.etag = etag or entry.etag
+            entry.last_modified = last_modified or entry.last_modified
+            entry.refresh()
+            if self.metrics_registry is not None:
+                self.metrics_registry.record_body(call.method, call.template, len(content), None,
+                                                  wire_size(response), response.headers.get("Content-Encoding", "identity"))
+            self._record_cache(call, UNCHANGED)
+            return entry.value
         
-        Returns:
-            Information for graduated tokens
-        """
-        return self._make_request("GET", "/tokens/multi/graduated")
+        value = self._decode(call, response)
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            self.cache.invalidate(call.cache_key)
+        else:
+            self.cache.put(call.cache_key, CacheEntry(value, digest, etag, last_modified, call.cache_ttl))
+        self._record_cache(call, MISS)
+        if self.hooks:
+            self.hooks.emit(ON_CHANGE, call, call.elapsed(), result=value)
+        return value
     
-    # ========================================
-    # PRICE ENDPOINTS (6 endpoints)
-    # ========================================
+    def _record_cache(self, call: "_Call", outcome: str) -> None:
+        if self.metrics_registry is not None:
+            self.metrics_registry.record_cache(call.method, call.template, outcome)
     
-    def get_token_price(self, token: str, price_changes: bool = False) -> Dict[str, Any]:
-        """
-        Get current token price
-        
-        Args:
-            token: Token address
-            price_changes: Include price change percentages
-            
-        Returns:
-            Current price and optional price changes
-        """
-        token = self._validate_token_address(token)
-        params = {"token": token}
-        if price_changes:
-            params["priceChanges"] = "true"
-        return self._make_request("GET", "/price", params=params)
+    def _decode(self, call: "_Call", response) -> Any:
+        """Decode a successful response body with the configured JSON backend (or the call's decoder)"""
+        decode_type = self._response_types.get(call.model) if call.model else None
+        content = response.content
+        started_ns = time.time_ns()
+        started = time.perf_counter()
+        try:
+            if call.decoder is not None:
+                return call.decoder(content)
+            return self.decoder.decode(content, decode_type)
+        except ValueError as e:
+            raise APIError(
+                f"Invalid {'payload' if call.decoder else 'JSON'} in API response: {str(e)}",
+                status_code=response.status_code,
+                response={"error": response.text[:200]}
+            )
+        finally:
+            seconds = time.perf_counter() - started
+            wire = wire_size(response)
+            if self.metrics_registry is not None:
+                self.metrics_registry.record_body(call.method, call.template, len(content), seconds,
+                                                  wire, response.headers.get("Content-Encoding", "identity"))
+            if call.phases is not None:
+                attributes = {"bytes": len(content)}
+                if wire is not None:
+                    attributes["wire_bytes"] = wire
+                call.phases.append(Phase(PHASE_DECODE, started_ns, started_ns + int(seconds * 1e9), attributes))
     
-    def get_price_history(self, token: str, time_from: int, time_to: int) -> Dict[str, Any]:
+    def _stream_items(self, endpoint: str, params: Dict[str, Any] = None,
+                      keys=None, meta: Dict[str, Any] = None,
+                      template: str = None) -> Iterator[Tuple[Optional[str], Any]]:
         """
-        Get historical price data
+        Stream array elements of a large GET response without loading the whole body
         
-        Args:
-            token: Token address
-            time_from: Start time (unix timestamp)
-            time_to: End time (unix timestamp)
-            
-        Returns:
-            Historical price data
+        Yields:
+            (array key, element) tuples, see streaming.iter_array_items
         """
-        token = self._validate_token_address(token)
-        params = {
-            "token": token,
-            "time_from": time_from,
-            "time_to": time_to
-        }
-        return self._make_request("GET", "/price/history", params=params)
-    
-    def get_price_at_timestamp(self, token: str, timestamp: int) -> Dict[str, Any]:
-        """
-        Get price at specific timestamp
+        response = self._make_request("GET", endpoint, params=params, stream=True, template=template)
+        received = 0
         
-        Args:
-            token: Token address
-            timestamp: Unix timestamp
-            
-        Returns:
-            Price at the specified timestamp
-        """
-        token = self._validate_token_address(token)
-        params = {
-            "token": token,
-            "timestamp": timestamp
-        }
-        return self._make_request("GET", "/price/history/timestamp", params=params)
-    
-    def get_price_range(self, token: str, time_from: int, time_to: int) -> Dict[str, Any]:
-        """
-        Get lowest and highest price in time range
+        def chunks():
+            nonlocal received
+            for chunk in response.iter_content(chunk_size=self.config.get("stream_chunk_size")):
+                received += len(chunk)
+                yield chunk
         
-        Args:
-            token: Token address
-            time_from: Start time (unix timestamp)
-            time_to: End time (unix timestamp)
-            
-        Returns:
-            Lowest and highest prices in the range
-        """
-        token = self._validate_token_address(token)
-        params = {
-            "token": token,
-            "time_from": time_from,
-            "time_to": time_to
-        }
-        return self._make_request("GET", "/price/history/range", params=params)
+        try:
+            yield from iter_array_items(chunks(), keys=keys, meta=meta)
+        except ValueError as e:
+            raise APIError(f"Invalid JSON in API response: {str(e)}", status_code=response.status_code)
+        except requests.exceptions.RequestException as e:
+            raise APIError(f"Response stream interrupted: {str(e)}")
+        finally:
+            response.close()
+            if self.metrics_registry is not None:
+                self.metrics_registry.record_body("GET", template or endpoint, received, None, wire_size(response),
+                                                  response.headers.get("Content-Encoding", "identity"))
     
-    def post_token_price(self, price_data: Dict[str, Any]) -> Dict[str, Any]:
+    def metrics(self, format: str = "dict") -> Union[Dict[str, Any], str]:
         """
-        Post token price data
+        Snapshot of request metrics
         
-        Args:
-            price_data: Price data to post
-            
-        Returns:
-            Response from price posting
-        """
-        return self._make_request("POST", "/price", data=price_data)
-    
-    def get_multiple_token_prices(self, tokens: List[str] = None) -> Dict[str, Any]:
-        """
-        Get prices for multiple tokens (GET method)
+        Per endpoint template: attempts, status codes, errors, retries, bytes
+        received (decompressed and on the wire, with the compression ratio and
+        content encodings), decode time and latency / scheduler-wait histograms
+        (p50/p90/p99/p99.9). Scheduler, circuit breaker, hedging and connection
+        pool state are included alongside.
         
         Args:
-            tokens: List of token addresses (optional)
-            
-        Returns:
-            Prices for multiple tokens
-        """
-        params = {}
-        if tokens:
-            params["tokens"] = ",".join(tokens)
-        return self._make_request("GET", "/price/multi", params=params)
-    
-    def post_multiple_token_prices(self, tokens: List[str]) -> Dict[str, Any]:
-        """
-        Get prices for multiple tokens (POST method)
+            format: "dict", "json" or "prometheus"
         
-        Args:
-            tokens: List of token addresses
-            
         Returns:
-            Prices for multiple tokens
-        """
-        if not tokens or not isinstance(tokens, list):
-            raise ValidationError("Tokens must be a non-empty list")
-        data = {"tokens": tokens}
-        return self._make_request("POST", "/price/multi", data=data)
-    
-    # ========================================
-    # WALLET ENDPOINTS (8 endpoints)
-    # ========================================
-    
-    def get_wallet_tokens(self, owner: str) -> Dict[str, Any]:
-        """
-        Get wallet token holdings
+            Metrics dictionary, or the JSON / Prometheus text export
         
-        Args:
-            owner: Wallet address
-            
-        Returns:
-            List of tokens held by the wallet
-        """
-        owner = self._validate_wallet_address(owner)
-        return self._make_request("GET", f"/wallet/{owner}")
-    
-    def get_wallet_basic(self, owner: str) -> Dict[str, Any]:
+        Raises:
+            ValidationError: When the format is unknown
         """
-        Get basic wallet information
+        if format not in ("dict", "json", "prometheus"):
+            raise ValidationError("Metrics format must be 'dict', 'json' or 'prometheus'")
+        registry = self.metrics_registry or MetricsRegistry()
+        if format == "prometheus":
+            return registry.to_prometheus() + pools_to_prometheus(self.connection_pools())
         
-        Args:
-            owner: Wallet address
-            
-        Returns:
-            Basic wallet information
-        """
-        owner = self._validate_wallet_address(owner)
-        return self._make_request("GET", f"/wallet/{owner}/basic")
+        with self._resilience_lock:
+            breakers = dict(self._breakers)
+        extra = {
+            "scheduler": self.scheduler.stats(),
+            "circuits": {family: breaker.stats() for family, breaker in sorted(breakers.items())},
+            "hedging": self._hedge_budget.stats(),
+            "connection_pools": self.connection_pools(),
+            "cache": self.cache.stats() if self.cache is not None else None
+        }
+        if format == "json":
+            return registry.to_json(extra)
+        return {"endpoints": registry.snapshot(), **extra}
     
-    def get_wallet_page(self, owner: str, page: int) -> Dict[str, Any]:
+    def lane(self, lane: str, tenant: str = None):
         """
-        Get wallet tokens with pagination
+        Context manager routing requests made inside the block through a scheduler lane
         
         Args:
-            owner: Wallet address
-            page: Page number
+            lane: Lane name ("interactive" or "batch" by default)
+            tenant: Optional tenant name for fair sharing inside the lane
             
-        Returns:
-            Paginated wallet token holdings
+        Example:
+            with detective.lane("batch", tenant="holder-crawler"):
+                detective.get_token_holders(token, page=page)
         """
-        owner = self._validate_wallet_address(owner)
-        return self._make_request("GET", f"/wallet/{owner}/page/{page}")
+        return request_lane(lane, tenant)
     
-    def get_wallet_trades(self, owner: str, page: int = 1, limit: int = 100) -> Dict[str, Any]:
-        """
-        Get wallet trading history
-        
-        Args:
-            owner: Wallet address
-            page: Page number for pagination
-            limit: Number of trades per page
-            
-        Returns:
-            Wallet trading history
-        """
-        owner = self._validate_wallet_address(owner)
-        params = {"page": page, "limit": limit}
-        return self._make_request("GET", f"/wallet/{owner}/trades", params=params)
+    def _validate_token_address(self, token: str) -> str:
+        """Validate token address format"""
+        return validate_token_address(token)
     
-    def get_wallet_chart(self, owner: str) -> Dict[str, Any]:
-        """
-        Get wallet performance chart data
-        
-        Args:
-            owner: Wallet address
-            
-        Returns:
-            Wallet performance chart data
-        """
-        owner = self._validate_wallet_address(owner)
-        return self._make_request("GET", f"/wallet/{owner}/chart")
+    def _validate_wallet_address(self, wallet: str) -> str:
+        """Validate wallet address format"""
+        return validate_wallet_address(wallet)
     
     # ========================================
-    # TRADE ENDPOINTS (3 endpoints)
+    # ENDPOINTS (generated from endpoints.ENDPOINTS)
     # ========================================
     
-    def get_pool_trades(self, token_address: str, pool_address: str, page: int = 1, limit: int = 100) -> Dict[str, Any]:
-        """
-        Get trades for a specific token/pool combination
-        
-        Args:
-            token_address: Token address
-            pool_address: Pool address
-            page: Page number for pagination
-            limit: Number of trades per page
-            
-        Returns:
-            List of trades for the token/pool
-        """
-        token_address = self._validate_token_address(token_address)
-        params = {"page": page, "limit": limit}
-        return self._make_request("GET", f"/trades/{token_address}/{pool_address}", params=params)
+    def _call_endpoint(self, endpoint: Endpoint, values: Tuple[Any, ...]) -> Any:
+        """Run a registered endpoint; every generated endpoint method calls this"""
+        path, template, params, data = endpoint.prepare(values)
+        decoder = self._events_decoder if endpoint.decoder is decode_events else endpoint.decoder
+        return self._make_request(endpoint.method, path, params=params or None, data=data,
+                                  model=endpoint.model, template=template, cache_ttl=endpoint.cache_ttl,
+                                  decoder=decoder)
     
-    def get_wallet_token_trades(self, token_address: str, pool_address: str, owner: str) -> Dict[str, Any]:
+    def batch(self, name: str, items: List[Any], lane: str = "batch", tenant: str = None,
+              max_workers: int = None, return_exceptions: bool = False, **kwargs) -> List[Any]:
         """
-        Get trades for a specific wallet on a token/pool
+        Call a batchable endpoint for many items
         
-        Args:
-            token_address: Token address
-            pool_address: Pool address
-            owner: Wallet address
-            
-        Returns:
-            Trades by the wallet on the token/pool
-        """
-        token_address = self._validate_token_address(token_address)
-        owner = self._validate_wallet_address(owner)
-        return self._make_request("GET", f"/trades/{token_address}/{pool_address}/{owner}")
-    
-    def get_token_wallet_trades(self, token_address: str, owner: str) -> Dict[str, Any]:
-        """
-        Get all trades by a wallet for a specific token
+        Endpoints with a multi counterpart (get_token_price uses POST
+        /price/multi) are served with as few multi requests as its batch size
+        allows. Others fan out one call per item over a worker pool. All
+        requests go through the given scheduler lane, so a batch does not
+        starve interactive calls.
         
         Args:
-            token_address: Token address
-            owner: Wallet address
+            name: Endpoint method name (e.g. "get_token_info")
+            items: Values for the endpoint's batch argument (e.g. token addresses)
+            lane: Scheduler lane for the requests (default: "batch")
+            tenant: Optional tenant name for fair sharing inside the lane
+            max_workers: Concurrent calls (default: batch_max_workers)
+            return_exceptions: Put exceptions in place of failed results instead
+                of raising the first one
+            **kwargs: Other arguments of the endpoint method, the same for every item
             
         Returns:
-            All trades by the wallet for the token
-        """
-        token_address = self._validate_token_address(token_address)
-        owner = self._validate_wallet_address(owner)
-        return self._make_request("GET", f"/trades/{token_address}/by-wallet/{owner}")
-    
-    # ========================================
-    # CHART DATA ENDPOINTS (2 endpoints)
-    # ========================================
-    
-    def get_chart_data(self, 
-                      token: str, 
-                      pool: str = None,
-                      interval: str = "1h",
-                      time_from: int = None,
-                      time_to: int = None,
-                      market_cap: bool = False,
-                      remove_outliers: bool = True) -> Dict[str, Any]:
-        """
-        Get OHLCV chart data for a token or token/pool
-        
-        Args:
-            token: Token address
-            pool: Pool address (optional)
-            interval: Time interval (1s, 5s, 15s, 1m, 3m, 5m, 15m, 30m, 1h, 2h, 4h, 6h, 8h, 12h, 1d, 3d, 1w, 1mn)
-            time_from: Start time (Unix timestamp)
-            time_to: End time (Unix timestamp)
-            market_cap: Return market cap data instead of pricing
-            remove_outliers: Remove outliers from data
+            Results in the order of `items`
             
-        Returns:
-            OHLCV chart data
-        """
-        token = self._validate_token_address(token)
+        Raises:
+            EndpointNotFoundError: When no endpoint has that name
+            ValidationError: When the endpoint is not batchable, or (without
+                return_exceptions) an item is not a valid address
+            
+        Example:
+            prices = detective.batch("get_token_price", token_addresses)
+        """
+        endpoint = get_endpoint(name)
+        if endpoint.batch is None:
+            raise ValidationError(f"{name} does not support batching")
+        items = list(items)
+        if not items:
+            return []
         
-        params = {
-            "type": interval,
-            "marketCap": str(market_cap).lower(),
-            "removeOutliers": str(remove_outliers).lower()
-        }
+        # Reject bad addresses locally before the first request is sent
+        # (with return_exceptions each bad item fails on its own, also locally)
+        check = endpoint.param(endpoint.batch).check
+        if check in (TOKEN, WALLET) and not return_exceptions:
+            validate_many(items, check)
         
-        if time_from:
-            params["time_from"] = time_from
-        if time_to:
-            params["time_to"] = time_to
+        def defaults_only() -> bool:
+            for key, value in kwargs.items():
+                param = endpoint.param(key)
+                if param is None or param.default != value:
+                    return False
+            return True
         
-        if pool:
-            return self._make_request("GET", f"/chart/{token}/{pool}", params=params)
-        else:
-            return self._make_request("GET", f"/chart/{token}", params=params)
-    
-    def get_holders_chart(self, token: str) -> Dict[str, Any]:
-        """
-        Get holders chart data for a token
+        if endpoint.batch_via and defaults_only():
+            return self._batch_via(endpoint, items, lane, tenant, return_exceptions)
         
-        Args:
-            token: Token address
-            
-        Returns:
-            Holders chart data over time
-        """
-        token = self._validate_token_address(token)
-        return self._make_request("GET", f"/holders/chart/{token}")
-    
-    def get_token_holders_chart(self, token: str) -> Dict[str, Any]:
-        """
-        Get token holders chart data (alternative endpoint)
+        method = getattr(self, name)
         
-        Args:
-            token: Token address
-            
-        Returns:
-            Token holders chart data over time
-        """
-        token = self._validate_token_address(token)
-        return self._make_request("GET", f"/chart/holders/{token}")
-    
-    # ========================================
-    # PNL DATA ENDPOINTS (3 endpoints)
-    # ========================================
-    
-    def get_wallet_pnl(self, wallet: str) -> Dict[str, Any]:
-        """
-        Get profit/loss data for a wallet
+        def call(item):
+            with request_lane(lane, tenant):
+                return method(**{endpoint.batch: item}, **kwargs)
         
-        Args:
-            wallet: Wallet address
-            
-        Returns:
-            Wallet PnL data across all tokens
-        """
-        wallet = self._validate_wallet_address(wallet)
-        return self._make_request("GET", f"/pnl/{wallet}")
+        return self._fan_out(call, items, max_workers, return_exceptions)
     
-    def get_first_buyers(self, token: str, limit: int = 100) -> Dict[str, Any]:
-        """
-        Get first buyers of a token
+    def _batch_via(self, endpoint: Endpoint, items: List[Any], lane: str, tenant: Optional[str],
+                   return_exceptions: bool) -> List[Any]:
+        """Batch through the endpoint's multi counterpart, splitting its response by item"""
+        via = get_endpoint(endpoint.batch_via)
+        check = endpoint.param(endpoint.batch)
+        failed: Dict[Any, BaseException] = {}
+        unique = []
+        for item in dict.fromkeys(items):
+            try:
+                unique.append(check.validate(item))
+            except ValidationError as e:
+                if not return_exceptions:
+                    raise
+                failed[item] = e
         
-        Args:
-            token: Token address
-            limit: Number of first buyers to return
-            
-        Returns:
-            List of first buyers with their purchase data
-        """
-        token = self._validate_token_address(token)
-        params = {"limit": limit}
-        return self._make_request("GET", f"/first-buyers/{token}", params=params)
-    
-    def get_wallet_token_pnl(self, wallet: str, token: str) -> Dict[str, Any]:
-        """
-        Get profit/loss data for a wallet on a specific token
+        size = via.batch_size or len(unique)
+        chunks = [unique[i:i + size] for i in range(0, len(unique), size)]
+        method = getattr(self, via.name)
         
-        Args:
-            wallet: Wallet address
-            token: Token address
-            
-        Returns:
-            Wallet PnL data for the specific token
-        """
-        wallet = self._validate_wallet_address(wallet)
-        token = self._validate_token_address(token)
-        return self._make_request("GET", f"/pnl/{wallet}/{token}")
+        def call(chunk):
+            with request_lane(lane, tenant):
+                return method(chunk)
+        
+        merged: Dict[Any, Any] = {}
+        for chunk, response in zip(chunks, self._fan_out(call, chunks, None, return_exceptions)):
+            if isinstance(response, BaseException):
+                failed.update(dict.fromkeys(chunk, response))
+            else:
+                merged.update(response)
+        return [failed[item] if item in failed else merged.get(item) for item in items]
     
-    # ========================================
-    # TOP TRADERS ENDPOINTS (3 endpoints)
-    # ========================================
+    def _fan_out(self, function, items: List[Any], max_workers: Optional[int],
+                 return_exceptions: bool) -> List[Any]:
+        """Run function(item) for every item on a worker pool, results in item order"""
+        workers = min(len(items), max_workers or self.config.get("batch_max_workers"))
+        if workers <= 1:
+            results = []
+            for item in items:
+                try:
+                    results.append(function(item))
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results.append(e)
+            return results
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="solana-detective-batch") as executor:
+            futures = [executor.submit(contextvars.copy_context().run, function, item) for item in items]
+        results = []
+        for future in futures:
+            error = future.exception()
+            if error is None:
+                results.append(future.result())
+            elif return_exceptions:
+                results.append(error)
+            else:
+                raise error
+        return results
     
-    def get_top_traders_all(self, page: int = None) -> Dict[str, Any]:
+    def paginate(self, name: str, *args, start_page: int = 1, max_pages: int = None,
+                 max_workers: int = None, **kwargs) -> Iterator[Any]:
         """
-        Get top traders across all tokens
+        Iterate over the pages of a paged endpoint
+        
+        Pages are requested one after the other from `start_page` on, until a
+        page is empty, holds fewer items than `limit`, says it has no next
+        page, or `max_pages` pages were returned.
+        
+        With `max_workers`, endpoints whose pages report a total item count
+        (get_token_holders) have the remaining pages requested concurrently
+        once the first one arrived; they are still returned in order.
         
         Args:
-            page: Page number for pagination (optional)
+            name: Endpoint method name (e.g. "get_token_holders")
+            *args: Other arguments of the endpoint method
+            start_page: First page to request (default: 1)
+            max_pages: Most pages to return (default: no limit)
+            max_workers: Concurrent page requests when the total is known
+                (default: one page at a time)
+            **kwargs: Other arguments of the endpoint method
             
         Returns:
-            List of top traders across all tokens
-        """
-        if page:
-            return self._make_request("GET", f"/top-traders/all/{page}")
-        else:
-            return self._make_request("GET", "/top-traders/all")
+            Iterator over the responses, one per page
+            
+        Raises:
+            EndpointNotFoundError: When no endpoint has that name
+            ValidationError: When the endpoint is not paged
+            
+        Example:
+            for page in detective.paginate("get_token_holders", token, limit=500):
+                process(page["accounts"])
+        """
+        endpoint = get_endpoint(name)
+        if endpoint.pagination != PAGE:
+            raise ValidationError(f"{name} is not paginated")
+        return self._pages(endpoint, args, kwargs, start_page, max_pages, max_workers)
     
-    def get_top_traders_token(self, token: str) -> Dict[str, Any]:
-        """
-        Get top traders for a specific token
+    def _pages(self, endpoint: Endpoint, args: Tuple[Any, ...], kwargs: Dict[str, Any],
+               page: int, max_pages: Optional[int], max_workers: int = None) -> Iterator[Any]:
+        method = getattr(self, endpoint.name)
+        limit_param = endpoint.param("limit")
+        limit = None
+        if limit_param is not None:
+            limit = kwargs.get("limit", limit_param.default)
+            if limit_param.transform is not None:
+                limit = limit_param.transform(limit)
         
-        Args:
-            token: Token address
-            
-        Returns:
-            List of top traders for the token
-        """
-        token = self._validate_token_address(token)
-        return self._make_request("GET", f"/top-traders/{token}")
+        returned = 0
+        while max_pages is None or returned < max_pages:
+            response = method(*args, page=page, **kwargs)
+            items = endpoint.page_items(response)
+            if not items:
+                return
+            yield response
+            returned += 1
+            if (limit and len(items) < limit) or not endpoint.has_next_page(response):
+                return
+            page += 1
+            total = endpoint.page_total(response) if max_workers and limit else None
+            if total is not None:
+                # Every remaining page is known: request them all at once
+                last = -(-total // limit)
+                if max_pages is not None:
+                    last = min(last, page + max_pages - returned - 1)
+                pages = list(range(page, last + 1))
+                responses = self._fan_out(lambda number: method(*args, page=number, **kwargs),
+                                          pages, max_workers, False) if pages else []
+                for response in responses:
+                    if not endpoint.page_items(response):
+                        return
+                    yield response
+                return
     
     # ========================================
-    # STATS AND EVENTS ENDPOINTS (4 endpoints)
+    # STREAMING
     # ========================================
     
-    def get_token_stats(self, token: str, pool: str = None) -> Dict[str, Any]:
+    def iter_token_holders(self, token: str, page: int = 1, limit: int = 250,
+                           meta: Dict[str, Any] = None) -> Iterator[Dict[str, Any]]:
         """
-        Get statistics for a token or token/pool
+        Stream token holders one record at a time
+        
+        Same request as get_token_holders, but the body is parsed incrementally
+        so memory stays flat regardless of page size.
         
         Args:
             token: Token address
-            pool: Pool address (optional)
+            page: Page number (default: 1)
+            limit: Items per page (default: 250, max: 500)
+            meta: Optional dict filled with the other response fields (e.g. "total")
             
-        Returns:
-            Token or token/pool statistics
+        Yields:
+            Holder records with wallet, amount, value and percentage
         """
         token = self._validate_token_address(token)
-        
-        if pool:
-            return self._make_request("GET", f"/stats/{token}/{pool}")
-        else:
-            return self._make_request("GET", f"/stats/{token}")
-    
-    def get_live_events(self) -> Dict[str, Any]:
-        """
-        Get live events across all tokens
-        
-        Returns:
-            Live events data
-        """
-        return self._make_request("GET", "/live-events")
-    
-    def get_token_events(self, token_address: str) -> Dict[str, Any]:
-        """
-        Get events for a specific token
-        
-        Args:
-            token_address: Token address
-            
-        Returns:
-            Token events data
-        """
-        token_address = self._validate_token_address(token_address)
-        return self._make_request("GET", f"/events/{token_address}")
+        params = {"page": page, "limit": min(limit, 500)}
+        for _, holder in self._stream_items(f"/tokens/{token}/holders", params=params,
+                                            keys={"accounts"}, meta=meta,
+                                            template="/tokens/{token}/holders"):
+            yield holder
     
-    def get_pool_events(self, token_address: str, pool_address: str) -> Dict[str, Any]:
+    def iter_tokens_multi_all(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
         """
-        Get events for a specific token/pool combination
+        Stream all tokens (multi endpoint) one record at a time
         
-        Args:
-            token_address: Token address
-            pool_address: Pool address
-            
-        Returns:
-            Pool events data
+        Yields:
+            (category, token record) tuples, e.g. ("latest", {...}), ("graduated", {...})
         """
-        token_address = self._validate_token_address(token_address)
-        return self._make_request("GET", f"/events/{token_address}/{pool_address}")
+        return self._stream_items("/tokens/multi/all")
     
-    # ========================================
-    # CREDITS ENDPOINT (1 endpoint)
-    # ========================================
-    
-    def get_credits(self) -> Dict[str, Any]:
+    def iter_tokens_multi_graduated(self) -> Iterator[Dict[str, Any]]:
         """
-        Get API credits information
+        Stream graduated tokens one record at a time
         
-        Returns:
-            Current API credits and usage information
+        Yields:
+            Graduated token records
         """
-        return self._make_request("GET", "/credits")
+        for _, token in self._stream_items("/tokens/multi/graduated"):
+            yield token
     
     # ========================================
     # UTILITY METHODS
@@ -829,15 +1027,9 @@ class SolanaDetective:
         Get list of all available endpoint methods
         
         Returns:
-            List of all available endpoint method names
+            List of all available endpoint method names (see endpoints.ENDPOINTS)
         """
-        endpoints = []
-        for attr_name in dir(self):
-            if (not attr_name.startswith('_') and 
-                callable(getattr(self, attr_name)) and
-                attr_name not in ['get_available_endpoints']):
-                endpoints.append(attr_name)
-        return sorted(endpoints)
+        return sorted(ENDPOINTS)
     
     def health_check(self) -> Dict[str, Any]:
         """
@@ -862,3 +1054,6 @@ class SolanaDetective:
                 "timestamp": time.time()
             }
 
+
+# Endpoint methods (get_token_info, get_wallet_trades, ...) come from the registry
+attach_endpoints(SolanaDetective, "_call_endpoint")
@@ -0,0 +1,140 @@
+"""
+Adaptive concurrency control for Solana Detective package
+AIMD limiter driven by observed latency and overload responses
+"""
+
+import time
+import random
+import threading
+from collections import deque
+from typing import Dict, Any
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Exponential backoff with full jitter
+
+    Spreading retries uniformly over [0, min(cap, base * 2^attempt)] keeps
+    clients that failed together from retrying together.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay of the first attempt in seconds
+        cap: Upper bound of the backoff window in seconds
+
+    Returns:
+        Seconds to sleep before retrying
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Additive-increase / multiplicative-decrease concurrency limiter
+
+    The limit grows by roughly one request per round trip while latency stays
+    close to the best latency seen recently, and is cut multiplicatively when
+    latency climbs past the tolerance or the API signals overload (429, 5xx,
+    timeouts). The limit therefore settles near what the server can actually
+    serve instead of a hand-tuned constant.
+    """
+
+    def __init__(self,
+                 initial_limit: float = 8,
+                 min_limit: float = 1,
+                 max_limit: float = 100,
+                 backoff_ratio: float = 0.5,
+                 latency_tolerance: float = 2.0,
+                 window: int = 100):
+        """
+        Initialize concurrency limiter
+
+        Args:
+            initial_limit: Concurrent requests allowed at start
+            min_limit: Lower bound of the limit
+            max_limit: Upper bound of the limit
+            backoff_ratio: Multiplier applied on 429/5xx/timeouts
+            latency_tolerance: Latency / baseline ratio treated as queueing
+            window: Number of recent samples used for the baseline latency
+        """
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+
+        self._lock = threading.Lock()
+        self._limit = min(self.max_limit, max(self.min_limit, float(initial_limit)))
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._samples = deque(maxlen=window)
+        self._smoothed = None
+        self._last_decrease = 0.0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of concurrent requests allowed"""
+        return max(1, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently holding a slot"""
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free"""
+        with self._lock:
+            if self._in_flight >= self.limit:
+                return False
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            return True
+
+    def release(self, latency: float, overloaded: bool = False) -> None:
+        """
+        Return a slot and feed the observation into the limit
+
+        Args:
+            latency: Request latency in seconds
+            overloaded: True for 429/5xx responses, timeouts and connection errors
+        """
+        with self._lock:
+            saturated = self._peak_in_flight >= self.limit
+            self._in_flight = max(0, self._in_flight - 1)
+            if self._in_flight == 0:
+                self._peak_in_flight = 0
+
+            if overloaded:
+                self._decrease(self.backoff_ratio)
+                return
+
+            self._samples.append(latency)
+            self._smoothed = latency if self._smoothed is None else 0.8 * self._smoothed + 0.2 * latency
+            baseline = min(self._samples)
+
+            if self._smoothed > baseline * self.latency_tolerance:
+                self._decrease(0.9)
+            elif saturated:
+                # Only grow while the limit is actually the bottleneck
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+
+    def _decrease(self, ratio: float) -> None:
+        # At most one cut per round trip, so a burst of failures from requests
+        # that were already in flight does not collapse the limit
+        now = time.monotonic()
+        if now - self._last_decrease < (self._smoothed or 0):
+            return
+        self._last_decrease = now
+        self._decreases += 1
+        self._limit = max(self.min_limit, self._limit * ratio)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limit and latency state"""
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "baseline_latency": min(self._samples) if self._samples else None,
+                "smoothed_latency": self._smoothed,
+                "decreases": self._decreases
+            }
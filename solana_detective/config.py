@@ -15,7 +15,52 @@ class Config:
         "timeout": 30,
         "max_retries": 3,
         "retry_delay": 1,
+        "retry_max_delay": 30,
         "rate_limit_delay": 0.1,
+        "rate_limit_burst": 1,
+        "default_lane": "interactive",
+        "tenant": None,
+        "scheduler_lane_weights": {"interactive": 16, "batch": 1},
+        "scheduler_tenant_weights": {},
+        "adaptive_concurrency": True,
+        "concurrency_limit_initial": 8,
+        "concurrency_limit_min": 1,
+        "concurrency_limit_max": 100,
+        "concurrency_backoff_ratio": 0.5,
+        "concurrency_latency_tolerance": 2.0,
+        "circuit_breaker": True,
+        "circuit_failure_threshold": 5,
+        "circuit_recovery_timeout": 30,
+        "circuit_half_open_max_calls": 1,
+        "hedge_requests": False,
+        "hedge_percentile": 95,
+        "hedge_min_samples": 20,
+        "hedge_budget": 0.1,
+        "hedge_max_workers": 32,
+        "json_backend": "auto",
+        "typed_responses": False,
+        "events_layout": "json",
+        "stream_chunk_size": 65536,
+        "batch_max_workers": 8,
+        "async_max_workers": 32,
+        "metrics_enabled": True,
+        "tracing": False,
+        "cassette": None,
+        "cassette_mode": "auto",
+        "share_session": True,
+        "pool_connections": 10,
+        "pool_maxsize": 32,
+        "pool_block": False,
+        "pool_warmup": 0,
+        "tcp_keepalive": True,
+        "tcp_keepalive_idle": 60,
+        "tcp_keepalive_interval": 10,
+        "tcp_keepalive_count": 5,
+        "http2": False,
+        "http2_prior_knowledge": False,
+        "accept_encoding": "auto",
+        "response_cache": False,
+        "cache_max_entries": 1024,
         "user_agent": "SolanaDetective/1.0.0",
         "verify_ssl": True
     }
@@ -48,8 +93,8 @@ class Config:
         # Override with provided kwargs
         self.config.update(kwargs)
         
-        # Validate required configuration
-        if not self.config.get("api_key"):
+        # Validate required configuration (replaying a cassette needs no key)
+        if not self.config.get("api_key") and self.config.get("cassette_mode") != "replay":
             raise ValueError("API key is required. Provide via api_key parameter or SOLANA_TRACKER_API_KEY environment variable.")
     
     def get(self, key: str, default: Any = None) -> Any:
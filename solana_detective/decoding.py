@@ -0,0 +1,108 @@
+"""
+JSON decoding backends for Solana Detective package
+Uses orjson or msgspec when installed and falls back to the standard library
+"""
+
+import json
+import importlib
+from typing import Any, Dict, Optional
+
+BACKENDS = ("auto", "orjson", "msgspec", "json")
+
+_modules: Dict[str, Any] = {}
+
+
+def _optional_import(name: str) -> Any:
+    """Import an optional backend on first use (None when it is not installed)"""
+    if name not in _modules:
+        try:
+            _modules[name] = importlib.import_module(name)
+        except ImportError:
+            _modules[name] = None
+    return _modules[name]
+
+
+class JSONDecoder:
+    """
+    Decode response bodies with the fastest available backend
+
+    Typed decoding (straight into msgspec Structs from solana_detective.models)
+    needs msgspec; when a body does not match its Struct, the decoder falls
+    back to plain dicts rather than failing the request.
+    """
+
+    def __init__(self, backend: str = "auto"):
+        """
+        Initialize decoder
+
+        Args:
+            backend: "auto", "orjson", "msgspec" or "json"
+
+        Raises:
+            ValueError: When the backend is unknown or not installed
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown JSON backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+        if backend == "auto":
+            backend = ("orjson" if _optional_import("orjson")
+                       else "msgspec" if _optional_import("msgspec") else "json")
+        if backend != "json" and _optional_import(backend) is None:
+            raise ValueError(f"JSON backend '{backend}' requires the {backend} package (pip install {backend})")
+
+        self.backend = backend
+        if backend == "orjson":
+            self._loads = _optional_import("orjson").loads
+        elif backend == "msgspec":
+            self._loads = _optional_import("msgspec").json.Decoder().decode
+        else:
+            self._loads = json.loads
+        self._typed: Dict[Any, Any] = {}
+
+    @property
+    def supports_typed(self) -> bool:
+        """Whether typed decoding into Structs is available"""
+        return _optional_import("msgspec") is not None
+
+    def decode(self, content: bytes, type: Any = None) -> Any:
+        """
+        Decode a JSON body
+
+        Args:
+            content: Raw response body
+            type: msgspec Struct (or container of Structs) to decode into (optional)
+
+        Returns:
+            Decoded value (dicts and lists, or Structs when `type` is given)
+
+        Raises:
+            ValueError: When the body is not valid JSON
+        """
+        msgspec = _optional_import("msgspec") if type is not None else None
+        if msgspec is not None:
+            decoder = self._typed.get(type)
+            if decoder is None:
+                decoder = self._typed[type] = msgspec.json.Decoder(type)
+            try:
+                return decoder.decode(content)
+            except msgspec.ValidationError:
+                pass
+        try:
+            return self._loads(content)
+        except ValueError:
+            raise
+        except Exception as e:
+            # msgspec.DecodeError is not a ValueError
+            raise ValueError(str(e)) from e
+
+
+_default_decoder: Optional[JSONDecoder] = None
+
+
+def get_decoder(backend: str = "auto") -> JSONDecoder:
+    """Return a decoder for the backend, sharing one instance for "auto" """
+    global _default_decoder
+    if backend != "auto":
+        return JSONDecoder(backend)
+    if _default_decoder is None:
+        _default_decoder = JSONDecoder("auto")
+    return _default_decoder
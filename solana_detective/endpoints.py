@@ -0,0 +1,656 @@
+"""
+Endpoint registry for Solana Detective package
+Declarative table of the Solana Tracker API endpoints the clients are generated from
+
+Each Endpoint records its HTTP method, path template(s), parameters and how
+they are validated and sent, plus pagination style, batchability, cache TTL
+and credit cost. SolanaDetective and AsyncSolanaDetective get one method per
+entry (see attach_endpoints); batching, pagination and introspection read
+the same table.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .exceptions import ValidationError, EndpointNotFoundError
+from .addresses import is_address, invalid_addresses
+from .events import EventColumns, decode_events
+
+# Where a parameter goes
+PATH = "path"      # substituted into the path template
+QUERY = "query"    # query string (None values are left out)
+BODY = "body"      # key of the JSON body
+RAW_BODY = "raw"   # the whole JSON body
+
+# Input checks
+TOKEN = "token"        # token address
+WALLET = "wallet"      # wallet address
+REQUIRED = "required"  # any non-empty value
+LIST = "list"          # non-empty list
+
+# Pagination styles
+PAGE = "page"  # `page` argument, 1-based
+
+MAX_PAGE_LIMIT = 500
+
+
+class _NoDefault:
+    """Default of a required parameter"""
+
+    def __repr__(self) -> str:
+        return "<required>"
+
+
+_NO_DEFAULT = _NoDefault()
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+def validate_token_address(token: str) -> str:
+    """Validate token address format (base58, decoding to a 32-byte public key)"""
+    if not token or not isinstance(token, str):
+        raise ValidationError("Token address must be a non-empty string")
+    if not is_address(token):
+        raise ValidationError("Invalid token address format")
+    return token
+
+
+def validate_wallet_address(wallet: str) -> str:
+    """Validate wallet address format (base58, decoding to a 32-byte public key)"""
+    if not wallet or not isinstance(wallet, str):
+        raise ValidationError("Wallet address must be a non-empty string")
+    if not is_address(wallet):
+        raise ValidationError("Invalid wallet address format")
+    return wallet
+
+
+def validate_many(addresses: Iterable[str], kind: str = TOKEN) -> List[str]:
+    """
+    Validate many token or wallet addresses before any request is sent
+
+    Args:
+        addresses: Addresses to check
+        kind: TOKEN or WALLET (only changes the error message)
+
+    Returns:
+        The addresses, as a list
+
+    Raises:
+        ValidationError: Naming the invalid addresses (the first few) and how many there are
+    """
+    addresses = list(addresses)
+    invalid = invalid_addresses(addresses)
+    if invalid:
+        examples = ", ".join(repr(addresses[i]) for i in invalid[:5])
+        more = f" and {len(invalid) - 5} more" if len(invalid) > 5 else ""
+        raise ValidationError(f"Invalid {kind} address format at {len(invalid)} of {len(addresses)} "
+                              f"positions: {examples}{more}")
+    return addresses
+
+
+# Query value transforms
+def clamp_limit(limit: int) -> int:
+    return min(limit, MAX_PAGE_LIMIT)
+
+
+def true_or_omit(flag: bool) -> Optional[str]:
+    return "true" if flag else None
+
+
+def lower_bool(flag: bool) -> str:
+    return str(flag).lower()
+
+
+def if_set(value: Any) -> Any:
+    return value or None
+
+
+def comma_join(values: Optional[List[str]]) -> Optional[str]:
+    return ",".join(values) if values else None
+
+
+class Param:
+    """One argument of an endpoint method"""
+
+    __slots__ = ("name", "description", "kind", "annotation", "default", "check", "label",
+                 "api_name", "transform")
+
+    def __init__(self, name: str, description: str, kind: str = PATH, annotation: Any = str,
+                 default: Any = _NO_DEFAULT, check: str = None, label: str = None,
+                 api_name: str = None, transform: Callable[[Any], Any] = None):
+        """
+        Initialize parameter
+
+        Args:
+            name: Python argument name (also the path placeholder name)
+            description: Docstring description
+            kind: PATH, QUERY, BODY or RAW_BODY
+            annotation: Type annotation of the argument
+            default: Default value (required when left out)
+            check: TOKEN, WALLET, REQUIRED or LIST input check
+            label: Subject of REQUIRED / LIST error messages (e.g. "Pool address")
+            api_name: Name sent to the API (defaults to `name`)
+            transform: Function applied to the value before it is sent
+        """
+        self.name = name
+        self.description = description
+        self.kind = kind
+        self.annotation = annotation
+        self.default = default
+        self.check = check
+        self.label = label
+        self.api_name = api_name or name
+        self.transform = transform
+
+    @property
+    def required(self) -> bool:
+        return self.default is _NO_DEFAULT
+
+    def validate(self, value: Any) -> Any:
+        """Run the input check; returns the value"""
+        if self.check == TOKEN:
+            return validate_token_address(value)
+        if self.check == WALLET:
+            return validate_wallet_address(value)
+        if self.check == REQUIRED and not value:
+            raise ValidationError(f"{self.label} is required")
+        if self.check == LIST and (not value or not isinstance(value, list)):
+            raise ValidationError(f"{self.label} must be a non-empty list")
+        return value
+
+    def __repr__(self) -> str:
+        return f"Param({self.name!r}, {self.kind})"
+
+
+class Endpoint:
+    """
+    One API operation and the client method generated for it
+
+    Attributes:
+        name: Client method name
+        method: HTTP method
+        paths: Path templates, most specific first; a call uses the first one
+            whose placeholders all have values (e.g. "/stats/{token}/{pool}"
+            when a pool is given, "/stats/{token}" otherwise)
+        params: Method arguments in order
+        summary: First docstring line
+        returns: Docstring description of the result
+        annotation: Return type annotation of the generated method
+        category: Endpoint group ("tokens", "price", "wallet", ...)
+        model: Typed response model name (see models.RESPONSE_TYPES)
+        decoder: Decodes the raw body instead of the JSON decoder (binary payloads)
+        pagination: PAGE when the endpoint is paged by a `page` argument
+        items_key: Key of the list in a page (None when the page is the list)
+        batch: Argument that batch() fans out over (None when not batchable)
+        batch_via: Multi endpoint batch() uses instead, keyed by item in its response
+        batch_size: Most items one call of a multi endpoint accepts
+        cache_ttl: Seconds a response may be reused with response_cache (0 = never cached)
+        credits: API credits one call costs
+    """
+
+    __slots__ = ("name", "method", "paths", "params", "summary", "returns", "annotation", "category", "model",
+                 "decoder", "pagination", "items_key", "batch", "batch_via", "batch_size", "cache_ttl",
+                 "credits", "_placeholders")
+
+    def __init__(self, name: str, method: str, paths: Tuple[str, ...], summary: str, returns: str,
+                 params: Tuple[Param, ...] = (), category: str = None, model: str = None,
+                 decoder: Callable[[bytes], Any] = None, pagination: str = None, items_key: str = None, batch: str = None,
+                 batch_via: str = None, batch_size: int = None, cache_ttl: float = 0,
+                 credits: int = 1, annotation: Any = Dict[str, Any]):
+        self.name = name
+        self.method = method
+        self.paths = paths
+        self.params = params
+        self.summary = summary
+        self.returns = returns
+        self.annotation = annotation
+        self.category = category
+        self.model = model
+        self.decoder = decoder
+        self.pagination = pagination
+        self.items_key = items_key
+        self.batch = batch
+        self.batch_via = batch_via
+        self.batch_size = batch_size
+        self.cache_ttl = cache_ttl
+        self.credits = credits
+        self._placeholders = [tuple(_PLACEHOLDER.findall(path)) for path in paths]
+
+    @property
+    def routes(self) -> List[str]:
+        """Routes as "METHOD /path", one per path template"""
+        return [f"{self.method} {path}" for path in self.paths]
+
+    def param(self, name: str) -> Optional[Param]:
+        for param in self.params:
+            if param.name == name:
+                return param
+        return None
+
+    def prepare(self, values: Tuple[Any, ...]) -> Tuple[str, str, Dict[str, Any], Any]:
+        """
+        Validate argument values and build the request
+
+        Args:
+            values: Argument values in parameter order
+
+        Returns:
+            (path, path template, query params, JSON body)
+
+        Raises:
+            ValidationError: When an argument fails its check
+        """
+        path_values: Dict[str, Any] = {}
+        params: Dict[str, Any] = {}
+        data = None
+        for param, value in zip(self.params, values):
+            if param.check is not None:
+                value = param.validate(value)
+            if param.transform is not None:
+                value = param.transform(value)
+            if param.kind == PATH:
+                # Optional path segments are only used when given
+                if value or param.required:
+                    path_values[param.name] = value
+            elif param.kind == QUERY:
+                if value is not None:
+                    params[param.api_name] = value
+            elif param.kind == BODY:
+                if data is None:
+                    data = {}
+                data[param.api_name] = value
+            else:
+                data = value
+
+        for template, placeholders in zip(self.paths, self._placeholders):
+            if all(name in path_values for name in placeholders):
+                break
+        path = template.format(**path_values) if placeholders else template
+        return path, template, params, data
+
+    def page_items(self, page: Any) -> Any:
+        """List of items in one page of a paged endpoint (dict or typed response)"""
+        if self.items_key is None:
+            return page
+        if isinstance(page, dict):
+            return page.get(self.items_key)
+        return getattr(page, self.items_key, None)
+
+    def page_total(self, page: Any) -> Optional[int]:
+        """Total item count a page reports across all pages (None when it does not)"""
+        total = page.get("total") if isinstance(page, dict) else getattr(page, "total", None)
+        return total if isinstance(total, int) and not isinstance(total, bool) else None
+
+    def has_next_page(self, page: Any) -> bool:
+        """False when a page says it is the last one (cursor-style pages)"""
+        if isinstance(page, dict):
+            return page.get("hasNextPage", True) is not False
+        return getattr(page, "hasNextPage", True) is not False
+
+    def docstring(self) -> str:
+        lines = [self.summary, ""]
+        if self.params:
+            lines.append("Args:")
+            lines.extend(f"    {param.name}: {param.description}" for param in self.params)
+            lines.append("")
+        lines.extend(["Returns:", f"    {self.returns}"])
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.name!r}, {', '.join(self.routes)})"
+
+
+def _token(name: str = "token", kind: str = PATH, description: str = "Token address") -> Param:
+    return Param(name, description, kind=kind, check=TOKEN)
+
+
+def _wallet(name: str = "owner", description: str = "Wallet address") -> Param:
+    return Param(name, description, check=WALLET)
+
+
+def _pool(name: str = "pool_address", description: str = "Pool address", **kwargs) -> Param:
+    return Param(name, description, **kwargs)
+
+
+def _paging(limit: int, description: str = "Page number (default: 1)",
+            limit_description: str = None, clamp: bool = True) -> Tuple[Param, Param]:
+    return (
+        Param("page", description, kind=QUERY, annotation=int, default=1),
+        Param("limit", limit_description or f"Items per page (default: {limit}, max: {MAX_PAGE_LIMIT})",
+              kind=QUERY, annotation=int, default=limit, transform=clamp_limit if clamp else None)
+    )
+
+
+_TIME_RANGE = (
+    Param("time_from", "Start time (unix timestamp)", kind=QUERY, annotation=int),
+    Param("time_to", "End time (unix timestamp)", kind=QUERY, annotation=int)
+)
+
+_TOKEN_LIST = Param("tokens", "List of token addresses", kind=BODY, annotation=List[str],
+                    check=LIST, label="Tokens")
+
+_CHART_INTERVALS = "1s, 5s, 15s, 1m, 3m, 5m, 15m, 30m, 1h, 2h, 4h, 6h, 8h, 12h, 1d, 3d, 1w, 1mn"
+
+# Cache TTLs are how stale each kind of data may sensibly be: prices and
+# trades move every block, historical data and first buyers never change.
+ENDPOINT_TABLE: Tuple[Endpoint, ...] = (
+    # ========================================
+    # TOKEN ENDPOINTS
+    # ========================================
+    Endpoint("get_token_info", "GET", ("/tokens/{token}",),
+             "Get comprehensive token information",
+             "Token information including pools, events, and risk data",
+             (_token(),), category="tokens", batch="token", cache_ttl=30),
+    Endpoint("get_tokens_by_pool", "GET", ("/tokens/by-pool/{pool_address}",),
+             "Get tokens by pool address",
+             "Token information for the specified pool",
+             (_pool(check=REQUIRED, label="Pool address"),), category="tokens",
+             batch="pool_address", cache_ttl=30),
+    Endpoint("get_token_holders", "GET", ("/tokens/{token}/holders",),
+             "Get token holders with pagination",
+             "List of token holders with balances and percentages",
+             (_token(),) + _paging(250), category="tokens", model="holders",
+             pagination=PAGE, items_key="accounts", batch="token", cache_ttl=60),
+    Endpoint("get_token_holders_top", "GET", ("/tokens/{token}/holders/top",),
+             "Get top 20 token holders",
+             "List of top 20 holders with balances and percentages",
+             (_token(),), category="tokens", model="holders_top", batch="token", cache_ttl=60),
+    Endpoint("get_token_ath", "GET", ("/tokens/{token}/ath",),
+             "Get token all-time high information",
+             "All-time high price data and timestamps",
+             (_token(),), category="tokens", batch="token", cache_ttl=300),
+    Endpoint("get_deployer_tokens", "GET", ("/deployer/{wallet}",),
+             "Get tokens deployed by a wallet",
+             "List of tokens deployed by the wallet",
+             (_wallet("wallet", "Deployer wallet address"),) + _paging(250), category="tokens",
+             pagination=PAGE, items_key="tokens", batch="wallet", cache_ttl=300),
+    Endpoint("search_tokens", "GET", ("/search",),
+             "Search for tokens by name or symbol",
+             "List of matching tokens",
+             (Param("query", "Search query", kind=QUERY, check=REQUIRED, label="Search query"),
+              Param("limit", "Number of results to return", kind=QUERY, annotation=int, default=10)),
+             category="tokens", cache_ttl=60),
+    Endpoint("get_latest_tokens", "GET", ("/tokens/latest",),
+             "Get latest tokens",
+             "List of latest tokens",
+             _paging(250), category="tokens", pagination=PAGE, cache_ttl=5),
+    Endpoint("get_tokens_multi", "GET", ("/tokens/multi",),
+             "Get information for multiple tokens (GET method)",
+             "Information for all requested tokens",
+             (Param("tokens", "List of token addresses", kind=QUERY, annotation=List[str],
+                    check=LIST, label="Tokens", transform=comma_join),),
+             category="tokens", batch_size=100, cache_ttl=30),
+    Endpoint("post_tokens_multi", "POST", ("/tokens/multi",),
+             "Get information for multiple tokens (POST method)",
+             "Information for all requested tokens",
+             (_TOKEN_LIST,), category="tokens", batch_size=100),
+    Endpoint("get_trending_tokens", "GET", ("/tokens/trending/{timeframe}", "/tokens/trending"),
+             "Get trending tokens",
+             "List of trending tokens",
+             (Param("timeframe", "Optional timeframe filter", default=None),),
+             category="tokens", cache_ttl=60),
+    Endpoint("get_tokens_by_volume", "GET", ("/tokens/volume/{timeframe}", "/tokens/volume"),
+             "Get tokens sorted by volume",
+             "List of tokens sorted by volume",
+             (Param("timeframe", "Optional timeframe filter", default=None),),
+             category="tokens", cache_ttl=60),
+    Endpoint("get_tokens_multi_all", "GET", ("/tokens/multi/all",),
+             "Get all tokens (multi endpoint)",
+             "Information for all tokens",
+             category="tokens", cache_ttl=10),
+    Endpoint("get_tokens_multi_graduated", "GET", ("/tokens/multi/graduated",),
+             "Get graduated tokens only",
+             "Information for graduated tokens",
+             category="tokens", cache_ttl=10),
+
+    # ========================================
+    # PRICE ENDPOINTS
+    # ========================================
+    Endpoint("get_token_price", "GET", ("/price",),
+             "Get current token price",
+             "Current price and optional price changes",
+             (_token(kind=QUERY),
+              Param("price_changes", "Include price change percentages", kind=QUERY, annotation=bool,
+                    default=False, api_name="priceChanges", transform=true_or_omit)),
+             category="price", model="price", batch="token", batch_via="post_multiple_token_prices",
+             cache_ttl=5),
+    Endpoint("get_price_history", "GET", ("/price/history",),
+             "Get historical price data",
+             "Historical price data",
+             (_token(kind=QUERY),) + _TIME_RANGE, category="price", batch="token", cache_ttl=300),
+    Endpoint("get_price_at_timestamp", "GET", ("/price/history/timestamp",),
+             "Get price at specific timestamp",
+             "Price at the specified timestamp",
+             (_token(kind=QUERY), Param("timestamp", "Unix timestamp", kind=QUERY, annotation=int)),
+             category="price", batch="token", cache_ttl=86400),
+    Endpoint("get_price_range", "GET", ("/price/history/range",),
+             "Get lowest and highest price in time range",
+             "Lowest and highest prices in the range",
+             (_token(kind=QUERY),) + _TIME_RANGE, category="price", batch="token", cache_ttl=300),
+    Endpoint("post_token_price", "POST", ("/price",),
+             "Post token price data",
+             "Response from price posting",
+             (Param("price_data", "Price data to post", kind=RAW_BODY, annotation=Dict[str, Any]),),
+             category="price"),
+    Endpoint("get_multiple_token_prices", "GET", ("/price/multi",),
+             "Get prices for multiple tokens (GET method)",
+             "Prices for multiple tokens",
+             (Param("tokens", "List of token addresses (optional)", kind=QUERY, annotation=List[str],
+                    default=None, transform=comma_join),),
+             category="price", batch_size=100, cache_ttl=5),
+    Endpoint("post_multiple_token_prices", "POST", ("/price/multi",),
+             "Get prices for multiple tokens (POST method)",
+             "Prices for multiple tokens",
+             (_TOKEN_LIST,), category="price", batch_size=100),
+
+    # ========================================
+    # WALLET ENDPOINTS
+    # ========================================
+    Endpoint("get_wallet_tokens", "GET", ("/wallet/{owner}",),
+             "Get wallet token holdings",
+             "List of tokens held by the wallet",
+             (_wallet(),), category="wallet", batch="owner", cache_ttl=30),
+    Endpoint("get_wallet_basic", "GET", ("/wallet/{owner}/basic",),
+             "Get basic wallet information",
+             "Basic wallet information",
+             (_wallet(),), category="wallet", batch="owner", cache_ttl=30),
+    Endpoint("get_wallet_page", "GET", ("/wallet/{owner}/page/{page}",),
+             "Get wallet tokens with pagination",
+             "Paginated wallet token holdings",
+             (_wallet(), Param("page", "Page number", annotation=int)), category="wallet",
+             pagination=PAGE, items_key="tokens", cache_ttl=30),
+    Endpoint("get_wallet_trades", "GET", ("/wallet/{owner}/trades",),
+             "Get wallet trading history",
+             "Wallet trading history",
+             (_wallet(),) + _paging(100, "Page number for pagination", "Number of trades per page",
+                                    clamp=False),
+             category="wallet", model="wallet_trades", pagination=PAGE, items_key="trades",
+             batch="owner", cache_ttl=15),
+    Endpoint("get_wallet_chart", "GET", ("/wallet/{owner}/chart",),
+             "Get wallet performance chart data",
+             "Wallet performance chart data",
+             (_wallet(),), category="wallet", batch="owner", cache_ttl=60),
+
+    # ========================================
+    # TRADE ENDPOINTS
+    # ========================================
+    Endpoint("get_pool_trades", "GET", ("/trades/{token_address}/{pool_address}",),
+             "Get trades for a specific token/pool combination",
+             "List of trades for the token/pool",
+             (_token("token_address"), _pool())
+             + _paging(100, "Page number for pagination", "Number of trades per page", clamp=False),
+             category="trades", pagination=PAGE, items_key="trades", cache_ttl=5),
+    Endpoint("get_wallet_token_trades", "GET", ("/trades/{token_address}/{pool_address}/{owner}",),
+             "Get trades for a specific wallet on a token/pool",
+             "Trades by the wallet on the token/pool",
+             (_token("token_address"), _pool(), _wallet()), category="trades", cache_ttl=15),
+    Endpoint("get_token_wallet_trades", "GET", ("/trades/{token_address}/by-wallet/{owner}",),
+             "Get all trades by a wallet for a specific token",
+             "All trades by the wallet for the token",
+             (_token("token_address"), _wallet()), category="trades", cache_ttl=15),
+
+    # ========================================
+    # CHART DATA ENDPOINTS
+    # ========================================
+    Endpoint("get_chart_data", "GET", ("/chart/{token}/{pool}", "/chart/{token}"),
+             "Get OHLCV chart data for a token or token/pool",
+             "OHLCV chart data",
+             (_token(),
+              _pool("pool", "Pool address (optional)", default=None),
+              Param("interval", f"Time interval ({_CHART_INTERVALS})", kind=QUERY, default="1h",
+                    api_name="type"),
+              Param("time_from", "Start time (Unix timestamp)", kind=QUERY, annotation=int,
+                    default=None, transform=if_set),
+              Param("time_to", "End time (Unix timestamp)", kind=QUERY, annotation=int,
+                    default=None, transform=if_set),
+              Param("market_cap", "Return market cap data instead of pricing", kind=QUERY,
+                    annotation=bool, default=False, api_name="marketCap", transform=lower_bool),
+              Param("remove_outliers", "Remove outliers from data", kind=QUERY, annotation=bool,
+                    default=True, api_name="removeOutliers", transform=lower_bool)),
+             category="chart", model="chart", batch="token", cache_ttl=30),
+    Endpoint("get_holders_chart", "GET", ("/holders/chart/{token}",),
+             "Get holders chart data for a token",
+             "Holders chart data over time",
+             (_token(),), category="chart", batch="token", cache_ttl=300),
+    Endpoint("get_token_holders_chart", "GET", ("/chart/holders/{token}",),
+             "Get token holders chart data (alternative endpoint)",
+             "Token holders chart data over time",
+             (_token(),), category="chart", batch="token", cache_ttl=300),
+
+    # ========================================
+    # PNL DATA ENDPOINTS
+    # ========================================
+    Endpoint("get_wallet_pnl", "GET", ("/pnl/{wallet}",),
+             "Get profit/loss data for a wallet",
+             "Wallet PnL data across all tokens",
+             (_wallet("wallet"),), category="pnl", model="wallet_pnl", batch="wallet", cache_ttl=60),
+    Endpoint("get_first_buyers", "GET", ("/first-buyers/{token}",),
+             "Get first buyers of a token",
+             "List of first buyers with their purchase data",
+             (_token(), Param("limit", "Number of first buyers to return", kind=QUERY, annotation=int,
+                              default=100)),
+             category="pnl", batch="token", cache_ttl=3600),
+    Endpoint("get_wallet_token_pnl", "GET", ("/pnl/{wallet}/{token}",),
+             "Get profit/loss data for a wallet on a specific token",
+             "Wallet PnL data for the specific token",
+             (_wallet("wallet"), _token()), category="pnl", model="token_pnl", cache_ttl=60),
+
+    # ========================================
+    # TOP TRADERS ENDPOINTS
+    # ========================================
+    Endpoint("get_top_traders_all", "GET", ("/top-traders/all/{page}", "/top-traders/all"),
+             "Get top traders across all tokens",
+             "List of top traders across all tokens",
+             (Param("page", "Page number for pagination (optional)", annotation=int, default=None),),
+             category="top_traders", pagination=PAGE, items_key="wallets", cache_ttl=300),
+    Endpoint("get_top_traders_token", "GET", ("/top-traders/{token}",),
+             "Get top traders for a specific token",
+             "List of top traders for the token",
+             (_token(),), category="top_traders", batch="token", cache_ttl=300),
+
+    # ========================================
+    # STATS AND EVENTS ENDPOINTS
+    # ========================================
+    Endpoint("get_token_stats", "GET", ("/stats/{token}/{pool}", "/stats/{token}"),
+             "Get statistics for a token or token/pool",
+             "Token or token/pool statistics",
+             (_token(), _pool("pool", "Pool address (optional)", default=None)),
+             category="stats", batch="token", cache_ttl=15),
+    Endpoint("get_live_events", "GET", ("/live-events",),
+             "Get live events across all tokens",
+             "Live events data",
+             category="events"),
+    Endpoint("get_token_events", "GET", ("/events/{token_address}",),
+             "Get events for a specific token",
+             "Token events as EventColumns (wallet index, amount, priceUsd, volume, type and time arrays)",
+             (_token("token_address"),), category="events", decoder=decode_events,
+             annotation=EventColumns, batch="token_address", cache_ttl=5),
+    Endpoint("get_pool_events", "GET", ("/events/{token_address}/{pool_address}",),
+             "Get events for a specific token/pool combination",
+             "Pool events as EventColumns (wallet index, amount, priceUsd, volume, type and time arrays)",
+             (_token("token_address"), _pool()), category="events", decoder=decode_events,
+             annotation=EventColumns, cache_ttl=5),
+
+    # ========================================
+    # CREDITS ENDPOINT
+    # ========================================
+    Endpoint("get_credits", "GET", ("/credits",),
+             "Get API credits information",
+             "Current API credits and usage information",
+             category="credits"),
+)
+
+# Method name -> Endpoint
+ENDPOINTS: Dict[str, Endpoint] = {endpoint.name: endpoint for endpoint in ENDPOINT_TABLE}
+
+
+def get_endpoint(name: str) -> Endpoint:
+    """
+    Look up an endpoint by method name
+
+    Raises:
+        EndpointNotFoundError: When no endpoint has that name
+    """
+    endpoint = ENDPOINTS.get(name)
+    if endpoint is None:
+        raise EndpointNotFoundError(f"Unknown endpoint '{name}'")
+    return endpoint
+
+
+def build_methods(endpoints: Tuple[Endpoint, ...], dispatch: str, is_async: bool = False,
+                  owner: str = "SolanaDetective") -> Dict[str, Callable[..., Any]]:
+    """
+    Generate client methods for endpoints
+
+    Each method has its endpoint's real signature (so calls bind as fast as a
+    hand-written method) and passes its argument values to
+    `self.<dispatch>(endpoint, values)`. All methods are compiled in one go
+    to keep import time down.
+
+    Args:
+        endpoints: Endpoints to generate methods for
+        dispatch: Name of the client method handling the call
+        is_async: Generate coroutine functions awaiting the dispatch method
+        owner: Class name used for __qualname__
+
+    Returns:
+        Method name -> function
+    """
+    sources = []
+    scope: Dict[str, Any] = {}
+    for endpoint in endpoints:
+        names = [param.name for param in endpoint.params]
+        arguments = "".join(f", {name}" for name in names)
+        values = "".join(f"{name}, " for name in names)
+        scope[f"_{endpoint.name}"] = endpoint
+        sources.append(
+            f"{'async ' if is_async else ''}def {endpoint.name}(self{arguments}):\n"
+            f"    return {'await ' if is_async else ''}self.{dispatch}(_{endpoint.name}, ({values}))\n"
+        )
+    namespace: Dict[str, Any] = {}
+    exec("".join(sources), scope, namespace)
+
+    methods = {}
+    for endpoint in endpoints:
+        method = namespace[endpoint.name]
+        defaults = []
+        for param in endpoint.params:
+            if not param.required:
+                defaults.append(param.default)
+            elif defaults:
+                raise ValueError(f"{endpoint.name}: required parameter {param.name} follows an optional one")
+        method.__defaults__ = tuple(defaults) or None
+        method.__annotations__ = {param.name: param.annotation for param in endpoint.params}
+        method.__annotations__["return"] = endpoint.annotation
+        method.__doc__ = endpoint.docstring()
+        method.__qualname__ = f"{owner}.{endpoint.name}"
+        method.endpoint = endpoint
+        methods[endpoint.name] = method
+    return methods
+
+
+def attach_endpoints(cls: type, dispatch: str, is_async: bool = False) -> type:
+    """Add a generated method for every registered endpoint to a client class"""
+    for name, method in build_methods(ENDPOINT_TABLE, dispatch, is_async, cls.__name__).items():
+        method.__module__ = cls.__module__
+        setattr(cls, name, method)
+    return cls
@@ -0,0 +1,302 @@
+"""
+Token event decoding for Solana Detective package
+Decodes /events payloads into columnar arrays (numpy when installed)
+
+The API documentation (GET /events/{tokenAddress}) says the body is binary
+data "that needs to be decoded" but does not publish the layout; its example
+is the decoded form, a JSON list of {wallet, amount, priceUsd, volume, type,
+time} events. Bodies are therefore decoded as that JSON list by default.
+
+The "compact" layout below is PROVISIONAL: it is defined by this package
+(for fixtures and the benchmark mock server), not taken from the API, and
+is only used when asked for (events_layout="compact"). All little-endian:
+
+    u32 wallet count
+    per wallet: u8 length, address (UTF-8)
+    u32 event count
+    per event: u32 wallet index, f64 amount, f64 priceUsd, f64 volume,
+               u8 type (0 buy, 1 sell), f64 time (ms since the epoch)
+
+With numpy compact records are read in place with one frombuffer() call and
+the columns are views into the response body; without it they are unpacked
+with struct.iter_unpack into array.array columns.
+"""
+
+import json
+import array
+import struct
+import warnings
+import importlib
+from typing import Any, Dict, Iterator, List, Sequence
+
+BACKENDS = ("auto", "numpy", "struct")
+
+# Payload layouts: the documented JSON events, or this package's provisional binary layout
+JSON = "json"
+COMPACT = "compact"
+LAYOUTS = (JSON, COMPACT)
+
+# Event type codes
+BUY = 0
+SELL = 1
+TYPE_NAMES = {BUY: "buy", SELL: "sell"}
+TYPE_CODES = {name: code for code, name in TYPE_NAMES.items()}
+
+_COUNT = struct.Struct("<I")
+_RECORD = struct.Struct("<IdddBd")
+RECORD_SIZE = _RECORD.size  # 37 bytes, unpadded
+
+_numpy: Any = False
+
+
+def _optional_numpy() -> Any:
+    """Import numpy on first use (None when it is not installed)"""
+    global _numpy
+    if _numpy is False:
+        try:
+            _numpy = importlib.import_module("numpy")
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+
+def _record_dtype(numpy: Any) -> Any:
+    return numpy.dtype([("wallet_index", "<u4"), ("amount", "<f8"), ("price_usd", "<f8"),
+                        ("volume", "<f8"), ("type", "u1"), ("time", "<f8")])
+
+
+class EventColumns:
+    """
+    Token events as columns
+
+    Attributes:
+        wallets: Distinct wallet addresses; wallet_index points into it
+        wallet_index: Wallet of each event (index into `wallets`)
+        amount: Token amount
+        price_usd: Token price in USD
+        volume: Trade volume in USD
+        type: Event type code (BUY or SELL)
+        time: Event time in milliseconds since the epoch
+
+    Columns are numpy arrays when numpy is installed (read-only views into
+    the response body, use numpy.ascontiguousarray before heavy number
+    crunching) and array.array otherwise. Indexing and iteration give the
+    event dicts of the JSON format, so code written against lists of events
+    keeps working.
+    """
+
+    __slots__ = ("wallets", "wallet_index", "amount", "price_usd", "volume", "type", "time")
+
+    def __init__(self, wallets: List[str], wallet_index: Sequence[int], amount: Sequence[float],
+                 price_usd: Sequence[float], volume: Sequence[float], type: Sequence[int],
+                 time: Sequence[float]):
+        self.wallets = wallets
+        self.wallet_index = wallet_index
+        self.amount = amount
+        self.price_usd = price_usd
+        self.volume = volume
+        self.type = type
+        self.time = time
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "EventColumns":
+        """
+        Build columns from events in the JSON format
+
+        Raises:
+            ValueError: When a record lacks a field or has an unknown type
+        """
+        wallets: Dict[str, int] = {}
+        try:
+            columns = (
+                [wallets.setdefault(record["wallet"], len(wallets)) for record in records],
+                [record["amount"] for record in records],
+                [record["priceUsd"] for record in records],
+                [record["volume"] for record in records],
+                [TYPE_CODES[record["type"]] for record in records],
+                [record["time"] for record in records]
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid event record: {e!r}") from e
+        numpy = _optional_numpy()
+        if numpy is not None:
+            typed = [numpy.array(column, dtype=dtype) for column, dtype in
+                     zip(columns, ("<u4", "<f8", "<f8", "<f8", "u1", "<f8"))]
+        else:
+            typed = [array.array(code, column) for column, code in zip(columns, "IdddBd")]
+        return cls(list(wallets), *typed)
+
+    def __len__(self) -> int:
+        return len(self.wallet_index)
+
+    def record(self, i: int) -> Dict[str, Any]:
+        """Event `i` as a dict in the JSON format"""
+        return {
+            "wallet": self.wallets[self.wallet_index[i]],
+            "amount": float(self.amount[i]),
+            "priceUsd": float(self.price_usd[i]),
+            "volume": float(self.volume[i]),
+            "type": TYPE_NAMES.get(int(self.type[i]), "unknown"),
+            "time": float(self.time[i])
+        }
+
+    def records(self) -> List[Dict[str, Any]]:
+        """All events as dicts in the JSON format (slow for large payloads)"""
+        return [self.record(i) for i in range(len(self))]
+
+    def wallet_addresses(self) -> List[str]:
+        """Wallet address of each event"""
+        wallets = self.wallets
+        return [wallets[i] for i in self.wallet_index]
+
+    def wallet_ids(self, table: Any) -> Sequence[int]:
+        """
+        Id of each event's wallet in an AddressTable
+
+        Only the wallet dictionary is interned; the per-event ids are a
+        gather over it (a numpy array with numpy, array.array otherwise).
+        """
+        ids = table.intern_many(self.wallets)
+        if hasattr(self.wallet_index, "__array__"):
+            return _optional_numpy().asarray(ids)[self.wallet_index]
+        return array.array("q", (ids[i] for i in self.wallet_index))
+
+    def take(self, indices: Sequence[int]) -> "EventColumns":
+        """Events at the given positions, in that order (same wallet dictionary)"""
+        if hasattr(self.amount, "__array__"):
+            return EventColumns(self.wallets, self.wallet_index[indices], self.amount[indices],
+                                self.price_usd[indices], self.volume[indices], self.type[indices],
+                                self.time[indices])
+        return EventColumns(self.wallets, *(array.array(column.typecode, (column[i] for i in indices))
+                                            for column in (self.wallet_index, self.amount, self.price_usd,
+                                                           self.volume, self.type, self.time)))
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("event index out of range")
+        return self.record(i)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def __repr__(self) -> str:
+        return f"EventColumns({len(self)} events, {len(self.wallets)} wallets)"
+
+
+def decode_events(content: bytes, backend: str = "auto", layout: str = JSON) -> EventColumns:
+    """
+    Decode an /events response body
+
+    Args:
+        content: Raw response body (any bytes-like object)
+        backend: "auto" (numpy when installed), "numpy" or "struct"; only
+            used by the compact layout
+        layout: JSON (the documented event list, default) or COMPACT (this
+            package's provisional binary layout, see the module docstring).
+            Compact bodies that do not match the layout but are JSON are
+            decoded as JSON with a RuntimeWarning.
+
+    Returns:
+        EventColumns
+
+    Raises:
+        ValueError: When the body does not match the layout, or the backend
+            or layout is unknown or not installed
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown events layout '{layout}'. Choose from: {', '.join(LAYOUTS)}")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown events backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+    view = memoryview(content).cast("B")
+    if layout == JSON:
+        return _decode_json(view)
+    numpy = _optional_numpy() if backend != "struct" else None
+    if backend == "numpy" and numpy is None:
+        raise ValueError("The numpy events backend requires the numpy package (pip install numpy)")
+
+    try:
+        wallets, offset, count = _read_header(view)
+        complete = len(view) == offset + count * RECORD_SIZE
+    except (struct.error, IndexError, UnicodeDecodeError):
+        complete = False
+    if not complete:
+        events = _decode_json(view, "size does not match the event count")
+        warnings.warn("Events body does not match the compact layout; decoded it as JSON events",
+                      RuntimeWarning, stacklevel=2)
+        return events
+
+    if numpy is not None:
+        records = numpy.frombuffer(view, dtype=_record_dtype(numpy), count=count, offset=offset)
+        wallet_index = records["wallet_index"]
+        if count and int(wallet_index.max()) >= len(wallets):
+            raise ValueError("Invalid event payload: wallet index out of range")
+        return EventColumns(wallets, wallet_index, records["amount"], records["price_usd"],
+                            records["volume"], records["type"], records["time"])
+
+    if not count:
+        return EventColumns(wallets, *(array.array(code) for code in "IdddBd"))
+    columns = zip(*_RECORD.iter_unpack(view[offset:]))
+    events = EventColumns(wallets, *(array.array(code, column) for code, column in zip("IdddBd", columns)))
+    if max(events.wallet_index) >= len(wallets):
+        raise ValueError("Invalid event payload: wallet index out of range")
+    return events
+
+
+def _read_header(view: memoryview) -> Any:
+    """(wallets, offset of the first record, event count) of a binary payload"""
+    (wallet_count,) = _COUNT.unpack_from(view, 0)
+    offset = _COUNT.size
+    wallets = []
+    for _ in range(wallet_count):
+        length = view[offset]
+        offset += 1
+        if offset + length > len(view):
+            raise struct.error("wallet dictionary truncated")
+        wallets.append(str(view[offset:offset + length], "utf-8"))
+        offset += length
+    (count,) = _COUNT.unpack_from(view, offset)
+    return wallets, offset + _COUNT.size, count
+
+
+def _decode_json(view: memoryview, reason: str = None) -> EventColumns:
+    head = bytes(view[:64]).lstrip()
+    if not head.startswith((b"[", b"{")):
+        if reason is not None:
+            raise ValueError(f"Invalid event payload: {reason}")
+        raise ValueError("Events body is not JSON. The API's binary event format is not publicly "
+                         "documented; decode the raw body yourself, or use events_layout='compact' "
+                         "for this package's provisional layout")
+    body = json.loads(bytes(view))
+    if isinstance(body, dict):
+        # Wrapped list ({"events": [...]}) or a single event
+        body = body["events"] if "events" in body else [body]
+    if not isinstance(body, list):
+        raise ValueError("Invalid event payload: expected a list of events")
+    return EventColumns.from_records(body)
+
+
+def encode_events(records: List[Dict[str, Any]]) -> bytes:
+    """
+    Encode events in the JSON format in the provisional compact layout
+
+    Used by the benchmark mock server and to build fixtures; the API does
+    not document this layout.
+
+    Raises:
+        ValueError: When a record lacks a field or a wallet address is too long
+    """
+    events = EventColumns.from_records(records)
+    parts = [_COUNT.pack(len(events.wallets))]
+    for wallet in events.wallets:
+        encoded = wallet.encode("utf-8")
+        if len(encoded) > 255:
+            raise ValueError(f"Wallet address too long for the event format: {wallet!r}")
+        parts.append(bytes((len(encoded),)) + encoded)
+    parts.append(_COUNT.pack(len(events)))
+    pack = _RECORD.pack
+    parts.extend(pack(*row) for row in zip(events.wallet_index, events.amount, events.price_usd,
+                                            events.volume, events.type, events.time))
+    return b"".join(parts)
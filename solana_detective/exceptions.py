@@ -31,3 +31,12 @@ class EndpointNotFoundError(SolanaDetectiveError):
     """Raised when requested endpoint is not implemented"""
     pass
 
+class CircuitOpenError(APIError):
+    """Raised when calls to an endpoint family are short-circuited after repeated failures"""
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class CassetteError(SolanaDetectiveError):
+    """Raised when a cassette cannot be read or has no recording for a replayed request"""
+    pass
@@ -0,0 +1,211 @@
+"""
+Request hooks for Solana Detective package
+Middleware chain with before-request, after-response, on-error, on-retry and on-change events
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Hook events
+BEFORE_REQUEST = "before_request"
+AFTER_RESPONSE = "after_response"
+ON_ERROR = "on_error"
+ON_RETRY = "on_retry"
+ON_CHANGE = "on_change"
+EVENTS = (BEFORE_REQUEST, AFTER_RESPONSE, ON_ERROR, ON_RETRY, ON_CHANGE)
+
+# Request phases recorded for hooks and tracing
+PHASE_RATE_LIMIT = "rate_limit_wait"
+PHASE_NETWORK = "http"
+PHASE_DECODE = "decode"
+
+
+class Phase:
+    """One timed phase of a call (wall-clock nanoseconds, as used by tracing backends)"""
+
+    __slots__ = ("name", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, name: str, start_ns: int, end_ns: int, attributes: Dict[str, Any] = None):
+        self.name = name
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.attributes = attributes or {}
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def __repr__(self) -> str:
+        return f"Phase({self.name!r}, {self.seconds:.6f}s)"
+
+
+class RequestEvent:
+    """
+    What a hook receives
+
+    Attributes:
+        name: Event name (before_request, after_response, on_error, on_retry, on_change)
+        method: HTTP method
+        endpoint: Request path
+        template: Endpoint path template (e.g. "/tokens/{token}/holders")
+        url: Full request URL
+        params: Query parameters
+        lane: Scheduler lane
+        tenant: Scheduler tenant (or None)
+        attempt: Number of retries made so far
+        started_ns: Wall-clock start of the call in nanoseconds
+        elapsed: Seconds since the call started
+        status_code: Status of the latest response (None if none was received)
+        response: Latest response object (None if none was received)
+        error: Exception raised (on_error) or that triggered a retry (on_retry)
+        retry_delay: Seconds until the next attempt (on_retry)
+        result: Newly decoded response (on_change)
+        phases: Timed rate-limit wait, network and decode phases so far
+        state: Dict shared by all events of one call, for hooks to keep data in
+    """
+
+    __slots__ = ("name", "method", "endpoint", "template", "url", "params", "lane", "tenant",
+                 "attempt", "started_ns", "elapsed", "status_code", "response", "error",
+                 "retry_delay", "result", "phases", "state")
+
+    def __init__(self, name: str, call: Any, elapsed: float, error: BaseException = None,
+                 retry_delay: float = None, result: Any = None):
+        self.name = name
+        self.method = call.method
+        self.endpoint = call.endpoint
+        self.template = call.template
+        self.url = call.url
+        self.params = call.params
+        self.lane = call.lane
+        self.tenant = call.tenant
+        self.attempt = call.attempt
+        self.started_ns = call.started_ns
+        self.elapsed = elapsed
+        self.status_code = call.status_code
+        self.response = call.response
+        self.error = error
+        self.retry_delay = retry_delay
+        self.result = result
+        self.phases: List[Phase] = list(call.phases or ())
+        self.state: Dict[str, Any] = call.state
+
+    def _total(self, phase: str) -> float:
+        return sum(p.seconds for p in self.phases if p.name == phase)
+
+    @property
+    def queue_wait(self) -> float:
+        """Seconds spent waiting in the rate limiter / scheduler"""
+        return self._total(PHASE_RATE_LIMIT)
+
+    @property
+    def network_seconds(self) -> float:
+        """Seconds spent on the network"""
+        return self._total(PHASE_NETWORK)
+
+    @property
+    def decode_seconds(self) -> float:
+        """Seconds spent decoding the response body"""
+        return self._total(PHASE_DECODE)
+
+    def __repr__(self) -> str:
+        return f"RequestEvent({self.name!r}, {self.method} {self.template}, attempt={self.attempt})"
+
+
+class HookChain:
+    """
+    Ordered hooks per request event
+
+    Hooks are plain callables taking a RequestEvent. Middleware objects group
+    them: any of their methods named after an event is registered. Hooks run
+    in registration order on the calling thread; an exception raised by a hook
+    is logged and does not fail the request.
+
+    Events:
+        before_request: Once per call, before the first attempt
+        on_retry: Before each retry, with the delay and the failed status or error
+        after_response: Once per call that returned a result
+        on_error: Once per call that raised, with the exception
+        on_change: When a cached endpoint returns a body that differs from the
+            cached one (or was not cached yet), with the decoded result; not
+            for cache hits, 304 revalidations or identical bodies
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hooks: Dict[str, List[Callable[[RequestEvent], Any]]] = {event: [] for event in EVENTS}
+
+    def __bool__(self) -> bool:
+        return any(self._hooks.values())
+
+    def register(self, event: str, hook: Callable[[RequestEvent], Any] = None):
+        """
+        Register a hook for an event (usable as a decorator)
+
+        Args:
+            event: One of before_request, after_response, on_error, on_retry, on_change
+            hook: Callable taking a RequestEvent
+
+        Raises:
+            ValueError: When the event is unknown
+        """
+        if event not in EVENTS:
+            raise ValueError(f"Unknown hook event '{event}'. Choose from: {', '.join(EVENTS)}")
+        if hook is None:
+            return lambda function: self.register(event, function)
+        with self._lock:
+            # Copy on write so emit() can iterate without locking
+            self._hooks[event] = self._hooks[event] + [hook]
+        return hook
+
+    def unregister(self, event: str, hook: Callable[[RequestEvent], Any]) -> None:
+        """Remove a hook registered for an event"""
+        with self._lock:
+            self._hooks[event] = [h for h in self._hooks.get(event, []) if h != hook]
+
+    def add(self, middleware: Any) -> Any:
+        """
+        Register every event method of a middleware object
+
+        Args:
+            middleware: Object with any of before_request, after_response,
+                on_error, on_retry, on_change methods
+
+        Returns:
+            The middleware, for chaining
+
+        Raises:
+            ValueError: When the object has no event methods
+        """
+        found = False
+        for event in EVENTS:
+            hook = getattr(middleware, event, None)
+            if callable(hook):
+                self.register(event, hook)
+                found = True
+        if not found:
+            raise ValueError(f"{type(middleware).__name__} defines none of: {', '.join(EVENTS)}")
+        return middleware
+
+    def remove(self, middleware: Any) -> None:
+        """Unregister a middleware added with add()"""
+        for event in EVENTS:
+            hook = getattr(middleware, event, None)
+            if hook is not None:
+                self.unregister(event, hook)
+
+    def emit(self, event: str, call: Any, elapsed: float, error: BaseException = None,
+             retry_delay: float = None, result: Any = None) -> Optional[RequestEvent]:
+        """Run the hooks registered for an event"""
+        hooks = self._hooks[event]
+        if not hooks:
+            return None
+        request_event = RequestEvent(event, call, elapsed, error, retry_delay, result)
+        for hook in hooks:
+            try:
+                hook(request_event)
+            except Exception:
+                logger.exception(f"Request hook {hook!r} failed on {event}")
+        return request_event
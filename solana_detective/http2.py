@@ -0,0 +1,268 @@
+"""
+HTTP/2 transport for Solana Detective package
+requests transport adapter multiplexing calls over HTTP/2 connections (httpx)
+"""
+
+import os
+import ssl
+import importlib.util
+import time
+import threading
+from datetime import timedelta
+from http.client import responses as REASONS
+from typing import Any, Callable, Dict, Iterator, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+
+try:
+    import httpx
+    import h2  # noqa: F401  httpx only negotiates HTTP/2 when h2 is installed
+except ImportError:  # HTTP/2 is optional
+    httpx = None
+
+
+def _installed(*modules: str) -> bool:
+    """Whether any of the modules can be imported"""
+    return any(importlib.util.find_spec(module) is not None for module in modules)
+
+
+# Content codings httpx can decompress: br and zstd only when their decoders are installed
+DECODABLE_ENCODINGS = frozenset()
+if httpx is not None:
+    DECODABLE_ENCODINGS = frozenset(
+        ["gzip", "deflate"]
+        + (["br"] if _installed("brotli", "brotlicffi") else [])
+        + (["zstd"] if _installed("zstandard") else [])
+    )
+
+from .transport import PoolSettings
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    Transport adapter sending requests over httpx with HTTP/2 enabled
+
+    Mounted on the client's session in place of PooledAdapter, so retries,
+    scheduling, metrics, hooks and cassettes work unchanged. Concurrent calls
+    (threads, batch(), AsyncSolanaDetective) share a few connections, each
+    carrying many streams, instead of one connection per call in flight.
+    Servers that do not offer HTTP/2 in the TLS handshake are spoken to over
+    HTTP/1.1, pooled the same way.
+
+    Plain http:// URLs only use HTTP/2 with `http2_prior_knowledge`, which
+    also means the server must speak it (there is no upgrade fallback).
+    pool_maxsize caps the connections per host; pool_block does not apply,
+    calls always wait for a connection or stream.
+    """
+
+    def __init__(self, settings: PoolSettings = None):
+        """
+        Initialize HTTP/2 adapter
+
+        Args:
+            settings: Pool size and keep-alive settings
+
+        Raises:
+            ValueError: When httpx or h2 is not installed
+        """
+        if httpx is None:
+            raise ValueError("HTTP/2 requires the httpx and h2 packages (pip install httpx[http2])")
+        super().__init__()
+        self.settings = settings or PoolSettings(http2=True)
+        self._lock = threading.Lock()
+        self._transports: Dict[Tuple[Any, ...], "httpx.HTTPTransport"] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _transport(self, scheme: str, verify: Any, cert: Any, proxy: str) -> "httpx.HTTPTransport":
+        """httpx transport (a connection pool) per TLS / proxy configuration"""
+        http1 = not (scheme == "http" and self.settings.http2_prior_knowledge)
+        key = (http1, verify, cert, proxy)
+        with self._lock:
+            transport = self._transports.get(key)
+            if transport is None:
+                limits = httpx.Limits(max_connections=self.settings.maxsize,
+                                      max_keepalive_connections=self.settings.maxsize)
+                transport = self._transports[key] = httpx.HTTPTransport(
+                    verify=_ssl_context(verify, cert),
+                    http1=http1,
+                    http2=True,
+                    limits=limits,
+                    proxy=proxy,
+                    socket_options=self.settings.socket_options()
+                )
+            return transport
+
+    def _origin_stats(self, origin: str) -> Dict[str, Any]:
+        stats = self._stats.get(origin)
+        if stats is None:
+            stats = self._stats[origin] = {
+                "maxsize": self.settings.maxsize,
+                "in_use": 0,
+                "connections_opened": 0,
+                "requests": 0,
+                "http2_responses": 0
+            }
+        return stats
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None,
+             verify=True, cert=None, proxies=None) -> requests.Response:
+        url = urlsplit(request.url)
+        origin = f"{url.scheme}://{url.hostname}:{url.port or (443 if url.scheme == 'https' else 80)}"
+        transport = self._transport(url.scheme, verify, cert, select_proxy(request.url, proxies))
+        with self._lock:
+            stats = self._origin_stats(origin)
+            stats["requests"] += 1
+            stats["in_use"] += 1
+
+        def trace(event: str, info: Dict[str, Any]) -> None:
+            if event == "connection.connect_tcp.complete":
+                with self._lock:
+                    stats["connections_opened"] += 1
+
+        def release() -> None:
+            with self._lock:
+                stats["in_use"] -= 1
+
+        outgoing = httpx.Request(
+            request.method,
+            request.url,
+            headers=list(request.headers.items()),
+            content=request.body,
+            extensions={"timeout": _timeouts(timeout), "trace": trace}
+        )
+        started = time.perf_counter()
+        try:
+            incoming = transport.handle_request(outgoing)
+        except Exception as e:
+            release()
+            raise _translate(e, request)
+
+        if incoming.http_version == "HTTP/2":
+            with self._lock:
+                stats["http2_responses"] += 1
+        body = _Body(incoming, request, release)
+        response = requests.Response()
+        response.status_code = incoming.status_code
+        response.headers = CaseInsensitiveDict(incoming.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = incoming.reason_phrase or REASONS.get(incoming.status_code, "")
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = body
+        if not stream:
+            # Read now so the stream is released before the caller decodes
+            response._content = body.read()
+            response._content_consumed = True
+        response.elapsed = timedelta(seconds=time.perf_counter() - started)
+        return response
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-host transport statistics, keyed by "scheme://host:port"
+
+        in_use counts responses still being read; connections_opened against
+        requests shows how many calls each connection carried.
+        """
+        with self._lock:
+            return {origin: dict(stats) for origin, stats in self._stats.items()}
+
+    def close(self) -> None:
+        with self._lock:
+            transports = list(self._transports.values())
+            self._transports.clear()
+        for transport in transports:
+            transport.close()
+
+
+class _Body:
+    """Body of an httpx response, as requests.Response.raw (read or streamed, decoded)"""
+
+    def __init__(self, response: "httpx.Response", request: requests.PreparedRequest,
+                 release: Callable[[], None]):
+        self._response = response
+        self._request = request
+        self._release = release
+        self._closed = False
+
+    def stream(self, amt: int = None, decode_content: bool = True) -> Iterator[bytes]:
+        try:
+            for chunk in self._response.iter_bytes(amt):
+                yield chunk
+        except Exception as e:
+            raise _translate(e, self._request, reading=True)
+        finally:
+            self.close()
+
+    def tell(self) -> int:
+        """Body bytes received so far, before decompression"""
+        return self._response.num_bytes_downloaded
+
+    def read(self, amt: int = None) -> bytes:
+        if self._closed:
+            return b""
+        return b"".join(self.stream(amt))
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._response.close()
+        finally:
+            self._release()
+
+    release_conn = close
+
+
+def _ssl_context(verify: Any, cert: Any) -> Any:
+    """httpx verify argument for requests-style verify (bool or CA path) and cert"""
+    if verify is False:
+        return False
+    if verify is True and not cert:
+        return True
+    if isinstance(verify, str):
+        if os.path.isdir(verify):
+            context = ssl.create_default_context(capath=verify)
+        else:
+            context = ssl.create_default_context(cafile=verify)
+    else:
+        context = httpx.create_ssl_context()
+    if cert:
+        if isinstance(cert, tuple):
+            context.load_cert_chain(*cert)
+        else:
+            context.load_cert_chain(cert)
+    return context
+
+
+def _timeouts(timeout: Any) -> Dict[str, Any]:
+    """httpcore timeout extension for a requests timeout (seconds or (connect, read))"""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+    else:
+        connect = read = timeout
+    return {"connect": connect, "read": read, "write": read, "pool": connect}
+
+
+def _translate(error: Exception, request: requests.PreparedRequest,
+               reading: bool = False) -> Exception:
+    """requests exception for an httpx one, so the client's error handling applies"""
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(error, request=request)
+    if isinstance(error, httpx.TimeoutException):
+        # requests reports timeouts while reading a body as connection errors
+        if reading:
+            return requests.exceptions.ConnectionError(error, request=request)
+        return requests.exceptions.ReadTimeout(error, request=request)
+    if isinstance(error, httpx.ProxyError):
+        return requests.exceptions.ProxyError(error, request=request)
+    if isinstance(error, httpx.DecodingError):
+        return requests.exceptions.ContentDecodingError(error, request=request)
+    if isinstance(error, httpx.TransportError):
+        return requests.exceptions.ConnectionError(error, request=request)
+    return error
@@ -0,0 +1,344 @@
+"""
+Request metrics for Solana Detective package
+Per-endpoint counters and HDR-style latency histograms with Prometheus/JSON export
+"""
+
+import bisect
+import json
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Histogram resolution: 2^7 sub-buckets per power of two (under 1% relative error)
+_SUB_BUCKET_BITS = 7
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+_HALF = _SUB_BUCKETS >> 1
+
+# Bucket bounds (seconds) used for Prometheus histogram export
+PROMETHEUS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in the style of HdrHistogram
+
+    Values are recorded in microseconds into buckets whose width doubles with
+    every power of two, so any latency from 1 us to hours is kept with ~1%
+    relative precision in a few hundred sparse counters. Samples are also
+    counted exactly against PROMETHEUS_BUCKETS, so exported buckets hold
+    every sample at or below their bound (e.g. requests cut at a timeout).
+    Not thread-safe; MetricsRegistry serialises access.
+    """
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        # Samples per Prometheus bucket (index of the first bound at or above them)
+        self._exported: Counter = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    @staticmethod
+    def _index(micros: int) -> int:
+        if micros < _SUB_BUCKETS:
+            return micros
+        shift = micros.bit_length() - _SUB_BUCKET_BITS
+        return _SUB_BUCKETS + (shift - 1) * _HALF + ((micros >> shift) - _HALF)
+
+    @staticmethod
+    def _upper_bound(index: int) -> int:
+        """Largest microsecond value stored in a bucket"""
+        if index < _SUB_BUCKETS:
+            return index
+        shift, offset = divmod(index - _SUB_BUCKETS, _HALF)
+        shift += 1
+        return ((offset + _HALF + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        """Add a latency sample in seconds"""
+        micros = max(0, int(seconds * 1e6))
+        self._counts[self._index(micros)] += 1
+        self._exported[bisect.bisect_left(PROMETHEUS_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Latency in seconds at the given percentile (0-100)"""
+        if not self.count:
+            return None
+        target = max(1, int(round(percentile / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(self._upper_bound(index) / 1e6, self.max)
+        return self.max
+
+    def cumulative(self, bounds: Tuple[float, ...] = PROMETHEUS_BUCKETS) -> List[int]:
+        """
+        Number of samples at or below each bound (seconds)
+
+        Exact for PROMETHEUS_BUCKETS; for other bounds, samples in a bucket
+        straddling a bound (within ~1% below it) are counted above it.
+        """
+        if tuple(bounds) == PROMETHEUS_BUCKETS:
+            seen = 0
+            result = []
+            for index in range(len(bounds)):
+                seen += self._exported[index]
+                result.append(seen)
+            return result
+        ordered = sorted(self._counts.items())
+        result = []
+        seen = 0
+        position = 0
+        for bound in bounds:
+            limit = bound * 1e6
+            while position < len(ordered) and self._upper_bound(ordered[position][0]) <= limit:
+                seen += ordered[position][1]
+                position += 1
+            result.append(seen)
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean, extremes and common percentiles"""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9)
+        }
+
+
+class EndpointMetrics:
+    """Counters for one method + endpoint template"""
+
+    def __init__(self):
+        self.requests = 0
+        self.status_codes: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.retries = 0
+        self.bytes_received = 0
+        self.wire_bytes = 0
+        self.encodings: Counter = Counter()
+        self.cache: Counter = Counter()
+        self.decode_seconds = 0.0
+        self.decodes = 0
+        self.latency = LatencyHistogram()
+        self.queue_wait = LatencyHistogram()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-dict copy of the counters"""
+        return {
+            "requests": self.requests,
+            "status_codes": {str(code): count for code, count in sorted(self.status_codes.items())},
+            "errors": dict(self.errors),
+            "retries": self.retries,
+            "bytes_received": self.bytes_received,
+            "wire_bytes": self.wire_bytes,
+            "compression_ratio": self.bytes_received / self.wire_bytes if self.wire_bytes else None,
+            "content_encodings": dict(self.encodings),
+            "cache": dict(self.cache),
+            "decode_seconds": self.decode_seconds,
+            "decode_mean_seconds": self.decode_seconds / self.decodes if self.decodes else None,
+            "latency": self.latency.summary(),
+            "queue_wait": self.queue_wait.summary()
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of per-endpoint request metrics
+
+    Endpoints are keyed by method and path template (e.g.
+    "GET /tokens/{token}/holders") so cardinality stays bounded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+
+    def _get(self, method: str, template: str) -> EndpointMetrics:
+        key = (method.upper(), template)
+        metrics = self._endpoints.get(key)
+        if metrics is None:
+            metrics = self._endpoints[key] = EndpointMetrics()
+        return metrics
+
+    def record_attempt(self, method: str, template: str, status_code: Optional[int],
+                       latency: float, queue_wait: float = 0.0, error: str = None) -> None:
+        """
+        Record one HTTP attempt
+
+        Args:
+            method: HTTP method
+            template: Endpoint path template
+            status_code: Response status (None when no response was received)
+            latency: Network latency in seconds
+            queue_wait: Seconds spent waiting in the request scheduler
+            error: Error kind when no response was received (e.g. "timeout")
+        """
+        with self._lock:
+            metrics = self._get(method, template)
+            metrics.requests += 1
+            metrics.latency.record(latency)
+            metrics.queue_wait.record(queue_wait)
+            if status_code is not None:
+                metrics.status_codes[status_code] += 1
+            if error:
+                metrics.errors[error] += 1
+
+    def record_retry(self, method: str, template: str) -> None:
+        """Record a retry of a request"""
+        with self._lock:
+            self._get(method, template).retries += 1
+
+    def record_error(self, method: str, template: str, error: str) -> None:
+        """Record an error raised without an HTTP attempt (e.g. open circuit)"""
+        with self._lock:
+            self._get(method, template).errors[error] += 1
+
+    def record_body(self, method: str, template: str, size: int, decode_seconds: float = None,
+                    wire_size: int = None, encoding: str = None) -> None:
+        """
+        Record a received body
+
+        Args:
+            method: HTTP method
+            template: Endpoint path template
+            size: Body size in bytes (decompressed)
+            decode_seconds: Time spent decoding the body (optional)
+            wire_size: Bytes received over the network, before decompression (optional)
+            encoding: Content-Encoding of the response (optional, "identity" when none)
+        """
+        with self._lock:
+            metrics = self._get(method, template)
+            metrics.bytes_received += size
+            if wire_size is not None:
+                metrics.wire_bytes += wire_size
+            if encoding:
+                metrics.encodings[encoding] += 1
+            if decode_seconds is not None:
+                metrics.decode_seconds += decode_seconds
+                metrics.decodes += 1
+
+    def record_cache(self, method: str, template: str, outcome: str) -> None:
+        """Record the response cache outcome of a call (hit, not_modified, unchanged, miss)"""
+        with self._lock:
+            self._get(method, template).cache[outcome] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint metrics keyed by "METHOD /template" """
+        with self._lock:
+            return {
+                f"{method} {template}": metrics.snapshot()
+                for (method, template), metrics in sorted(self._endpoints.items())
+            }
+
+    def reset(self) -> None:
+        """Drop all recorded metrics"""
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_json(self, extra: Dict[str, Any] = None, **kwargs) -> str:
+        """
+        Export the snapshot as JSON
+
+        Args:
+            extra: Additional top-level sections (e.g. scheduler state)
+            **kwargs: Passed to json.dumps
+        """
+        document = {"endpoints": self.snapshot()}
+        document.update(extra or {})
+        return json.dumps(document, **kwargs)
+
+    def to_prometheus(self, prefix: str = "solana_detective") -> str:
+        """Export counters and latency histograms in the Prometheus text format"""
+        lines = []
+        with self._lock:
+            items = sorted(self._endpoints.items())
+
+            def family(name: str, kind: str, help_text: str) -> None:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+            family("requests_total", "counter", "HTTP attempts per endpoint and status code")
+            for (method, template), metrics in items:
+                for code, count in sorted(metrics.status_codes.items()):
+                    lines.append(f"{prefix}_requests_total{_labels(method, template, status=code)} {count}")
+
+            family("errors_total", "counter", "Requests that failed without a response, per kind")
+            for (method, template), metrics in items:
+                for kind, count in sorted(metrics.errors.items()):
+                    lines.append(f"{prefix}_errors_total{_labels(method, template, kind=kind)} {count}")
+
+            family("cache_total", "counter", "Response cache outcomes per endpoint")
+            for (method, template), metrics in items:
+                for outcome, count in sorted(metrics.cache.items()):
+                    lines.append(f"{prefix}_cache_total{_labels(method, template, outcome=outcome)} {count}")
+
+            for name, attribute, help_text in (
+                ("retries_total", "retries", "Retried attempts per endpoint"),
+                ("response_bytes_total", "bytes_received", "Response body bytes per endpoint, decompressed"),
+                ("response_wire_bytes_total", "wire_bytes", "Response body bytes received over the network"),
+                ("decode_seconds_total", "decode_seconds", "Time spent decoding response bodies"),
+            ):
+                family(name, "counter", help_text)
+                for (method, template), metrics in items:
+                    lines.append(f"{prefix}_{name}{_labels(method, template)} {getattr(metrics, attribute)}")
+
+            for name, attribute, help_text in (
+                ("request_latency_seconds", "latency", "Network latency per HTTP attempt"),
+                ("queue_wait_seconds", "queue_wait", "Time spent waiting in the request scheduler"),
+            ):
+                family(name, "histogram", help_text)
+                for (method, template), metrics in items:
+                    histogram = getattr(metrics, attribute)
+                    for bound, count in zip(PROMETHEUS_BUCKETS, histogram.cumulative()):
+                        lines.append(f"{prefix}_{name}_bucket{_labels(method, template, le=bound)} {count}")
+                    lines.append(f"{prefix}_{name}_bucket{_labels(method, template, le='+Inf')} {histogram.count}")
+                    lines.append(f"{prefix}_{name}_sum{_labels(method, template)} {histogram.total}")
+                    lines.append(f"{prefix}_{name}_count{_labels(method, template)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def pools_to_prometheus(pools: Dict[str, Dict[str, Any]], prefix: str = "solana_detective") -> str:
+    """Export connection pool statistics (see PooledAdapter.pool_stats) in the Prometheus text format"""
+    lines = []
+    for name, key, kind, help_text in (
+        ("pool_maxsize", "maxsize", "gauge", "Connections kept per host"),
+        ("pool_in_use_connections", "in_use", "gauge", "Connections checked out of the pool"),
+        ("pool_idle_connections", "idle", "gauge", "Open connections waiting in the pool"),
+        ("pool_connections_opened_total", "connections_opened", "counter", "Connections opened (TCP/TLS handshakes)"),
+        ("pool_requests_total", "requests", "counter", "Requests sent over pooled connections"),
+        ("pool_discarded_total", "discarded", "counter", "Connections closed because the pool was full"),
+        ("pool_wait_seconds_total", "wait_seconds", "counter", "Time spent waiting for a pooled connection"),
+        ("pool_http2_responses_total", "http2_responses", "counter", "Responses received over HTTP/2"),
+    ):
+        # HTTP/1.1 and HTTP/2 pools report different statistics
+        samples = [(host, stats[key]) for host, stats in sorted(pools.items()) if key in stats]
+        if not samples:
+            continue
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for host, value in samples:
+            lines.append(f'{prefix}_{name}{{host="{_escape(host)}"}} {value}')
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _labels(method: str, template: str, **extra: Any) -> str:
+    """Render a Prometheus label set"""
+    pairs = [("method", method), ("endpoint", template)] + list(extra.items())
+    rendered = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return "{" + rendered + "}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
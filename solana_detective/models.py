@@ -0,0 +1,129 @@
+"""
+Typed response models for Solana Detective package
+msgspec Structs for the large, frequently used endpoints
+
+Only defined when msgspec is installed. Enable with `typed_responses=True`;
+endpoints without a model keep returning dictionaries.
+"""
+
+from typing import Any, Dict, List, Optional
+
+try:
+    import msgspec
+except ImportError:  # typed responses are optional
+    msgspec = None
+
+# Model name -> decode type. Empty without msgspec.
+RESPONSE_TYPES: Dict[str, Any] = {}
+
+if msgspec is not None:
+
+    class Value(msgspec.Struct):
+        """Amount in quote (SOL) and USD"""
+        quote: Optional[float] = None
+        usd: Optional[float] = None
+
+    class Holder(msgspec.Struct):
+        """Token holder (holders pages use `wallet`, top holders use `address`)"""
+        wallet: Optional[str] = None
+        address: Optional[str] = None
+        amount: float = 0.0
+        percentage: float = 0.0
+        value: Optional[Value] = None
+
+    class HoldersPage(msgspec.Struct):
+        """Page of /tokens/{token}/holders"""
+        total: int = 0
+        accounts: List[Holder] = []
+
+    class TradeLeg(msgspec.Struct):
+        """One side of a wallet trade"""
+        address: Optional[str] = None
+        amount: Optional[float] = None
+        token: Optional[Dict[str, Any]] = None
+
+    class WalletTrade(msgspec.Struct):
+        """Trade from /wallet/{owner}/trades"""
+        tx: Optional[str] = None
+        wallet: Optional[str] = None
+        program: Optional[str] = None
+        time: Optional[int] = None
+        # Price and volume legs occasionally carry "" instead of numbers
+        price: Optional[Dict[str, Any]] = None
+        volume: Optional[Dict[str, Any]] = None
+        from_: Optional[TradeLeg] = msgspec.field(default=None, name="from")
+        to: Optional[TradeLeg] = None
+
+    class WalletTradesPage(msgspec.Struct):
+        """Page of /wallet/{owner}/trades"""
+        trades: List[WalletTrade] = []
+        nextCursor: Optional[int] = None
+        hasNextPage: bool = False
+
+    class TokenPnL(msgspec.Struct):
+        """PnL of one wallet on one token"""
+        holding: float = 0.0
+        held: float = 0.0
+        sold: float = 0.0
+        realized: float = 0.0
+        unrealized: float = 0.0
+        total: float = 0.0
+        total_sold: float = 0.0
+        total_invested: float = 0.0
+        average_buy_amount: float = 0.0
+        current_value: float = 0.0
+        cost_basis: float = 0.0
+        first_buy_time: Optional[int] = None
+        last_buy_time: Optional[int] = None
+        last_sell_time: Optional[int] = None
+        last_trade_time: Optional[int] = None
+        buy_transactions: Optional[int] = None
+        sell_transactions: Optional[int] = None
+        total_transactions: Optional[int] = None
+
+    class PnLSummary(msgspec.Struct):
+        """Summary block of /pnl/{wallet}"""
+        realized: float = 0.0
+        unrealized: float = 0.0
+        total: float = 0.0
+        totalInvested: float = 0.0
+        averageBuyAmount: float = 0.0
+        totalWins: int = 0
+        totalLosses: int = 0
+        winPercentage: float = 0.0
+        lossPercentage: float = 0.0
+
+    class WalletPnL(msgspec.Struct):
+        """Response of /pnl/{wallet}"""
+        tokens: Dict[str, TokenPnL] = {}
+        summary: Optional[PnLSummary] = None
+
+    class Candle(msgspec.Struct):
+        """OHLCV candle"""
+        open: float = 0.0
+        close: float = 0.0
+        low: float = 0.0
+        high: float = 0.0
+        volume: float = 0.0
+        time: int = 0
+
+    class Chart(msgspec.Struct):
+        """Response of /chart/{token}"""
+        oclhv: List[Candle] = []
+
+    class Price(msgspec.Struct):
+        """Response of /price"""
+        price: Optional[float] = None
+        liquidity: Optional[float] = None
+        marketCap: Optional[float] = None
+        lastUpdated: Optional[int] = None
+
+    RESPONSE_TYPES.update({
+        "holders": HoldersPage,
+        "holders_top": List[Holder],
+        "wallet_trades": WalletTradesPage,
+        "wallet_pnl": WalletPnL,
+        "token_pnl": TokenPnL,
+        "chart": Chart,
+        "price": Price,
+    })
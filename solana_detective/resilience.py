@@ -0,0 +1,197 @@
+"""
+Tail-latency controls for Solana Detective package
+Per-endpoint-family circuit breakers and hedged request support
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Dict, Any, Optional
+
+from .exceptions import CircuitOpenError
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def endpoint_family(endpoint: str) -> str:
+    """
+    Group an endpoint path by its first segment
+
+    Example:
+        "/tokens/abc/holders" -> "/tokens"
+    """
+    return "/" + endpoint.lstrip("/").split("/", 1)[0].split("?", 1)[0]
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one endpoint family
+
+    After `failure_threshold` consecutive failures (timeouts, connection
+    errors, 5xx) the circuit opens and calls fail fast with CircuitOpenError.
+    Once `recovery_timeout` has passed, a limited number of probe calls are
+    let through (half-open); a successful probe closes the circuit, a failed
+    one opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5,
+                 recovery_timeout: float = 30, half_open_max_calls: int = 1):
+        """
+        Initialize circuit breaker
+
+        Args:
+            name: Endpoint family guarded by this breaker
+            failure_threshold: Consecutive failures that trip the circuit
+            recovery_timeout: Seconds to stay open before probing
+            half_open_max_calls: Concurrent probe calls allowed while half-open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._trips = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving open -> half-open once the recovery timeout passed"""
+        with self._lock:
+            self._refresh(time.monotonic())
+            return self._state
+
+    def _refresh(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+
+    def before_call(self) -> None:
+        """
+        Admit a call or fail fast
+
+        Raises:
+            CircuitOpenError: When the circuit is open or all probes are taken
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return
+            retry_after = max(0.0, self.recovery_timeout - (now - self._opened_at))
+        raise CircuitOpenError(
+            f"Circuit open for {self.name} endpoints. Retry after {retry_after:.1f} seconds",
+            retry_after=retry_after
+        )
+
+    def record_success(self) -> None:
+        """Record a successful call"""
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._state = CLOSED
+                self._probes = 0
+
+    def record_failure(self) -> None:
+        """Record a failed call"""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._trips += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker state and counters"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "trips": self._trips
+        }
+
+
+class LatencyTracker:
+    """Rolling window of recent successful latencies for one endpoint family"""
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize latency tracker
+
+        Args:
+            window: Number of recent samples kept
+        """
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window)
+
+    def record(self, latency: float) -> None:
+        """Add a latency sample in seconds"""
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Latency at the given percentile
+
+        Args:
+            percentile: Percentile between 0 and 100
+            min_samples: Return None until this many samples were seen
+
+        Returns:
+            Latency in seconds, or None without enough samples
+        """
+        with self._lock:
+            if len(self._samples) < max(1, min_samples):
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(percentile / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """Caps hedged copies to a fraction of all hedge-eligible requests"""
+
+    def __init__(self, ratio: float = 0.1):
+        """
+        Initialize hedge budget
+
+        Args:
+            ratio: Maximum hedged copies per eligible request
+        """
+        self.ratio = ratio
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record_request(self) -> None:
+        """Count one hedge-eligible request"""
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self) -> bool:
+        """Take budget for one hedged copy"""
+        with self._lock:
+            if self.hedges + 1 > self.ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def record_win(self) -> None:
+        """Count a hedged copy that answered first"""
+        with self._lock:
+            self.hedge_wins += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Request, hedge and hedge-win counters"""
+        with self._lock:
+            return {"requests": self.requests, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
@@ -0,0 +1,293 @@
+"""
+Request scheduler for Solana Detective package
+Priority lanes with weighted fair queueing over one shared rate limit
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import deque
+from typing import Dict, Any, Optional, Tuple, Iterator
+
+from .concurrency import AdaptiveConcurrencyLimiter
+
+# Built-in lanes
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+DEFAULT_LANE_WEIGHTS = {
+    INTERACTIVE: 16,
+    BATCH: 1
+}
+
+_current_lane: ContextVar = ContextVar("solana_detective_lane", default=None)
+
+
+@contextmanager
+def request_lane(lane: str, tenant: str = None) -> Iterator[None]:
+    """
+    Route every request made inside the block through a scheduler lane
+
+    Args:
+        lane: Lane name (e.g. "interactive", "batch")
+        tenant: Optional tenant name for fair sharing inside the lane
+    """
+    token = _current_lane.set((lane, tenant))
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+def current_lane() -> Optional[Tuple[str, Optional[str]]]:
+    """Return the (lane, tenant) pair set by the innermost request_lane block"""
+    return _current_lane.get()
+
+
+class TokenBucket:
+    """Token bucket rate limiter (not thread-safe, guarded by the scheduler lock)"""
+
+    def __init__(self, rate: float, burst: float = 1):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Tokens added per second (0 disables rate limiting)
+            burst: Maximum number of tokens held at once
+        """
+        self.rate = rate
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available (0 when one is available now)"""
+        if not self.rate:
+            return 0.0
+        self._refill(now)
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def consume(self, now: float) -> None:
+        """Take one token"""
+        if self.rate:
+            self._refill(now)
+            self._tokens -= 1
+
+
+class _Waiter:
+    __slots__ = ("lane", "tenant", "event", "enqueued")
+
+    def __init__(self, lane: str, tenant: Optional[str]):
+        self.lane = lane
+        self.tenant = tenant
+        self.event = threading.Event()
+        self.enqueued = time.monotonic()
+
+
+class _Flow:
+    """A fair-queueing flow: virtual finish tag plus either waiters or child flows"""
+    __slots__ = ("weight", "tag", "last", "vtime", "queue", "children")
+
+    def __init__(self, weight: float):
+        self.weight = float(weight)
+        self.tag = 0.0
+        self.last = 0.0
+        # Virtual time of the child flows: tag of the last child dispatched
+        self.vtime = 0.0
+        self.queue = deque()
+        self.children: Dict[Optional[str], "_Flow"] = {}
+
+
+class RequestScheduler:
+    """
+    Admission scheduler shared by every request of one or more clients
+
+    Requests wait in priority lanes. Lanes share the rate limit by weighted
+    fair queueing, and tenants inside a lane share the lane the same way, so
+    a crawl running in the batch lane only gets the capacity interactive
+    callers leave unused (plus a small guaranteed share set by the weights).
+
+    With a concurrency limiter attached, a request is only dispatched when
+    the limiter also has a free slot; callers must then report the outcome
+    through release().
+    """
+
+    def __init__(self,
+                 rate_limit_delay: float = 0.1,
+                 burst: float = 1,
+                 lane_weights: Dict[str, float] = None,
+                 tenant_weights: Dict[str, float] = None,
+                 default_lane: str = INTERACTIVE,
+                 limiter: AdaptiveConcurrencyLimiter = None):
+        """
+        Initialize request scheduler
+
+        Args:
+            rate_limit_delay: Minimum spacing between requests in seconds (0 disables)
+            burst: Number of requests allowed back to back before spacing applies
+            lane_weights: Relative share of each lane when all lanes are busy
+            tenant_weights: Relative share of each tenant inside its lane (default 1)
+            default_lane: Lane used when the caller does not pick one
+            limiter: Concurrency limiter gating dispatch (optional)
+        """
+        rate = 1.0 / rate_limit_delay if rate_limit_delay else 0
+        self._bucket = TokenBucket(rate, burst)
+        self.lane_weights = dict(lane_weights or DEFAULT_LANE_WEIGHTS)
+        self.tenant_weights = dict(tenant_weights or {})
+        self.default_lane = default_lane
+        self.limiter = limiter
+
+        self._lock = threading.Lock()
+        self._root = _Flow(1)
+        self._vtime = 0.0
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    @classmethod
+    def from_config(cls, config) -> "RequestScheduler":
+        """Create scheduler from a Config object"""
+        limiter = None
+        if config.get("adaptive_concurrency", True):
+            limiter = AdaptiveConcurrencyLimiter(
+                initial_limit=config.get("concurrency_limit_initial", 8),
+                min_limit=config.get("concurrency_limit_min", 1),
+                max_limit=config.get("concurrency_limit_max", 100),
+                backoff_ratio=config.get("concurrency_backoff_ratio", 0.5),
+                latency_tolerance=config.get("concurrency_latency_tolerance", 2.0)
+            )
+        return cls(
+            rate_limit_delay=config.get("rate_limit_delay"),
+            burst=config.get("rate_limit_burst", 1),
+            lane_weights=config.get("scheduler_lane_weights"),
+            tenant_weights=config.get("scheduler_tenant_weights"),
+            default_lane=config.get("default_lane", INTERACTIVE),
+            limiter=limiter
+        )
+
+    # ---- fair queueing bookkeeping (callers hold self._lock) ----
+
+    def _child(self, parent: _Flow, name: Optional[str], weight: float) -> _Flow:
+        flow = parent.children.get(name)
+        if flow is None:
+            flow = parent.children[name] = _Flow(weight)
+        return flow
+
+    def _activate(self, flow: _Flow, vtime: float) -> None:
+        """Give a flow that just became backlogged its next finish tag"""
+        flow.tag = max(flow.last, vtime) + 1.0 / flow.weight
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        lane = self._child(self._root, waiter.lane, self.lane_weights.get(waiter.lane, 1))
+        tenant = self._child(lane, waiter.tenant, self.tenant_weights.get(waiter.tenant, 1))
+        if not lane.queue:
+            self._activate(lane, self._vtime)
+        if not tenant.queue:
+            # Tenant tags are on the lane's own clock, not the lane-level one
+            self._activate(tenant, lane.vtime)
+            lane.queue.append(tenant)
+        tenant.queue.append(waiter)
+
+    def _peek(self) -> Optional[_Waiter]:
+        lanes = [flow for flow in self._root.children.values() if flow.queue]
+        if not lanes:
+            return None
+        lane = min(lanes, key=lambda flow: flow.tag)
+        tenant = min(lane.queue, key=lambda flow: flow.tag)
+        return tenant.queue[0]
+
+    def _dispatch(self, waiter: _Waiter) -> None:
+        lane = self._root.children[waiter.lane]
+        tenant = lane.children[waiter.tenant]
+        tenant.queue.popleft()
+
+        self._vtime = lane.last = lane.tag
+        lane.vtime = tenant.last = tenant.tag
+        if tenant.queue:
+            tenant.tag = tenant.last + 1.0 / tenant.weight
+        else:
+            lane.queue.remove(tenant)
+        if lane.queue:
+            lane.tag = lane.last + 1.0 / lane.weight
+
+    # ---- public API ----
+
+    def acquire(self, lane: str = None, tenant: str = None) -> float:
+        """
+        Block until the request may be sent
+
+        Args:
+            lane: Lane to queue in (default: scheduler default lane)
+            tenant: Tenant to account the request to
+
+        Returns:
+            Seconds spent waiting in the queue
+        """
+        waiter = _Waiter(lane or self.default_lane, tenant)
+        with self._lock:
+            self._enqueue(waiter)
+
+        while True:
+            with self._lock:
+                delay = None
+                if self._peek() is waiter:
+                    now = time.monotonic()
+                    delay = self._bucket.delay(now)
+                    if delay <= 0 and self.limiter is not None and not self.limiter.try_acquire():
+                        # Woken again by release() when a slot frees up
+                        delay = None
+                    elif delay <= 0:
+                        self._bucket.consume(now)
+                        self._dispatch(waiter)
+                        waited = now - waiter.enqueued
+                        self._record(waiter.lane, waited)
+                        following = self._peek()
+                        if following is not None:
+                            following.event.set()
+                        return waited
+                waiter.event.clear()
+            waiter.event.wait(delay)
+
+    def release(self, latency: float, overloaded: bool = False) -> None:
+        """
+        Report a finished request to the concurrency limiter
+
+        Args:
+            latency: Request latency in seconds
+            overloaded: True for 429/5xx responses, timeouts and connection errors
+        """
+        if self.limiter is None:
+            return
+        self.limiter.release(latency, overloaded)
+        with self._lock:
+            head = self._peek()
+            if head is not None:
+                head.event.set()
+
+    def _record(self, lane: str, waited: float) -> None:
+        stats = self._stats.setdefault(lane, {"dispatched": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0})
+        stats["dispatched"] += 1
+        stats["wait_seconds"] += waited
+        stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+
+    def queued(self) -> Dict[str, int]:
+        """Number of requests currently waiting, per lane"""
+        with self._lock:
+            return {
+                name: sum(len(tenant.queue) for tenant in flow.queue)
+                for name, flow in self._root.children.items()
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        """Dispatch counts and queue waits per lane, plus limiter state"""
+        with self._lock:
+            stats = {lane: dict(values) for lane, values in self._stats.items()}
+        if self.limiter is not None:
+            stats["concurrency"] = self.limiter.stats()
+        return stats
@@ -0,0 +1,137 @@
+"""
+Incremental JSON parsing for Solana Detective package
+Yields array elements of very large responses one at a time
+"""
+
+import json
+import codecs
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+# Consumed text is dropped from the buffer once this many characters piled up
+_COMPACT_THRESHOLD = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",:]}" + _WHITESPACE
+
+
+class _Reader:
+    """Text buffer over a chunk iterator that grows on demand and drops consumed text"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Append the next chunk; False once the body is exhausted"""
+        if self.pos >= _COMPACT_THRESHOLD:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.buf += self._utf8.decode(chunk)
+                return True
+        if not self.exhausted:
+            self.buf += self._utf8.decode(b"", final=True)
+            self.exhausted = True
+        return False
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of body)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume one of `chars` or raise"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Malformed JSON: expected one of {chars!r} at offset {self.pos}, got {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more chunks as needed"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if not self.fill():
+                    raise ValueError(f"Malformed JSON: {e}") from None
+                continue
+            # A value not followed by a delimiter may be cut short (e.g. "3." of "3.25")
+            if not self.exhausted and (end >= len(self.buf) or self.buf[end] not in _DELIMITERS):
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_array_items(chunks: Iterable[bytes],
+                     keys: Optional[Set[str]] = None,
+                     meta: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[Optional[str], Any]]:
+    """
+    Stream the elements of top-level JSON arrays
+
+    Handles two shapes: a top-level array (`[...]`, yielded with key None)
+    and a top-level object whose members are arrays (`{"accounts": [...]}`,
+    yielded with the member name). Only the element being parsed is held in
+    memory, so peak memory does not grow with the size of the response.
+    Elements are decoded by the C-accelerated stdlib scanner.
+
+    Args:
+        chunks: Raw body chunks (e.g. response.iter_content())
+        keys: Object members to stream (default: every array member)
+        meta: Optional dict filled with the other top-level members (e.g. "total")
+
+    Yields:
+        (key, element) tuples
+
+    Raises:
+        ValueError: When the body is not valid JSON
+    """
+    reader = _Reader(chunks)
+    opening = reader.expect("[{")
+
+    if opening == "[":
+        yield from _iter_array(reader, None)
+    else:
+        if reader.peek() == "}":
+            reader.pos += 1
+        else:
+            while True:
+                key = reader.value()
+                if not isinstance(key, str):
+                    raise ValueError("Malformed JSON: object key is not a string")
+                reader.expect(":")
+                if reader.peek() == "[" and (keys is None or key in keys):
+                    reader.pos += 1
+                    yield from _iter_array(reader, key)
+                else:
+                    value = reader.value()
+                    if meta is not None:
+                        meta[key] = value
+                if reader.expect(",}") == "}":
+                    break
+
+    if reader.peek():
+        raise ValueError("Malformed JSON: trailing data after top-level value")
+
+
+def _iter_array(reader: _Reader, key: Optional[str]) -> Iterator[Tuple[Optional[str], Any]]:
+    """Yield the elements of an array whose opening bracket was just consumed"""
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield key, reader.value()
+        if reader.expect(",]") == "]":
+            return
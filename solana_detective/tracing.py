@@ -0,0 +1,90 @@
+"""
+OpenTelemetry tracing for Solana Detective package
+Request spans with separate rate-limit wait, network and decode child spans
+"""
+
+from typing import Any
+
+try:
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # tracing is optional
+    otel_trace = None
+
+from .hooks import RequestEvent
+
+TRACER_NAME = "solana_detective"
+
+
+class TracingMiddleware:
+    """
+    Hook middleware emitting one OpenTelemetry span per call
+
+    The call span ("GET /tokens/{token}/holders") gets a child span for every
+    recorded phase: rate_limit_wait (scheduler / rate limiter), http (network,
+    one per attempt or hedged copy) and decode (JSON parsing). Child spans are
+    created with the phase's own start and end times, so a slow call shows at
+    a glance whether throttling, the network or parsing took the time.
+    """
+
+    def __init__(self, tracer: Any = None):
+        """
+        Initialize tracing middleware
+
+        Args:
+            tracer: OpenTelemetry Tracer (default: from the global tracer provider)
+
+        Raises:
+            ValueError: When opentelemetry-api is not installed
+        """
+        if otel_trace is None:
+            raise ValueError("Tracing requires the opentelemetry-api package (pip install opentelemetry-api)")
+        self.tracer = tracer or otel_trace.get_tracer(TRACER_NAME)
+
+    def before_request(self, event: RequestEvent) -> None:
+        event.state["span"] = self.tracer.start_span(
+            f"{event.method} {event.template}",
+            kind=SpanKind.CLIENT,
+            start_time=event.started_ns,
+            attributes={
+                "http.method": event.method,
+                "http.url": event.url,
+                "http.route": event.template,
+                "solana_detective.lane": event.lane,
+                "solana_detective.tenant": event.tenant or ""
+            }
+        )
+
+    def on_retry(self, event: RequestEvent) -> None:
+        span = event.state.get("span")
+        if span is not None:
+            attributes = {"attempt": event.attempt, "delay": event.retry_delay}
+            if event.status_code is not None and event.error is None:
+                attributes["http.status_code"] = event.status_code
+            if event.error is not None:
+                attributes["error"] = type(event.error).__name__
+            span.add_event("retry", attributes=attributes)
+
+    def after_response(self, event: RequestEvent) -> None:
+        self._finish(event)
+
+    def on_error(self, event: RequestEvent) -> None:
+        span = event.state.get("span")
+        if span is not None:
+            span.record_exception(event.error)
+            span.set_status(Status(StatusCode.ERROR, str(event.error)))
+        self._finish(event)
+
+    def _finish(self, event: RequestEvent) -> None:
+        span = event.state.pop("span", None)
+        if span is None:
+            return
+        context = otel_trace.set_span_in_context(span)
+        for phase in event.phases:
+            child = self.tracer.start_span(phase.name, context=context, start_time=phase.start_ns,
+                                           attributes=phase.attributes)
+            child.end(end_time=phase.end_ns)
+        if event.status_code is not None:
+            span.set_attribute("http.status_code", event.status_code)
+        span.set_attribute("solana_detective.retries", event.attempt)
+        span.end(end_time=event.started_ns + int(event.elapsed * 1e9))
@@ -0,0 +1,397 @@
+"""
+Shared HTTP transport for Solana Detective package
+Process-wide requests sessions with tunable, instrumented connection pools
+
+A session only holds connection pools here: the API key and the other
+headers are sent with each request, and cookies are not kept, so clients
+with different keys can share one. Clients with the same pool settings share
+a session; sessions are dropped in forked children, which open their own
+connections.
+"""
+
+import os
+import time
+import socket
+import http.client
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+from urllib3.util.request import ACCEPT_ENCODING
+
+logger = logging.getLogger(__name__)
+
+# Content codings in order of preference: best ratio and fastest decoding first
+PREFERRED_ENCODINGS = ("zstd", "br", "gzip", "deflate")
+# Seconds warm_up() waits for a pool slot when pool_block is set
+WARMUP_POOL_TIMEOUT = 0.05
+
+
+class PoolSettings(NamedTuple):
+    """Connection pool and TCP keep-alive settings (hashable, keys the shared sessions)"""
+    connections: int = 10         # hosts with a cached pool
+    maxsize: int = 32             # connections kept per host
+    block: bool = False           # wait for a free connection instead of opening a throwaway one
+    keepalive: bool = True        # TCP keep-alive probes on idle connections
+    keepalive_idle: int = 60      # seconds idle before the first probe
+    keepalive_interval: int = 10  # seconds between probes
+    keepalive_count: int = 5      # failed probes before the connection is dropped
+    http2: bool = False           # HTTP/2 through httpx (see http2.py)
+    http2_prior_knowledge: bool = False  # HTTP/2 without negotiation on plain http:// URLs
+
+    @classmethod
+    def from_config(cls, config: Any) -> "PoolSettings":
+        return cls(
+            connections=config.get("pool_connections"),
+            maxsize=config.get("pool_maxsize"),
+            block=config.get("pool_block"),
+            keepalive=config.get("tcp_keepalive"),
+            keepalive_idle=config.get("tcp_keepalive_idle"),
+            keepalive_interval=config.get("tcp_keepalive_interval"),
+            keepalive_count=config.get("tcp_keepalive_count"),
+            http2=config.get("http2"),
+            http2_prior_knowledge=config.get("http2_prior_knowledge")
+        )
+
+    def socket_options(self) -> List[tuple]:
+        """urllib3 socket options: Nagle off, plus keep-alive where the platform supports it"""
+        options = list(HTTPConnection.default_socket_options)
+        if not self.keepalive:
+            return options
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        # Linux names the idle time TCP_KEEPIDLE, macOS TCP_KEEPALIVE
+        idle = getattr(socket, "TCP_KEEPIDLE", None) or getattr(socket, "TCP_KEEPALIVE", None)
+        for option, value in ((idle, self.keepalive_idle),
+                              (getattr(socket, "TCP_KEEPINTVL", None), self.keepalive_interval),
+                              (getattr(socket, "TCP_KEEPCNT", None), self.keepalive_count)):
+            if option is not None:
+                options.append((socket.IPPROTO_TCP, option, value))
+        return options
+
+
+class _CountingReader:
+    """Socket file wrapper counting the bytes read through it"""
+
+    def __init__(self, fp):
+        self._fp = fp
+        self.count = 0
+
+    def read(self, *args) -> bytes:
+        data = self._fp.read(*args)
+        self.count += len(data)
+        return data
+
+    def read1(self, *args) -> bytes:
+        data = self._fp.read1(*args)
+        self.count += len(data)
+        return data
+
+    def readline(self, *args) -> bytes:
+        line = self._fp.readline(*args)
+        self.count += len(line)
+        return line
+
+    def readinto(self, buffer) -> int:
+        size = self._fp.readinto(buffer)
+        self.count += size or 0
+        return size
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fp, name)
+
+
+class _CountingHTTPResponse(http.client.HTTPResponse):
+    """http.client response counting the body bytes received (before decoding, chunk framing included)"""
+
+    body_reader: Optional[_CountingReader] = None
+
+    def begin(self) -> None:
+        super().begin()
+        # Headers are parsed: everything read from here on is the body
+        if self.fp is not None:
+            self.fp = self.body_reader = _CountingReader(self.fp)
+
+
+class _CountingConnection:
+    """urllib3 connection whose responses count their body bytes"""
+
+    last_response: Optional[_CountingHTTPResponse] = None
+
+    def response_class(self, sock, *args, **kwargs) -> _CountingHTTPResponse:
+        # http.client creates every response through this attribute
+        self.last_response = _CountingHTTPResponse(sock, *args, **kwargs)
+        return self.last_response
+
+
+class _CountingHTTPConnection(_CountingConnection, HTTPConnection):
+    pass
+
+
+class _CountingHTTPSConnection(_CountingConnection, HTTPSConnection):
+    pass
+
+
+class _InstrumentedPool:
+    """Counts pool waits and connections discarded because the pool was full"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.maxsize = self.pool.maxsize
+        self.discarded = 0
+        self.wait_seconds = 0.0
+
+    def _get_conn(self, timeout=None):
+        started = time.perf_counter()
+        try:
+            return super()._get_conn(timeout)
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.wait_seconds += waited
+
+    def _put_conn(self, conn) -> None:
+        pool = self.pool
+        if conn is not None and pool is not None and pool.full():
+            with self._stats_lock:
+                self.discarded += 1
+        super()._put_conn(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self.pool
+        free = list(pool.queue) if pool is not None else []
+        return {
+            "maxsize": self.maxsize,
+            # Slots hold None until a connection has been opened in them
+            "in_use": max(0, self.maxsize - len(free)),
+            "idle": sum(1 for conn in free if conn is not None),
+            "connections_opened": self.num_connections,
+            "requests": self.num_requests,
+            "discarded": self.discarded,
+            "wait_seconds": self.wait_seconds
+        }
+
+
+class _InstrumentedHTTPConnectionPool(_InstrumentedPool, HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _InstrumentedHTTPSConnectionPool(_InstrumentedPool, HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with configurable pool sizes and keep-alive, and pool statistics
+
+    Retries are left to the client (max_retries=0) so every attempt is scheduled.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["settings"]
+
+    def __init__(self, settings: PoolSettings = None):
+        self.settings = settings or PoolSettings()
+        super().__init__(pool_connections=self.settings.connections,
+                         pool_maxsize=self.settings.maxsize,
+                         pool_block=self.settings.block,
+                         max_retries=0)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault("socket_options", self.settings.socket_options())
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _InstrumentedHTTPConnectionPool,
+            "https": _InstrumentedHTTPSConnectionPool
+        }
+
+    def build_response(self, req, resp) -> requests.Response:
+        response = super().build_response(req, resp)
+        # The body has not been read yet and the connection is still attached
+        # to the response, so its byte counter belongs to this response
+        connection = getattr(resp, "connection", None)
+        response._body_reader = getattr(getattr(connection, "last_response", None), "body_reader", None)
+        return response
+
+    def warm_up(self, url: str, connections: int, verify: Any = True,
+                proxies: Dict[str, str] = None, cert: Any = None) -> int:
+        """
+        Open connections to a host ahead of the first requests
+
+        Pools are keyed by the TLS settings, so pass the verify / proxies / cert
+        the requests will be sent with (Session.merge_environment_settings).
+
+        Args:
+            url: Any URL on the host (e.g. the API base URL)
+            connections: Idle connections wanted (capped at the pool size)
+            verify: TLS verification (bool or CA bundle path)
+            proxies: Proxies by scheme
+            cert: Client certificate
+
+        Returns:
+            Connections opened (already open idle connections count towards the
+            total; slots in use are skipped)
+        """
+        count = min(connections, self.settings.maxsize)
+        if count <= 0:
+            return 0
+        if hasattr(self, "get_connection_with_tls_context"):
+            request = requests.Request("GET", url).prepare()
+            pool = self.get_connection_with_tls_context(request, verify, proxies=proxies, cert=cert)
+        else:
+            # requests < 2.32: pools are keyed by URL and proxy only
+            pool = self.get_connection(url, proxies)
+        if not (hasattr(pool, "_get_conn") and hasattr(pool, "_put_conn")):
+            logger.debug("Connection warm-up skipped: unsupported urllib3 connection pool")
+            return 0
+        # Check out every slot first so each one is opened exactly once; with
+        # pool_block only the slots free now are warmed instead of waiting
+        conns = []
+        for _ in range(count):
+            try:
+                conns.append(pool._get_conn(timeout=WARMUP_POOL_TIMEOUT))
+            except EmptyPoolError:
+                break
+        if not conns:
+            return 0
+
+        def open_one(conn) -> bool:
+            if conn.sock is not None:
+                return False
+            try:
+                conn.connect()
+                return True
+            except Exception as e:
+                logger.debug(f"Connection warm-up to {url} failed: {e}")
+                conn.close()
+                return False
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(conns), thread_name_prefix="solana-detective-warmup") as executor:
+                return sum(executor.map(open_one, conns))
+        finally:
+            for conn in conns:
+                pool._put_conn(conn)
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host pool utilization, keyed by "scheme://host:port" """
+        stats = {}
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if isinstance(pool, _InstrumentedPool):
+                stats[f"{pool.scheme}://{pool.host}:{pool.port}"] = pool.stats()
+        return stats
+
+
+def accept_encoding(http2: bool = False) -> str:
+    """
+    Accept-Encoding value listing the content codings the transport can decode
+
+    zstd and br are offered when their decoders (zstandard, brotli) are
+    installed; gzip and deflate always are.
+
+    Args:
+        http2: Limit to the codings the HTTP/2 transport (httpx) decodes
+    """
+    available = set(ACCEPT_ENCODING.split(","))
+    if http2:
+        from .http2 import DECODABLE_ENCODINGS
+        available &= DECODABLE_ENCODINGS
+    return ", ".join(encoding for encoding in PREFERRED_ENCODINGS if encoding in available)
+
+
+def wire_size(response: requests.Response) -> Optional[int]:
+    """
+    Bytes of the response body read from the network, before decompression
+
+    None when the transport does not report it; 0 for responses replayed from
+    a cassette, which never touch the network.
+    """
+    reader = getattr(response, "_body_reader", None)
+    if reader is not None:
+        return reader.count
+    tell = getattr(response.raw, "tell", None)
+    if tell is None:
+        return None
+    try:
+        return tell()
+    except (OSError, ValueError):
+        return None
+
+
+_lock = threading.Lock()
+_sessions: Dict[PoolSettings, requests.Session] = {}
+
+
+def new_adapter(settings: PoolSettings = None) -> BaseAdapter:
+    """
+    HTTP adapter for pool settings: HTTP2Adapter with http2, PooledAdapter otherwise
+
+    Raises:
+        ValueError: When http2 is set and httpx / h2 are not installed
+    """
+    settings = settings or PoolSettings()
+    if settings.http2:
+        from .http2 import HTTP2Adapter
+        return HTTP2Adapter(settings)
+    return PooledAdapter(settings)
+
+
+def new_session(adapter: BaseAdapter = None) -> requests.Session:
+    """
+    Session with one adapter for http and https
+
+    Args:
+        adapter: Transport adapter (default PooledAdapter with default settings)
+    """
+    session = requests.Session()
+    adapter = adapter or PooledAdapter()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def shared_session(settings: PoolSettings = None) -> requests.Session:
+    """
+    Process-wide session for a pool configuration, created on first use
+
+    Args:
+        settings: Pool settings the session's adapter is built with
+
+    Raises:
+        ValueError: When http2 is set and httpx / h2 are not installed
+    """
+    settings = settings or PoolSettings()
+    with _lock:
+        session = _sessions.get(settings)
+        if session is None:
+            session = _sessions[settings] = new_session(new_adapter(settings))
+            # Shared between clients, so nothing from one response may leak into another's requests
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
+
+def close_shared_sessions() -> None:
+    """Close every shared session and its pooled connections"""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def _reset_after_fork() -> None:
+    global _lock
+    _lock = threading.Lock()
+    _sessions.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
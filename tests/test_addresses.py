@@ -0,0 +1,78 @@
+"""
+Tests for base58 coding and address validation
+"""
+
+import random
+import unittest
+
+from solana_detective.addresses import ALPHABET, address_key, b58decode, b58encode, is_address
+from solana_detective.endpoints import WALLET, validate_many
+from solana_detective.exceptions import ValidationError
+
+
+def reference_is_address(value) -> bool:
+    """Decode with plain integer arithmetic and check the key size"""
+    if not isinstance(value, str) or not value or any(char not in ALPHABET for char in value):
+        return False
+    number = 0
+    for char in value:
+        number = number * 58 + ALPHABET.index(char)
+    zeros = len(value) - len(value.lstrip("1"))
+    return zeros + (number.bit_length() + 7) // 8 == 32
+
+
+class Base58Test(unittest.TestCase):
+    def test_round_trip(self):
+        rng = random.Random(5)
+        for size in (0, 1, 2, 31, 32, 33, 64):
+            for zeros in (0, 1, 3):
+                data = bytes(zeros) + bytes(rng.randrange(256) for _ in range(size))
+                with self.subTest(size=size, zeros=zeros):
+                    self.assertEqual(b58decode(b58encode(data)), data)
+
+    def test_known_values(self):
+        self.assertEqual(b58encode(b"hello world"), "StV1DL6CwTryKyV")
+        self.assertEqual(b58encode(bytes(32)), "1" * 32)
+        self.assertEqual(b58decode("So11111111111111111111111111111111111111112")[:2], bytes([6, 155]))
+
+    def test_invalid_characters(self):
+        for value in ("0OIl", "abc ", "ü", None):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    b58decode(value)
+
+
+class IsAddressTest(unittest.TestCase):
+    def test_matches_reference_decoder(self):
+        rng = random.Random(6)
+        top = b58encode(b"\xff" * 32)
+        values = ["1" * 32, "1" * 31, "1" * 33, "1" * 31 + "2", top, top[:-1] + "z", "2" + top[1:],
+                  b58encode(bytes(31) + b"\1"), b58encode(b"\1" + bytes(31)), b58encode(b"\1" + bytes(32)),
+                  "", "So11111111111111111111111111111111111111112", 12345, None, b"1" * 32]
+        for _ in range(3000):
+            values.append("".join(rng.choice(ALPHABET) for _ in range(rng.randint(30, 46))))
+            key = bytes(rng.randint(0, 3)) + bytes(rng.randrange(256) for _ in range(rng.randint(28, 34)))
+            values.append(b58encode(key))
+        values += [value[:-1] + "0" for value in values[:50] if isinstance(value, str) and value]
+        for value in values:
+            self.assertEqual(is_address(value), reference_is_address(value), msg=repr(value))
+
+    def test_address_key(self):
+        key = bytes(range(32))
+        self.assertEqual(address_key(b58encode(key)), key)
+        with self.assertRaises(ValueError):
+            address_key(b58encode(key[1:]))
+
+    def test_validate_many_names_invalid_positions(self):
+        good = b58encode(bytes(range(1, 33)))
+        self.assertEqual(validate_many(iter([good, good])), [good, good])
+        with self.assertRaises(ValidationError) as caught:
+            validate_many([good, "bad", good] + ["0"] * 6, WALLET)
+        message = str(caught.exception)
+        self.assertIn("wallet", message.lower())
+        self.assertIn("7 of 9", message)
+        self.assertIn("and 2 more", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
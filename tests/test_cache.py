@@ -0,0 +1,126 @@
+"""
+Tests for the response cache and conditional revalidation
+"""
+
+import json
+import unittest
+
+import requests
+
+from solana_detective import SolanaDetective
+from solana_detective.addresses import b58encode
+from solana_detective.cache import CacheEntry, ResponseCache
+
+TOKEN = b58encode(bytes([4]) * 32)
+
+
+class _Server:
+    """Fake session.request honouring If-None-Match and If-Modified-Since"""
+
+    def __init__(self):
+        self.body = {"price": 1}
+        self.etag = '"v1"'
+        self.last_modified = None
+        self.honour_validators = True
+        self.cache_control = None
+        self.requests = []
+
+    def __call__(self, method, url, headers=None, **kwargs):
+        headers = headers or {}
+        self.requests.append(headers)
+        response = requests.Response()
+        response.request = requests.Request(method, url).prepare()
+        if self.honour_validators and (
+                (self.etag and headers.get("If-None-Match") == self.etag) or
+                (self.last_modified and headers.get("If-Modified-Since") == self.last_modified)):
+            response.status_code = 304
+            response._content = b""
+            return response
+        response.status_code = 200
+        response._content = json.dumps(self.body).encode()
+        for name, value in (("ETag", self.etag), ("Last-Modified", self.last_modified),
+                            ("Cache-Control", self.cache_control)):
+            if value:
+                response.headers[name] = value
+        return response
+
+
+class RevalidationTest(unittest.TestCase):
+    def setUp(self):
+        self.client = SolanaDetective(api_key="k", rate_limit_delay=0, response_cache=True, metrics_enabled=True)
+        self.server = self.client.session.request = _Server()
+
+    def expire(self):
+        for entry in self.client.cache._entries.values():
+            entry.expires = 0
+
+    def outcomes(self):
+        return self.client.metrics_registry.snapshot()["GET /tokens/{token}"]["cache"]
+
+    def test_fresh_entries_make_no_request(self):
+        first = self.client.get_token_info(TOKEN)
+        self.assertIs(self.client.get_token_info(TOKEN), first)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.outcomes(), {"miss": 1, "hit": 1})
+
+    def test_stale_entry_revalidated_with_etag(self):
+        first = self.client.get_token_info(TOKEN)
+        self.expire()
+        self.assertIs(self.client.get_token_info(TOKEN), first)
+        self.assertEqual(self.server.requests[1].get("If-None-Match"), '"v1"')
+        self.assertEqual(self.outcomes(), {"miss": 1, "not_modified": 1})
+        # The 304 started a new TTL period
+        self.client.get_token_info(TOKEN)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_stale_entry_revalidated_with_last_modified(self):
+        self.server.etag = None
+        self.server.last_modified = "Mon, 19 Oct 2026 08:00:00 GMT"
+        first = self.client.get_token_info(TOKEN)
+        self.expire()
+        self.assertIs(self.client.get_token_info(TOKEN), first)
+        self.assertNotIn("If-None-Match", self.server.requests[1])
+        self.assertEqual(self.server.requests[1]["If-Modified-Since"], self.server.last_modified)
+
+    def test_unchanged_body_is_not_decoded_again(self):
+        self.server.honour_validators = False
+        first = self.client.get_token_info(TOKEN)
+        self.expire()
+        self.assertIs(self.client.get_token_info(TOKEN), first)
+        self.assertEqual(self.outcomes(), {"miss": 1, "unchanged": 1})
+
+    def test_changed_body_replaces_entry(self):
+        self.client.get_token_info(TOKEN)
+        self.expire()
+        self.server.body, self.server.etag = {"price": 2}, '"v2"'
+        self.assertEqual(self.client.get_token_info(TOKEN), {"price": 2})
+        self.assertEqual(self.outcomes(), {"miss": 2})
+        self.expire()
+        self.client.get_token_info(TOKEN)
+        self.assertEqual(self.server.requests[-1]["If-None-Match"], '"v2"')
+
+    def test_no_store_is_not_cached(self):
+        self.server.cache_control = "no-store"
+        self.client.get_token_info(TOKEN)
+        self.client.get_token_info(TOKEN)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(len(self.client.cache), 0)
+
+    def test_headers_without_validators_are_not_changed(self):
+        self.client.get_token_info(TOKEN)
+        self.assertNotIn("If-None-Match", self.client.headers)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def test_least_recently_used_is_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        for key in "abc":
+            cache.put(key, CacheEntry(key, b"", None, None, 60))
+            if key == "b":
+                cache.get("a")
+        self.assertEqual(sorted(cache._entries), ["a", "c"])
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Tests for cassette record and replay
+"""
+
+import gc
+import json
+import os
+import tempfile
+import unittest
+import weakref
+
+import requests
+from requests.adapters import BaseAdapter
+
+from solana_detective import SolanaDetective
+from solana_detective.addresses import b58encode
+from solana_detective.cassette import AUTO, RECORD, REPLAY, Cassette, CassetteAdapter, _open_cassettes, request_key
+from solana_detective.exceptions import CassetteError
+
+TOKEN = b58encode(bytes([3]) * 32)
+
+
+class _FakeAdapter(BaseAdapter):
+    """Answers every request with a numbered JSON body"""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append(request.url)
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response.headers["X-Private"] = "dropped"
+        response._content = json.dumps({"n": len(self.sent), "url": request.url}).encode()
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def prepare(method: str, url: str, **kwargs) -> requests.PreparedRequest:
+    return requests.Request(method, url, **kwargs).prepare()
+
+
+class RequestKeyTest(unittest.TestCase):
+    def test_host_and_param_order_are_ignored(self):
+        self.assertEqual(request_key("get", "https://a.io/tokens/x?page=2&limit=100"),
+                         request_key("GET", "http://localhost:8080/tokens/x?limit=100&page=2"))
+        self.assertEqual(request_key("GET", "https://a.io/tokens/x?limit=100&page=2"),
+                         "GET /tokens/x?limit=100&page=2")
+        self.assertNotEqual(request_key("GET", "https://a.io/tokens/x?page=1"),
+                            request_key("GET", "https://a.io/tokens/x?page=2"))
+
+    def test_json_bodies_are_canonicalized(self):
+        first = request_key("POST", "https://a.io/tokens/multi", b'{"tokens": ["a", "b"], "x": 1}')
+        second = request_key("POST", "https://a.io/tokens/multi", '{"x":1,"tokens":["a","b"]}')
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, request_key("POST", "https://a.io/tokens/multi", b'{"tokens": ["b", "a"]}'))
+
+
+class CassetteTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "run.json.gz")
+
+    def record(self, urls, mode=RECORD):
+        fake = _FakeAdapter()
+        with Cassette(self.path, mode) as cassette:
+            adapter = CassetteAdapter(cassette, fake)
+            bodies = [adapter.send(prepare("GET", url)).json() for url in urls]
+        return fake, bodies
+
+    def test_replay_returns_recorded_responses_in_order(self):
+        urls = ["https://a.io/price?token=x", "https://a.io/price?token=x", "https://a.io/tokens/y"]
+        _, recorded = self.record(urls)
+        with Cassette(self.path, REPLAY) as cassette:
+            adapter = CassetteAdapter(cassette, _FakeAdapter())
+            replayed = [adapter.send(prepare("GET", url.replace("a.io", "b.io"))) for url in urls + urls[:1]]
+            self.assertEqual([response.json() for response in replayed], recorded + recorded[1:2])
+            self.assertNotIn("X-Private", replayed[0].headers)
+            self.assertEqual(cassette.stats()["hits"], 4)
+            with self.assertRaises(CassetteError):
+                adapter.send(prepare("GET", "https://a.io/tokens/z"))
+
+    def test_auto_records_only_misses(self):
+        self.record(["https://a.io/tokens/y"])
+        fake, bodies = self.record(["https://a.io/tokens/y", "https://a.io/tokens/z"], mode=AUTO)
+        self.assertEqual(fake.sent, ["https://a.io/tokens/z"])
+        self.assertEqual(len(Cassette(self.path, REPLAY)), 2)
+
+    def test_missing_file_in_replay_mode(self):
+        with self.assertRaises(CassetteError):
+            Cassette(self.path, REPLAY)
+
+    def test_client_saves_and_closes_its_cassette(self):
+        client = SolanaDetective(api_key="k", rate_limit_delay=0, cassette=self.path, cassette_mode=RECORD)
+        client.session.get_adapter(client.config.get("base_url")).adapter = _FakeAdapter()
+        client.get_token_info(TOKEN)
+        cassette = client.cassette
+        self.assertIn(cassette, _open_cassettes)
+        client.close()
+        self.assertNotIn(cassette, _open_cassettes)
+
+        replay = SolanaDetective(cassette=self.path, cassette_mode=REPLAY)
+        self.assertEqual(replay.get_token_info(TOKEN)["n"], 1)
+
+    def test_unreferenced_cassettes_are_not_kept_alive(self):
+        cassette = Cassette(self.path, RECORD)
+        reference = weakref.ref(cassette)
+        del cassette
+        gc.collect()
+        self.assertIsNone(reference())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Tests for holder snapshots, concentration metrics and diffs
+"""
+
+import math
+import random
+import unittest
+
+from solana_detective.addresses import AddressTable, b58encode
+from solana_detective.analysis import HolderSnapshot
+
+TOKEN = b58encode(bytes([5]) * 32)
+WALLETS = [b58encode(bytes([7]) + i.to_bytes(31, "big")) for i in range(60)]
+
+
+def random_holders(rng: random.Random, count: int):
+    """Holder records, some wallets listed twice (several token accounts)"""
+    return [{"wallet": rng.choice(WALLETS), "amount": float(rng.choice((0, rng.randint(1, 10 ** 6))))}
+            for _ in range(count)]
+
+
+def balances(holders):
+    result = {}
+    for holder in holders:
+        result[holder["wallet"]] = result.get(holder["wallet"], 0.0) + holder["amount"]
+    return result
+
+
+class ConcentrationTest(unittest.TestCase):
+    def test_metrics_match_reference(self):
+        rng = random.Random(8)
+        holders = random_holders(rng, 120)
+        snapshot = HolderSnapshot.from_holders(TOKEN, holders, reported_total=120)
+        expected = balances(holders)
+        self.assertEqual(dict(zip(snapshot.addresses, snapshot.balances.tolist())), expected)
+
+        values = sorted(expected.values(), reverse=True)
+        total = sum(values)
+        positive = [value for value in values if value > 0]
+        # Mean absolute difference definition of the Gini coefficient
+        gini = (sum(abs(a - b) for a in positive for b in positive) /
+                (2 * len(positive) ** 2 * (sum(positive) / len(positive))))
+        metrics = snapshot.concentration(top=(1, 10, 100))
+        self.assertEqual(metrics["holders"], len(positive))
+        self.assertEqual(metrics["reported_total"], 120)
+        self.assertAlmostEqual(metrics["gini"], gini)
+        self.assertAlmostEqual(metrics["hhi"], sum((value / total) ** 2 for value in values))
+        self.assertAlmostEqual(metrics["top_1_share"], values[0] / total)
+        self.assertAlmostEqual(metrics["top_10_share"], sum(values[:10]) / total)
+        self.assertEqual(metrics["top_100_share"], 1.0)
+        top = snapshot.top(5)
+        self.assertEqual(top["balance"].tolist(), values[:5])
+        self.assertEqual([expected[wallet] for wallet in top["wallet"]], values[:5])
+
+    def test_empty_and_equal_distributions(self):
+        empty = HolderSnapshot.from_holders(TOKEN, [])
+        self.assertEqual((empty.gini(), empty.hhi(), empty.top_share(10)), (0.0, 0.0, 0.0))
+        equal = HolderSnapshot.from_holders(TOKEN, [{"address": wallet, "amount": 5} for wallet in WALLETS[:4]])
+        self.assertAlmostEqual(equal.gini(), 0.0)
+        self.assertAlmostEqual(equal.hhi(), 0.25)
+
+
+class DiffTest(unittest.TestCase):
+    def test_diff_matches_reference(self):
+        rng = random.Random(9)
+        table = AddressTable()
+        old_holders, new_holders = random_holders(rng, 80), random_holders(rng, 80)
+        before = HolderSnapshot.from_holders(TOKEN, old_holders, table)
+        after = HolderSnapshot.from_holders(TOKEN, new_holders, table)
+        diff = after.diff(before)
+        old, new = balances(old_holders), balances(new_holders)
+        changes = {wallet: (old.get(wallet, 0.0), new.get(wallet, 0.0)) for wallet in set(old) | set(new)
+                   if old.get(wallet, 0.0) != new.get(wallet, 0.0)}
+        self.assertEqual(dict(zip(diff.table.lookup(diff.ids), zip(diff.before.tolist(), diff.after.tolist()))),
+                         changes)
+
+        growth = sorted((after - before for before, after in changes.values() if after > before), reverse=True)
+        self.assertEqual(diff.accumulators()["change"].tolist(), growth)
+        self.assertEqual(diff.accumulators(limit=3)["change"].tolist(), growth[:3])
+        shrink = sorted(after - before for before, after in changes.values() if after < before)
+        self.assertEqual(diff.distributors()["change"].tolist(), shrink)
+        self.assertEqual(sorted(diff.new_holders()["wallet"]),
+                         sorted(wallet for wallet, (b, a) in changes.items() if b <= 0 < a))
+        self.assertEqual(sorted(diff.exited()["wallet"]),
+                         sorted(wallet for wallet, (b, a) in changes.items() if a <= 0 < b))
+        summary = diff.summary()
+        self.assertEqual(summary["changed"], len(changes))
+        self.assertTrue(math.isclose(summary["net_change"], sum(new.values()) - sum(old.values())))
+
+    def test_snapshots_must_share_a_table(self):
+        first = HolderSnapshot.from_holders(TOKEN, [{"wallet": WALLETS[0], "amount": 1}])
+        second = HolderSnapshot.from_holders(TOKEN, [{"wallet": WALLETS[0], "amount": 2}])
+        with self.assertRaises(ValueError):
+            second.diff(first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Tests for lineage graphs and the deployer crawl
+"""
+
+import random
+import unittest
+
+from solana_detective import SolanaDetective
+from solana_detective.addresses import AddressTable, b58encode
+from solana_detective.analysis import LineageCrawler, LineageGraph
+from solana_detective.analysis.lineage import DEPLOYED, TOKEN_NODE, WALLET_NODE
+
+
+def address(kind: int, i: int) -> str:
+    return b58encode(bytes([kind]) + i.to_bytes(31, "big"))
+
+
+def union_find_labels(size: int, edges):
+    parent = list(range(size))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in edges:
+        parent[find(a)] = find(b)
+    return [find(i) for i in range(size)]
+
+
+class LineageGraphTest(unittest.TestCase):
+    def random_graph(self, seed: int, size: int, edges: int):
+        rng = random.Random(seed)
+        table = AddressTable()
+        ids = table.intern_many([address(8, i) for i in range(size)])
+        src = [rng.randrange(size) for _ in range(edges)]
+        dst = [rng.randrange(size) for _ in range(edges)]
+        kinds = [rng.randrange(3) for _ in range(edges)]
+        graph = LineageGraph(table, ids, [i % 2 for i in range(size)], [0] * size, src, dst, kinds)
+        return graph, list(zip(src, dst, kinds))
+
+    def test_components_match_union_find(self):
+        for size, edges in ((1, 0), (50, 20), (300, 250), (300, 600)):
+            with self.subTest(size=size, edges=edges):
+                graph, edge_list = self.random_graph(size + edges, size, edges)
+                reference = union_find_labels(size, [(a, b) for a, b, _ in edge_list])
+                labels = graph.component_labels().tolist()
+                # Same partition, numbered by first node
+                self.assertEqual(len(set(zip(labels, reference))), len(set(reference)))
+                self.assertEqual(len(set(labels)), len(set(reference)))
+                first_seen = list(dict.fromkeys(labels))
+                self.assertEqual(first_seen, sorted(first_seen))
+
+    def test_neighbors_and_duplicate_edges(self):
+        graph, edge_list = self.random_graph(1, 40, 120)
+        self.assertEqual(graph.edge_count, len(set(edge_list)))
+        for node in range(40):
+            expected = sorted({b for a, b, _ in edge_list if a == node} | {a for a, b, _ in edge_list if b == node})
+            self.assertEqual(graph.neighbor_nodes(node).tolist(), expected)
+            deployed = sorted({b for a, b, kind in edge_list if a == node and kind == DEPLOYED} |
+                              {a for a, b, kind in edge_list if b == node and kind == DEPLOYED})
+            self.assertEqual(graph.neighbor_nodes(node, "deployed").tolist(), deployed)
+        with self.assertRaises(ValueError):
+            graph.neighbor_nodes(0, "nope")
+        with self.assertRaises(KeyError):
+            graph.neighbors(address(9, 0))
+
+
+class LineageCrawlerTest(unittest.TestCase):
+    def setUp(self):
+        self.client = SolanaDetective(api_key="k", rate_limit_delay=0)
+        self.deployers = [address(1, i) for i in range(3)]
+        self.tokens = {
+            self.deployers[0]: [address(2, i) for i in range(600)],
+            self.deployers[1]: [address(3, i) for i in range(2)],
+            self.deployers[2]: [],
+        }
+        self.buyer = address(4, 0)
+        # The first buyer of deployer 1's first token deploys too
+        self.tokens[self.buyer] = [address(5, 0)]
+        self.calls = []
+        self.client.get_deployer_tokens = self.deployer_tokens
+        self.client.get_first_buyers = self.first_buyers
+        self.client.get_top_traders_token = lambda token, **kwargs: []
+
+    def deployer_tokens(self, wallet, page=1, limit=250):
+        self.calls.append(("get_deployer_tokens", wallet, page))
+        mints = self.tokens[wallet][(page - 1) * limit:page * limit]
+        return {"tokens": [{"mint": mint} for mint in mints]}
+
+    def first_buyers(self, token, limit=100):
+        self.calls.append(("get_first_buyers", token, None))
+        if token == self.tokens[self.deployers[1]][1]:
+            raise RuntimeError("boom")
+        return [{"wallet": self.buyer}] if token == self.tokens[self.deployers[1]][0] else []
+
+    def test_every_deployer_page_is_read_and_charged(self):
+        graph = LineageCrawler(self.client, max_depth=0, credit_budget=100).crawl(self.deployers)
+        pages = sorted(page for name, wallet, page in self.calls if wallet == self.deployers[0])
+        self.assertEqual(pages, [1, 2, 3])
+        self.assertEqual(len(graph.neighbors(self.deployers[0], "deployed")), 600)
+        self.assertEqual(graph.credits_used, len(self.calls))
+        self.assertFalse(graph.truncated)
+
+    def test_budget_cuts_pages_short(self):
+        graph = LineageCrawler(self.client, max_depth=0, credit_budget=4).crawl(self.deployers)
+        self.assertEqual(graph.credits_used, len(self.calls))
+        self.assertEqual(graph.credits_used, 4)
+        self.assertTrue(graph.truncated)
+        graph = LineageCrawler(self.client, max_depth=0, deployer_pages=2).crawl(self.deployers[:1])
+        self.assertEqual(len(graph.neighbors(self.deployers[0])), 500)
+
+    def test_crawl_follows_first_buyers_and_records_errors(self):
+        crawler = LineageCrawler(self.client, max_depth=1, top_traders=False)
+        graph = crawler.crawl(self.deployers[1:])
+        self.assertEqual(graph.neighbors(self.buyer, "first_buyer"), [self.tokens[self.deployers[1]][0]])
+        self.assertEqual(graph.neighbors(self.buyer, "deployed"), self.tokens[self.buyer])
+        self.assertEqual([(name, token) for name, token, _ in graph.errors],
+                         [("get_first_buyers", self.tokens[self.deployers[1]][1])])
+        cluster, = graph.clusters(min_deployers=2)
+        self.assertEqual(sorted(cluster["deployers"]), sorted([self.deployers[1], self.buyer]))
+        # Depth 1 stops before the buyer's own tokens are explored further
+        self.assertNotIn(("get_first_buyers", self.tokens[self.buyer][0], None), self.calls)
+        self.assertEqual(graph.kinds[graph.node(self.buyer)], WALLET_NODE)
+        self.assertEqual(graph.kinds[graph.node(self.tokens[self.buyer][0])], TOKEN_NODE)
+        self.assertEqual(int(graph.depths[graph.node(self.buyer)]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for latency histograms and metrics export
+"""
+
+import json
+import random
+import unittest
+
+from solana_detective.metrics import PROMETHEUS_BUCKETS, LatencyHistogram, MetricsRegistry
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_buckets_cover_every_value_within_one_percent(self):
+        values = list(range(20000)) + [random.Random(1).randrange(1 << 40) for _ in range(20000)]
+        for micros in values:
+            index = LatencyHistogram._index(micros)
+            upper = LatencyHistogram._upper_bound(index)
+            self.assertGreaterEqual(upper, micros)
+            self.assertLessEqual(upper - micros, micros / 64)
+            # The previous bucket ends just below this value's bucket
+            if index:
+                self.assertLess(LatencyHistogram._upper_bound(index - 1), micros)
+
+    def test_indices_are_dense_and_increasing(self):
+        indices = [LatencyHistogram._index(micros) for micros in range(1 << 16)]
+        steps = {b - a for a, b in zip(indices, indices[1:])}
+        self.assertEqual(steps, {0, 1})
+
+    def test_percentiles_match_sorted_samples(self):
+        rng = random.Random(2)
+        samples = [rng.lognormvariate(-3, 1.5) for _ in range(10000)]
+        histogram = LatencyHistogram()
+        for sample in samples:
+            histogram.record(sample)
+        ordered = sorted(samples)
+        for percentile in (1, 50, 90, 99, 99.9, 100):
+            expected = ordered[max(1, round(percentile / 100 * len(ordered))) - 1]
+            with self.subTest(percentile=percentile):
+                self.assertAlmostEqual(histogram.percentile(percentile), expected, delta=expected / 64 + 1e-6)
+        summary = histogram.summary()
+        self.assertEqual(summary["count"], len(samples))
+        self.assertAlmostEqual(summary["mean"], sum(samples) / len(samples))
+        self.assertEqual((summary["min"], summary["max"]), (ordered[0], ordered[-1]))
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+    def test_cumulative_counts(self):
+        rng = random.Random(3)
+        samples = [rng.uniform(0, 0.3) for _ in range(5000)]
+        histogram = LatencyHistogram()
+        for sample in samples:
+            histogram.record(sample)
+        # Exported buckets are exact, bound included
+        samples += list(PROMETHEUS_BUCKETS)
+        for bound in PROMETHEUS_BUCKETS:
+            histogram.record(bound)
+        self.assertEqual(histogram.cumulative(),
+                         [sum(sample <= bound for sample in samples) for bound in PROMETHEUS_BUCKETS])
+        # Other bounds come from the log-linear buckets
+        bounds = (0.001, 0.0333, 0.2)
+        for bound, count in zip(bounds, histogram.cumulative(bounds)):
+            # A bucket straddling the bound is counted above it
+            self.assertLessEqual(count, sum(sample <= bound for sample in samples))
+            self.assertGreaterEqual(count, sum(sample <= bound * 63 / 64 for sample in samples))
+
+
+class MetricsRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        for latency, status in ((0.004, 200), (0.02, 200), (0.3, 503), (2.0, 200)):
+            self.registry.record_attempt("get", "/tokens/{token}", status, latency, queue_wait=0.001)
+        self.registry.record_attempt("GET", "/tokens/{token}", None, 5.0, error="timeout")
+        self.registry.record_retry("GET", "/tokens/{token}")
+        self.registry.record_body("GET", "/tokens/{token}", 1000, 0.002, wire_size=250, encoding="gzip")
+        self.registry.record_cache("GET", '/search "q"', "hit")
+
+    def test_snapshot_and_json(self):
+        snapshot = json.loads(self.registry.to_json(extra={"scheduler": {"queued": 0}}))
+        self.assertEqual(snapshot["scheduler"], {"queued": 0})
+        endpoint = snapshot["endpoints"]["GET /tokens/{token}"]
+        self.assertEqual(endpoint["requests"], 5)
+        self.assertEqual(endpoint["status_codes"], {"200": 3, "503": 1})
+        self.assertEqual(endpoint["errors"], {"timeout": 1})
+        self.assertEqual(endpoint["retries"], 1)
+        self.assertEqual(endpoint["compression_ratio"], 4.0)
+        self.assertEqual(endpoint["content_encodings"], {"gzip": 1})
+        self.assertEqual(endpoint["latency"]["count"], 5)
+        self.registry.reset()
+        self.assertEqual(self.registry.snapshot(), {})
+
+    def test_prometheus_histogram(self):
+        text = self.registry.to_prometheus(prefix="sd")
+        labels = 'method="GET",endpoint="/tokens/{token}"'
+        buckets = [int(line.rsplit(" ", 1)[1]) for line in text.splitlines()
+                   if line.startswith(f"sd_request_latency_seconds_bucket{{{labels}")]
+        # 5.0 falls in le="5.0" itself
+        expected = [sum(latency <= bound for latency in (0.004, 0.02, 0.3, 2.0, 5.0)) for bound in PROMETHEUS_BUCKETS]
+        self.assertEqual(buckets, expected + [5])
+        self.assertIn(f"sd_requests_total{{{labels},status=\"503\"}} 1", text)
+        self.assertIn(f"sd_request_latency_seconds_count{{{labels}}} 5", text)
+        self.assertIn('sd_cache_total{method="GET",endpoint="/search \\"q\\"",outcome="hit"} 1', text)
+        self.assertIn("# TYPE sd_request_latency_seconds histogram", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
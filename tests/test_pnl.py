@@ -0,0 +1,120 @@
+"""
+Tests for cohort PnL rollups against a brute-force reference
+"""
+
+import math
+import random
+import unittest
+
+from solana_detective import SolanaDetective
+from solana_detective.addresses import b58encode
+from solana_detective.analysis import CohortPnL
+
+DAY = 86400 * 1000
+WALLETS = [b58encode(bytes([12]) + i.to_bytes(31, "big")) for i in range(15)]
+TOKENS = [b58encode(bytes([13]) + i.to_bytes(31, "big")) for i in range(8)]
+
+
+def random_record(rng: random.Random):
+    realized, unrealized = rng.uniform(-50, 50), rng.uniform(-50, 50)
+    return {"realized": realized, "unrealized": unrealized, "total": realized + unrealized,
+            "total_invested": rng.choice((0, rng.uniform(1, 100))), "current_value": rng.uniform(0, 100),
+            "holding": rng.uniform(0, 10), "first_buy_time": 1_750_000_000_000 + rng.randrange(10 * DAY),
+            "last_trade_time": 1_750_000_000_000 + rng.randrange(10 * DAY)}
+
+
+class CohortPnLTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(13)
+        self.pnl = CohortPnL()
+        # (wallet, token) -> (cohort, record); adding a pair again replaces it
+        self.positions = {}
+        for _ in range(200):
+            wallet, token = rng.choice(WALLETS), rng.choice(TOKENS)
+            cohort = "whales" if WALLETS.index(wallet) < 5 else rng.choice(("retail", None))
+            record = random_record(rng)
+            self.pnl.add_position(wallet, token, record, cohort)
+            self.positions[(wallet, token)] = (cohort, record)
+
+    def reference(self, key, cohort=None):
+        groups = {}
+        for (wallet, token), (position_cohort, record) in self.positions.items():
+            if cohort is not None and position_cohort != cohort:
+                continue
+            group = key(wallet, token, position_cohort, record)
+            if group is None:
+                continue
+            row = groups.setdefault(group, {"positions": 0, "wallets": set(), "wins": 0, "total": 0.0,
+                                            "invested": 0.0, "realized": 0.0})
+            row["positions"] += 1
+            row["wallets"].add(wallet)
+            row["wins"] += record["total"] > 0
+            row["total"] += record["total"]
+            row["invested"] += record["total_invested"]
+            row["realized"] += record["realized"]
+        return groups
+
+    def assert_rollup(self, result, level, expected):
+        self.assertEqual(sorted(result[level]), sorted(expected))
+        for i, group in enumerate(result[level]):
+            row = expected[group]
+            self.assertEqual(result["positions"][i], row["positions"])
+            self.assertEqual(result["wallets"][i], len(row["wallets"]))
+            self.assertEqual(result["wins"][i], row["wins"])
+            self.assertAlmostEqual(result["total"][i], row["total"])
+            self.assertAlmostEqual(result["realized"][i], row["realized"])
+            roi = row["total"] / row["invested"] if row["invested"] > 0 else math.nan
+            self.assertTrue(math.isclose(result["roi"][i], roi) or (math.isnan(roi) and math.isnan(result["roi"][i])))
+
+    def test_rollups_match_reference(self):
+        self.assertEqual(len(self.pnl), len(self.positions))
+        self.assert_rollup(self.pnl.by_token(), "token", self.reference(lambda w, t, c, r: t))
+        self.assert_rollup(self.pnl.by_wallet(cohort="whales"), "wallet",
+                           self.reference(lambda w, t, c, r: w, cohort="whales"))
+        self.assert_rollup(self.pnl.by_cohort(), "cohort", self.reference(lambda w, t, c, r: c))
+        with self.assertRaises(KeyError):
+            self.pnl.by_token(cohort="nope")
+
+    def test_by_window_matches_reference(self):
+        result = self.pnl.by_window("1d", time="last_trade_time")
+        first = min(record["last_trade_time"] for _, record in self.positions.values()) // DAY * DAY
+        expected = self.reference(lambda w, t, c, r: int((r["last_trade_time"] - first) // DAY))
+        self.assertEqual(result["start"][0], first)
+        for bucket, start in enumerate(result["start"].tolist()):
+            row = expected.get(bucket, {"positions": 0, "total": 0.0})
+            self.assertEqual(result["positions"][bucket], row["positions"], start)
+            self.assertAlmostEqual(result["total"][bucket], row["total"])
+
+    def test_by_window_needs_times(self):
+        pnl = CohortPnL()
+        pnl.add_wallet(WALLETS[0], {"tokens": {TOKENS[0]: {"realized": 1.0, "total": 1.0}}})
+        with self.assertRaises(ValueError):
+            pnl.by_window("1d")
+        self.assertEqual(len(CohortPnL().by_window("1d")["start"]), 0)
+
+    def test_leaderboard(self):
+        board = self.pnl.leaderboard("wallet", sort="total", limit=5, min_invested=50)
+        expected = self.reference(lambda w, t, c, r: w)
+        kept = sorted((row["total"] for row in expected.values() if row["invested"] >= 50), reverse=True)[:5]
+        for value, expected_value in zip(board["total"].tolist(), kept):
+            self.assertAlmostEqual(value, expected_value)
+        with self.assertRaises(ValueError):
+            self.pnl.leaderboard(sort="wallet")
+
+    def test_fetch_wallet_pnl(self):
+        client = SolanaDetective(api_key="k", rate_limit_delay=0)
+
+        def wallet_pnl(wallet, **kwargs):
+            if wallet == WALLETS[1]:
+                raise RuntimeError("boom")
+            return {"tokens": {TOKENS[0]: {"total": 2.0}, TOKENS[1]: {"total": -1.0}, "bad": {"total": 9.0}}}
+
+        client.get_wallet_pnl = wallet_pnl
+        pnl = CohortPnL(client)
+        self.assertEqual(pnl.fetch(WALLETS[:3], cohort="c"), 4)
+        self.assertEqual(list(pnl.errors), [WALLETS[1]])
+        self.assertEqual(pnl.by_cohort()["total"].tolist(), [2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Tests for portfolio history balances and valuation
+"""
+
+import random
+import unittest
+
+from solana_detective.addresses import b58encode
+from solana_detective.analysis import PortfolioHistory
+from solana_detective.analysis.portfolio import QUOTE_TOKENS
+
+HOUR = 3600 * 1000
+SOL = QUOTE_TOKENS[0]
+WALLET = b58encode(bytes([1]) * 32)
+TOKEN = b58encode(bytes([2]) * 32)
+
+
+def trade(time: float, paid: str, paid_amount: float, received: str, received_amount: float, tx: str = None):
+    return {"tx": tx, "time": time, "from": {"address": paid, "amount": paid_amount},
+            "to": {"address": received, "amount": received_amount}, "volume": {"usd": 10.0}}
+
+
+def floored_balances(deltas):
+    """Running balance that never goes below zero, one bucket at a time"""
+    balance, result = 0.0, []
+    for delta in deltas:
+        balance = max(balance + delta, 0.0)
+        result.append(balance)
+    return result
+
+
+class BalanceTest(unittest.TestCase):
+    def test_receipts_after_selling_holdings_from_before_the_history(self):
+        portfolio = PortfolioHistory()
+        # Sell 5 tokens held before the history for 1 SOL, then buy 3 back for 2 SOL
+        portfolio.add_trades(WALLET, [trade(0, TOKEN, 5, SOL, 1, "a"), trade(HOUR, SOL, 2, TOKEN, 3, "b")])
+        positions = portfolio.positions(WALLET, interval="1h")
+        balances = dict(zip(positions["token"], positions["balance"].tolist()))
+        self.assertEqual(balances[TOKEN], [0.0, 3.0])
+        self.assertEqual(balances[SOL], [1.0, 0.0])
+
+    def test_matches_bucket_by_bucket_reference(self):
+        rng = random.Random(7)
+        tokens = [b58encode(bytes([10 + i]) * 32) for i in range(4)]
+        trades = []
+        for i in range(300):
+            paid, received = rng.sample(tokens, 2)
+            trades.append(trade(rng.randrange(24) * HOUR + rng.randrange(HOUR), paid, rng.randint(1, 9),
+                                received, rng.randint(1, 9), str(i)))
+        portfolio = PortfolioHistory(quote_tokens=())
+        portfolio.add_trades(WALLET, trades)
+        positions = portfolio.positions(WALLET, interval="1h", start=0, end=24 * HOUR - 1)
+        for token, balance in zip(positions["token"], positions["balance"].tolist()):
+            deltas = [0.0] * 24
+            for record in trades:
+                bucket = int(record["time"] // HOUR)
+                if record["from"]["address"] == token:
+                    deltas[bucket] -= record["from"]["amount"]
+                if record["to"]["address"] == token:
+                    deltas[bucket] += record["to"]["amount"]
+            self.assertEqual(balance, floored_balances(deltas))
+
+    def test_value_uses_last_candle_before_bucket_end(self):
+        portfolio = PortfolioHistory()
+        portfolio.add_trades(WALLET, [trade(0, SOL, 1, TOKEN, 10, "a")])
+        # Candle times are seconds; the 90 minute candle prices the second bucket
+        portfolio.add_candles(TOKEN, [{"time": 0, "close": 2.0}, {"time": 5400, "close": 3.0}])
+        portfolio.add_candles(SOL, [{"time": 0, "close": 100.0}])
+        curve = portfolio.history(WALLET, interval="1h", start=0, end=2 * HOUR)
+        self.assertEqual(curve["value"].tolist(), [20.0, 30.0, 30.0])
+        self.assertEqual(curve["risk_value"].tolist(), [20.0, 30.0, 30.0])
+        self.assertEqual(curve["drawdown"].tolist(), [0.0, 0.0, 0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
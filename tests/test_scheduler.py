@@ -0,0 +1,64 @@
+"""
+Tests for the request scheduler's fair queueing
+"""
+
+import unittest
+
+from solana_detective.scheduler import RequestScheduler, _Waiter
+
+
+def dispatch_order(scheduler: RequestScheduler, count: int):
+    """Tenants of the next `count` dispatched requests"""
+    order = []
+    with scheduler._lock:
+        for _ in range(count):
+            waiter = scheduler._peek()
+            scheduler._dispatch(waiter)
+            order.append(waiter.tenant)
+    return order
+
+
+class TenantFairnessTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = RequestScheduler(rate_limit_delay=0)
+
+    def enqueue(self, tenant: str, count: int, lane: str = "interactive"):
+        with self.scheduler._lock:
+            for _ in range(count):
+                self.scheduler._enqueue(_Waiter(lane, tenant))
+
+    def test_new_tenant_interleaves_with_old_one(self):
+        for lane in ("interactive", "batch"):
+            with self.subTest(lane=lane):
+                self.scheduler = RequestScheduler(rate_limit_delay=0)
+                self.enqueue("a", 100, lane)
+                self.assertEqual(dispatch_order(self.scheduler, 100), ["a"] * 100)
+
+                self.enqueue("a", 50, lane)
+                self.enqueue("b", 50, lane)
+                order = dispatch_order(self.scheduler, 100)
+                # Neither tenant waits for the other's whole backlog
+                self.assertEqual(order[:20].count("a"), 10)
+                self.assertEqual(order[:20].count("b"), 10)
+                self.assertEqual(sorted(order), ["a"] * 50 + ["b"] * 50)
+
+    def test_returning_tenant_gets_no_credit_for_idle_time(self):
+        self.enqueue("a", 30)
+        dispatch_order(self.scheduler, 30)
+        self.enqueue("b", 30)
+        dispatch_order(self.scheduler, 10)
+        # "a" comes back while "b" is still busy: it shares from now on
+        self.enqueue("a", 10)
+        order = dispatch_order(self.scheduler, 10)
+        self.assertIn(order.count("a"), (4, 5, 6))
+
+    def test_tenant_weights(self):
+        self.scheduler.tenant_weights = {"heavy": 3}
+        self.enqueue("light", 40)
+        self.enqueue("heavy", 40)
+        order = dispatch_order(self.scheduler, 40)
+        self.assertEqual(order.count("heavy"), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
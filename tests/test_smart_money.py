@@ -0,0 +1,203 @@
+"""
+Tests for the smart-money index against a brute-force reference
+"""
+
+import math
+import os
+import random
+import tempfile
+import unittest
+
+from solana_detective import SolanaDetective
+from solana_detective.addresses import b58encode
+from solana_detective.analysis import SmartMoneyIndex
+from solana_detective.analysis.smart_money import DOWNSIDE_FLOOR
+
+WALLETS = [b58encode(bytes([14]) + i.to_bytes(31, "big")) for i in range(40)]
+TOKENS = [b58encode(bytes([15]) + i.to_bytes(31, "big")) for i in range(10)]
+
+
+def random_tokens(rng: random.Random):
+    """PnL per token of one trader, at least one priced position"""
+    tokens = {}
+    for token in rng.sample(TOKENS, rng.randint(1, 8)):
+        tokens[token] = {"total_invested": rng.choice((0, rng.uniform(1, 100))), "total": rng.uniform(-80, 120)}
+    tokens[TOKENS[0]] = {"total_invested": rng.uniform(1, 100), "total": rng.uniform(-80, 120)}
+    return tokens
+
+
+def random_summary(rng: random.Random):
+    realized, unrealized = rng.uniform(-500, 500), rng.uniform(-500, 500)
+    return {"realized": realized, "unrealized": unrealized, "total": realized + unrealized,
+            "totalInvested": rng.uniform(10, 1000), "totalWins": rng.randint(0, 20),
+            "totalLosses": rng.randint(0, 20)}
+
+
+def reference_stats(tokens):
+    rois = [p["total"] / p["total_invested"] for p in tokens.values() if p["total_invested"] > 0]
+    totals = [p["total"] for p in tokens.values()]
+    mean = sum(rois) / len(rois)
+    gross_profit = sum(max(total, 0.0) for total in totals)
+    return {
+        "positions": len(rois),
+        "token_wins": sum(roi > 0 for roi in rois),
+        "mean_roi": mean,
+        "std_roi": math.sqrt(sum((roi - mean) ** 2 for roi in rois) / len(rois)),
+        "downside": math.sqrt(sum(min(roi, 0.0) ** 2 for roi in rois) / len(rois)),
+        "gross_profit": gross_profit,
+        "gross_loss": sum(max(-total, 0.0) for total in totals),
+        "top_profit": max(0.0, max(totals)),
+    }
+
+
+def reference_percentiles(values):
+    """Rank / (n - 1) with NaN lowest and ties in row order"""
+    order = sorted(range(len(values)), key=lambda i: (-math.inf if math.isnan(values[i]) else values[i], i))
+    ranks = [0.0] * len(values)
+    for position, i in enumerate(order):
+        ranks[i] = position / (len(values) - 1)
+    return ranks
+
+
+class FakeApi:
+    """Top-trader pages and per-wallet PnL and holdings, counting enrichment calls"""
+
+    def __init__(self, seed: int, page_size: int = 15):
+        rng = random.Random(seed)
+        self.page_size = page_size
+        self.listed = list(WALLETS[:35])
+        self.summaries = {wallet: random_summary(rng) for wallet in WALLETS}
+        self.tokens = {wallet: random_tokens(rng) for wallet in WALLETS}
+        self.holdings = {wallet: rng.uniform(0, 5000) for wallet in WALLETS}
+        self.failing = set()
+        self.enriched = []
+
+    def attach(self, client: SolanaDetective) -> SolanaDetective:
+        client.get_top_traders_all = self.top_traders
+        client.get_wallet_pnl = self.wallet_pnl
+        client.get_wallet_basic = self.wallet_basic
+        return client
+
+    def top_traders(self, page=None, **kwargs):
+        # Past the end the list wraps around to the first page
+        start = (page - 1) * self.page_size % len(self.listed)
+        wallets = self.listed[start:start + self.page_size]
+        return {"wallets": [{"wallet": wallet, "summary": dict(self.summaries[wallet])} for wallet in wallets]
+                + [{"wallet": "not-a-wallet", "summary": {}}]}
+
+    def wallet_pnl(self, wallet, **kwargs):
+        self.enriched.append(wallet)
+        return {"tokens": self.tokens[wallet]}
+
+    def wallet_basic(self, wallet, **kwargs):
+        if wallet in self.failing:
+            raise RuntimeError("boom")
+        return {"total": self.holdings[wallet]}
+
+
+class SmartMoneyIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeApi(14)
+        self.client = self.api.attach(SolanaDetective(api_key="k", rate_limit_delay=0))
+        self.index = SmartMoneyIndex(self.client)
+        self.counts = self.index.refresh(max_workers=4)
+
+    def test_refresh_enriches_every_listed_trader(self):
+        self.assertEqual(self.counts, {"traders": 35, "new": 35, "changed": 35, "enriched": 35, "errors": 0})
+        self.assertEqual(self.index.wallets, self.api.listed)
+        self.assertEqual(sorted(self.api.enriched), sorted(self.api.listed))
+        for wallet in self.api.listed:
+            values = self.index.get(wallet)
+            summary = self.api.summaries[wallet]
+            self.assertEqual(values["realized"], summary["realized"])
+            self.assertEqual(values["wins"], summary["totalWins"])
+            self.assertEqual(values["holdings_value"], self.api.holdings[wallet])
+            self.assertTrue(values["listed"])
+            for name, expected in reference_stats(self.api.tokens[wallet]).items():
+                self.assertAlmostEqual(values[name], expected, msg=name)
+
+    def test_scores_match_reference(self):
+        scores = self.index.scores(weights={"total": 2.0, "consistency": 1.0})
+        stats = [reference_stats(self.api.tokens[wallet]) for wallet in self.index.wallets]
+        risk = [s["mean_roi"] / max(s["downside"], DOWNSIDE_FLOOR) * math.sqrt(s["positions"]) for s in stats]
+        consistency = [(s["token_wins"] + 1) / (s["positions"] + 2) *
+                       (1.0 - (s["top_profit"] / s["gross_profit"] if s["gross_profit"] > 0 else 1.0))
+                       for s in stats]
+        totals = [self.api.summaries[wallet]["total"] for wallet in self.index.wallets]
+        for i in range(len(stats)):
+            self.assertAlmostEqual(scores["risk_adjusted"][i], risk[i])
+            self.assertAlmostEqual(scores["consistency"][i], consistency[i])
+        expected = [(2 * a + b) / 3 for a, b in zip(reference_percentiles(totals),
+                                                    reference_percentiles(consistency))]
+        for value, expected_value in zip(scores["score"].tolist(), expected):
+            self.assertAlmostEqual(value, expected_value)
+        with self.assertRaises(ValueError):
+            self.index.scores(weights={"nope": 1.0})
+
+    def test_rank_filters_and_sorts(self):
+        top = self.index.rank(sort="risk_adjusted", limit=10, min_positions=3)
+        kept = [wallet for wallet in self.index.wallets if reference_stats(self.api.tokens[wallet])["positions"] >= 3]
+        self.assertEqual(len(top["wallet"]), min(10, len(kept)))
+        self.assertTrue(set(top["wallet"]) <= set(kept))
+        values = top["risk_adjusted"].tolist()
+        self.assertEqual(values, sorted(values, reverse=True))
+        with self.assertRaises(ValueError):
+            self.index.rank(sort="listed")
+
+    def test_only_changed_traders_are_enriched_again(self):
+        realized, unrealized, dropped = self.api.listed[0], self.api.listed[1], self.api.listed[2]
+        self.api.summaries[realized]["realized"] += 1.0
+        self.api.summaries[unrealized]["unrealized"] += 7.0
+        self.api.listed.remove(dropped)
+        self.api.listed.extend(WALLETS[35:])
+        self.api.enriched.clear()
+        counts = self.index.refresh()
+        self.assertEqual(counts, {"traders": 39, "new": 5, "changed": 6, "enriched": 6, "errors": 0})
+        self.assertEqual(sorted(self.api.enriched), sorted([realized] + WALLETS[35:]))
+        # Unrealized PnL moves with prices and is stored without enrichment
+        self.assertEqual(self.index.get(unrealized)["unrealized"], self.api.summaries[unrealized]["unrealized"])
+        self.assertFalse(self.index.get(dropped)["listed"])
+        self.assertNotIn(dropped, self.index.rank()["wallet"])
+        self.assertIn(dropped, self.index.rank(listed=False)["wallet"])
+        self.assertEqual(len(self.index), 40)
+
+    def test_failures_are_kept_and_retried(self):
+        wallet = self.api.listed[4]
+        self.api.summaries[wallet]["totalLosses"] += 1
+        self.api.failing.add(wallet)
+        counts = self.index.refresh()
+        self.assertEqual((counts["changed"], counts["enriched"], counts["errors"]), (1, 0, 1))
+        self.assertEqual(list(self.index.errors), [wallet])
+        # The stored fingerprint did not move, so the next refresh retries
+        self.api.failing.clear()
+        self.api.enriched.clear()
+        counts = self.index.refresh()
+        self.assertEqual((counts["changed"], counts["enriched"], counts["errors"]), (1, 1, 0))
+        self.assertEqual(self.api.enriched, [wallet])
+        self.assertEqual(self.index.errors, {})
+        self.assertEqual(self.index.get(wallet)["losses"], self.api.summaries[wallet]["totalLosses"])
+        self.assertEqual(self.index.refresh()["changed"], 0)
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "smart_money.json.gz")
+            self.index.save(path)
+            loaded = SmartMoneyIndex.load(path, self.client)
+            self.assertEqual(loaded.wallets, self.index.wallets)
+            for name, column in self.index.columns.items():
+                self.assertEqual(loaded.columns[name].dtype, column.dtype)
+                self.assertEqual(loaded.columns[name].tolist(), column.tolist())
+            self.api.enriched.clear()
+            self.assertEqual(loaded.refresh()["changed"], 0)
+            self.assertEqual(self.api.enriched, [])
+            self.assertEqual(len(SmartMoneyIndex.load(os.path.join(directory, "missing.json.gz"))), 0)
+            with self.assertRaises(FileNotFoundError):
+                SmartMoneyIndex.load(os.path.join(directory, "missing.json.gz"), missing_ok=False)
+
+    def test_refresh_needs_a_client(self):
+        with self.assertRaises(ValueError):
+            SmartMoneyIndex().refresh()
+
+
+if __name__ == "__main__":
+    unittest.main()
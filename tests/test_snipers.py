@@ -0,0 +1,124 @@
+"""
+Tests for the first-buyer index against a brute-force reference
+"""
+
+import math
+import random
+import unittest
+
+from solana_detective import SolanaDetective
+from solana_detective.addresses import b58encode
+from solana_detective.analysis import SniperIndex
+
+WALLETS = [b58encode(bytes([10]) + i.to_bytes(31, "big")) for i in range(30)]
+TOKENS = [b58encode(bytes([11]) + i.to_bytes(31, "big")) for i in range(12)]
+
+
+def random_launches(seed: int):
+    rng = random.Random(seed)
+    launches = {}
+    for token in TOKENS:
+        buyers = []
+        for wallet in rng.sample(WALLETS, rng.randint(0, 15)) + rng.sample(WALLETS, 2):
+            time = None if rng.random() < 0.1 else 1_000_000 + rng.randrange(50_000)
+            buyers.append({"wallet": wallet, "first_buy_time": time, "total_invested": rng.randint(1, 100)})
+        launches[token] = buyers
+    return launches
+
+
+def reference_entries(buyers):
+    """(wallet, rank, delay, invested) of one launch: by time, unknown times last, first listing kept"""
+    order = sorted(range(len(buyers)), key=lambda i: (buyers[i]["first_buy_time"] is None,
+                                                      buyers[i]["first_buy_time"] or 0))
+    times = [buyer["first_buy_time"] for buyer in buyers if buyer["first_buy_time"] is not None]
+    entries, seen = [], set()
+    for i in order:
+        buyer = buyers[i]
+        if buyer["wallet"] in seen:
+            continue
+        seen.add(buyer["wallet"])
+        time = buyer["first_buy_time"]
+        delay = time - min(times) if time is not None else math.nan
+        entries.append((buyer["wallet"], len(entries), delay, buyer["total_invested"]))
+    return entries
+
+
+class SniperIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.launches = random_launches(12)
+        self.index = SniperIndex()
+        for token, buyers in self.launches.items():
+            self.index.add(token, buyers)
+        self.entries = {token: reference_entries(buyers) for token, buyers in self.launches.items()}
+
+    def test_buyers_and_launches_of(self):
+        for token, entries in self.entries.items():
+            self.assertEqual(self.index.buyers_of(token), [wallet for wallet, *_ in entries])
+        wallet = WALLETS[3]
+        expected = sorted(((token, rank) for token, entries in self.entries.items()
+                           for entry_wallet, rank, _, _ in entries if entry_wallet == wallet),
+                          key=lambda item: item[1])
+        launches = self.index.launches_of(wallet)
+        self.assertEqual(sorted(zip(launches["token"], launches["rank"].tolist())), sorted(expected))
+        self.assertEqual(launches["rank"].tolist(), sorted(launches["rank"].tolist()))
+        self.assertEqual(self.index.launches_of(TOKENS[0])["token"], [])
+        with self.assertRaises(KeyError):
+            self.index.buyers_of(WALLETS[0])
+
+    def test_rank_wallets_matches_reference(self):
+        ranked = self.index.rank_wallets(min_launches=2, early_rank=5, sort="score")
+        stats = {}
+        for entries in self.entries.values():
+            for wallet, rank, delay, invested in entries:
+                row = stats.setdefault(wallet, {"launches": 0, "early": 0, "best": rank, "score": 0.0,
+                                                "delays": [], "invested": 0})
+                row["launches"] += 1
+                row["early"] += rank < 5
+                row["best"] = min(row["best"], rank)
+                row["score"] += 1 / (1 + rank)
+                row["invested"] += invested
+                if not math.isnan(delay):
+                    row["delays"].append(delay)
+        kept = {wallet: row for wallet, row in stats.items() if row["launches"] >= 2}
+        self.assertEqual(sorted(ranked["wallet"]), sorted(kept))
+        for i, wallet in enumerate(ranked["wallet"]):
+            row = kept[wallet]
+            self.assertEqual(ranked["launches"][i], row["launches"])
+            self.assertEqual(ranked["early_launches"][i], row["early"])
+            self.assertEqual(ranked["best_rank"][i], row["best"])
+            self.assertAlmostEqual(ranked["score"][i], row["score"])
+            self.assertEqual(ranked["invested"][i], row["invested"])
+            if row["delays"]:
+                self.assertAlmostEqual(ranked["mean_delay_ms"][i], sum(row["delays"]) / len(row["delays"]))
+        self.assertEqual(ranked["score"].tolist(), sorted(ranked["score"].tolist(), reverse=True))
+        with self.assertRaises(ValueError):
+            self.index.rank_wallets(sort="nope")
+
+    def test_overlap(self):
+        tokens = TOKENS[:4]
+        buyers = [{wallet for wallet, *_ in self.entries[token]} for token in tokens]
+        self.assertEqual(sorted(self.index.overlap(tokens)), sorted(set.intersection(*buyers)))
+        at_least_two = {wallet for wallet in WALLETS if sum(wallet in group for group in buyers) >= 2}
+        self.assertEqual(sorted(self.index.overlap(tokens, min_launches=2)), sorted(at_least_two))
+
+    def test_fetch_skips_indexed_launches_and_keeps_errors(self):
+        client = SolanaDetective(api_key="k", rate_limit_delay=0)
+        requested = []
+
+        def first_buyers(token, limit=100):
+            requested.append(token)
+            if token == TOKENS[2]:
+                raise RuntimeError("boom")
+            return self.launches[token]
+
+        client.get_first_buyers = first_buyers
+        index = SniperIndex(client)
+        index.add(TOKENS[0], self.launches[TOKENS[0]])
+        self.assertEqual(index.fetch(TOKENS[:3]), 1)
+        self.assertEqual(sorted(requested), sorted(TOKENS[1:3]))
+        self.assertEqual(list(index.errors), [TOKENS[2]])
+        self.assertEqual(index.buyers_of(TOKENS[1]), self.index.buyers_of(TOKENS[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
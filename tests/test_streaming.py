@@ -0,0 +1,97 @@
+"""
+Tests for incremental JSON parsing and streamed responses
+"""
+
+import json
+import unittest
+
+from solana_detective import SolanaDetective
+from solana_detective.streaming import iter_array_items
+
+BODIES = [
+    [],
+    [1, 2.25, -3e-7, True, None, "x"],
+    [{"wallet": "Ünïcødé ✓ 🚀", "amount": 12345.678}, {"nested": [[1], {"a": []}]}, "\\\"]"],
+    {"accounts": [{"id": i, "balance": i * 1.5} for i in range(50)], "total": 50, "page": {"next": None}},
+    {"total": 0, "accounts": []},
+    {},
+]
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def reference(body, keys=None):
+    """Elements and other members of a body, from json.loads"""
+    if isinstance(body, list):
+        return [(None, item) for item in body], {}
+    items, meta = [], {}
+    for key, value in body.items():
+        if isinstance(value, list) and (keys is None or key in keys):
+            items += [(key, item) for item in value]
+        else:
+            meta[key] = value
+    return items, meta
+
+
+class IterArrayItemsTest(unittest.TestCase):
+    def test_matches_json_loads_for_any_chunking(self):
+        for body in BODIES:
+            for indent in (None, 2):
+                data = json.dumps(body, indent=indent, ensure_ascii=False).encode()
+                for size in (1, 2, 7, len(data) or 1):
+                    with self.subTest(body=body, indent=indent, size=size):
+                        meta = {}
+                        items = list(iter_array_items(chunked(data, size), meta=meta))
+                        self.assertEqual((items, meta), reference(body))
+
+    def test_selected_keys_only(self):
+        body = {"a": [1, 2], "b": [3], "total": 3}
+        data = json.dumps(body).encode()
+        for size in (1, 2, 7):
+            with self.subTest(size=size):
+                meta = {}
+                items = list(iter_array_items(chunked(data, size), keys={"b"}, meta=meta))
+                self.assertEqual((items, meta), reference(body, keys={"b"}))
+
+    def test_number_split_across_chunks(self):
+        self.assertEqual(list(iter_array_items([b"[3", b".", b"25,1", b"0]"])), [(None, 3.25), (None, 10)])
+
+    def test_malformed_bodies(self):
+        for data in (b"", b"3", b"[1, 2", b"[1 2]", b'{"a": [1]', b"[1] x", b'{1: [2]}'):
+            for size in (1, 7):
+                with self.subTest(data=data, size=size):
+                    with self.assertRaises(ValueError):
+                        list(iter_array_items(chunked(data, size)))
+
+
+class _Response:
+    headers = {}
+
+    def __init__(self, status_code: int, body: bytes = b""):
+        self.status_code = status_code
+        self.body = body
+        self.closed = False
+        self.raw = None
+
+    def iter_content(self, chunk_size=1):
+        return iter(chunked(self.body, 3))
+
+    def close(self):
+        self.closed = True
+
+
+class StreamRetryTest(unittest.TestCase):
+    def test_retried_responses_are_closed(self):
+        client = SolanaDetective(api_key="k", rate_limit_delay=0, retry_delay=0, max_retries=3)
+        responses = [_Response(503), _Response(502), _Response(200, b'{"tokens": [1, 2]}')]
+        sent = list(responses)
+        client.session.request = lambda **kwargs: sent.pop(0)
+        items = list(client._stream_items("/tokens/multi/all"))
+        self.assertEqual(items, [("tokens", 1), ("tokens", 2)])
+        self.assertEqual([response.closed for response in responses], [True, True, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
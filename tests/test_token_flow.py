@@ -0,0 +1,109 @@
+"""
+Tests for token flow analytics against brute-force references
+"""
+
+import math
+import random
+import unittest
+
+from solana_detective.analysis import TokenFlow
+from solana_detective.events import EventColumns
+
+MINUTE = 60 * 1000
+T0 = 1_760_000_000_000
+
+
+def random_events(seed: int, count: int = 400):
+    rng = random.Random(seed)
+    wallets = [f"wallet{i}" for i in range(25)]
+    events = []
+    for _ in range(count):
+        amount = rng.uniform(1, 1000)
+        price = rng.uniform(0.5, 2.0)
+        events.append({"wallet": rng.choice(wallets), "amount": amount, "priceUsd": price,
+                       "volume": amount * price, "type": rng.choice(("buy", "sell")),
+                       "time": T0 + rng.randrange(60 * MINUTE)})
+    return events
+
+
+def close(actual, expected):
+    if expected is None or (isinstance(expected, float) and math.isnan(expected)):
+        return actual is None or math.isnan(actual)
+    return math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-9)
+
+
+class TokenFlowTest(unittest.TestCase):
+    def setUp(self):
+        self.records = random_events(11)
+        # Events arrive unordered; the reference works in time order
+        self.ordered = sorted(self.records, key=lambda event: event["time"])
+        self.flow = TokenFlow(EventColumns.from_records(self.records))
+
+    def test_rolling_windows_match_reference(self):
+        for k in (1, 5):
+            with self.subTest(window=k):
+                result = self.flow.windows("1m", window=f"{k}m")
+                for row, start in enumerate(result["start"].tolist()):
+                    inside = [event for event in self.ordered if start <= event["time"] < start + k * MINUTE]
+                    buys = [event for event in inside if event["type"] == "buy"]
+                    sells = [event for event in inside if event["type"] == "sell"]
+                    buy_volume = sum(event["volume"] for event in buys)
+                    sell_volume = sum(event["volume"] for event in sells)
+                    traded = sum(event["amount"] for event in inside)
+                    expected = {
+                        "trades": len(inside),
+                        "buys": len(buys),
+                        "sells": len(sells),
+                        "buyers": len({event["wallet"] for event in buys}),
+                        "sellers": len({event["wallet"] for event in sells}),
+                        "wallets": len({event["wallet"] for event in inside}),
+                        "buy_volume": buy_volume,
+                        "sell_volume": sell_volume,
+                        "net_volume": buy_volume - sell_volume,
+                        "pressure": (buy_volume - sell_volume) / (buy_volume + sell_volume) if inside else None,
+                        "vwap": sum(e["priceUsd"] * e["amount"] for e in inside) / traded if inside else None,
+                        "open": inside[0]["priceUsd"] if inside else None,
+                        "close": inside[-1]["priceUsd"] if inside else None,
+                    }
+                    for name, value in expected.items():
+                        self.assertTrue(close(float(result[name][row]), value), (k, row, name))
+
+    def test_summary_matches_reference(self):
+        now = T0 + 60 * MINUTE
+        summary = self.flow.summary(windows=("5m", "1h"), now=now)
+        for label, span in (("5m", 5 * MINUTE), ("1h", 60 * MINUTE)):
+            inside = [event for event in self.ordered if now - span <= event["time"] < now]
+            stats = summary[label]
+            self.assertEqual(stats["transactions"], len(inside))
+            self.assertEqual(stats["buyers"], len({e["wallet"] for e in inside if e["type"] == "buy"}))
+            self.assertTrue(close(stats["volume"]["sells"], sum(e["volume"] for e in inside if e["type"] == "sell")))
+            self.assertEqual(stats["price"], inside[-1]["priceUsd"])
+
+    def test_wallet_flow_matches_reference(self):
+        flow = self.flow.wallet_flow(sort="net_volume")
+        net = {}
+        for event in self.records:
+            sign = 1 if event["type"] == "buy" else -1
+            net[event["wallet"]] = net.get(event["wallet"], 0.0) + sign * event["volume"]
+        self.assertEqual(sorted(flow["wallet"]), sorted(net))
+        for wallet, value in zip(flow["wallet"], flow["net_volume"].tolist()):
+            self.assertTrue(close(value, net[wallet]))
+        self.assertEqual(flow["net_volume"].tolist(), sorted(flow["net_volume"].tolist(), reverse=True))
+        with self.assertRaises(ValueError):
+            self.flow.wallet_flow(sort="nope")
+
+    def test_large_trades_and_vwap(self):
+        large = self.flow.large_trades(min_volume=1000, limit=5)
+        expected = sorted((e["volume"] for e in self.records if e["volume"] >= 1000), reverse=True)[:5]
+        self.assertEqual(list(large.volume), expected)
+        traded = sum(e["amount"] for e in self.records)
+        self.assertTrue(close(self.flow.vwap(), sum(e["priceUsd"] * e["amount"] for e in self.records) / traded))
+        self.assertIsNone(self.flow.vwap(start=0, end=1))
+
+    def test_window_must_be_a_multiple_of_the_interval(self):
+        with self.assertRaises(ValueError):
+            self.flow.windows("2m", window="3m")
+
+
+if __name__ == "__main__":
+    unittest.main()
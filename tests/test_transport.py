@@ -0,0 +1,90 @@
+"""
+Tests for the pooled transport against a local HTTP server
+"""
+
+import gzip
+import http.server
+import json
+import threading
+import time
+import unittest
+
+import requests
+
+from solana_detective.transport import PooledAdapter, PoolSettings, new_session, wire_size
+
+BODY = gzip.compress(json.dumps(list(range(5000))).encode())
+CHUNK = 1000
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Serves BODY gzipped, with a Content-Length or (on /chunked) in CHUNK-byte chunks"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        if self.path != "/chunked":
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+            return
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i in range(0, len(BODY), CHUNK):
+            part = BODY[i:i + CHUNK]
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+class TransportTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_wire_size_counts_body_bytes_before_decoding(self):
+        session = new_session(PooledAdapter())
+        self.addCleanup(session.close)
+        chunks = [BODY[i:i + CHUNK] for i in range(0, len(BODY), CHUNK)]
+        # Chunk framing: size line and CRLF per chunk, then the last-chunk line and CRLF
+        framed = sum(len(b"%x\r\n\r\n" % len(chunk)) + len(chunk) for chunk in chunks) + len(b"0\r\n\r\n")
+        for _ in range(2):  # the second round reuses the pooled connection
+            response = session.get(self.url)
+            self.assertEqual(response.content, gzip.decompress(BODY))
+            self.assertEqual(wire_size(response), len(BODY))
+            response = session.get(self.url + "chunked")
+            self.assertEqual(response.content, gzip.decompress(BODY))
+            self.assertEqual(wire_size(response), framed)
+        response = session.get(self.url + "chunked", stream=True)
+        self.assertEqual(sum(len(chunk) for chunk in response.iter_content(100)), len(gzip.decompress(BODY)))
+        self.assertEqual(wire_size(response), framed)
+
+    @unittest.skipUnless(hasattr(PooledAdapter, "get_connection_with_tls_context"), "requires requests >= 2.32")
+    def test_warm_up_skips_slots_in_use_when_the_pool_blocks(self):
+        adapter = PooledAdapter(PoolSettings(maxsize=4, block=True))
+        self.addCleanup(adapter.close)
+        self.assertEqual(adapter.warm_up(self.url, 4), 4)
+        self.assertEqual(adapter.warm_up(self.url, 4), 0)
+        pool = adapter.get_connection_with_tls_context(requests.Request("GET", self.url).prepare(), True)
+        held = [pool._get_conn() for _ in range(4)]
+        started = time.perf_counter()
+        self.assertEqual(adapter.warm_up(self.url, 4), 0)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        for conn in held:
+            pool._put_conn(conn)
+        self.assertEqual(pool.stats()["idle"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
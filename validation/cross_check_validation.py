@@ -14,6 +14,7 @@ from typing import Dict, List, Set, Any
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from solana_detective import SolanaDetective
+from solana_detective.endpoints import ENDPOINTS
 
 class CrossCheckValidator:
     """Validates package implementation against official API documentation"""
@@ -117,10 +118,8 @@ class CrossCheckValidator:
         """Validate that all official endpoints are implemented"""
         print("🔍 VALIDATING ENDPOINT COVERAGE...")
         
-        # Get implemented methods from our client
-        detective = SolanaDetective(api_key="dummy_key_for_validation")
-        implemented_methods = [method for method in dir(detective) 
-                             if not method.startswith('_') and callable(getattr(detective, method))]
+        # Get implemented methods from the endpoint registry
+        implemented_methods = set(ENDPOINTS)
         
         # Check coverage
         total_endpoints = len(self.official_endpoints)
@@ -332,21 +331,12 @@ class CrossCheckValidator:
                 except Exception as e:
                     orthography_issues.append(f"{file_path}: Read error - {e}")
         
-        # Check for consistent naming
-        if os.path.exists("solana_detective/client.py"):
-            try:
-                with open("solana_detective/client.py", "r") as f:
-                    content = f.read()
-                
-                # Check method naming consistency
-                method_pattern = r"def (get_|post_|search_|health_)"
-                methods = re.findall(method_pattern, content)
-                
-                if len(methods) < 30:  # Should have many methods
-                    orthography_issues.append("client.py: Insufficient method definitions found")
-                    
-            except Exception as e:
-                orthography_issues.append(f"client.py: Analysis error - {e}")
+        # Check method naming consistency (endpoint methods are generated from the registry)
+        method_pattern = r"^(get_|post_|search_)"
+        methods = [name for name in ENDPOINTS if re.match(method_pattern, name)]
+        
+        if len(methods) < 30:  # Should have many methods
+            orthography_issues.append("endpoints.py: Insufficient endpoint definitions found")
         
         result = {
             "orthography_issues": orthography_issues,
@@ -4,12 +4,18 @@ Quality Control Validator for Solana Detective Package
 Validates endpoint coverage, code quality, and functionality
 """
 
+import re
 import json
 import inspect
 import sys
 import os
 from typing import Dict, List, Any, Tuple
 from solana_detective.client import SolanaDetective
+from solana_detective.endpoints import ENDPOINTS
+
+def normalize_route(route: str) -> str:
+    """Route with placeholder names dropped ("GET /tokens/{tokenAddress}" -> "GET /tokens/{}")"""
+    return re.sub(r"\{[^}]+\}", "{}", route)
 
 class QualityControlValidator:
     """Comprehensive quality control validator"""
@@ -19,63 +25,9 @@ class QualityControlValidator:
         with open('QUALITY_CHECKED_SOLANA_API_DOCS.json', 'r') as f:
             self.api_docs = json.load(f)
         
-        # Method to endpoint mapping
+        # Method to endpoint mapping, straight from the endpoint registry
         self.method_endpoint_mapping = {
-            # Token Endpoints
-            "get_token_info": "GET /tokens/{tokenAddress}",
-            "get_tokens_by_pool": "GET /tokens/by-pool/{poolAddress}",
-            "get_token_holders": "GET /tokens/{tokenAddress}/holders",
-            "get_token_holders_top": "GET /tokens/{tokenAddress}/holders/top",
-            "get_token_ath": "GET /tokens/{tokenAddress}/ath",
-            "get_deployer_tokens": "GET /deployer/{wallet}",
-            "search_tokens": "GET /search",
-            "get_latest_tokens": "GET /tokens/latest",
-            "get_tokens_multi": "POST /tokens/multi",
-            "get_trending_tokens": "GET /tokens/trending",  # Also covers GET /tokens/trending/{timeframe}
-            "get_tokens_by_volume": "GET /tokens/volume",   # Also covers GET /tokens/volume/{timeframe}
-            "get_tokens_multi_all": "GET /tokens/multi/all",
-            "get_tokens_multi_graduated": "GET /tokens/multi/graduated",
-            
-            # Price Endpoints
-            "get_token_price": "GET /price",
-            "get_price_history": "GET /price/history",
-            "get_price_at_timestamp": "GET /price/history/timestamp",
-            "get_price_range": "GET /price/history/range",
-            "post_token_price": "POST /price",
-            "get_multiple_token_prices": "GET /price/multi",
-            "post_multiple_token_prices": "POST /price/multi",
-            
-            # Wallet Endpoints
-            "get_wallet_tokens": "GET /wallet/{owner}",
-            "get_wallet_basic": "GET /wallet/{owner}/basic",
-            "get_wallet_page": "GET /wallet/{owner}/page/{page}",
-            "get_wallet_trades": "GET /wallet/{owner}/trades",
-            "get_wallet_chart": "GET /wallet/{owner}/chart",
-            
-            # Trade Endpoints
-            "get_pool_trades": "GET /trades/{tokenAddress}/{poolAddress}",
-            "get_wallet_token_trades": "GET /trades/{tokenAddress}/{poolAddress}/{owner}",
-            "get_token_wallet_trades": "GET /trades/{tokenAddress}/by-wallet/{owner}",
-            
-            # Chart Data Endpoints
-            "get_chart_data": ["GET /chart/{token}", "GET /chart/{token}/{pool}"],  # Handles both
-            "get_holders_chart": "GET /holders/chart/{token}",
-            
-            # PnL Data Endpoints
-            "get_wallet_pnl": "GET /pnl/{wallet}",
-            "get_first_buyers": "GET /first-buyers/{token}",
-            "get_wallet_token_pnl": "GET /pnl/{wallet}/{token}",
-            
-            # Top Traders Endpoints
-            "get_top_traders_all": ["GET /top-traders/all", "GET /top-traders/all/{page}"],  # Handles both
-            "get_top_traders_token": "GET /top-traders/{token}",
-            
-            # Stats and Events Endpoints
-            "get_token_stats": ["GET /stats/{token}", "GET /stats/{token}/{pool}"],  # Handles both
-            "get_live_events": ["GET /events/{tokenAddress}", "GET /events/{tokenAddress}/{poolAddress}"],  # Handles both
-            
-            # Credits Endpoint
-            "get_credits": "GET /credits"
+            name: endpoint.routes for name, endpoint in ENDPOINTS.items()
         }
         
     def validate_endpoint_coverage(self) -> Dict[str, Any]:
@@ -84,15 +36,12 @@ class QualityControlValidator:
         print("=" * 50)
         
         # Get all expected endpoints
-        expected_endpoints = set(self.api_docs['endpoints'].keys())
+        expected_endpoints = {normalize_route(route) for route in self.api_docs['endpoints']}
         
         # Get all covered endpoints
         covered_endpoints = set()
-        for method_name, endpoint_mapping in self.method_endpoint_mapping.items():
-            if isinstance(endpoint_mapping, list):
-                covered_endpoints.update(endpoint_mapping)
-            else:
-                covered_endpoints.add(endpoint_mapping)
+        for method_name, routes in self.method_endpoint_mapping.items():
+            covered_endpoints.update(normalize_route(route) for route in routes)
         
         # Find missing and extra endpoints
         missing_endpoints = expected_endpoints - covered_endpoints
@@ -196,9 +145,11 @@ class QualityControlValidator:
         print("\n🔍 ERROR HANDLING VALIDATION")
         print("=" * 50)
         
-        # Read client.py to check error handling patterns
-        with open('solana_detective/client.py', 'r') as f:
-            client_code = f.read()
+        # Read client.py and the endpoint registry to check error handling patterns
+        client_code = ""
+        for path in ('solana_detective/client.py', 'solana_detective/endpoints.py'):
+            with open(path, 'r') as f:
+                client_code += f.read()
         
         error_patterns = {
             "try_except_blocks": client_code.count("try:"),